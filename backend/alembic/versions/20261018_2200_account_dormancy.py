@@ -0,0 +1,50 @@
+"""account dormancy
+
+Add accounts.last_activity_at and accounts.dormant_since, backfill the last
+activity from existing transactions and create the partial index used by
+the dormancy sweep.
+
+Revision ID: a25ad941e504
+Revises:
+Create Date: 2026-10-18 22:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a25ad941e504"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases created by create_all_tables already have these
+    op.execute("ALTER TABLE accounts ADD COLUMN IF NOT EXISTS last_activity_at TIMESTAMP WITHOUT TIME ZONE")
+    op.execute("ALTER TABLE accounts ADD COLUMN IF NOT EXISTS dormant_since TIMESTAMP WITHOUT TIME ZONE")
+
+    # One-time backfill; afterwards the column is maintained on posting
+    op.execute("""
+        UPDATE accounts a
+        SET last_activity_at = coalesce(t.last_activity, a.created_at)
+        FROM (
+            SELECT a2.id, max(t2.created_at) AS last_activity
+            FROM accounts a2
+            LEFT JOIN transactions t2 ON t2.account_id = a2.id
+            GROUP BY a2.id
+        ) t
+        WHERE a.id = t.id AND a.last_activity_at IS NULL
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_accounts_dormancy
+        ON accounts (last_activity_at, id)
+        WHERE is_active AND dormant_since IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_accounts_dormancy")
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS dormant_since")
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS last_activity_at")
@@ -0,0 +1,122 @@
+"""partition transactions
+
+Create transactions_partitioned, hash-partitioned on account_id, and keep it
+in sync with transactions through a trigger. Existing rows are copied and
+the tables swapped online by scripts/partition_transactions.py:
+
+    python scripts/partition_transactions.py backfill
+    python scripts/partition_transactions.py verify
+    python scripts/partition_transactions.py cutover
+    python scripts/partition_transactions.py drop-old
+
+Databases created by create_all_tables are already partitioned and are
+left alone. Downgrade is only possible before the cutover.
+
+Revision ID: 5c1f0e7d9b42
+Revises: a25ad941e504
+Create Date: 2026-10-18 23:00:00
+
+"""
+from alembic import op
+
+from app.config.settings import settings
+from app.db.partitioning import hash_partitions_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = "5c1f0e7d9b42"
+down_revision = "a25ad941e504"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "created_at", "updated_at", "id", "transaction_type", "amount", "currency",
+    "description", "reference_id", "status", "recipient_account_id", "account_id",
+)
+
+
+def _is_partitioned() -> bool:
+    return op.get_bind().exec_driver_sql(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('transactions')"
+    ).scalar() or False
+
+
+def upgrade() -> None:
+    if _is_partitioned():
+        return
+
+    # Application code upserts on (reference_id, account_id) before and after the cutover
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS transactions_reference_id_account_id_key
+            ON transactions (reference_id, account_id)
+        """)
+
+    # INCLUDING DEFAULTS shares transactions_id_seq with the current table
+    op.execute("""
+        CREATE TABLE transactions_partitioned (LIKE transactions INCLUDING DEFAULTS)
+        PARTITION BY HASH (account_id)
+    """)
+    for statement in hash_partitions_ddl(
+        "transactions_partitioned", settings.TRANSACTION_PARTITIONS, name="transactions",
+    ):
+        op.execute(statement)
+
+    op.execute("""
+        ALTER TABLE transactions_partitioned
+        ADD CONSTRAINT transactions_partitioned_pkey PRIMARY KEY (id, account_id)
+    """)
+    op.execute("""
+        ALTER TABLE transactions_partitioned
+        ADD CONSTRAINT uq_transactions_partitioned_reference_id_account_id UNIQUE (reference_id, account_id)
+    """)
+    op.execute("CREATE INDEX ix_transactions_partitioned_reference_id ON transactions_partitioned (reference_id)")
+    op.execute("""
+        CREATE INDEX ix_transactions_partitioned_account_id_created_at
+        ON transactions_partitioned (account_id, created_at)
+    """)
+    op.execute("""
+        ALTER TABLE transactions_partitioned
+        ADD CONSTRAINT transactions_partitioned_account_id_fkey
+        FOREIGN KEY (account_id) REFERENCES accounts (id)
+    """)
+    op.execute("""
+        ALTER TABLE transactions_partitioned
+        ADD CONSTRAINT transactions_partitioned_recipient_account_id_fkey
+        FOREIGN KEY (recipient_account_id) REFERENCES accounts (id)
+    """)
+
+    # The trigger holds the latest version of a row, so it overwrites what
+    # the backfill copied; the backfill never overwrites
+    columns = ", ".join(COLUMNS)
+    new_values = ", ".join(f"NEW.{column}" for column in COLUMNS)
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in COLUMNS)
+    op.execute(f"""
+        CREATE FUNCTION transactions_sync_partitioned() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.account_id <> NEW.account_id) THEN
+                DELETE FROM transactions_partitioned WHERE id = OLD.id AND account_id = OLD.account_id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            INSERT INTO transactions_partitioned ({columns}) VALUES ({new_values})
+            ON CONFLICT (id, account_id) DO UPDATE SET {updates};
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER transactions_sync_partitioned
+        AFTER INSERT OR UPDATE OR DELETE ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transactions_sync_partitioned()
+    """)
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        raise RuntimeError("transactions was already swapped for the partitioned table")
+    op.execute("DROP TRIGGER IF EXISTS transactions_sync_partitioned ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS transactions_sync_partitioned()")
+    op.execute("DROP TABLE IF EXISTS transactions_partitioned")
+    op.execute("DROP INDEX IF EXISTS transactions_reference_id_account_id_key")
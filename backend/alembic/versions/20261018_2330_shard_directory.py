@@ -0,0 +1,55 @@
+"""shard directory
+
+Create user_shards and account_directory on the primary database and fill
+the directory from the existing accounts, so lookups keep working once
+SHARD_DATABASES is set. User placements are recorded afterwards with
+scripts/rebalance_shards.py pin.
+
+Revision ID: 8d3b6a2f1c70
+Revises: 5c1f0e7d9b42
+Create Date: 2026-10-18 23:30:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8d3b6a2f1c70"
+down_revision = "5c1f0e7d9b42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases created by create_all_tables already have these
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS user_shards (
+            user_id INTEGER PRIMARY KEY REFERENCES users (id),
+            shard VARCHAR(50) NOT NULL,
+            moving BOOLEAN NOT NULL DEFAULT false,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS account_directory (
+            account_id INTEGER PRIMARY KEY,
+            account_number VARCHAR(20) NOT NULL,
+            user_id INTEGER NOT NULL REFERENCES users (id)
+        )
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_account_directory_account_number "
+        "ON account_directory (account_number)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_account_directory_user_id ON account_directory (user_id)")
+
+    op.execute("""
+        INSERT INTO account_directory (account_id, account_number, user_id)
+        SELECT id, account_number, user_id FROM accounts
+        ON CONFLICT (account_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS account_directory")
+    op.execute("DROP TABLE IF EXISTS user_shards")
@@ -0,0 +1,49 @@
+"""transaction segments
+
+Create the catalog of archived transaction months written by
+scripts/archive_transactions.py.
+
+Revision ID: 3e9a4c6d2b18
+Revises: 8d3b6a2f1c70
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3e9a4c6d2b18"
+down_revision = "8d3b6a2f1c70"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases created by create_all_tables already have these
+    op.execute("""
+        DO $$ BEGIN
+            CREATE TYPE segmentstatus AS ENUM ('VERIFIED', 'SERVING', 'PURGED');
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS transaction_segments (
+            id SERIAL PRIMARY KEY,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            month DATE NOT NULL,
+            shard VARCHAR(50) NOT NULL DEFAULT '',
+            path VARCHAR(255) NOT NULL,
+            row_count INTEGER NOT NULL,
+            amount_total BIGINT NOT NULL,
+            checksum VARCHAR(64) NOT NULL,
+            status segmentstatus NOT NULL DEFAULT 'VERIFIED',
+            CONSTRAINT uq_transaction_segments_month_shard UNIQUE (month, shard)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_transaction_segments_id ON transaction_segments (id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS transaction_segments")
+    op.execute("DROP TYPE IF EXISTS segmentstatus")
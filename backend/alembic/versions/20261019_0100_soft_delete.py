@@ -0,0 +1,55 @@
+"""soft delete
+
+Add deleted_at to users and accounts, and give the foreign keys to users
+and accounts the ON DELETE behavior the retention purge relies on:
+audit logs keep their rows without the user, idempotency keys and shard
+placements go with it, and transfers keep their rows without a purged
+recipient account.
+
+Revision ID: 6b2f8e1a9c43
+Revises: 3e9a4c6d2b18
+Create Date: 2026-10-19 01:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "6b2f8e1a9c43"
+down_revision = "3e9a4c6d2b18"
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = (
+    ("audit_logs", "user_id", "users", "SET NULL"),
+    ("idempotency_keys", "user_id", "users", "CASCADE"),
+    ("user_shards", "user_id", "users", "CASCADE"),
+    ("transactions", "recipient_account_id", "accounts", "SET NULL"),
+)
+
+
+def _replace_foreign_key(table: str, column: str, referenced: str, action: str) -> None:
+    name = f"{table}_{column}_fkey"
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+        f"FOREIGN KEY ({column}) REFERENCES {referenced} (id) ON DELETE {action}"
+    )
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases created by create_all_tables already have these
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITHOUT TIME ZONE")
+    op.execute("ALTER TABLE accounts ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITHOUT TIME ZONE")
+
+    for table, column, referenced, action in FOREIGN_KEYS:
+        _replace_foreign_key(table, column, referenced, action)
+
+
+def downgrade() -> None:
+    for table, column, referenced, _ in FOREIGN_KEYS:
+        _replace_foreign_key(table, column, referenced, "NO ACTION")
+
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS deleted_at")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS deleted_at")
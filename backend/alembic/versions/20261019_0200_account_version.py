@@ -0,0 +1,28 @@
+"""account version
+
+Add the version column bumped by every write to an account, which the
+account cache uses to tell a fresh snapshot from a stale one and the ORM
+uses for optimistic locking.
+
+Revision ID: 9d4c2a7e5f16
+Revises: 6b2f8e1a9c43
+Create Date: 2026-10-19 02:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "9d4c2a7e5f16"
+down_revision = "6b2f8e1a9c43"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases created by create_all_tables already have it
+    op.execute("ALTER TABLE accounts ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS version")
@@ -0,0 +1,30 @@
+"""interest carry
+
+Add the columns the daily interest accrual keeps per account: the interest
+accrued below a cent that has not been posted yet, and the last date
+interest was accrued for, which makes a rerun for the same date a no-op.
+
+Revision ID: 4f7b1d9e3a52
+Revises: 9d4c2a7e5f16
+Create Date: 2026-10-19 03:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "4f7b1d9e3a52"
+down_revision = "9d4c2a7e5f16"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases created by create_all_tables already have them
+    op.execute("ALTER TABLE accounts ADD COLUMN IF NOT EXISTS accrued_interest DOUBLE PRECISION NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE accounts ADD COLUMN IF NOT EXISTS interest_accrued_on DATE")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS interest_accrued_on")
+    op.execute("ALTER TABLE accounts DROP COLUMN IF EXISTS accrued_interest")
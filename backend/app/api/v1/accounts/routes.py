@@ -3,11 +3,13 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.replicas import get_read_db
+from app.db.session import get_db, get_unit_of_work
+from app.db.unit_of_work import UnitOfWork
 from app.services import AccountService, AuthService
 from app.schemas.account import Account, AccountCreate, AccountUpdate, AccountList
 from app.db.models.user import User as UserModel
-from app.db.models.account import AccountType
+from app.db.models.account import Account as AccountModel, AccountType
 
 router = APIRouter()
 
@@ -18,7 +20,7 @@ async def read_accounts(
     limit: int = 100,
     account_type: Optional[AccountType] = None,
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: UserModel = Depends(AuthService.get_current_user),
 ):
     """
@@ -63,7 +65,7 @@ async def read_accounts(
 async def create_account(
     request: Request,
     account_in: AccountCreate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
 ):
     """
@@ -86,17 +88,19 @@ async def create_account(
     client_ip = request.client.host if request.client else None
     
     account = await AccountService.create(
-        db,
+        uow.db,
         obj_in=account_in,
         user_id=user_id,
         current_user_id=current_user.id,
         ip_address=client_ip,
     )
     
+    uow.commit()
+    
     # Send notification for new account
     from app.services import NotificationService
     await NotificationService.send_account_created_notification(
-        db,
+        uow.db,
         account_id=account.id,
     )
     
@@ -113,168 +117,113 @@ async def read_account(
     Regular users can only get their own accounts.
     Superusers can get any account.
     """
-    account = await AccountService.get(db, account_id=account_id)
-    
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-    
-    # Check if user has permission to access this account
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this account",
-        )
-    
-    return account
+    # Served from the account cache, filled from the primary
+    return await AccountService.get_snapshot(db, account_id=account_id, user=current_user)
 
 @router.put("/{account_id}", response_model=Account)
 async def update_account(
     request: Request,
-    account_id: int,
     account_in: AccountUpdate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
+    account: AccountModel = Depends(AccountService.owned("update this account")),
 ):
     """
     Update an account.
     Regular users can only update their own accounts.
     Superusers can update any account.
     """
-    account = await AccountService.get(db, account_id=account_id)
-    
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-    
-    # Check if user has permission to update this account
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to update this account",
-        )
-    
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
     updated_account = await AccountService.update(
-        db,
-        account_id=account_id,
+        uow.db,
+        account_id=account.id,
+        account=account,
         obj_in=account_in,
         current_user_id=current_user.id,
         ip_address=client_ip,
     )
     
+    uow.commit()
+    
     return updated_account
 
 @router.post("/{account_id}/deactivate", response_model=Account)
 async def deactivate_account(
     request: Request,
-    account_id: int,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
+    account: AccountModel = Depends(AccountService.owned("deactivate this account")),
 ):
     """
     Deactivate an account.
     Regular users can only deactivate their own accounts.
     Superusers can deactivate any account.
     """
-    account = await AccountService.get(db, account_id=account_id)
-    
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-    
-    # Check if user has permission to deactivate this account
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to deactivate this account",
-        )
-    
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
     deactivated_account = await AccountService.deactivate(
-        db,
-        account_id=account_id,
+        uow.db,
+        account_id=account.id,
+        account=account,
         current_user_id=current_user.id,
         ip_address=client_ip,
     )
     
+    uow.commit()
+    
     return deactivated_account
 
 @router.post("/{account_id}/reactivate", response_model=Account)
 async def reactivate_account(
     request: Request,
-    account_id: int,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
+    account: AccountModel = Depends(AccountService.owned("reactivate this account")),
 ):
     """
     Reactivate an account.
     Regular users can only reactivate their own accounts.
     Superusers can reactivate any account.
     """
-    account = await AccountService.get(db, account_id=account_id)
-    
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-    
-    # Check if user has permission to reactivate this account
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to reactivate this account",
-        )
-    
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
     reactivated_account = await AccountService.reactivate(
-        db,
-        account_id=account_id,
+        uow.db,
+        account_id=account.id,
+        account=account,
         current_user_id=current_user.id,
         ip_address=client_ip,
     )
     
+    uow.commit()
+    
     return reactivated_account
 
 @router.delete("/{account_id}", response_model=Account)
 async def delete_account(
     request: Request,
-    account_id: int,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_active_superuser),
+    account: AccountModel = Depends(AccountService.owned("delete this account")),
 ):
     """
     Delete an account. Only superusers can delete accounts.
     """
-    account = await AccountService.get(db, account_id=account_id)
-    
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-    
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
     deleted_account = await AccountService.delete(
-        db,
-        account_id=account_id,
+        uow.db,
+        account_id=account.id,
+        account=account,
         current_user_id=current_user.id,
         ip_address=client_ip,
     )
     
+    uow.commit()
+    
     return deleted_account
\ No newline at end of file
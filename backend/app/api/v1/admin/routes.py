@@ -0,0 +1,97 @@
+# backend/app/api/v1/admin/routes.py
+from dataclasses import asdict
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api.v1.admin.schemas import (
+    BlockingCallSite,
+    MemoryProfile,
+    ProfilerArm,
+    ProfilerStatus,
+    ProfileSummary,
+    SlowQuery,
+)
+from app.core.loop_monitor import loop_monitor
+from app.core.profiler import MEMORY, request_profiler
+from app.db.models.user import User as UserModel
+from app.db.slow_queries import slow_query_log
+from app.services import AuthService
+
+router = APIRouter()
+
+@router.get("/slow-queries", response_model=List[SlowQuery])
+async def read_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: UserModel = Depends(AuthService.get_current_active_superuser),
+):
+    """
+    Get the most recent slow queries recorded by this worker, newest first.
+    Only superusers can access this endpoint.
+    """
+    return [asdict(entry) for entry in slow_query_log.recent(limit)]
+
+@router.post("/profiler", response_model=ProfilerStatus)
+async def arm_profiler(
+    arm: ProfilerArm,
+    current_user: UserModel = Depends(AuthService.get_current_active_superuser),
+):
+    """
+    Profile the next N requests handled by this worker, optionally only those
+    under a path prefix, as stack samples ("cpu") or traced allocations
+    ("memory"). Send 0 to disarm.
+    Only superusers can access this endpoint.
+    """
+    request_profiler.arm(arm.requests, arm.path_prefix, arm.mode)
+    return {"armed": request_profiler.armed}
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def read_profiles(
+    current_user: UserModel = Depends(AuthService.get_current_active_superuser),
+):
+    """
+    Get the profiles stored by this worker, newest first.
+    Only superusers can access this endpoint.
+    """
+    return request_profiler.list()
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    responses={200: {"model": MemoryProfile}},
+)
+async def read_profile(
+    profile_id: str,
+    current_user: UserModel = Depends(AuthService.get_current_active_superuser),
+):
+    """
+    Download a CPU profile as a collapsed stack file (flamegraph.pl,
+    speedscope), or get a memory profile with its top allocation sites.
+    Only superusers can access this endpoint.
+    """
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    if profile.kind == MEMORY:
+        return JSONResponse(jsonable_encoder(MemoryProfile(**asdict(profile))))
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="{profile.id}.collapsed"'},
+    )
+
+@router.get("/blocking-calls", response_model=List[BlockingCallSite])
+async def read_blocking_calls(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: UserModel = Depends(AuthService.get_current_active_superuser),
+):
+    """
+    Get the call sites that blocked this worker's event loop the longest in
+    total, with the stack of their latest block.
+    Only superusers can access this endpoint.
+    """
+    return [asdict(site) for site in loop_monitor.top(limit)]
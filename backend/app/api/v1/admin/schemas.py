@@ -0,0 +1,60 @@
+# backend/app/api/v1/admin/schemas.py
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field
+
+class SlowQuery(BaseModel):
+    timestamp: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    caller: Optional[str]
+    request_id: str
+    explain: Optional[str] = None
+
+class ProfilerArm(BaseModel):
+    requests: int = Field(..., ge=0, le=1000)
+    path_prefix: Optional[str] = None
+    mode: str = Field("cpu", regex="^(cpu|memory)$")
+
+class ProfilerStatus(BaseModel):
+    armed: int
+
+class ProfileSummary(BaseModel):
+    id: str
+    kind: str
+    method: str
+    path: str
+    created_at: datetime
+    interval: Optional[float] = None
+    total_samples: Optional[int] = None
+    peak_bytes: Optional[int] = None
+    retained_blocks: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+class AllocationSite(BaseModel):
+    site: str
+    size_bytes: int
+    blocks: int
+
+class MemoryProfile(BaseModel):
+    id: str
+    method: str
+    path: str
+    created_at: datetime
+    peak_bytes: int
+    retained_bytes: int
+    retained_blocks: int
+    top_sites: List[AllocationSite]
+
+class BlockingCallSite(BaseModel):
+    site: str
+    leaf: str
+    count: int
+    total_ms: float
+    max_ms: float
+    last_seen: datetime
+    stack: str
@@ -1,10 +1,10 @@
 # backend/app/api/v1/auth/routes.py
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from app.db.session import get_db
+from app.db.session import get_unit_of_work
+from app.db.unit_of_work import UnitOfWork
 from app.core.security import create_access_token
 from app.services import AuthService, UserService
 from app.schemas.auth import Token, Login, PasswordChange
@@ -16,7 +16,7 @@ router = APIRouter()
 @router.post("/login", response_model=Token)
 async def login_access_token(
     request: Request,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """
@@ -26,12 +26,15 @@ async def login_access_token(
     client_ip = request.client.host if request.client else None
     
     user = await AuthService.authenticate_user(
-        db, 
+        uow.db, 
         email=form_data.username, 
         password=form_data.password,
         ip_address=client_ip,
     )
     
+    # Failed attempts are audited too
+    uow.commit()
+    
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,7 +56,7 @@ async def login_access_token(
 async def login_email_password(
     request: Request,
     login_data: Login,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     """
     Login using email and password, get an access token for future requests.
@@ -62,12 +65,15 @@ async def login_email_password(
     client_ip = request.client.host if request.client else None
     
     user = await AuthService.authenticate_user(
-        db, 
+        uow.db, 
         email=login_data.email, 
         password=login_data.password,
         ip_address=client_ip,
     )
     
+    # Failed attempts are audited too
+    uow.commit()
+    
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,7 +94,7 @@ async def login_email_password(
 async def logout(
     request: Request,
     current_user: User = Depends(AuthService.get_current_user),
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     """
     Logout the current user.
@@ -97,11 +103,13 @@ async def logout(
     client_ip = request.client.host if request.client else None
     
     await AuthService.logout(
-        db,
+        uow.db,
         user_id=current_user.id,
         ip_address=client_ip,
     )
     
+    uow.commit()
+    
     return {"detail": "Successfully logged out"}
 
 @router.post("/password-change")
@@ -109,7 +117,7 @@ async def change_password(
     request: Request,
     password_data: PasswordChange,
     current_user: User = Depends(AuthService.get_current_user),
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     """
     Change the current user's password.
@@ -119,7 +127,7 @@ async def change_password(
     
     try:
         await UserService.change_password(
-            db,
+            uow.db,
             user_id=current_user.id,
             current_password=password_data.current_password,
             new_password=password_data.new_password,
@@ -131,6 +139,8 @@ async def change_password(
             detail=str(e),
         )
     
+    uow.commit()
+    
     return {"detail": "Password changed successfully"}
 
 @router.get("/me", response_model=User)
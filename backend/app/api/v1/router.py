@@ -5,10 +5,12 @@ from app.api.v1.auth.routes import router as auth_router
 from app.api.v1.users.routes import router as users_router
 from app.api.v1.accounts.routes import router as accounts_router
 from app.api.v1.transactions.routes import router as transactions_router
+from app.api.v1.admin.routes import router as admin_router
 
 api_router = APIRouter()
 
 api_router.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(users_router, prefix="/users", tags=["Users"])
 api_router.include_router(accounts_router, prefix="/accounts", tags=["Accounts"])
-api_router.include_router(transactions_router, prefix="/transactions", tags=["Transactions"])
\ No newline at end of file
+api_router.include_router(transactions_router, prefix="/transactions", tags=["Transactions"])
+api_router.include_router(admin_router, prefix="/admin", tags=["Admin"])
\ No newline at end of file
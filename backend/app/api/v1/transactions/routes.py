@@ -1,11 +1,20 @@
 # backend/app/api/v1/transactions/routes.py
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from xml.etree.ElementTree import ParseError
+from fastapi import APIRouter, Depends, File, Header, HTTPException, status, Request, Response, UploadFile
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.db.session import get_db
-from app.services import TransactionService, AccountService, AuthService, NotificationService
+from app.core.timing import span
+from app.db.replicas import get_read_db, get_snapshot_db
+from app.db.session import get_db, get_unit_of_work
+from app.db.unit_of_work import UnitOfWork
+from app.services import (
+    TransactionService, AccountService, AuthService, NotificationService,
+    IdempotencyService, BulkPaymentService,
+)
+from app.services.idempotency import IDEMPOTENCY_KEY_HEADER
 from app.schemas.transaction import (
     Transaction, TransactionList, TransactionWithAccount,
     DepositCreate, WithdrawalCreate, TransferCreate, PaymentCreate
@@ -27,7 +36,7 @@ async def read_transactions(
     status: Optional[TransactionStatus] = None,
     min_amount: Optional[float] = None,
     max_amount: Optional[float] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: UserModel = Depends(AuthService.get_current_user),
 ):
     """
@@ -40,18 +49,7 @@ async def read_transactions(
     
     if account_id:
         # Check if user has permission to access this account
-        account = await AccountService.get(db, account_id=account_id)
-        if not account:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Account not found",
-            )
-            
-        if account.user_id != current_user.id and not current_user.is_superuser:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions to access this account",
-            )
+        await AccountService.authorize(db, account_id=account_id, user=current_user)
             
         # Get transactions for specific account
         transactions = await TransactionService.get_account_transactions(
@@ -69,7 +67,7 @@ async def read_transactions(
         
         # Count total transactions for this account
         from app.db.repositories import transaction_repository
-        total = transaction_repository.count(
+        total = transaction_repository.count_account_transactions(
             db, 
             account_id=account_id,
         )
@@ -132,7 +130,7 @@ async def read_transactions(
 @router.get("/{transaction_id}", response_model=Transaction)
 async def read_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: UserModel = Depends(AuthService.get_current_user),
 ):
     """
@@ -148,15 +146,13 @@ async def read_transaction(
             detail="Transaction not found",
         )
     
-    # Get account for permission check
-    account = await AccountService.get(db, account_id=transaction.account_id)
-    
     # Check if user has permission to access this transaction
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this transaction",
-        )
+    await AccountService.authorize(
+        db,
+        account_id=transaction.account_id,
+        user=current_user,
+        action="access this transaction",
+    )
     
     return transaction
 
@@ -164,50 +160,62 @@ async def read_transaction(
 async def create_deposit(
     request: Request,
     deposit_in: DepositCreate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
 ):
     """
     Create a deposit transaction.
     """
-    # Check if user has permission to deposit to this account
-    account = await AccountService.get(db, account_id=deposit_in.account_id)
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-        
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to deposit to this account",
-        )
-    
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
-    try:
-        transaction = await TransactionService.create_deposit(
-            db,
-            account_id=deposit_in.account_id,
-            amount=deposit_in.amount,
-            description=deposit_in.description,
-            currency=deposit_in.currency,
-            current_user_id=current_user.id,
-            ip_address=client_ip,
-        )
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
+    async with IdempotencyService.scope(
+        uow.db,
+        key=idempotency_key,
+        user_id=current_user.id,
+        request=request,
+        payload=deposit_in,
+    ) as idempotency:
+        # Replay the stored response without touching accounts
+        if idempotency.replay is not None:
+            return idempotency.replay
+        
+        # Load the account if the user may deposit to it
+        with span("authorize"):
+            account = await AccountService.get_owned(
+                uow.db,
+                account_id=deposit_in.account_id,
+                user=current_user,
+                action="deposit to this account",
+            )
+        
+        try:
+            transaction = await TransactionService.create_deposit(
+                uow.db,
+                account_id=deposit_in.account_id,
+                account=account,
+                amount=deposit_in.amount,
+                description=deposit_in.description,
+                currency=deposit_in.currency,
+                current_user_id=current_user.id,
+                ip_address=client_ip,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+        
+        await idempotency.save(Transaction.from_orm(transaction))
+        uow.commit()
     
     # Send transaction notification
-    await NotificationService.send_transaction_notification(
-        db,
-        transaction_id=transaction.id,
-    )
+    with span("notify"):
+        await NotificationService.send_transaction_notification(
+            uow.db,
+            transaction_id=transaction.id,
+        )
     
     return transaction
 
@@ -215,58 +223,70 @@ async def create_deposit(
 async def create_withdrawal(
     request: Request,
     withdrawal_in: WithdrawalCreate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
 ):
     """
     Create a withdrawal transaction.
     """
-    # Check if user has permission to withdraw from this account
-    account = await AccountService.get(db, account_id=withdrawal_in.account_id)
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-        
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to withdraw from this account",
-        )
-    
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
-    try:
-        transaction = await TransactionService.create_withdrawal(
-            db,
-            account_id=withdrawal_in.account_id,
-            amount=withdrawal_in.amount,
-            description=withdrawal_in.description,
-            currency=withdrawal_in.currency,
-            current_user_id=current_user.id,
-            ip_address=client_ip,
-        )
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
+    async with IdempotencyService.scope(
+        uow.db,
+        key=idempotency_key,
+        user_id=current_user.id,
+        request=request,
+        payload=withdrawal_in,
+    ) as idempotency:
+        # Replay the stored response without touching accounts
+        if idempotency.replay is not None:
+            return idempotency.replay
+        
+        # Load the account if the user may withdraw from it
+        with span("authorize"):
+            account = await AccountService.get_owned(
+                uow.db,
+                account_id=withdrawal_in.account_id,
+                user=current_user,
+                action="withdraw from this account",
+            )
+        
+        try:
+            transaction = await TransactionService.create_withdrawal(
+                uow.db,
+                account_id=withdrawal_in.account_id,
+                account=account,
+                amount=withdrawal_in.amount,
+                description=withdrawal_in.description,
+                currency=withdrawal_in.currency,
+                current_user_id=current_user.id,
+                ip_address=client_ip,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+        
+        await idempotency.save(Transaction.from_orm(transaction))
+        uow.commit()
     
     # Send transaction notification
-    await NotificationService.send_transaction_notification(
-        db,
-        transaction_id=transaction.id,
-    )
+    with span("notify"):
+        await NotificationService.send_transaction_notification(
+            uow.db,
+            transaction_id=transaction.id,
+        )
     
-    # Check if balance is low and send notification if needed
-    low_balance_threshold = 100.0  # Example threshold
-    await NotificationService.send_low_balance_notification(
-        db,
-        account_id=withdrawal_in.account_id,
-        threshold=low_balance_threshold,
-    )
+        # Check if balance is low and send notification if needed
+        low_balance_threshold = 100.0  # Example threshold
+        await NotificationService.send_low_balance_notification(
+            uow.db,
+            account_id=withdrawal_in.account_id,
+            threshold=low_balance_threshold,
+        )
     
     return transaction
 
@@ -274,67 +294,81 @@ async def create_withdrawal(
 async def create_transfer(
     request: Request,
     transfer_in: TransferCreate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
 ):
     """
     Create a transfer transaction.
     """
-    # Check if user has permission to transfer from this account
-    source_account = await AccountService.get(db, account_id=transfer_in.source_account_id)
-    if not source_account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Source account not found",
-        )
-        
-    if source_account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to transfer from this account",
-        )
-    
-    # Check if destination account exists
-    destination_account = await AccountService.get(db, account_id=transfer_in.destination_account_id)
-    if not destination_account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Destination account not found",
-        )
-    
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
-    try:
-        transaction = await TransactionService.create_transfer(
-            db,
-            source_account_id=transfer_in.source_account_id,
-            destination_account_id=transfer_in.destination_account_id,
-            amount=transfer_in.amount,
-            description=transfer_in.description,
-            currency=transfer_in.currency,
-            current_user_id=current_user.id,
-            ip_address=client_ip,
-        )
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
+    async with IdempotencyService.scope(
+        uow.db,
+        key=idempotency_key,
+        user_id=current_user.id,
+        request=request,
+        payload=transfer_in,
+    ) as idempotency:
+        # Replay the stored response without touching accounts
+        if idempotency.replay is not None:
+            return idempotency.replay
+        
+        with span("authorize"):
+            # Load the source account if the user may transfer from it
+            source_account = await AccountService.get_owned(
+                uow.db,
+                account_id=transfer_in.source_account_id,
+                user=current_user,
+                action="transfer from this account",
+                not_found="Source account not found",
+            )
+            
+            # Check if destination account exists
+            destination_account = await AccountService.get(uow.db, account_id=transfer_in.destination_account_id)
+            if not destination_account:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Destination account not found",
+                )
+        
+        try:
+            transaction = await TransactionService.create_transfer(
+                uow.db,
+                source_account_id=transfer_in.source_account_id,
+                destination_account_id=transfer_in.destination_account_id,
+                source_account=source_account,
+                destination_account=destination_account,
+                amount=transfer_in.amount,
+                description=transfer_in.description,
+                currency=transfer_in.currency,
+                current_user_id=current_user.id,
+                ip_address=client_ip,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+        
+        await idempotency.save(Transaction.from_orm(transaction))
+        uow.commit()
     
     # Send transaction notification
-    await NotificationService.send_transaction_notification(
-        db,
-        transaction_id=transaction.id,
-    )
+    with span("notify"):
+        await NotificationService.send_transaction_notification(
+            uow.db,
+            transaction_id=transaction.id,
+        )
     
-    # Check if balance is low and send notification if needed
-    low_balance_threshold = 100.0  # Example threshold
-    await NotificationService.send_low_balance_notification(
-        db,
-        account_id=transfer_in.source_account_id,
-        threshold=low_balance_threshold,
-    )
+        # Check if balance is low and send notification if needed
+        low_balance_threshold = 100.0  # Example threshold
+        await NotificationService.send_low_balance_notification(
+            uow.db,
+            account_id=transfer_in.source_account_id,
+            threshold=low_balance_threshold,
+        )
     
     return transaction
 
@@ -342,85 +376,118 @@ async def create_transfer(
 async def create_payment(
     request: Request,
     payment_in: PaymentCreate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER),
 ):
     """
     Create a payment transaction.
     """
-    # Check if user has permission to make payment from this account
-    account = await AccountService.get(db, account_id=payment_in.account_id)
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
+    # Get client IP for audit
+    client_ip = request.client.host if request.client else None
+    
+    async with IdempotencyService.scope(
+        uow.db,
+        key=idempotency_key,
+        user_id=current_user.id,
+        request=request,
+        payload=payment_in,
+    ) as idempotency:
+        # Replay the stored response without touching accounts
+        if idempotency.replay is not None:
+            return idempotency.replay
         
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to make payment from this account",
+        # Load the account if the user may make payment from it
+        with span("authorize"):
+            account = await AccountService.get_owned(
+                uow.db,
+                account_id=payment_in.account_id,
+                user=current_user,
+                action="make payment from this account",
+            )
+        
+        try:
+            transaction = await TransactionService.create_payment(
+                uow.db,
+                account_id=payment_in.account_id,
+                account=account,
+                amount=payment_in.amount,
+                recipient=payment_in.recipient,
+                description=payment_in.description,
+                currency=payment_in.currency,
+                current_user_id=current_user.id,
+                ip_address=client_ip,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+        
+        await idempotency.save(Transaction.from_orm(transaction))
+        uow.commit()
+    
+    # Send transaction notification
+    with span("notify"):
+        await NotificationService.send_transaction_notification(
+            uow.db,
+            transaction_id=transaction.id,
         )
     
+        # Check if balance is low and send notification if needed
+        low_balance_threshold = 100.0  # Example threshold
+        await NotificationService.send_low_balance_notification(
+            uow.db,
+            account_id=payment_in.account_id,
+            threshold=low_balance_threshold,
+        )
+    
+    return transaction
+
+@router.post("/bulk/pain001")
+async def ingest_pain001(
+    request: Request,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(AuthService.get_current_user),
+):
+    """
+    Ingest an ISO 20022 pain.001 credit transfer file.
+    Returns a pain.002 status report listing rejected payments.
+    Regular users can only debit their own accounts.
+    """
     # Get client IP for audit
     client_ip = request.client.host if request.client else None
     
     try:
-        transaction = await TransactionService.create_payment(
+        report = await run_in_threadpool(
+            BulkPaymentService.ingest_pain001,
             db,
-            account_id=payment_in.account_id,
-            amount=payment_in.amount,
-            recipient=payment_in.recipient,
-            description=payment_in.description,
-            currency=payment_in.currency,
+            source=file.file,
             current_user_id=current_user.id,
+            is_superuser=current_user.is_superuser,
             ip_address=client_ip,
         )
-    except ValueError as e:
+    except ParseError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
+            detail=f"Invalid pain.001 file: {e}",
         )
     
-    # Send transaction notification
-    await NotificationService.send_transaction_notification(
-        db,
-        transaction_id=transaction.id,
-    )
-    
-    # Check if balance is low and send notification if needed
-    low_balance_threshold = 100.0  # Example threshold
-    await NotificationService.send_low_balance_notification(
-        db,
-        account_id=payment_in.account_id,
-        threshold=low_balance_threshold,
-    )
-    
-    return transaction
+    return Response(content=report.to_pain002(), media_type="application/xml")
 
 @router.get("/stats/{account_id}")
 async def get_transaction_stats(
     account_id: int,
     days: int = 30,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_snapshot_db),
     current_user: UserModel = Depends(AuthService.get_current_user),
 ):
     """
     Get transaction statistics for an account.
     """
     # Check if user has permission to access this account
-    account = await AccountService.get(db, account_id=account_id)
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
-        )
-        
-    if account.user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this account",
-        )
+    await AccountService.authorize(db, account_id=account_id, user=current_user)
     
     stats = await TransactionService.get_transaction_stats(
         db,
@@ -3,7 +3,8 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_unit_of_work
+from app.db.unit_of_work import UnitOfWork
 from app.services import UserService, AuthService
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.db.models.user import User as UserModel
@@ -40,7 +41,7 @@ async def read_users(
 async def create_user(
     request: Request,
     user_in: UserCreate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: Optional[UserModel] = Depends(AuthService.get_current_active_superuser),
 ):
     """
@@ -52,7 +53,7 @@ async def create_user(
     
     try:
         user = await UserService.create(
-            db, 
+            uow.db, 
             user_in=user_in, 
             current_user_id=current_user.id if current_user else None,
             ip_address=client_ip,
@@ -63,6 +64,8 @@ async def create_user(
             detail=str(e),
         )
     
+    uow.commit()
+    
     return user
 
 @router.get("/{user_id}", response_model=User)
@@ -96,7 +99,7 @@ async def update_user(
     request: Request,
     user_id: int,
     user_in: UserUpdate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_user),
 ):
     """
@@ -115,7 +118,7 @@ async def update_user(
     
     try:
         user = await UserService.update(
-            db, 
+            uow.db, 
             user_id=user_id, 
             user_in=user_in,
             current_user_id=current_user.id,
@@ -133,13 +136,15 @@ async def update_user(
             detail="User not found",
         )
     
+    uow.commit()
+    
     return user
 
 @router.delete("/{user_id}", response_model=User)
 async def delete_user(
     request: Request,
     user_id: int,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: UserModel = Depends(AuthService.get_current_active_superuser),
 ):
     """
@@ -149,7 +154,7 @@ async def delete_user(
     client_ip = request.client.host if request.client else None
     
     user = await UserService.delete(
-        db, 
+        uow.db, 
         user_id=user_id,
         current_user_id=current_user.id,
         ip_address=client_ip,
@@ -161,4 +166,6 @@ async def delete_user(
             detail="User not found",
         )
     
+    uow.commit()
+    
     return user
\ No newline at end of file
@@ -42,6 +42,61 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 minutes
     DB_ECHO_SQL: bool = DEBUG  # Log SQL in development mode
     
+    # Read replica settings (comma-separated host[:port] list; empty sends reads to the primary)
+    POSTGRES_REPLICA_HOSTS: str = os.getenv("POSTGRES_REPLICA_HOSTS", "")
+    REPLICA_POOL_SIZE: int = int(os.getenv("REPLICA_POOL_SIZE", "10"))
+    REPLICA_MAX_OVERFLOW: int = int(os.getenv("REPLICA_MAX_OVERFLOW", "10"))
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+    REPLICA_TRACKED_USERS: int = int(os.getenv("REPLICA_TRACKED_USERS", "100000"))
+    REPLICA_READ_AFTER_COOKIE_MAX_AGE: int = int(os.getenv("REPLICA_READ_AFTER_COOKIE_MAX_AGE", "60"))  # Seconds a write keeps the client off lagging replicas
+
+    # Sharding settings (comma-separated name=host[:port]/database; empty keeps everything on one database)
+    SHARD_DATABASES: str = os.getenv("SHARD_DATABASES", "")
+    SHARD_POOL_SIZE: int = int(os.getenv("SHARD_POOL_SIZE", "10"))
+    SHARD_MAX_OVERFLOW: int = int(os.getenv("SHARD_MAX_OVERFLOW", "10"))
+    SHARD_VIRTUAL_NODES: int = int(os.getenv("SHARD_VIRTUAL_NODES", "64"))
+    SHARD_ID_STRIDE: int = int(os.getenv("SHARD_ID_STRIDE", "64"))  # Upper bound on the number of shards
+    SHARD_DIRECTORY_CACHE_SIZE: int = int(os.getenv("SHARD_DIRECTORY_CACHE_SIZE", "100000"))
+    SHARD_PLACEMENT_TTL_SECONDS: int = int(os.getenv("SHARD_PLACEMENT_TTL_SECONDS", "30"))
+    CROSS_SHARD_TRANSFER_TIMEOUT_SECONDS: int = int(os.getenv("CROSS_SHARD_TRANSFER_TIMEOUT_SECONDS", "600"))
+
+    # Admission control settings (capacity defaults to pool size plus overflow)
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    ADMISSION_CAPACITY: int = int(os.getenv("ADMISSION_CAPACITY", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+    ADMISSION_STANDARD_SHARE: float = float(os.getenv("ADMISSION_STANDARD_SHARE", "0.8"))
+    ADMISSION_BULK_SHARE: float = float(os.getenv("ADMISSION_BULK_SHARE", "0.25"))
+    ADMISSION_MONEY_QUEUE_TIMEOUT_MS: float = float(os.getenv("ADMISSION_MONEY_QUEUE_TIMEOUT_MS", "2000"))
+    ADMISSION_STANDARD_QUEUE_TIMEOUT_MS: float = float(os.getenv("ADMISSION_STANDARD_QUEUE_TIMEOUT_MS", "500"))
+    ADMISSION_BULK_QUEUE_TIMEOUT_MS: float = float(os.getenv("ADMISSION_BULK_QUEUE_TIMEOUT_MS", "0"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "100"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+    # Request deadline settings (applied as statement_timeout; X-Request-Timeout overrides, in ms)
+    REQUEST_DEADLINES_ENABLED: bool = os.getenv("REQUEST_DEADLINES_ENABLED", "true").lower() == "true"
+    REQUEST_DEADLINE_MS: int = int(os.getenv("REQUEST_DEADLINE_MS", "10000"))
+    REQUEST_DEADLINE_MONEY_MS: int = int(os.getenv("REQUEST_DEADLINE_MONEY_MS", "15000"))
+    REQUEST_DEADLINE_BULK_MS: int = int(os.getenv("REQUEST_DEADLINE_BULK_MS", "30000"))
+    REQUEST_DEADLINE_INGEST_MS: int = int(os.getenv("REQUEST_DEADLINE_INGEST_MS", "600000"))
+    REQUEST_DEADLINE_MAX_MS: int = int(os.getenv("REQUEST_DEADLINE_MAX_MS", "120000"))
+
+    # Query accounting settings
+    SQL_QUERY_HEADERS: bool = DEBUG  # Server-Timing and X-DB-* response headers
+    SQL_QUERY_BUDGET: int = int(os.getenv("SQL_QUERY_BUDGET", "20"))  # Statements per request before warning
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))  # Repeats of one statement shape
+    
+    # Per-stage request timing (app.core.timing.span)
+    STAGE_TIMING_ENABLED: bool = os.getenv("STAGE_TIMING_ENABLED", "true").lower() == "true"
+    STAGE_TIMING_HEADERS: bool = DEBUG  # Server-Timing response header
+    
+    # Slow query log settings (threshold 0 disables)
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.05"))
+    SLOW_QUERY_BUFFER_SIZE: int = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "200"))
+    SLOW_QUERY_LOG_FILE: Optional[str] = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.{pid}.log")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUP_COUNT: int = int(os.getenv("SLOW_QUERY_LOG_BACKUP_COUNT", "5"))
+    
     # Security settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "changethisinsecretkey")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
@@ -65,9 +120,79 @@ class Settings(BaseSettings):
     
     EMAIL_TEMPLATES_DIR: str = "app/email-templates/build"
     
+    # Logging settings
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_JSON: bool = os.getenv("LOG_JSON", "false").lower() == "true"
+
+    # Metrics settings (set PROMETHEUS_MULTIPROC_DIR for multi-worker aggregation)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Profiler settings (X-Profile header from superusers, or armed via the admin API)
+    PROFILER_ENABLED: bool = os.getenv("PROFILER_ENABLED", "true").lower() == "true"
+    PROFILER_INTERVAL_MS: float = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+    PROFILER_MAX_PROFILES: int = int(os.getenv("PROFILER_MAX_PROFILES", "50"))
+    PROFILER_OUTPUT_DIR: Optional[str] = os.getenv("PROFILER_OUTPUT_DIR")
+
+    # Event loop monitor settings
+    LOOP_MONITOR_ENABLED: bool = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+    LOOP_MONITOR_INTERVAL_MS: float = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+    LOOP_BLOCK_THRESHOLD_MS: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+    LOOP_BLOCKING_SITES: int = int(os.getenv("LOOP_BLOCKING_SITES", "100"))
+
     # Rate limiting settings
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
-    
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_LOGIN_PER_MINUTE", "10"))
+    RATE_LIMIT_MONEY_MOVEMENT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_MONEY_MOVEMENT_PER_MINUTE", "30"))
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory or shared
+    RATE_LIMIT_SHARDS: int = int(os.getenv("RATE_LIMIT_SHARDS", "16"))
+    RATE_LIMIT_MAX_BUCKETS: int = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "100000"))
+    RATE_LIMIT_SHARED_MEMORY_NAME: str = os.getenv("RATE_LIMIT_SHARED_MEMORY_NAME", "banking-system-rate-limit")
+    RATE_LIMIT_SHARED_SLOTS: int = int(os.getenv("RATE_LIMIT_SHARED_SLOTS", "65536"))
+
+    # Account settings
+    ACCOUNT_OWNER_CACHE_SIZE: int = int(os.getenv("ACCOUNT_OWNER_CACHE_SIZE", "100000"))
+    ACCOUNT_CACHE_SIZE: int = int(os.getenv("ACCOUNT_CACHE_SIZE", "100000"))
+    ACCOUNT_CACHE_TTL_SECONDS: int = int(os.getenv("ACCOUNT_CACHE_TTL_SECONDS", "30"))  # Bounds staleness from other processes
+
+    # Cache invalidation bus settings (LISTEN/NOTIFY between workers)
+    INVALIDATION_BUS_ENABLED: bool = os.getenv("INVALIDATION_BUS_ENABLED", "true").lower() == "true"
+    INVALIDATION_CHANNEL: str = os.getenv("INVALIDATION_CHANNEL", "cache_invalidation")
+    INVALIDATION_MAX_ENTRIES: int = int(os.getenv("INVALIDATION_MAX_ENTRIES", "1000"))  # Above this a commit flushes the entity
+    INVALIDATION_HEARTBEAT_SECONDS: int = int(os.getenv("INVALIDATION_HEARTBEAT_SECONDS", "5"))
+    INVALIDATION_RECONNECT_SECONDS: int = int(os.getenv("INVALIDATION_RECONNECT_SECONDS", "1"))
+
+    # Idempotency settings
+    IDEMPOTENCY_KEY_TTL_HOURS: int = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = int(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "3600"))
+
+    # Transaction partitioning settings (hash partitions on account_id; changing it needs a repartition)
+    TRANSACTION_PARTITIONS: int = int(os.getenv("TRANSACTION_PARTITIONS", "16"))
+
+    # Transaction archive settings (closed months older than TRANSACTION_ARCHIVE_AFTER_MONTHS move to segment files)
+    TRANSACTION_ARCHIVE_DIR: str = os.getenv("TRANSACTION_ARCHIVE_DIR", "archive/transactions")
+    TRANSACTION_ARCHIVE_AFTER_MONTHS: int = int(os.getenv("TRANSACTION_ARCHIVE_AFTER_MONTHS", "24"))
+    TRANSACTION_ARCHIVE_BLOCK_ROWS: int = int(os.getenv("TRANSACTION_ARCHIVE_BLOCK_ROWS", "1024"))
+    TRANSACTION_ARCHIVE_REFRESH_SECONDS: int = int(os.getenv("TRANSACTION_ARCHIVE_REFRESH_SECONDS", "60"))
+    TRANSACTION_ARCHIVE_DELETE_CHUNK_SIZE: int = int(os.getenv("TRANSACTION_ARCHIVE_DELETE_CHUNK_SIZE", "10000"))
+
+    # Retention settings (deleted users and accounts are kept, with their transactions, for ACCOUNT_RETENTION_DAYS)
+    ACCOUNT_RETENTION_DAYS: int = int(os.getenv("ACCOUNT_RETENTION_DAYS", "2555"))
+    RETENTION_PURGE_CHUNK_SIZE: int = int(os.getenv("RETENTION_PURGE_CHUNK_SIZE", "5000"))
+    RETENTION_PURGE_INTERVAL_SECONDS: int = int(os.getenv("RETENTION_PURGE_INTERVAL_SECONDS", "3600"))
+
+    # Interest accrual settings
+    INTEREST_ACCRUAL_CHUNK_SIZE: int = int(os.getenv("INTEREST_ACCRUAL_CHUNK_SIZE", "20000"))
+    INTEREST_DAY_COUNT_BASIS: int = int(os.getenv("INTEREST_DAY_COUNT_BASIS", "365"))
+
+    # Fee engine settings
+    FEE_ASSESSMENT_CHUNK_SIZE: int = int(os.getenv("FEE_ASSESSMENT_CHUNK_SIZE", "50000"))
+
+    # Dormancy settings
+    DORMANCY_DAYS: int = int(os.getenv("DORMANCY_DAYS", "365"))
+    DORMANCY_SWEEP_CHUNK_SIZE: int = int(os.getenv("DORMANCY_SWEEP_CHUNK_SIZE", "1000"))
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,189 @@
+# backend/app/core/admission.py
+import asyncio
+import bisect
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from app.core.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_WAIT,
+    ADMISSION_QUEUED,
+    ADMISSION_SHED,
+)
+
+# Priority classes, highest priority first
+MONEY_MOVEMENT = "money"
+STANDARD = "standard"
+BULK = "bulk"
+
+# Shed reasons
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+NOT_QUEUED = "not_queued"
+
+@dataclass
+class PriorityClass:
+    """
+    Admission policy of one priority class.
+
+    Attributes:
+        name: Class name
+        priority: Lower is served first
+        limit: Maximum requests of this class in flight
+        queue_timeout: Seconds a request may wait for a slot, 0 to shed at once
+    """
+    name: str
+    priority: int
+    limit: int
+    queue_timeout: float
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    name: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+class AdmissionController:
+    """
+    Bound the requests in flight to what the database pool can serve.
+
+    Requests that find no free slot wait in a priority queue for at most
+    their class's queue timeout and are shed afterwards, or at once when the
+    queue is full, instead of blocking for DB_POOL_TIMEOUT on a pool
+    checkout. Lower priority classes are capped below the total capacity,
+    so the remaining slots stay available to money movement. A new request
+    never overtakes a queued one of the same or a higher priority.
+
+    Waiters are re-checked when a request is released and, through
+    wake_soon(), whenever the pool gets a connection back, as connections
+    held outside requests also take capacity.
+
+    Runs on the event loop only, except for wake_soon(); no locking.
+    """
+
+    def __init__(
+        self,
+        classes: List[PriorityClass],
+        *,
+        capacity: int,
+        max_queue: int,
+        pool_in_use: Callable[[], int] = lambda: 0,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            classes: Priority classes
+            capacity: Maximum requests in flight (pool size plus overflow)
+            max_queue: Maximum waiting requests over all classes
+            pool_in_use: Connections currently checked out, so that
+                connections held outside requests also count
+        """
+        self.classes: Dict[str, PriorityClass] = {cls.name: cls for cls in classes}
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self._pool_in_use = pool_in_use
+        self.in_flight = 0
+        self._class_in_flight: Dict[str, int] = {cls.name: 0 for cls in classes}
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _can_admit(self, name: str) -> bool:
+        return (
+            max(self.in_flight, self._pool_in_use()) < self.capacity
+            and self._class_in_flight[name] < self.classes[name].limit
+        )
+
+    def _has_room(self, name: str) -> bool:
+        return self._class_in_flight[name] < self.classes[name].limit
+
+    def _waiting_ahead(self, priority: int) -> bool:
+        # Waiters held back by their class limit alone don't block other classes
+        return any(
+            waiter.priority <= priority and self._has_room(waiter.name)
+            for waiter in self._waiters
+        )
+
+    def _admit(self, name: str) -> None:
+        self.in_flight += 1
+        self._class_in_flight[name] += 1
+        ADMISSION_IN_FLIGHT.labels(name).inc()
+
+    async def acquire(self, name: str) -> bool:
+        """
+        Wait for a slot.
+
+        Args:
+            name: Priority class
+
+        Returns:
+            True if admitted (call release() when done), False if shed
+        """
+        cls = self.classes[name]
+        if self._can_admit(name) and not self._waiting_ahead(cls.priority):
+            self._admit(name)
+            return True
+
+        if cls.queue_timeout <= 0:
+            ADMISSION_SHED.labels(name, NOT_QUEUED).inc()
+            return False
+        if len(self._waiters) >= self.max_queue:
+            ADMISSION_SHED.labels(name, QUEUE_FULL).inc()
+            return False
+
+        self._loop = asyncio.get_running_loop()
+        waiter = _Waiter(cls.priority, next(self._sequence), name, asyncio.get_running_loop().create_future())
+        bisect.insort(self._waiters, waiter)
+        # Capacity freed without a wake yet goes to the waiters in order, this one included
+        self.wake()
+        ADMISSION_QUEUED.labels(name).inc()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait((waiter.future,), timeout=cls.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away while queued; hand back a slot granted meanwhile
+            if waiter.future.done():
+                self.release(name)
+            raise
+        finally:
+            ADMISSION_QUEUED.labels(name).dec()
+            ADMISSION_QUEUE_WAIT.labels(name).observe(time.perf_counter() - start)
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+
+        if waiter.future.cancelled():
+            ADMISSION_SHED.labels(name, QUEUE_TIMEOUT).inc()
+            return False
+        return True
+
+    def release(self, name: str) -> None:
+        """Free the slot of a finished request and admit waiters."""
+        self.in_flight -= 1
+        self._class_in_flight[name] -= 1
+        ADMISSION_IN_FLIGHT.labels(name).dec()
+        self.wake()
+
+    def wake(self) -> None:
+        """Admit waiters in priority order while there is capacity."""
+        for waiter in list(self._waiters):
+            if max(self.in_flight, self._pool_in_use()) >= self.capacity:
+                break
+            if self._has_room(waiter.name):
+                self._waiters.remove(waiter)
+                self._admit(waiter.name)
+                waiter.future.set_result(True)
+
+    def wake_soon(self) -> None:
+        """Schedule wake() on the event loop; safe from any thread, e.g. on a pool check-in."""
+        loop = self._loop
+        if self._waiters and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.wake)
@@ -14,4 +14,22 @@ class CustomException(Exception):
         self.detail = detail
         self.data = data or {}
         
-        super().__init__(self.detail)
\ No newline at end of file
+        super().__init__(self.detail)
+
+class DeadlineExceeded(CustomException):
+    """The request ran out of time, or its client disconnected."""
+
+    def __init__(self, detail: str = "Request deadline exceeded"):
+        super().__init__(status_code=504, detail=detail)
+
+class ShardUnavailable(CustomException):
+    """The user's data is being moved to another shard."""
+
+    def __init__(self, detail: str = "Account data is being migrated, retry shortly"):
+        super().__init__(status_code=503, detail=detail)
+
+class ConcurrentUpdate(CustomException):
+    """Another request changed the record between reading and writing it."""
+
+    def __init__(self, detail: str = "Account was changed by another request, retry"):
+        super().__init__(status_code=409, detail=detail)
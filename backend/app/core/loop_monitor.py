@@ -0,0 +1,170 @@
+# backend/app/core/loop_monitor.py
+import asyncio
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+logger = logging.getLogger("banking-system")
+
+# (module, function, current line) from outermost to innermost
+Stack = List[Tuple[str, str, int]]
+
+@dataclass
+class BlockingSite:
+    """
+    Code that held the event loop past the block threshold.
+
+    Attributes:
+        site: Innermost application frame, e.g. "app.services.auth:authenticate:52"
+        leaf: Innermost frame overall (the blocking library call)
+        count: Number of blocks
+        total_ms: Total blocked time
+        max_ms: Longest block
+        last_seen: Time of the latest block
+        stack: Collapsed stack of the latest block
+    """
+    site: str
+    leaf: str
+    count: int
+    total_ms: float
+    max_ms: float
+    last_seen: datetime
+    stack: str
+
+def capture_stack(thread_id: int) -> Stack:
+    """Capture the current stack of another thread."""
+    frame = sys._current_frames().get(thread_id)
+    stack: Stack = []
+    while frame is not None:
+        stack.append((frame.f_globals.get("__name__", "?"), frame.f_code.co_name, frame.f_lineno))
+        frame = frame.f_back
+    return stack[::-1]
+
+def blocking_site(stack: Stack) -> Tuple[str, str]:
+    """
+    Attribute a blocked stack to the application code responsible.
+
+    Returns:
+        (innermost app.* frame or else the leaf, leaf frame)
+    """
+    leaf = ":".join(map(str, stack[-1][:2])) if stack else "?"
+    for module, function, line in reversed(stack):
+        if module.startswith("app.") and module != __name__:
+            return f"{module}:{function}:{line}", leaf
+    return leaf, leaf
+
+class LoopMonitor:
+    """
+    Measure event loop lag and catch the callbacks that block it.
+
+    A heartbeat task sleeps for `interval` and records how late it woke up
+    in the event_loop_lag_seconds histogram. A watchdog thread checks the
+    heartbeat; once it is overdue by `block_threshold` the loop is stuck in
+    a callback, so the watchdog captures the loop thread's stack. When the
+    heartbeat resumes, the block's duration is added to the statistics of
+    the responsible call site.
+    """
+
+    def __init__(self, *, interval: float, block_threshold: float, max_sites: int):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self._max_sites = max_sites
+        self._sites: Dict[str, BlockingSite] = {}
+        self._lock = threading.Lock()
+        self._last_beat = 0.0
+        self._stalled: Optional[Stack] = None
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    def top(self, limit: int = 20) -> List[BlockingSite]:
+        """
+        Get the call sites that blocked the loop the longest in total.
+
+        Args:
+            limit: Maximum number of sites
+
+        Returns:
+            Sites ordered by total blocked time
+        """
+        with self._lock:
+            sites = list(self._sites.values())
+        return sorted(sites, key=lambda site: site.total_ms, reverse=True)[:limit]
+
+    async def _heartbeat(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - start - self.interval)
+            EVENT_LOOP_LAG.observe(lag)
+            with self._lock:
+                self._last_beat = now
+                stalled, self._stalled = self._stalled, None
+            if stalled:
+                self._record(stalled, lag)
+
+    def _watch(self) -> None:
+        overdue = self.interval + self.block_threshold
+        while not self._stopped.wait(self.block_threshold / 2):
+            with self._lock:
+                if self._stalled is not None or time.perf_counter() - self._last_beat < overdue:
+                    continue
+            stack = capture_stack(self._thread_id)
+            with self._lock:
+                self._stalled = stack
+
+    def _record(self, stack: Stack, lag: float) -> None:
+        EVENT_LOOP_BLOCKS.inc()
+        site, leaf = blocking_site(stack)
+        blocked_ms = round(lag * 1000, 3)
+        collapsed = ";".join(f"{module}:{function}:{line}" for module, function, line in stack)
+        logger.warning(f"Event loop blocked for {blocked_ms:.0f}ms at {site} ({leaf})")
+
+        with self._lock:
+            entry = self._sites.get(site)
+            if entry is None:
+                if len(self._sites) >= self._max_sites:
+                    smallest = min(self._sites.values(), key=lambda s: s.total_ms)
+                    del self._sites[smallest.site]
+                entry = self._sites[site] = BlockingSite(
+                    site=site, leaf=leaf, count=0, total_ms=0.0, max_ms=0.0,
+                    last_seen=datetime.now(), stack=collapsed,
+                )
+            entry.count += 1
+            entry.total_ms += blocked_ms
+            entry.max_ms = max(entry.max_ms, blocked_ms)
+            entry.last_seen = datetime.now()
+            entry.leaf = leaf
+            entry.stack = collapsed
+
+# Monitor of this worker's event loop, started on application startup
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD_MS / 1000,
+    max_sites=settings.LOOP_BLOCKING_SITES,
+)
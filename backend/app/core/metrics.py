@@ -0,0 +1,202 @@
+# backend/app/core/metrics.py
+"""
+Prometheus metrics.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory before the workers start. Every worker then writes its samples to
+memory-mapped files there, and /metrics aggregates the files of all workers.
+Without it, /metrics reports the current process only.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client import REGISTRY
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# HTTP metrics
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_STAGE_DURATION = Histogram(
+    "http_request_stage_duration_seconds",
+    "Time spent in each stage of a request (see app.core.timing.span)",
+    ["route", "stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+# Event loop metrics
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event loop wake-up and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total",
+    "Times a callback held the event loop longer than LOOP_BLOCK_THRESHOLD_MS",
+)
+
+# Database pool metrics
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured connection pool size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+
+# Read replica metrics
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replay lag of each read replica at its last health check",
+    ["replica"],
+    multiprocess_mode="max",
+)
+DB_REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "1 if the replica is used for reads, 0 if it is skipped",
+    ["replica"],
+    multiprocess_mode="min",
+)
+DB_READS_ROUTED = Counter(
+    "db_reads_routed_total",
+    "Read-only sessions by the server they were routed to",
+    ["target"],
+)
+
+# Admission control metrics
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "Admitted requests in flight by priority class",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued_requests",
+    "Requests waiting for admission by priority class",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Time queued requests waited for admission",
+    ["priority"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0),
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_requests_total",
+    "Requests rejected with 503 by priority class and reason",
+    ["priority", "reason"],
+)
+
+# Business metrics
+TRANSACTIONS_POSTED = Counter(
+    "transactions_posted_total",
+    "Transactions posted by type",
+    ["type"],
+)
+FAILED_LOGINS = Counter(
+    "auth_failed_logins_total",
+    "Failed login attempts by reason",
+    ["reason"],
+)
+NOTIFICATIONS_SENT = Counter(
+    "notifications_sent_total",
+    "Notifications sent by channel",
+    ["channel"],
+)
+
+# Cache metrics
+ACCOUNT_CACHE_REQUESTS = Counter(
+    "account_cache_requests_total",
+    "Account cache lookups by result",
+    ["result"],
+)
+ACCOUNT_CACHE_INVALIDATIONS = Counter(
+    "account_cache_invalidations_total",
+    "Account cache entries invalidated after a write",
+)
+CACHE_INVALIDATIONS_RECEIVED = Counter(
+    "cache_invalidations_received_total",
+    "Invalidations received from other workers by entity",
+    ["entity"],
+)
+CACHE_RESYNCS = Counter(
+    "cache_resyncs_total",
+    "Flushes of every cache after the invalidation listener may have missed messages",
+)
+
+def render_metrics() -> bytes:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        Exposition payload
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+def mark_process_dead(pid: int = None) -> None:
+    """Drop the live gauges of a worker that is shutting down."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+__all__ = [
+    "CONTENT_TYPE_LATEST",
+    "HTTP_REQUEST_DURATION",
+    "HTTP_REQUEST_STAGE_DURATION",
+    "HTTP_REQUESTS_IN_PROGRESS",
+    "EVENT_LOOP_LAG",
+    "EVENT_LOOP_BLOCKS",
+    "DB_POOL_SIZE",
+    "DB_POOL_CHECKED_OUT",
+    "DB_POOL_OVERFLOW",
+    "DB_POOL_CHECKOUT_WAIT",
+    "DB_REPLICA_LAG",
+    "DB_REPLICA_HEALTHY",
+    "DB_READS_ROUTED",
+    "ADMISSION_IN_FLIGHT",
+    "ADMISSION_QUEUED",
+    "ADMISSION_QUEUE_WAIT",
+    "ADMISSION_SHED",
+    "TRANSACTIONS_POSTED",
+    "FAILED_LOGINS",
+    "NOTIFICATIONS_SENT",
+    "ACCOUNT_CACHE_REQUESTS",
+    "ACCOUNT_CACHE_INVALIDATIONS",
+    "CACHE_INVALIDATIONS_RECEIVED",
+    "CACHE_RESYNCS",
+    "render_metrics",
+    "mark_process_dead",
+]
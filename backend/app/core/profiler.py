@@ -0,0 +1,328 @@
+# backend/app/core/profiler.py
+import asyncio
+import os
+import sys
+import threading
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from app.config.settings import settings
+
+# Profile kinds
+CPU = "cpu"
+MEMORY = "memory"
+
+# Frames of the sampler itself never appear in a profile
+_SAMPLER_FILE = os.path.abspath(__file__)
+
+# Stack recorded while the profiled task waits (I/O, threadpool, other tasks)
+SUSPENDED = "(suspended)"
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}:{code.co_firstlineno}"
+
+@dataclass
+class Profile:
+    """
+    Collapsed stack samples of one request.
+
+    Attributes:
+        id: Profile ID
+        method: HTTP method
+        path: Request path
+        created_at: When profiling started
+        interval: Sampling interval in seconds
+        samples: Number of samples per collapsed stack
+    """
+    id: str
+    method: str
+    path: str
+    created_at: datetime
+    interval: float
+    samples: Counter = field(default_factory=Counter)
+    kind = CPU
+
+    @property
+    def total_samples(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """
+        Render in the collapsed stack format (one "frame;frame;frame count" per
+        line), readable by flamegraph.pl, speedscope and inferno.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+@dataclass
+class AllocationSite:
+    """Memory allocated at one source line and still alive."""
+    site: str
+    size_bytes: int
+    blocks: int
+
+@dataclass
+class MemoryProfile:
+    """
+    Python allocations of one request, traced with tracemalloc.
+
+    Attributes:
+        id: Profile ID
+        method: HTTP method
+        path: Request path
+        created_at: When tracing started
+        peak_bytes: Peak traced memory above the level at start
+        retained_bytes: Memory allocated during the request and alive when
+            the response started (the rendered body, caches, leaks)
+        retained_blocks: Number of such allocations
+        top_sites: Largest retained allocations by source line
+    """
+    id: str
+    method: str
+    path: str
+    created_at: datetime
+    peak_bytes: int = 0
+    retained_bytes: int = 0
+    retained_blocks: int = 0
+    top_sites: List[AllocationSite] = field(default_factory=list)
+    kind = MEMORY
+
+class AllocationTracker:
+    """
+    Trace the Python allocations of one request.
+
+    tracemalloc is process-wide, so only one tracker runs at a time and the
+    figures include anything concurrent requests allocate meanwhile.
+    Tracing slows allocation down several times; it is only on while a
+    tracker runs.
+    """
+    _active = threading.Lock()
+
+    def __init__(self, profile: MemoryProfile, *, top: int = 10):
+        self.profile = profile
+        self.top = top
+        self._started_tracing = False
+        self._snapshotted = False
+
+    def start(self) -> bool:
+        """
+        Start tracing.
+
+        Returns:
+            False if another tracker is running
+        """
+        if not self._active.acquire(blocking=False):
+            return False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        self._before = tracemalloc.take_snapshot()
+        return True
+
+    def snapshot(self) -> MemoryProfile:
+        """Record what is allocated now and the peak so far."""
+        self._snapshotted = True
+        self.profile.peak_bytes = tracemalloc.get_traced_memory()[1] - self._baseline
+        after = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        grown = [stat for stat in after.compare_to(self._before, "lineno") if stat.size_diff > 0]
+        self.profile.retained_bytes = sum(stat.size_diff for stat in grown)
+        self.profile.retained_blocks = sum(max(stat.count_diff, 0) for stat in grown)
+        self.profile.top_sites = [
+            AllocationSite(
+                site=f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                size_bytes=stat.size_diff,
+                blocks=stat.count_diff,
+            )
+            for stat in grown[:self.top]
+        ]
+        return self.profile
+
+    def stop(self) -> MemoryProfile:
+        """Stop tracing; takes a snapshot first unless one was taken."""
+        if not self._snapshotted:
+            self.snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        self._before = None
+        self._active.release()
+        return self.profile
+
+class StackSampler:
+    """
+    Statistical profiler for code running on one thread.
+
+    A background thread wakes every `interval` seconds and records the
+    target thread's current stack. For coroutines, pass the task and its
+    loop: while another task is running the sample is recorded as
+    SUSPENDED instead, so concurrent requests sharing the event loop do not
+    pollute the profile and the suspended share shows time spent awaiting.
+    """
+
+    def __init__(
+        self,
+        profile: Profile,
+        *,
+        thread_id: int,
+        task: Optional[asyncio.Task] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self.profile = profile
+        self.thread_id = thread_id
+        self.task = task
+        self.loop = loop
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        self._stopped.set()
+        self._thread.join()
+        return self.profile
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.profile.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        if self.task is not None and asyncio.current_task(self.loop) is not self.task:
+            self.profile.samples[SUSPENDED] += 1
+            return
+        frame = sys._current_frames().get(self.thread_id)
+        stack: List[str] = []
+        while frame is not None:
+            if frame.f_code.co_filename != _SAMPLER_FILE:
+                stack.append(_frame_name(frame))
+            frame = frame.f_back
+        if stack:
+            self.profile.samples[";".join(reversed(stack))] += 1
+
+class RequestProfiler:
+    """
+    On-demand request profiling state of one worker.
+
+    Profiling is armed per request (superuser header) or for the next N
+    requests (admin toggle), either as stack samples (CPU) or as traced
+    allocations (MEMORY). Finished profiles are kept in a bounded in-memory
+    store; CPU profiles are also written to output_dir as <id>.collapsed
+    files when it is set.
+    """
+
+    def __init__(self, *, interval: float, max_profiles: int, output_dir: Optional[str] = None):
+        self.interval = interval
+        self.output_dir = output_dir
+        self._max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._armed = 0
+        self._mode = CPU
+        self._path_prefix: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def armed(self) -> int:
+        """Number of upcoming requests that will be profiled."""
+        return self._armed
+
+    @property
+    def mode(self) -> str:
+        """Kind of profile taken of armed requests."""
+        return self._mode
+
+    def arm(self, requests: int, path_prefix: Optional[str] = None, mode: str = CPU) -> None:
+        """
+        Profile the next matching requests.
+
+        Args:
+            requests: Number of requests to profile, 0 to disarm
+            path_prefix: Only profile requests whose path starts with this
+            mode: CPU (stack samples) or MEMORY (allocations)
+        """
+        with self._lock:
+            self._armed = requests
+            self._path_prefix = path_prefix
+            self._mode = mode
+
+    def take(self, path: str) -> Optional[str]:
+        """
+        Consume one armed slot if the request matches.
+
+        Returns:
+            Profile kind to take, None if the request is not profiled
+        """
+        if not self._armed:
+            return None
+        with self._lock:
+            if not self._armed or (self._path_prefix and not path.startswith(self._path_prefix)):
+                return None
+            self._armed -= 1
+            return self._mode
+
+    def start(self, method: str, path: str) -> StackSampler:
+        """
+        Start sampling the current task.
+
+        Must be called from the coroutine being profiled.
+        """
+        profile = Profile(
+            id=uuid.uuid4().hex,
+            method=method,
+            path=path,
+            created_at=datetime.now(),
+            interval=self.interval,
+        )
+        sampler = StackSampler(
+            profile,
+            thread_id=threading.get_ident(),
+            task=asyncio.current_task(),
+            loop=asyncio.get_running_loop(),
+        )
+        sampler.start()
+        return sampler
+
+    def start_memory(self, method: str, path: str) -> Optional[AllocationTracker]:
+        """
+        Start tracing allocations.
+
+        Returns:
+            The tracker, None if another request is being traced
+        """
+        tracker = AllocationTracker(
+            MemoryProfile(id=uuid.uuid4().hex, method=method, path=path, created_at=datetime.now())
+        )
+        return tracker if tracker.start() else None
+
+    def save(self, profile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self._max_profiles:
+                self._profiles.popitem(last=False)
+        if self.output_dir and profile.kind == CPU:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, f"{profile.id}.collapsed"), "w") as f:
+                f.write(profile.collapsed())
+
+    def get(self, profile_id: str):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> list:
+        """Stored profiles, newest first."""
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+# Profiler of this worker, used by ProfilerMiddleware and the admin API
+request_profiler = RequestProfiler(
+    interval=settings.PROFILER_INTERVAL_MS / 1000,
+    max_profiles=settings.PROFILER_MAX_PROFILES,
+    output_dir=settings.PROFILER_OUTPUT_DIR,
+)
@@ -0,0 +1,245 @@
+# backend/app/core/rate_limit.py
+import hashlib
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    Token bucket parameters.
+
+    Attributes:
+        capacity: Maximum burst size in requests
+        refill_rate: Tokens added per second
+    """
+    capacity: float
+    refill_rate: float
+
+    @classmethod
+    def per_minute(cls, requests: int) -> "RateLimitRule":
+        """Allow `requests` per minute with a burst of the same size."""
+        return cls(capacity=float(requests), refill_rate=requests / 60.0)
+
+    @property
+    def full_after(self) -> float:
+        """Seconds an empty bucket needs to refill completely."""
+        return self.capacity / self.refill_rate
+
+def _take(
+    tokens: float,
+    updated: float,
+    now: float,
+    rule: RateLimitRule,
+) -> Tuple[float, float]:
+    """
+    Refill a bucket and try to take one token.
+
+    Returns:
+        (remaining tokens, seconds to wait), wait is 0.0 if the token was taken
+    """
+    tokens = min(rule.capacity, tokens + (now - updated) * rule.refill_rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / rule.refill_rate
+
+class InMemoryTokenBucketStore:
+    """
+    Sharded in-process token bucket store.
+
+    Buckets live in one of `shards` LRU dictionaries, each behind its own
+    lock, so concurrent callers rarely contend. A bucket that has refilled
+    completely is equivalent to a missing one, so full shards evict their
+    least recently used buckets once those have refilled. A shard whose
+    buckets are all still refilling grows up to twice its share of
+    max_buckets and only then evicts one regardless, which resets that
+    key's limit; max_buckets should exceed the keys active within the
+    longest refill time.
+    """
+
+    def __init__(self, shards: int = 16, max_buckets: int = 100_000):
+        """
+        Initialize the store.
+
+        Args:
+            shards: Number of independently locked shards
+            max_buckets: Maximum number of buckets kept across all shards
+        """
+        self._shards: List["OrderedDict[str, List[float]]"] = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shard_size = max(1, max_buckets // shards)
+        self._hard_size = 2 * self._shard_size
+
+    def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float, float]:
+        """
+        Take one token from the bucket identified by key.
+
+        Args:
+            key: Bucket key
+            rule: Bucket parameters
+
+        Returns:
+            (allowed, remaining tokens, seconds until a token is available)
+        """
+        index = hash(key) % len(self._shards)
+        shard = self._shards[index]
+        now = time.monotonic()
+        with self._locks[index]:
+            bucket = shard.get(key)
+            if bucket is None:
+                bucket = [rule.capacity, now, now]
+                shard[key] = bucket
+                self._evict(shard, now)
+            else:
+                shard.move_to_end(key)
+            bucket[0], retry_after = _take(bucket[0], bucket[1], now, rule)
+            # [tokens, last update, time the bucket is full again]
+            bucket[1] = now
+            bucket[2] = now + (rule.capacity - bucket[0]) / rule.refill_rate
+        return retry_after == 0.0, bucket[0], retry_after
+
+    def _evict(self, shard: "OrderedDict[str, List[float]]", now: float) -> None:
+        while len(shard) > self._shard_size:
+            oldest = next(iter(shard.values()))
+            if oldest[2] > now and len(shard) <= self._hard_size:
+                return
+            shard.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all buckets."""
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
+
+class SharedMemoryTokenBucketStore:
+    """
+    Token bucket store shared by all worker processes on one host.
+
+    Buckets are fixed-size slots (key hash, tokens, last update) in an
+    open-addressing table inside a named POSIX shared memory segment. Slots
+    are grouped into stripes guarded by byte-range fcntl locks on a lock
+    file, so workers only serialize on the same stripe. time.monotonic() is
+    system-wide on Linux, so timestamps written by one worker are valid in
+    the others.
+
+    The first worker creates the segment and the rest attach to it. The
+    segment outlives worker restarts on purpose: a stale bucket is simply a
+    full one.
+    """
+
+    _SLOT = struct.Struct("<Qdd")
+    _PROBES = 8
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        slots: int = 65_536,
+        stripes: int = 64,
+        stale_after: float = 60.0,
+    ):
+        """
+        Create or attach to the shared segment.
+
+        Args:
+            name: Segment name, shared by all workers of one deployment
+            slots: Number of bucket slots
+            stripes: Number of lock stripes
+            stale_after: Seconds after which an untouched bucket may be reused
+                for another key (the longest refill time of any rule)
+        """
+        import fcntl
+        from multiprocessing import resource_tracker, shared_memory
+
+        self._fcntl = fcntl
+        self._slots = slots
+        self._stripes = max(1, min(stripes, slots))
+        self._stale_after = stale_after
+        size = slots * self._SLOT.size
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # Keep the segment when a worker exits, other workers still use it
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._buf = self._shm.buf
+        self._lock_fd = os.open(
+            os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else "/tmp", f"{name}.lock"),
+            os.O_RDWR | os.O_CREAT,
+            0o600,
+        )
+
+    def _key_hash(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        # 0 marks an empty slot
+        return int.from_bytes(digest, "little") or 1
+
+    def hit(self, key: str, rule: RateLimitRule) -> Tuple[bool, float, float]:
+        """
+        Take one token from the bucket identified by key.
+
+        Args:
+            key: Bucket key
+            rule: Bucket parameters
+
+        Returns:
+            (allowed, remaining tokens, seconds until a token is available)
+        """
+        key_hash = self._key_hash(key)
+        home = key_hash % self._slots
+        # Probe sequences never cross a stripe boundary, one lock covers them
+        stripe_size = self._slots // self._stripes
+        stripe = min(home // stripe_size, self._stripes - 1)
+        slot_struct = self._SLOT
+        buf = self._buf
+
+        self._fcntl.lockf(self._lock_fd, self._fcntl.LOCK_EX, 1, stripe)
+        try:
+            now = time.monotonic()
+            stripe_start = stripe * stripe_size
+            stripe_end = self._slots if stripe == self._stripes - 1 else stripe_start + stripe_size
+            target = None
+            oldest = None
+            for probe in range(self._PROBES):
+                slot = stripe_start + (home - stripe_start + probe) % (stripe_end - stripe_start)
+                offset = slot * slot_struct.size
+                slot_hash, tokens, updated = slot_struct.unpack_from(buf, offset)
+                if slot_hash == key_hash:
+                    target = (offset, tokens, updated)
+                    break
+                if target is None and (slot_hash == 0 or now - updated >= self._stale_after):
+                    target = (offset, rule.capacity, now)
+                if oldest is None or updated < oldest[2]:
+                    oldest = (offset, rule.capacity, updated)
+            if target is None:
+                # All probed slots are busy; recycle the least recently used one
+                target = (oldest[0], rule.capacity, now)
+
+            offset, tokens, updated = target
+            tokens, retry_after = _take(tokens, updated, now, rule)
+            slot_struct.pack_into(buf, offset, key_hash, tokens, now)
+        finally:
+            self._fcntl.lockf(self._lock_fd, self._fcntl.LOCK_UN, 1, stripe)
+        return retry_after == 0.0, tokens, retry_after
+
+    def clear(self) -> None:
+        """Remove all buckets."""
+        self._buf[:] = bytes(len(self._buf))
+
+    def close(self) -> None:
+        """Detach from the segment without destroying it."""
+        self._buf = None
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Destroy the segment (for tests and controlled shutdowns)."""
+        from multiprocessing import resource_tracker
+
+        # Re-register so SharedMemory.unlink() can unregister it again
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
@@ -0,0 +1,73 @@
+# backend/app/core/timing.py
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+class SpanRecorder:
+    """
+    Durations of the named stages of one request.
+
+    Attributes:
+        spans: (stage, seconds) in completion order; a stage may repeat
+    """
+
+    def __init__(self):
+        self.spans: List[Tuple[str, float]] = []
+
+    def totals(self) -> Dict[str, float]:
+        """Total seconds per stage, in order of first completion."""
+        totals: Dict[str, float] = {}
+        for name, duration in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def server_timing(self) -> str:
+        """Render the stages as a Server-Timing header value."""
+        return ", ".join(
+            f"{name};dur={duration * 1000:.2f}" for name, duration in self.totals().items()
+        )
+
+# Recorder of the request being handled, set by ServerTimingMiddleware
+_current: ContextVar[Optional[SpanRecorder]] = ContextVar("span_recorder", default=None)
+
+def current_span_recorder() -> Optional[SpanRecorder]:
+    """Get the span recorder of the current request, if timing is enabled."""
+    return _current.get()
+
+def start_recording() -> Tuple[SpanRecorder, object]:
+    """
+    Record spans in the current context.
+
+    Returns:
+        (recorder, token for stop_recording)
+    """
+    recorder = SpanRecorder()
+    return recorder, _current.set(recorder)
+
+def stop_recording(token) -> None:
+    """Stop recording spans in the current context."""
+    _current.reset(token)
+
+class span:
+    """
+    Time a stage of the current request.
+
+        with span("balance_update"):
+            ...
+
+    Without an active recorder this costs one context variable lookup.
+    """
+    __slots__ = ("name", "recorder", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "span":
+        self.recorder = _current.get()
+        if self.recorder is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.recorder is not None:
+            self.recorder.spans.append((self.name, time.perf_counter() - self.start))
@@ -2,17 +2,26 @@
 from .session import (
     get_db,
     get_transactional_db,
+    get_unit_of_work,
     execute_raw_sql,
     create_all_tables,
     drop_all_tables,
     engine,
     SessionLocal,
 )
+from .replicas import get_read_db, get_snapshot_db
+from .invalidation import invalidation_bus
+from .unit_of_work import UnitOfWork
 
 # Export symbols for convenient importing
 __all__ = [
     "get_db",
     "get_transactional_db",
+    "get_unit_of_work",
+    "UnitOfWork",
+    "get_read_db",
+    "get_snapshot_db",
+    "invalidation_bus",
     "execute_raw_sql",
     "create_all_tables",
     "drop_all_tables",
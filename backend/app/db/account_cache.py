@@ -0,0 +1,190 @@
+# backend/app/db/account_cache.py
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.core.metrics import ACCOUNT_CACHE_INVALIDATIONS, ACCOUNT_CACHE_REQUESTS
+from app.db.models.account import Account, AccountType
+from app.utils.cache import LRUCache
+
+# Session.info key of the accounts written in the session's transaction
+PENDING_KEY = "account_cache_pending"
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """
+    Immutable copy of an account row, safe to share between requests.
+
+    Has the attributes of the Account schema, so routes can return it as is.
+    """
+    id: int
+    user_id: int
+    account_number: str
+    account_type: AccountType
+    balance: float
+    currency: str
+    is_active: bool
+    last_activity_at: Optional[datetime]
+    dormant_since: Optional[datetime]
+    deleted_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+    @classmethod
+    def from_account(cls, account: Account) -> "AccountSnapshot":
+        """Copy a loaded account."""
+        return cls(
+            id=account.id,
+            user_id=account.user_id,
+            account_number=account.account_number,
+            account_type=account.account_type,
+            balance=account.balance,
+            currency=account.currency,
+            is_active=account.is_active,
+            last_activity_at=account.last_activity_at,
+            dormant_since=account.dormant_since,
+            deleted_at=account.deleted_at,
+            created_at=account.created_at,
+            updated_at=account.updated_at,
+            version=account.version,
+        )
+
+class AccountCache:
+    """
+    Read-through cache of account snapshots keyed by account ID.
+
+    Every committed write invalidates its accounts synchronously (see the
+    session hooks below), and leaves a tombstone with the generation of the
+    invalidation and the version it committed. A reader takes a generation
+    with begin() before loading the row, and put() refuses the snapshot if
+    the account was invalidated since, unless the snapshot is at least as
+    new as the committed version. A load racing a write can therefore never
+    cache a balance older than the write.
+
+    Writes made by other processes are only seen when entries expire, after
+    ttl seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self._entries = LRUCache(maxsize=maxsize)  # id -> (snapshot, expires_at)
+        self._tombstones = LRUCache(maxsize=maxsize)  # id -> (generation, version or None)
+        self._generations = itertools.count(1)
+        self._cleared = 0
+        self._lock = threading.Lock()
+
+    def begin(self) -> int:
+        """Get the generation to pass to put(); call it before loading the row."""
+        with self._lock:
+            return next(self._generations)
+
+    def get(self, account_id: int) -> Optional[AccountSnapshot]:
+        """
+        Get the cached snapshot of an account.
+
+        Args:
+            account_id: Account ID
+
+        Returns:
+            Snapshot if cached and not expired, None otherwise
+        """
+        entry = self._entries.get(account_id)
+        if entry is None or entry[1] <= time.monotonic():
+            ACCOUNT_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        ACCOUNT_CACHE_REQUESTS.labels(result="hit").inc()
+        return entry[0]
+
+    def put(self, snapshot: AccountSnapshot, *, started: int) -> bool:
+        """
+        Cache a snapshot loaded after begin() returned started.
+
+        Args:
+            snapshot: Snapshot of the loaded row
+            started: Generation returned by begin() before the load
+
+        Returns:
+            Whether the snapshot was cached
+        """
+        with self._lock:
+            if started <= self._cleared:
+                return False
+            tombstone = self._tombstones.get(snapshot.id)
+            if tombstone is not None:
+                generation, version = tombstone
+                if generation > started and (version is None or snapshot.version < version):
+                    return False
+            self._entries.set(snapshot.id, (snapshot, time.monotonic() + self.ttl))
+            return True
+
+    def invalidate(self, account_id: int, version: Optional[int] = None) -> None:
+        """
+        Drop an account after a write.
+
+        Args:
+            account_id: Account ID
+            version: Version the write committed, None if unknown
+        """
+        with self._lock:
+            self._entries.pop(account_id)
+            self._tombstones.set(account_id, (next(self._generations), version))
+        ACCOUNT_CACHE_INVALIDATIONS.inc()
+
+    def clear(self) -> None:
+        """Drop every account, e.g. when writes may have been missed."""
+        with self._lock:
+            self._entries.clear()
+            self._tombstones.clear()
+            self._cleared = next(self._generations)
+
+account_cache = AccountCache(maxsize=settings.ACCOUNT_CACHE_SIZE, ttl=settings.ACCOUNT_CACHE_TTL_SECONDS)
+
+def _pending(session: Session) -> Dict[int, Optional[int]]:
+    return session.info.setdefault(PENDING_KEY, {})
+
+def pending_invalidations(session: Session) -> Dict[int, Optional[int]]:
+    """Get the accounts the session will invalidate on commit, with their committed versions."""
+    return session.info.get(PENDING_KEY, {})
+
+def invalidate_on_commit(db: Session, account_ids: Iterable[int]) -> None:
+    """
+    Invalidate accounts once the session commits.
+
+    Writes through the ORM are tracked automatically; bulk UPDATEs that
+    bypass it must register the accounts they touch.
+
+    Args:
+        db: Database session
+        account_ids: IDs of the updated accounts
+    """
+    pending = _pending(db)
+    for account_id in account_ids:
+        pending[account_id] = None
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_accounts(session: Session, flush_context) -> None:
+    pending = _pending(session)
+    for instance in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, Account):
+            # Read the instance dict, so no attribute is loaded mid-flush
+            account_id = instance.__dict__.get("id")
+            if account_id is not None and pending.get(account_id, 0) is not None:
+                pending[account_id] = instance.__dict__.get("version")
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_accounts(session: Session) -> None:
+    pending: Dict[int, Optional[int]] = session.info.pop(PENDING_KEY, {})
+    for account_id, version in pending.items():
+        account_cache.invalidate(account_id, version)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_accounts(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
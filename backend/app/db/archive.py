@@ -0,0 +1,459 @@
+# backend/app/db/archive.py
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.db.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.db.models.transaction_segment import SegmentStatus, TransactionSegment
+from app.utils.cache import LRUCache
+
+MAGIC = b"TXNSEG01"
+
+# Amounts are stored as int64 cents
+AMOUNT_SCALE = 100
+
+# Stored in place of a missing recipient account
+NULL_ID = -1
+
+EPOCH = datetime(1970, 1, 1)
+
+# int64 columns, and one-byte code columns with the enum whose members they index
+INT_COLUMNS = ("id", "account_id", "recipient_account_id", "created_at", "updated_at", "amount")
+CODE_COLUMNS = {"transaction_type": TransactionType, "status": TransactionStatus}
+
+def month_bounds(month: date) -> Tuple[datetime, datetime]:
+    """Get the first instant of a month and of the month after it."""
+    start = datetime(month.year, month.month, 1)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+def _micros(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+def _from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+def _cents(amount: float) -> int:
+    cents = round(amount * AMOUNT_SCALE)
+    if abs(cents - amount * AMOUNT_SCALE) > 1e-4:
+        raise ValueError(f"Amount {amount} has fractions of a cent and cannot be archived")
+    return cents
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+def _canonical(row: Mapping) -> bytes:
+    """Encoding of a row hashed by the checksums, independent of where the row was read from."""
+    return json.dumps([
+        row["id"], row["account_id"], row["transaction_type"].value, _cents(row["amount"]),
+        row["currency"], row["description"], row["reference_id"], row["status"].value,
+        row["recipient_account_id"], _micros(row["created_at"]), _micros(row["updated_at"]),
+    ], ensure_ascii=False).encode()
+
+def checksum_rows(rows: Iterable[Mapping]) -> Tuple[int, int, str]:
+    """
+    Checksum transaction rows.
+
+    Args:
+        rows: Rows ordered by account_id, created_at, id
+
+    Returns:
+        Tuple of (row count, amount total in cents, SHA-256 hex digest)
+    """
+    digest = hashlib.sha256()
+    count = total = 0
+    for row in rows:
+        digest.update(_canonical(row))
+        digest.update(b"\n")
+        count += 1
+        total += _cents(row["amount"])
+    return count, total, digest.hexdigest()
+
+def write_segment(path: str, rows: Iterable[Mapping], *, block_rows: int = None) -> Tuple[int, int, str]:
+    """
+    Write transaction rows to a segment file.
+
+    Columns are stored one after the other as fixed-width arrays, aligned
+    so they can be memory-mapped: int64 IDs, timestamps and amounts in
+    cents, one-byte type and status codes and fixed-width currency and
+    reference strings. Descriptions are zlib-compressed in blocks of
+    block_rows rows. The file is written next to path and renamed into
+    place, so readers never see a partial segment.
+
+    Args:
+        path: Segment file path
+        rows: Rows ordered by account_id, created_at, id
+        block_rows: Rows per compressed description block
+
+    Returns:
+        Checksum of the rows written, as returned by checksum_rows
+
+    Raises:
+        ValueError: If the rows are out of order or an amount is not in whole cents
+    """
+    block_rows = block_rows or settings.TRANSACTION_ARCHIVE_BLOCK_ROWS
+    values: Dict[str, list] = {name: [] for name in (*INT_COLUMNS, *CODE_COLUMNS, "currency", "reference_id")}
+    descriptions: List[Optional[bytes]] = []
+    digest = hashlib.sha256()
+    total = 0
+    previous = None
+    for row in rows:
+        key = (row["account_id"], row["created_at"], row["id"])
+        if previous is not None and key < previous:
+            raise ValueError("Segment rows must be ordered by account_id, created_at, id")
+        previous = key
+
+        digest.update(_canonical(row))
+        digest.update(b"\n")
+        total += _cents(row["amount"])
+        values["id"].append(row["id"])
+        values["account_id"].append(row["account_id"])
+        values["recipient_account_id"].append(
+            NULL_ID if row["recipient_account_id"] is None else row["recipient_account_id"]
+        )
+        values["created_at"].append(_micros(row["created_at"]))
+        values["updated_at"].append(_micros(row["updated_at"]))
+        values["amount"].append(_cents(row["amount"]))
+        for name, codes in CODE_COLUMNS.items():
+            values[name].append(list(codes).index(row[name]))
+        values["currency"].append(row["currency"].encode())
+        values["reference_id"].append((row["reference_id"] or "").encode())
+        descriptions.append(None if row["description"] is None else row["description"].encode())
+
+    count = len(descriptions)
+    arrays = {name: np.array(values[name], dtype="<i8") for name in INT_COLUMNS}
+    arrays.update({name: np.array(values[name], dtype="u1") for name in CODE_COLUMNS})
+    for name in ("currency", "reference_id"):
+        width = max((len(value) for value in values[name]), default=1) or 1
+        arrays[name] = np.array(values[name], dtype=f"S{width}")
+    arrays["description_length"] = np.array(
+        [-1 if value is None else len(value) for value in descriptions], dtype="<i4",
+    )
+    blocks = [
+        zlib.compress(b"".join(value or b"" for value in descriptions[start:start + block_rows]))
+        for start in range(0, count, block_rows)
+    ]
+    arrays["description_blocks"] = np.cumsum([0] + [len(block) for block in blocks], dtype="<i8")
+    arrays["description_data"] = np.frombuffer(b"".join(blocks), dtype="u1")
+
+    columns = {}
+    offset = 0
+    for name, array in arrays.items():
+        columns[name] = {"dtype": array.dtype.str, "count": len(array), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({
+        "version": 1,
+        "rows": count,
+        "block_rows": block_rows,
+        "codes": {name: [code.name for code in codes] for name, codes in CODE_COLUMNS.items()},
+        "columns": columns,
+    }).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        for name, array in arrays.items():
+            file.seek(data_start + columns[name]["offset"])
+            file.write(array.tobytes())
+        # Pad the last column so every array lies within the file
+        file.truncate(data_start + offset)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return count, total, digest.hexdigest()
+
+class Segment:
+    """
+    Memory-mapped, read-only segment file.
+
+    Rows are ordered by account_id, then created_at, so the rows of an
+    account in a date range are found by binary search.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a segment file.
+
+        Args:
+            path: Segment file path
+
+        Raises:
+            ValueError: If the file is not a segment
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a transaction segment")
+        header_length = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 8], "little")
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mmap[header_start:header_start + header_length])
+        data_start = _align(header_start + header_length)
+
+        self.rows = header["rows"]
+        self.block_rows = header["block_rows"]
+        self._codes = {
+            name: [CODE_COLUMNS[name][code] for code in codes] for name, codes in header["codes"].items()
+        }
+        self._columns = {
+            name: np.frombuffer(
+                self._mmap, dtype=np.dtype(spec["dtype"]), count=spec["count"], offset=data_start + spec["offset"],
+            )
+            for name, spec in header["columns"].items()
+        }
+        self._blocks = LRUCache(maxsize=8)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a column as a read-only array backed by the mapping."""
+        return self._columns[name]
+
+    def select(
+        self,
+        account_id: int,
+        *,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        transaction_type: TransactionType = None,
+        status: TransactionStatus = None,
+        min_amount: float = None,
+        max_amount: float = None,
+    ) -> np.ndarray:
+        """
+        Find the rows of an account matching the history filters.
+
+        Args:
+            account_id: Account ID
+            start_date: Rows created at or after this time
+            end_date: Rows created at or before this time
+            transaction_type: Filter by transaction type
+            status: Filter by status
+            min_amount: Filter by minimum amount
+            max_amount: Filter by maximum amount
+
+        Returns:
+            Row indexes, oldest first
+        """
+        account_ids = self._columns["account_id"]
+        start = int(np.searchsorted(account_ids, account_id, "left"))
+        end = int(np.searchsorted(account_ids, account_id, "right"))
+        # Within an account rows are ordered by created_at, so dates narrow the range too
+        if start_date is not None:
+            start += int(np.searchsorted(self._columns["created_at"][start:end], _micros(start_date), "left"))
+        if end_date is not None:
+            end = start + int(np.searchsorted(self._columns["created_at"][start:end], _micros(end_date), "right"))
+
+        indexes = np.arange(start, end)
+        mask = np.ones(len(indexes), dtype=bool)
+        for name, value in (("transaction_type", transaction_type), ("status", status)):
+            if value is not None:
+                code = self._codes[name].index(value) if value in self._codes[name] else -1
+                mask &= self._columns[name][start:end] == code
+        amounts = self._columns["amount"][start:end] / AMOUNT_SCALE
+        if min_amount is not None:
+            mask &= amounts >= min_amount
+        if max_amount is not None:
+            mask &= amounts <= max_amount
+        return indexes[mask]
+
+    def description(self, index: int) -> Optional[str]:
+        """Decompress the description of a row."""
+        lengths = self._columns["description_length"]
+        if lengths[index] < 0:
+            return None
+        block = index // self.block_rows
+        data = self._blocks.get(block)
+        if data is None:
+            offsets = self._columns["description_blocks"]
+            data = zlib.decompress(self._columns["description_data"][offsets[block]:offsets[block + 1]].tobytes())
+            self._blocks.set(block, data)
+        position = int(np.maximum(lengths[block * self.block_rows:index], 0).sum())
+        return data[position:position + int(lengths[index])].decode()
+
+    def row(self, index: int) -> Dict:
+        """Decode one row into Transaction column values."""
+        columns = self._columns
+        recipient_account_id = int(columns["recipient_account_id"][index])
+        return {
+            "id": int(columns["id"][index]),
+            "account_id": int(columns["account_id"][index]),
+            "transaction_type": self._codes["transaction_type"][columns["transaction_type"][index]],
+            "amount": int(columns["amount"][index]) / AMOUNT_SCALE,
+            "currency": columns["currency"][index].decode(),
+            "description": self.description(index),
+            "reference_id": columns["reference_id"][index].decode() or None,
+            "status": self._codes["status"][columns["status"][index]],
+            "recipient_account_id": None if recipient_account_id == NULL_ID else recipient_account_id,
+            "created_at": _from_micros(columns["created_at"][index]),
+            "updated_at": _from_micros(columns["updated_at"][index]),
+        }
+
+    def checksum(self) -> Tuple[int, int, str]:
+        """Checksum every row of the segment, as checksum_rows does for the source."""
+        return checksum_rows(self.row(index) for index in range(self.rows))
+
+class TransactionArchive:
+    """
+    Read side of the transaction archive.
+
+    Months whose segments are serving are read from the segment files and
+    no longer from the transactions table: created_at below boundary()
+    means archived. The catalog is reloaded every refresh_seconds and
+    segments stay mapped once opened. TRANSACTION_ARCHIVE_DIR must hold
+    the same files on every application host.
+    """
+
+    def __init__(self, root: str, *, refresh_seconds: float):
+        """
+        Initialize the archive.
+
+        Args:
+            root: Directory holding the segment files
+            refresh_seconds: How long a loaded catalog is used
+        """
+        self.root = root
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._months: Dict[date, List[Tuple[str, str]]] = {}
+        self._loaded_at: Optional[float] = None
+        self._segments: Dict[Tuple[str, str], Segment] = {}
+
+    def path_for(self, shard: Optional[str], month: date) -> str:
+        """Get the path of a month's segment, relative to the archive directory."""
+        return os.path.join(shard or "default", f"{month:%Y-%m}.seg")
+
+    def invalidate(self) -> None:
+        """Reload the catalog on next use."""
+        self._loaded_at = None
+
+    def served_months(self, db: Session) -> Dict[date, List[Tuple[str, str]]]:
+        """
+        Get the months read from segments.
+
+        Args:
+            db: Database session
+
+        Returns:
+            (path, checksum) of the segments of each month
+        """
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > self.refresh_seconds:
+            months: Dict[date, List[Tuple[str, str]]] = {}
+            for month, path, checksum in db.query(
+                TransactionSegment.month, TransactionSegment.path, TransactionSegment.checksum,
+            ).filter(TransactionSegment.status.in_([SegmentStatus.SERVING, SegmentStatus.PURGED])):
+                months.setdefault(month, []).append((path, checksum))
+            served = {key for keys in months.values() for key in keys}
+            with self._lock:
+                # Unmap segments no longer served or since rewritten
+                self._segments = {key: segment for key, segment in self._segments.items() if key in served}
+            self._months, self._loaded_at = months, now
+        return self._months
+
+    def boundary(self, db: Session) -> Optional[datetime]:
+        """
+        Get the time before which transactions are archived.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Start of the month after the newest served month, None if nothing is archived
+        """
+        months = self.served_months(db)
+        return month_bounds(max(months))[1] if months else None
+
+    def segment(self, path: str, checksum: str) -> Segment:
+        """
+        Get a mapped segment.
+
+        Args:
+            path: Path relative to the archive directory
+            checksum: Catalog checksum, telling rewritten versions of a path apart
+
+        Returns:
+            Segment, mapped on first use
+        """
+        segment = self._segments.get((path, checksum))
+        if segment is None:
+            with self._lock:
+                segment = self._segments.get((path, checksum))
+                if segment is None:
+                    segment = self._segments[(path, checksum)] = Segment(os.path.join(self.root, path))
+        return segment
+
+    def _matches(
+        self,
+        db: Session,
+        account_ids: List[int],
+        wanted: Optional[int],
+        start_date: datetime = None,
+        end_date: datetime = None,
+        **filters,
+    ) -> List[Tuple[int, int, Segment, int]]:
+        """Find (created_at, id, segment, index) of matching rows, newest first, stopping after wanted rows."""
+        matches = []
+        for month, keys in sorted(self.served_months(db).items(), reverse=True):
+            month_start, month_end = month_bounds(month)
+            if (start_date is not None and start_date >= month_end) or (end_date is not None and end_date < month_start):
+                continue
+            found = []
+            for path, checksum in keys:
+                segment = self.segment(path, checksum)
+                created_at, ids = segment.column("created_at"), segment.column("id")
+                for account_id in account_ids:
+                    for index in segment.select(account_id, start_date=start_date, end_date=end_date, **filters):
+                        found.append((int(created_at[index]), int(ids[index]), segment, int(index)))
+            found.sort(key=lambda match: (match[0], match[1]), reverse=True)
+            matches += found
+            if wanted is not None and len(matches) >= wanted:
+                break
+        return matches
+
+    def get_transactions(
+        self,
+        db: Session,
+        *,
+        account_ids: List[int],
+        skip: int = 0,
+        limit: int = 100,
+        **filters,
+    ) -> List[Transaction]:
+        """
+        Get archived transactions of accounts, newest first.
+
+        Args:
+            db: Database session
+            account_ids: Account IDs
+            skip: Number of transactions to skip
+            limit: Maximum number of transactions to return
+            **filters: History filters accepted by Segment.select
+
+        Returns:
+            Transient Transaction objects, not attached to the session
+        """
+        matches = self._matches(db, account_ids, skip + limit, **filters)
+        return [Transaction(**segment.row(index)) for _, _, segment, index in matches[skip:skip + limit]]
+
+    def count(self, db: Session, *, account_ids: List[int], **filters) -> int:
+        """Count archived transactions of accounts matching the history filters."""
+        return len(self._matches(db, account_ids, None, **filters))
+
+# Shared by the repositories of this process
+transaction_archive = TransactionArchive(
+    settings.TRANSACTION_ARCHIVE_DIR,
+    refresh_seconds=settings.TRANSACTION_ARCHIVE_REFRESH_SECONDS,
+)
@@ -0,0 +1,20 @@
+# backend/app/db/context.py
+from contextvars import ContextVar
+from typing import Optional
+
+# User of the request being handled, bound by AuthService.get_current_user
+_current_user_id: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+_current_user_is_superuser: ContextVar[bool] = ContextVar("current_user_is_superuser", default=False)
+
+def bind_user(user_id: int, *, superuser: bool = False) -> None:
+    """Bind the user of the current request, for read-your-writes and shard routing."""
+    _current_user_id.set(user_id)
+    _current_user_is_superuser.set(superuser)
+
+def current_user_id() -> Optional[int]:
+    """Get the user bound to the current request, if any."""
+    return _current_user_id.get()
+
+def current_user_is_superuser() -> bool:
+    """Whether the user bound to the current request is a superuser."""
+    return _current_user_is_superuser.get()
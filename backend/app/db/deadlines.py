@@ -0,0 +1,158 @@
+# backend/app/db/deadlines.py
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.exceptions import DeadlineExceeded
+
+logger = logging.getLogger("banking-system")
+
+# SQLSTATE of a statement cancelled by statement_timeout or a cancel request
+QUERY_CANCELED = "57014"
+
+class RequestDeadline:
+    """
+    Time budget of one request and the connections working for it.
+
+    Attributes:
+        budget: Seconds the request may take
+        expires_at: time.monotonic() at which the budget runs out
+        cancelled: The client disconnected
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        self.cancelled = False
+        self._connections: Set = set()
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self) -> None:
+        """
+        Raise if the request should stop doing work.
+
+        Raises:
+            DeadlineExceeded: If the budget ran out or the client disconnected
+        """
+        if self.cancelled:
+            raise DeadlineExceeded("Client disconnected")
+        if time.monotonic() >= self.expires_at:
+            raise DeadlineExceeded()
+
+    def attach(self, dbapi_connection) -> None:
+        with self._lock:
+            self._connections.add(dbapi_connection)
+
+    def detach(self, dbapi_connection) -> None:
+        with self._lock:
+            self._connections.discard(dbapi_connection)
+
+    def cancel(self) -> int:
+        """
+        Stop the request's database work.
+
+        Statements running on the request's connections are cancelled
+        through the driver's cancel request (like pg_cancel_backend, but
+        without needing another connection), and later statements fail
+        before they are sent.
+
+        Returns:
+            Number of connections a cancel request was sent to
+        """
+        self.cancelled = True
+        with self._lock:
+            connections = list(self._connections)
+        for dbapi_connection in connections:
+            try:
+                dbapi_connection.cancel()
+            except Exception as e:
+                logger.warning(f"Failed to cancel statement: {e}")
+        return len(connections)
+
+# Deadline of the request being handled, set by DeadlineMiddleware
+_current: ContextVar[Optional[RequestDeadline]] = ContextVar("request_deadline", default=None)
+
+def current_deadline() -> Optional[RequestDeadline]:
+    """Get the deadline of the current request, if any."""
+    return _current.get()
+
+def start_deadline(budget: float) -> Tuple[RequestDeadline, object]:
+    """
+    Give the current context a deadline.
+
+    Args:
+        budget: Seconds from now
+
+    Returns:
+        (deadline, token for stop_deadline)
+    """
+    deadline = RequestDeadline(budget)
+    return deadline, _current.set(deadline)
+
+def stop_deadline(token) -> None:
+    """Remove the deadline from the current context."""
+    _current.reset(token)
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Enforce request deadlines on an engine's connections.
+
+    Every transaction of a request starts with SET LOCAL statement_timeout
+    set to the time left. Statements are refused once the deadline passed
+    or the client disconnected, and connections are tracked while checked
+    out so RequestDeadline.cancel() can reach them.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        deadline = _current.get()
+        if deadline is not None:
+            deadline.attach(dbapi_connection)
+            connection_record.info["deadline"] = deadline
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        deadline = connection_record.info.pop("deadline", None)
+        if deadline is not None:
+            deadline.detach(dbapi_connection)
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        deadline = _current.get()
+        if deadline is None:
+            return
+        deadline.check()
+        # psycopg2 opens the transaction with this statement, so LOCAL covers it
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(
+                "SET LOCAL statement_timeout = %s",
+                (max(1, int(deadline.remaining() * 1000)),),
+            )
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        deadline = _current.get()
+        if deadline is not None:
+            deadline.check()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        deadline = _current.get()
+        if deadline is not None and getattr(context.original_exception, "pgcode", None) == QUERY_CANCELED:
+            raise DeadlineExceeded(
+                "Client disconnected" if deadline.cancelled else "Request deadline exceeded"
+            ) from context.original_exception
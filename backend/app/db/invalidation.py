@@ -0,0 +1,286 @@
+# backend/app/db/invalidation.py
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.core.metrics import CACHE_INVALIDATIONS_RECEIVED, CACHE_RESYNCS
+from app.db.account_cache import account_cache, pending_invalidations
+from app.db.session import engine, shard_router
+
+logger = logging.getLogger("banking-system")
+
+# Session.info keys: entries published with publish(), and the databases
+# shared with the other workers that the transaction touched
+PENDING_KEY = "invalidation_pending"
+SHARED_KEY = "invalidation_shared"
+
+# Entries per NOTIFY; payloads are limited to 8000 bytes
+MESSAGE_ENTRIES = 150
+
+NOTIFY = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
+
+@dataclass
+class Subscriber:
+    """
+    A process-local cache kept in step by the bus.
+
+    Attributes:
+        evict: Drops one entry, given its key and the committed version (None if unknown)
+        flush: Drops every entry
+        pending: Entries the cache tracks itself and invalidates on commit, by key
+    """
+    evict: Callable[[Any, Optional[int]], None]
+    flush: Callable[[], None]
+    pending: Optional[Callable[[Session], Mapping[Any, Optional[int]]]] = None
+
+class InvalidationBus:
+    """
+    Invalidation of process-local caches across workers over LISTEN/NOTIFY.
+
+    The writer evicts its own entries when it commits; the bus tells every
+    other worker. (entity, key, version) entries are sent with NOTIFY on
+    every shared database the writing transaction touched, inside its
+    transaction there, and Postgres delivers each copy only if, and once,
+    that database commits. A session writing to several shards commits
+    them one after the other, so a worker may hear of an entry before the
+    shard holding it has committed, but always hears it again afterwards.
+    Each worker runs listen() as a background task, with a dedicated
+    connection to each database.
+
+    A listener can only miss messages while it is not listening, so every
+    cache is flushed whenever a connection is lost and again once LISTEN
+    is back in place. The listener sends itself a heartbeat on each
+    connection and treats a silent one as lost, which catches dead TCP
+    connections.
+
+    Attributes:
+        engine: Engine of the primary database
+        channel: Notification channel
+    """
+
+    def __init__(self, engine: Engine, channel: str, *, databases: Iterable[Engine] = ()):
+        """
+        Initialize the bus.
+
+        Args:
+            engine: Engine of the primary database
+            channel: Notification channel
+            databases: Other databases whose writes are published, e.g. the shards
+        """
+        self.engine = engine
+        self.channel = channel
+        self._databases = [engine, *(database for database in databases if database is not engine)]
+        self._listening: Set[Engine] = set()
+        self._subscribers: Dict[str, Subscriber] = {}
+        self._origin_pid: Optional[int] = None
+        self._origin = ""
+
+    @property
+    def origin(self) -> str:
+        """Identity of this worker, so it can skip its own messages (renewed after a fork)."""
+        pid = os.getpid()
+        if self._origin_pid != pid:
+            self._origin_pid, self._origin = pid, f"{pid}-{uuid.uuid4().hex}"
+        return self._origin
+
+    @property
+    def listening(self) -> bool:
+        """Whether the listener is connected to every database."""
+        return len(self._listening) == len(self._databases)
+
+    def shares(self, engine: Engine) -> bool:
+        """Whether writes through an engine are seen by the other workers and must be published."""
+        return engine in self._databases
+
+    def subscribe(self, entity: str, subscriber: Subscriber) -> None:
+        """Register the cache of an entity."""
+        self._subscribers[entity] = subscriber
+
+    def publish(self, db: Session, entity: str, key: Any, version: Optional[int] = None) -> None:
+        """
+        Tell the other workers about a write once the session commits.
+
+        Args:
+            db: Database session doing the write
+            entity: Entity name the cache subscribed with
+            key: Key of the written entry, JSON serializable
+            version: Version the write commits, None if unknown
+        """
+        entries = db.info.setdefault(PENDING_KEY, {}).setdefault(entity, {})
+        if entries.get(key, 0) is not None:
+            entries[key] = version
+
+    def _entries(self, session: Session) -> List[list]:
+        published = session.info.get(PENDING_KEY, {})
+        entries: List[list] = []
+        for entity, subscriber in self._subscribers.items():
+            pending = dict(subscriber.pending(session)) if subscriber.pending else {}
+            pending.update(published.get(entity, {}))
+            if len(pending) > settings.INVALIDATION_MAX_ENTRIES:
+                entries.append([entity, None, None])
+            else:
+                entries.extend([entity, key, version] for key, version in pending.items())
+        return entries
+
+    def notify(self, session: Session) -> None:
+        """Send the session's pending entries on each shared database it touched; called before it commits."""
+        # Commit would flush after this hook, too late for the entries of the final flush
+        session.flush()
+        databases = session.info.get(SHARED_KEY)
+        if not databases:
+            return
+        entries = self._entries(session)
+        if not entries:
+            return
+        origin = self.origin
+        payloads = [
+            json.dumps({"origin": origin, "entries": entries[i:i + MESSAGE_ENTRIES]})
+            for i in range(0, len(entries), MESSAGE_ENTRIES)
+        ]
+        # Which database holds which entry is unknown, so each one sends them all
+        for database in databases:
+            session.connection(bind_arguments={"bind": database})\
+                .execute(NOTIFY, {"channel": self.channel, "payloads": payloads})
+
+    def dispatch(self, payload: str) -> None:
+        """
+        Apply a notification from another worker.
+
+        Args:
+            payload: Notification payload
+        """
+        try:
+            message = json.loads(payload)
+            origin, entries = message["origin"], message.get("entries", [])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Malformed cache invalidation, flushing every cache: {payload[:200]}")
+            self.resync()
+            return
+        if origin == self.origin:
+            return
+        for entity, key, version in entries:
+            subscriber = self._subscribers.get(entity)
+            if subscriber is None:
+                continue
+            if key is None:
+                subscriber.flush()
+            else:
+                subscriber.evict(key, version)
+            CACHE_INVALIDATIONS_RECEIVED.labels(entity=entity).inc()
+
+    def resync(self) -> None:
+        """Flush every cache, as messages may have been missed."""
+        for subscriber in self._subscribers.values():
+            subscriber.flush()
+        CACHE_RESYNCS.inc()
+
+    def _connect(self, database: Engine):
+        # A connection of its own, outside the pool, for as long as it lives
+        connection = database.raw_connection()
+        connection.detach()
+        connection.dbapi_connection.autocommit = True
+        with connection.dbapi_connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return connection
+
+    def _heartbeat(self, database: Engine) -> None:
+        payload = json.dumps({"origin": self.origin, "heartbeat": True})
+        with database.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT")\
+                .execute(NOTIFY, {"channel": self.channel, "payloads": [payload]})
+
+    async def _listen(self, database: Engine) -> None:
+        connection = await run_in_threadpool(self._connect, database)
+        dbapi_connection = connection.dbapi_connection
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        loop.add_reader(dbapi_connection.fileno(), readable.set)
+        try:
+            # Writes committed before LISTEN took effect were never sent to us
+            self._listening.add(database)
+            self.resync()
+            logger.info(f"Listening for cache invalidations on {self.channel} ({database.url.database})")
+
+            interval = settings.INVALIDATION_HEARTBEAT_SECONDS
+            last_heard = next_heartbeat = time.monotonic()
+            while True:
+                try:
+                    await asyncio.wait_for(readable.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                readable.clear()
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    self.dispatch(dbapi_connection.notifies.pop(0).payload)
+                    last_heard = time.monotonic()
+
+                now = time.monotonic()
+                if now - last_heard > 3 * interval:
+                    raise ConnectionError(f"no notification for {now - last_heard:.0f}s, not even heartbeats")
+                if now >= next_heartbeat:
+                    await run_in_threadpool(self._heartbeat, database)
+                    next_heartbeat = now + interval
+        finally:
+            self._listening.discard(database)
+            loop.remove_reader(dbapi_connection.fileno())
+            connection.close()
+
+    async def _listen_forever(self, database: Engine) -> None:
+        while True:
+            try:
+                await self._listen(database)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener disconnected from {database.url.database}: {e}")
+            # Nothing is heard until LISTEN is back, so nothing cached meanwhile can be trusted
+            self.resync()
+            await asyncio.sleep(settings.INVALIDATION_RECONNECT_SECONDS)
+
+    async def listen(self) -> None:
+        """Background task evicting entries written by other workers, listening on every database."""
+        await asyncio.gather(*(self._listen_forever(database) for database in self._databases))
+
+invalidation_bus = InvalidationBus(
+    engine,
+    settings.INVALIDATION_CHANNEL,
+    databases=shard_router.shards.values(),
+)
+
+invalidation_bus.subscribe("account", Subscriber(
+    evict=account_cache.invalidate,
+    flush=account_cache.clear,
+    pending=pending_invalidations,
+))
+invalidation_bus.subscribe("user_placement", Subscriber(
+    evict=lambda user_id, version: shard_router.forget_placement(user_id),
+    flush=shard_router.forget_placements,
+))
+
+@event.listens_for(Session, "after_begin")
+def _track_shared_databases(session: Session, transaction, connection) -> None:
+    databases = session.info.setdefault(SHARED_KEY, [])
+    if invalidation_bus.shares(connection.engine) and connection.engine not in databases:
+        databases.append(connection.engine)
+
+@event.listens_for(Session, "before_commit")
+def _notify_pending(session: Session) -> None:
+    if settings.INVALIDATION_BUS_ENABLED:
+        invalidation_bus.notify(session)
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(SHARED_KEY, None)
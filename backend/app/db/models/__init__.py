@@ -3,6 +3,9 @@ from .user import User
 from .account import Account, AccountType
 from .transaction import Transaction, TransactionType, TransactionStatus
 from .audit import AuditLog, AuditAction
+from .idempotency import IdempotencyKey
+from .shard_directory import UserShard, AccountDirectory
+from .transaction_segment import TransactionSegment, SegmentStatus
 
 # For convenient importing
 __all__ = [
@@ -13,5 +16,10 @@ __all__ = [
     "TransactionType", 
     "TransactionStatus", 
     "AuditLog", 
-    "AuditAction"
+    "AuditAction",
+    "IdempotencyKey",
+    "UserShard",
+    "AccountDirectory",
+    "TransactionSegment",
+    "SegmentStatus",
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 # backend/app/db/models/account.py
-from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, Enum, Date, DateTime, Index, func, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -14,19 +14,43 @@ class AccountType(enum.Enum):
 class Account(BaseModel):
     """Account model for different types of bank accounts"""
     __tablename__ = "accounts"
-    
+    __table_args__ = (
+        # Dormancy sweep scans only active, unflagged accounts by last activity
+        Index(
+            "ix_accounts_dormancy",
+            "last_activity_at",
+            "id",
+            postgresql_where=text("is_active AND dormant_since IS NULL"),
+        ),
+    )
     account_number = Column(String(20), unique=True, index=True, nullable=False)
     account_type = Column(Enum(AccountType), nullable=False)
     balance = Column(Float, default=0.0, nullable=False)
     currency = Column(String(3), default="USD", nullable=False)  # ISO 4217 currency code
     is_active = Column(Boolean, default=True)
+    last_activity_at = Column(DateTime, default=func.now(), nullable=True)  # Last posting
+    dormant_since = Column(DateTime, nullable=True)  # Set by the dormancy sweep
+    deleted_at = Column(DateTime, nullable=True)  # Soft deletion; purged after ACCOUNT_RETENTION_DAYS
+    accrued_interest = Column(Float, default=0.0, server_default=text("0"), nullable=False)  # Interest below a cent, not yet posted
+    interest_accrued_on = Column(Date, nullable=True)  # Last date interest was accrued for
+    version = Column(Integer, default=1, server_default=text("1"), nullable=False)  # Bumped by every write
+    
+    # UPDATEs through the ORM bump version and fail with StaleDataError if another write got there first;
+    # balance changes lock the row beforehand (AccountRepository.lock), so they never do
+    __mapper_args__ = {"version_id_col": version}
     
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationships
     owner = relationship("User", back_populates="accounts")
-    transactions = relationship("Transaction", back_populates="account", cascade="all, delete-orphan")
+    # Never loaded on delete: transactions are removed in chunks by the retention purge
+    transactions = relationship(
+        "Transaction",
+        back_populates="account",
+        foreign_keys="Transaction.account_id",
+        passive_deletes="all",
+    )
     
     def __repr__(self):
         return f"<Account {self.account_number}>"
\ No newline at end of file
@@ -23,7 +23,7 @@ class AuditLog(BaseModel):
     ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6 address
     
     # Foreign keys
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # NULL for system actions
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # NULL for system actions
     
     def __repr__(self):
         return f"<AuditLog {self.action.value} {self.entity_type} {self.entity_id}>"
\ No newline at end of file
@@ -0,0 +1,25 @@
+# backend/app/db/models/idempotency.py
+from sqlalchemy import Column, String, Integer, ForeignKey, JSON, DateTime, UniqueConstraint
+
+from ..base import BaseModel
+
+class IdempotencyKey(BaseModel):
+    """Stored response for a client-supplied Idempotency-Key"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),
+    )
+
+    key = Column(String(255), nullable=False)
+    request_method = Column(String(10), nullable=False)
+    request_path = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of method, path and body
+    response_status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    # Foreign keys
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.user_id}:{self.key}>"
@@ -0,0 +1,27 @@
+# backend/app/db/models/shard_directory.py
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, func
+
+from ..base import Base
+
+class UserShard(Base):
+    """Shard holding a user's accounts, transactions, audit and idempotency rows"""
+    __tablename__ = "user_shards"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(String(50), nullable=False)
+    moving = Column(Boolean, default=False, nullable=False)  # Set while the rebalancer copies the user
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<UserShard {self.user_id}:{self.shard}>"
+
+class AccountDirectory(Base):
+    """Global index of accounts, kept on the primary database"""
+    __tablename__ = "account_directory"
+
+    account_id = Column(Integer, primary_key=True, autoincrement=False)
+    account_number = Column(String(20), unique=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<AccountDirectory {self.account_number}:{self.user_id}>"
@@ -1,10 +1,12 @@
 # backend/app/db/models/transaction.py
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum, Text
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
 
+from app.config.settings import settings
 from ..base import BaseModel
+from ..partitioning import create_partitions_after
 
 class TransactionType(enum.Enum):
     DEPOSIT = "deposit"
@@ -23,22 +25,37 @@ class TransactionStatus(enum.Enum):
 class Transaction(BaseModel):
     """Transaction model for tracking money movements"""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Unique keys of a partitioned table must include the partition key
+        UniqueConstraint("reference_id", "account_id", name="uq_transactions_reference_id_account_id"),
+        # Account history and statistics read one account by date
+        Index("ix_transactions_account_id_created_at", "account_id", "created_at"),
+        {"postgresql_partition_by": "HASH (account_id)"},
+    )
+    
+    # The table key is (id, account_id) as Postgres requires for partitioning;
+    # id stays unique through its sequence and is the key the ORM uses
+    id = Column(Integer, primary_key=True, autoincrement=True)
     
     transaction_type = Column(Enum(TransactionType), nullable=False)
     amount = Column(Float, nullable=False)
     currency = Column(String(3), default="USD", nullable=False)  # ISO 4217 currency code
     description = Column(Text)
-    reference_id = Column(String(50), unique=True, index=True)
+    reference_id = Column(String(50), index=True)
     status = Column(Enum(TransactionStatus), default=TransactionStatus.PENDING, nullable=False)
     
     # For transfers
-    recipient_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
+    recipient_account_id = Column(Integer, ForeignKey("accounts.id", ondelete="SET NULL"), nullable=True)
     
-    # Foreign keys
-    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    # Foreign keys; the default NO ACTION keeps an account while its transactions are retained
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
     
     # Relationships
-    account = relationship("Account", back_populates="transactions")
+    account = relationship("Account", back_populates="transactions", foreign_keys=[account_id])
+    
+    __mapper_args__ = {"primary_key": [id]}
     
     def __repr__(self):
-        return f"<Transaction {self.reference_id}>"
\ No newline at end of file
+        return f"<Transaction {self.reference_id}>"
+
+create_partitions_after(Transaction.__table__, settings.TRANSACTION_PARTITIONS)
\ No newline at end of file
@@ -0,0 +1,28 @@
+# backend/app/db/models/transaction_segment.py
+from sqlalchemy import BigInteger, Column, Date, Enum, Integer, String, UniqueConstraint
+import enum
+
+from ..base import BaseModel
+
+class SegmentStatus(enum.Enum):
+    VERIFIED = "verified"  # Written and checked against the source rows
+    SERVING = "serving"  # Reads of the month go to the segments
+    PURGED = "purged"  # Source rows deleted
+
+class TransactionSegment(BaseModel):
+    """Archived month of one shard's transactions, stored in a segment file"""
+    __tablename__ = "transaction_segments"
+    __table_args__ = (
+        UniqueConstraint("month", "shard", name="uq_transaction_segments_month_shard"),
+    )
+
+    month = Column(Date, nullable=False)  # First day of the month
+    shard = Column(String(50), default="", nullable=False)  # Empty without sharding
+    path = Column(String(255), nullable=False)  # Relative to TRANSACTION_ARCHIVE_DIR
+    row_count = Column(Integer, nullable=False)
+    amount_total = Column(BigInteger, nullable=False)  # In cents
+    checksum = Column(String(64), nullable=False)  # SHA-256 of the rows
+    status = Column(Enum(SegmentStatus), default=SegmentStatus.VERIFIED, nullable=False)
+
+    def __repr__(self):
+        return f"<TransactionSegment {self.month:%Y-%m} {self.shard or 'default'}>"
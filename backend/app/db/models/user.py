@@ -1,5 +1,5 @@
 # backend/app/db/models/user.py
-from sqlalchemy import Boolean, Column, String, Text
+from sqlalchemy import Boolean, Column, DateTime, String, Text
 from sqlalchemy.orm import relationship
 
 from ..base import BaseModel
@@ -15,13 +15,15 @@ class User(BaseModel):
     phone_number = Column(String(20))
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    deleted_at = Column(DateTime, nullable=True)  # Soft deletion; purged after ACCOUNT_RETENTION_DAYS
     
     # Profile information
     address = Column(Text)
     date_of_birth = Column(String(10))  # Format: YYYY-MM-DD
     
     # Relationships
-    accounts = relationship("Account", back_populates="owner", cascade="all, delete-orphan")
+    # Never loaded on delete: accounts are removed by the retention purge
+    accounts = relationship("Account", back_populates="owner", passive_deletes="all")
     
     def __repr__(self):
         return f"<User {self.username}>"
\ No newline at end of file
@@ -0,0 +1,126 @@
+# backend/app/db/partitioning.py
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Set
+
+from sqlalchemy import event, func, literal_column, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import DDL
+
+def partition_name(table: str, remainder: int) -> str:
+    """Name of a hash partition, e.g. transactions_p3."""
+    return f"{table}_p{remainder}"
+
+def hash_partitions_ddl(table: str, count: int, name: Optional[str] = None) -> List[str]:
+    """
+    Statements creating the hash partitions of a partitioned table.
+
+    Args:
+        table: Partitioned table
+        count: Number of partitions (the hash modulus)
+        name: Table name the partitions are named after, defaults to table
+
+    Returns:
+        One CREATE TABLE ... PARTITION OF statement per partition
+    """
+    return [
+        f"CREATE TABLE IF NOT EXISTS {partition_name(name or table, remainder)} PARTITION OF {table} "
+        f"FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+        for remainder in range(count)
+    ]
+
+def create_partitions_after(table, count: int) -> None:
+    """
+    Create the hash partitions whenever metadata.create_all creates a table.
+
+    Args:
+        table: SQLAlchemy Table declared with postgresql_partition_by
+        count: Number of partitions
+    """
+    for statement in hash_partitions_ddl(table.name, count):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+def partition_count(db: Session, table: str) -> int:
+    """
+    Get the number of partitions of a table from the catalog.
+
+    Args:
+        db: Database session
+        table: Table name
+
+    Returns:
+        Number of partitions, 0 if the table is not partitioned
+    """
+    return db.execute(
+        text("SELECT count(*) FROM pg_inherits WHERE inhparent = to_regclass(:table)"),
+        {"table": table},
+    ).scalar() or 0
+
+def in_partition(table: str, column, modulus: int, remainder: int):
+    """
+    Filter rows whose key would hash into one partition of a table.
+
+    Used to split bulk work on accounts along the transactions partitions,
+    e.g. in_partition("transactions", Account.id, 16, 3): every transaction
+    written for the matching accounts lands in transactions_p3.
+
+    Args:
+        table: Hash-partitioned table
+        column: Column holding values of the partition key
+        modulus: Number of partitions of the table
+        remainder: Partition number
+
+    Returns:
+        SQL boolean expression
+    """
+    return func.satisfies_hash_partition(
+        literal_column(f"'{table}'::regclass"), modulus, remainder, column
+    )
+
+def scanned_relations(plan: dict) -> Set[str]:
+    """
+    Get the tables a query plan reads.
+
+    Args:
+        plan: "Plan" node of EXPLAIN (FORMAT JSON) output
+
+    Returns:
+        Names of the relations scanned anywhere in the plan
+    """
+    relations = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        relations |= scanned_relations(child)
+    return relations
+
+@contextmanager
+def explain_plans(db: Session) -> Iterator[List[dict]]:
+    """
+    Collect the plans of the SELECT statements a session runs.
+
+    Each statement is explained with its actual parameters on the same
+    connection before it runs, so the plans show the partitions the
+    planner kept after pruning.
+
+    Args:
+        db: Database session
+
+    Yields:
+        List the "Plan" nodes are appended to
+    """
+    plans: List[dict] = []
+    connection = db.connection()
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        explain_cursor = conn.connection.cursor()
+        try:
+            explain_cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plans.append(explain_cursor.fetchone()[0][0]["Plan"])
+        finally:
+            explain_cursor.close()
+
+    event.listen(connection, "before_cursor_execute", explain)
+    try:
+        yield plans
+    finally:
+        event.remove(connection, "before_cursor_execute", explain)
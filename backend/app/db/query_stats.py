@@ -0,0 +1,120 @@
+# backend/app/db/query_stats.py
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Collapse expanded IN lists, so IN (1, 2) and IN (1, 2, 3) have one shape
+_IN_LIST = re.compile(r"\((?:%\(\w+\)s|\?)(?:,\s*(?:%\(\w+\)s|\?))*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so executions that differ only in bound values match.
+
+    Args:
+        statement: SQL as sent to the DBAPI (parameters are placeholders)
+
+    Returns:
+        Normalized statement
+    """
+    return _IN_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+class QueryStats:
+    """
+    Statements executed within a scope (a request or a test).
+
+    Attributes:
+        count: Number of statements
+        duration: Total time spent in cursor execution, in seconds
+        statements: Executions per raw statement text
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Get statement shapes executed at least threshold times (N+1 candidates).
+
+        Args:
+            threshold: Minimum number of executions
+
+        Returns:
+            List of (shape, executions), most repeated first
+        """
+        shapes: Counter = Counter()
+        for statement, executions in self.statements.items():
+            shapes[statement_shape(statement)] += executions
+        return [(shape, n) for shape, n in shapes.most_common() if n >= threshold]
+
+# Stats of the request being handled, set by QueryStatsMiddleware
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Process-wide recorders (used by tests, where the app runs on another thread)
+_recorders: List[QueryStats] = []
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Get the query stats of the current request, if tracked."""
+    return _current.get()
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count statements executed in the current context (request)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    """Count statements executed by any thread while the block runs."""
+    stats = QueryStats()
+    _recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        _recorders.remove(stats)
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach query accounting to an engine.
+
+    Costs one context variable lookup per statement when nothing is tracking.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None or _recorders:
+            conn.info["query_start_time"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start_time = conn.info.pop("query_start_time", None)
+        if start_time is None:
+            return
+        duration = time.perf_counter() - start_time
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        for recorder in _recorders:
+            recorder.record(statement, duration)
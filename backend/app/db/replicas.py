@@ -0,0 +1,316 @@
+# backend/app/db/replicas.py
+import asyncio
+import itertools
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generator, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.core.metrics import DB_READS_ROUTED, DB_REPLICA_HEALTHY, DB_REPLICA_LAG
+from app.db import deadlines, query_stats, slow_queries
+from app.db.context import current_user_id
+from app.db.session import SessionLocal, engine, shard_router
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger("banking-system")
+
+PRIMARY = "primary"
+
+# Cookie carrying the WAL position of the client's last write between requests
+READ_AFTER_COOKIE = "read_after_lsn"
+
+_HEALTH_QUERY = """
+SELECT pg_is_in_recovery(),
+       pg_last_wal_replay_lsn()::text,
+       CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+       END
+"""
+
+def parse_lsn(lsn: Optional[str]) -> int:
+    """
+    Convert a Postgres LSN such as "16/B374D848" to a comparable integer.
+
+    Args:
+        lsn: LSN text, None on a server without WAL replay
+
+    Returns:
+        Position in the WAL in bytes, 0 for None
+    """
+    if not lsn:
+        return 0
+    high, _, low = lsn.partition("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+@dataclass
+class Replica:
+    """
+    A streaming replica and what its last health check found.
+
+    Attributes:
+        name: host:port
+        engine: Engine of the replica
+        healthy: Reachable, in recovery and within the lag limit
+        replay_lsn: Last replayed WAL position
+        lag_seconds: Replay delay behind the primary
+        checked_at: Time of the last health check
+    """
+    name: str
+    engine: Engine
+    healthy: bool = False
+    replay_lsn: int = 0
+    lag_seconds: Optional[float] = None
+    checked_at: Optional[datetime] = None
+
+@dataclass
+class ReadAfter:
+    """
+    WAL positions of one request, set up by ReadYourWritesMiddleware.
+
+    Attributes:
+        min_lsn: Position the client's reads must see, from its cookie
+        write_lsn: Position reached by the request's own commits, 0 if it wrote nothing
+    """
+    min_lsn: int = 0
+    write_lsn: int = 0
+
+# Positions of the request being handled; mutated in place, so commits in
+# the threadpool (which runs a copy of the context) are seen by the middleware
+_read_after: ContextVar[Optional[ReadAfter]] = ContextVar("read_after", default=None)
+
+def start_read_after(min_lsn: int = 0) -> Tuple[ReadAfter, object]:
+    """
+    Track the WAL positions of the current request.
+
+    Args:
+        min_lsn: Position the client's reads must see
+
+    Returns:
+        (positions, token for stop_read_after)
+    """
+    read_after = ReadAfter(min_lsn=min_lsn)
+    return read_after, _read_after.set(read_after)
+
+def stop_read_after(token) -> None:
+    """Stop tracking WAL positions in the current context."""
+    _read_after.reset(token)
+
+class ReplicaRouter:
+    """
+    Pick the engine for read-only sessions.
+
+    Healthy replicas are used in turn. A replica is skipped while it lags
+    more than max_lag behind the primary, or when it has not replayed the
+    last write of the requesting user yet, which keeps reads after a write
+    consistent. Without a usable replica, reads go to the primary.
+
+    Write positions are kept per process, and also returned to the client
+    in the read_after_lsn cookie by ReadYourWritesMiddleware, so a read
+    served by another worker still waits for the write.
+    """
+
+    def __init__(self, replicas: List[Replica], *, max_lag: float, tracked_users: int):
+        """
+        Initialize the router.
+
+        Args:
+            replicas: Replicas to route to
+            max_lag: Seconds of replay lag after which a replica is skipped
+            tracked_users: Number of users whose last write position is kept
+        """
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self._write_lsns: LRUCache = LRUCache(maxsize=tracked_users)
+        self._turn = itertools.count()
+
+    def record_write(self, user_id: int, lsn: int) -> None:
+        """Remember the WAL position a user's last commit reached."""
+        self._write_lsns.set(user_id, max(lsn, self._write_lsns.get(user_id, 0)))
+
+    def choose(self, user_id: Optional[int] = None, *, min_lsn: int = 0) -> Optional[Replica]:
+        """
+        Choose a replica for a read.
+
+        Args:
+            user_id: Requesting user, whose own writes must be visible
+            min_lsn: WAL position the replica must have replayed, e.g. from the client's cookie
+
+        Returns:
+            Replica to read from, None to read from the primary
+        """
+        if not self.replicas:
+            return None
+        if user_id is not None:
+            min_lsn = max(min_lsn, self._write_lsns.get(user_id, 0))
+        start = next(self._turn)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if not replica.healthy:
+                continue
+            if replica.replay_lsn >= min_lsn or self._replayed(replica) >= min_lsn:
+                DB_READS_ROUTED.labels(replica.name).inc()
+                return replica
+        DB_READS_ROUTED.labels(PRIMARY).inc()
+        return None
+
+    @staticmethod
+    def _replayed(replica: Replica) -> int:
+        # The health check may be older than the user's write; ask the replica
+        try:
+            with replica.engine.connect() as conn:
+                replica.replay_lsn = parse_lsn(
+                    conn.exec_driver_sql("SELECT pg_last_wal_replay_lsn()::text").scalar()
+                )
+        except Exception as e:
+            logger.warning(f"Replica {replica.name} unreachable: {e}")
+            replica.healthy = False
+        return replica.replay_lsn
+
+    def check(self, replica: Replica) -> None:
+        """Refresh the health and replication position of a replica."""
+        try:
+            with replica.engine.connect() as conn:
+                in_recovery, lsn, lag = conn.exec_driver_sql(_HEALTH_QUERY).one()
+            replica.replay_lsn = parse_lsn(lsn)
+            replica.lag_seconds = float(lag)
+            replica.healthy = bool(in_recovery) and replica.lag_seconds <= self.max_lag
+        except Exception as e:
+            logger.warning(f"Replica {replica.name} health check failed: {e}")
+            replica.healthy = False
+        replica.checked_at = datetime.now()
+        DB_REPLICA_HEALTHY.labels(replica.name).set(int(replica.healthy))
+        if replica.lag_seconds is not None:
+            DB_REPLICA_LAG.labels(replica.name).set(replica.lag_seconds)
+
+    def check_all(self) -> None:
+        for replica in self.replicas:
+            self.check(replica)
+
+    async def check_periodically(self) -> None:
+        """Background task checking the replicas every REPLICA_HEALTH_CHECK_INTERVAL_SECONDS."""
+        while True:
+            await run_in_threadpool(self.check_all)
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+
+def create_replica(host: str) -> Replica:
+    """Create the engine of a replica given as host or host:port."""
+    hostname, _, port = host.strip().partition(":")
+    replica_engine = create_engine(
+        f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{hostname}:{port or settings.POSTGRES_PORT}/{settings.POSTGRES_DB}",
+        pool_size=settings.REPLICA_POOL_SIZE,
+        max_overflow=settings.REPLICA_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        echo=settings.DB_ECHO_SQL,
+    )
+    query_stats.instrument_engine(replica_engine)
+    if settings.REQUEST_DEADLINES_ENABLED:
+        deadlines.instrument_engine(replica_engine)
+    if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+        slow_queries.instrument_engine(replica_engine, slow_queries.slow_query_log)
+    return Replica(name=f"{hostname}:{port or settings.POSTGRES_PORT}", engine=replica_engine)
+
+replica_router = ReplicaRouter(
+    [create_replica(host) for host in settings.POSTGRES_REPLICA_HOSTS.split(",") if host.strip()],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    tracked_users=settings.REPLICA_TRACKED_USERS,
+)
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica when it is marked read-only.
+
+    The engine is chosen on first use and kept for the session, so all its
+    reads see one replica. Flushes always go to the primary, and so does
+    everything after the session has written.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not self.info.get("read_only") or self._flushing or self.info.get("primary"):
+            return engine
+        bind = self.info.get("bind")
+        if bind is None:
+            read_after = _read_after.get()
+            replica = replica_router.choose(
+                current_user_id(), min_lsn=read_after.min_lsn if read_after is not None else 0,
+            )
+            bind = self.info["bind"] = replica.engine if replica is not None else engine
+        return bind
+
+# Replicas are only set up for the single database; shards serve reads themselves
+ReadSessionLocal = SessionLocal if shard_router.shards else sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    expire_on_commit=False,
+)
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context) -> None:
+    session.info["wrote"] = session.info["primary"] = True
+
+@event.listens_for(Session, "after_begin")
+def _after_begin(session, transaction, connection) -> None:
+    if session.info.get("snapshot"):
+        connection.exec_driver_sql("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session) -> None:
+    wrote = session.info.pop("wrote", False)
+    user_id = current_user_id()
+    read_after = _read_after.get()
+    if not wrote or (user_id is None and read_after is None) or not replica_router.replicas:
+        return
+    # The session cannot run SQL after commit; the position is read separately
+    try:
+        with engine.connect() as conn:
+            lsn = parse_lsn(conn.exec_driver_sql("SELECT pg_current_wal_lsn()::text").scalar())
+    except Exception as e:
+        logger.warning(f"Could not read the WAL position of a commit: {e}")
+        return
+    if user_id is not None:
+        replica_router.record_write(user_id, lsn)
+    if read_after is not None:
+        read_after.write_lsn = max(read_after.write_lsn, lsn)
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session) -> None:
+    session.info.pop("wrote", None)
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    FastAPI dependency that provides a Session for reads, served by a
+    replica when one is healthy and has the user's writes.
+
+    Yields:
+        Session: SQLAlchemy Session object
+    """
+    db = ReadSessionLocal(info={"read_only": True})
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_snapshot_db() -> Generator[Session, None, None]:
+    """
+    FastAPI dependency like get_read_db whose transactions run as
+    REPEATABLE READ READ ONLY, so multi-query reports see one snapshot.
+
+    Yields:
+        Session: SQLAlchemy Session object
+    """
+    db = ReadSessionLocal(info={"read_only": True, "snapshot": True})
+    try:
+        yield db
+    finally:
+        db.close()
@@ -3,12 +3,14 @@ from .users import UserRepository
 from .accounts import AccountRepository
 from .transactions import TransactionRepository
 from .audit import AuditLogRepository
+from .idempotency import IdempotencyKeyRepository
 
 # Create repository instances
 user_repository = UserRepository()
 account_repository = AccountRepository()
 transaction_repository = TransactionRepository()
 audit_repository = AuditLogRepository()
+idempotency_repository = IdempotencyKeyRepository()
 
 # Export repository instances for convenient importing
 __all__ = [
@@ -16,4 +18,5 @@ __all__ = [
     "account_repository",
     "transaction_repository",
     "audit_repository",
+    "idempotency_repository",
 ]
\ No newline at end of file
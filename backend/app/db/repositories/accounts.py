@@ -1,13 +1,26 @@
 # backend/app/db/repositories/accounts.py
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import desc, func
+from sqlalchemy import desc, event, func, or_, tuple_, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
+from app.core.exceptions import ConcurrentUpdate
+from app.db.account_cache import account_cache, invalidate_on_commit
 from app.db.models.account import Account, AccountType
+from app.db.partitioning import in_partition
 from app.schemas.account import AccountCreate, AccountUpdate
 from .base import BaseRepository
 
+# IDs of the accounts locked by the session's current transaction
+LOCKED_KEY = "locked_accounts"
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_locks(session: Session, transaction) -> None:
+    # Also on savepoints, which may release locks taken after them
+    session.info.pop(LOCKED_KEY, None)
+
 
 class AccountRepository(BaseRepository[Account, AccountCreate, AccountUpdate]):
     """Repository for Account model operations."""
@@ -15,6 +28,64 @@ class AccountRepository(BaseRepository[Account, AccountCreate, AccountUpdate]):
     def __init__(self):
         super().__init__(Account)
     
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Account,
+        obj_in: Union[AccountUpdate, Dict[str, Any]]
+    ) -> Account:
+        """
+        Update an account, bumping its version.
+        
+        Args:
+            db: Database session
+            db_obj: Account to update
+            obj_in: Update data
+            
+        Returns:
+            Updated account
+            
+        Raises:
+            ConcurrentUpdate: If the account was written since it was loaded
+        """
+        try:
+            return super().update(db, db_obj=db_obj, obj_in=obj_in)
+        except StaleDataError:
+            account_cache.invalidate(db_obj.id)
+            raise ConcurrentUpdate()
+    
+    def lock(self, db: Session, *, account: Account) -> Account:
+        """
+        Lock an account row until the transaction ends, reloading it.
+
+        Balance changes lock the row first: concurrent ones wait for each
+        other instead of failing the version check with ConcurrentUpdate,
+        and work from the current balance and version. A row this
+        transaction already locked, e.g. by a transfer locking both of its
+        accounts up front, cannot have changed since and is not reloaded.
+
+        Args:
+            db: Database session
+            account: Loaded account
+
+        Returns:
+            The same account, with current values
+        """
+        locked = db.info.setdefault(LOCKED_KEY, set())
+        if account.id in locked:
+            return account
+
+        # Pending changes would be overwritten by the reload
+        db.flush()
+        account = db.query(Account)\
+            .filter(Account.id == account.id)\
+            .populate_existing()\
+            .with_for_update()\
+            .one()
+        locked.add(account.id)
+        return account
+    
     def get_by_account_number(self, db: Session, *, account_number: str) -> Optional[Account]:
         """
         Get an account by account number.
@@ -28,6 +99,53 @@ class AccountRepository(BaseRepository[Account, AccountCreate, AccountUpdate]):
         """
         return db.query(Account).filter(Account.account_number == account_number).first()
     
+    def get_by_account_numbers(self, db: Session, *, account_numbers: List[str]) -> List[Account]:
+        """
+        Get accounts for a set of account numbers in a single query.
+        
+        Args:
+            db: Database session
+            account_numbers: Account numbers
+            
+        Returns:
+            List of accounts found
+        """
+        if not account_numbers:
+            return []
+        return db.query(Account).filter(Account.account_number.in_(account_numbers)).all()
+
+    def get_owned(self, db: Session, *, account_id: int, user_id: Optional[int]) -> Optional[Account]:
+        """
+        Get an account if it belongs to a user, in a single query.
+
+        Args:
+            db: Database session
+            account_id: Account ID
+            user_id: ID of the user who must own the account, None for any owner
+
+        Returns:
+            Account if found, not deleted and owned by the user, None otherwise
+        """
+        query = db.query(Account).filter(Account.id == account_id, Account.deleted_at.is_(None))
+        if user_id is not None:
+            query = query.filter(Account.user_id == user_id)
+        return query.first()
+
+    def get_owner_id(self, db: Session, *, account_id: int) -> Optional[int]:
+        """
+        Get the ID of the user owning an account.
+
+        Args:
+            db: Database session
+            account_id: Account ID
+
+        Returns:
+            Owner ID if the account exists and is not deleted, None otherwise
+        """
+        return db.query(Account.user_id)\
+            .filter(Account.id == account_id, Account.deleted_at.is_(None))\
+            .scalar()
+
     def get_user_accounts(
         self, 
         db: Session, 
@@ -52,7 +170,7 @@ class AccountRepository(BaseRepository[Account, AccountCreate, AccountUpdate]):
         Returns:
             List of accounts
         """
-        query = db.query(Account).filter(Account.user_id == user_id)
+        query = db.query(Account).filter(Account.user_id == user_id, Account.deleted_at.is_(None))
         
         if account_type:
             query = query.filter(Account.account_type == account_type)
@@ -138,33 +256,219 @@ class AccountRepository(BaseRepository[Account, AccountCreate, AccountUpdate]):
         db.flush()
         return db_obj
     
-    def get_inactive_accounts(self, db: Session, *, days_inactive: int = 180) -> List[Account]:
+    def get_id_range(self, db: Session) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the smallest and largest account IDs.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Tuple of (min_id, max_id), both None if there are no accounts
+        """
+        return db.query(func.min(Account.id), func.max(Account.id)).one()
+    
+    def get_balances_in_id_range(
+        self,
+        db: Session,
+        *,
+        account_type: AccountType,
+        start_id: int,
+        end_id: int,
+        accrual_date: Optional[date] = None,
+        partition: Optional[int] = None,
+        partitions: Optional[int] = None,
+    ) -> List[Tuple[int, float, float]]:
+        """
+        Get (id, balance, accrued_interest) of active, funded accounts in an ID range.
+        
+        Columns are selected directly so no ORM objects are built.
+        
+        Args:
+            db: Database session
+            account_type: Account type
+            start_id: First account ID (inclusive)
+            end_id: Last account ID (exclusive)
+            accrual_date: Skip accounts whose interest was already accrued for this date
+            partition: Only accounts whose transactions go to this partition
+            partitions: Number of transactions partitions, required with partition
+            
+        Returns:
+            List of (id, balance, accrued_interest) tuples ordered by ID
+        """
+        query = db.query(Account.id, Account.balance, Account.accrued_interest)\
+            .filter(
+                Account.id >= start_id,
+                Account.id < end_id,
+                Account.account_type == account_type,
+                Account.is_active == True,  # noqa: E712
+                Account.balance > 0,
+            )
+        if accrual_date is not None:
+            query = query.filter(or_(
+                Account.interest_accrued_on.is_(None),
+                Account.interest_accrued_on < accrual_date,
+            ))
+        if partition is not None:
+            query = query.filter(in_partition("transactions", Account.id, partitions, partition))
+        return query.order_by(Account.id).all()
+    
+    def get_inactive_accounts(
+        self,
+        db: Session,
+        *,
+        days_inactive: int = 180,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Account]:
         """
-        Get accounts that haven't had any activity for a specified number of days.
+        Get active accounts that haven't had any activity for a specified number of days.
+        
+        Uses the maintained last_activity_at column, so the cost does not
+        depend on the size of the transaction history.
         
         Args:
             db: Database session
             days_inactive: Number of days of inactivity
+            skip: Number of accounts to skip
+            limit: Maximum number of accounts to return
             
         Returns:
             List of inactive accounts
         """
-        from sqlalchemy import text
-        from datetime import datetime, timedelta
-        
         cutoff_date = datetime.now() - timedelta(days=days_inactive)
         
-        # This uses a subquery to find accounts with no transactions after the cutoff date
-        query = text("""
-            SELECT a.* FROM accounts a
-            LEFT JOIN (
-                SELECT account_id, MAX(created_at) as last_activity
-                FROM transactions
-                GROUP BY account_id
-            ) t ON a.id = t.account_id
-            WHERE t.last_activity IS NULL OR t.last_activity < :cutoff_date
-            AND a.is_active = TRUE
-        """)
-        
-        result = db.execute(query, {"cutoff_date": cutoff_date})
-        return [Account(**dict(row)) for row in result]
\ No newline at end of file
+        return db.query(Account)\
+            .filter(
+                Account.is_active == True,  # noqa: E712
+                Account.last_activity_at < cutoff_date,
+            )\
+            .order_by(Account.last_activity_at, Account.id)\
+            .offset(skip)\
+            .limit(limit)\
+            .all()
+    
+    def get_dormancy_candidates(
+        self,
+        db: Session,
+        *,
+        cutoff_date: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 1000,
+    ) -> List[Tuple[int, int, str, float, str, datetime]]:
+        """
+        Get the next chunk of active, unflagged accounts inactive since before a cutoff.
+        
+        Uses keyset pagination on (last_activity_at, id), which matches the
+        partial ix_accounts_dormancy index, so each chunk costs O(chunk size).
+        
+        Args:
+            db: Database session
+            cutoff_date: Accounts with last activity before this are dormant
+            after: (last_activity_at, id) of the last row of the previous chunk
+            limit: Maximum number of accounts to return
+            
+        Returns:
+            List of (id, user_id, account_number, balance, currency, last_activity_at) tuples
+        """
+        query = db.query(
+            Account.id,
+            Account.user_id,
+            Account.account_number,
+            Account.balance,
+            Account.currency,
+            Account.last_activity_at,
+        ).filter(
+            Account.is_active == True,  # noqa: E712
+            Account.dormant_since.is_(None),
+            Account.last_activity_at < cutoff_date,
+        )
+        
+        if after is not None:
+            query = query.filter(tuple_(Account.last_activity_at, Account.id) > tuple_(*after))
+        
+        return query.order_by(Account.last_activity_at, Account.id).limit(limit).all()
+    
+    def soft_delete_user_accounts(self, db: Session, *, user_id: int) -> int:
+        """
+        Mark all accounts of a user deleted and inactive in one UPDATE.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            
+        Returns:
+            Number of updated accounts
+        """
+        statement = update(Account)\
+            .where(Account.user_id == user_id, Account.deleted_at.is_(None))\
+            .values({Account.deleted_at: func.now(), Account.is_active: False, Account.version: Account.version + 1})\
+            .returning(Account.id)\
+            .execution_options(synchronize_session=False)
+        account_ids = db.execute(statement).scalars().all()
+        invalidate_on_commit(db, account_ids)
+        return len(account_ids)
+    
+    def get_deleted(self, db: Session, *, deleted_before: datetime, limit: int) -> List[Tuple[int, str]]:
+        """
+        Get accounts soft-deleted before a time.
+        
+        Args:
+            db: Database session
+            deleted_before: Upper bound on the deletion time
+            limit: Maximum number of accounts to return
+            
+        Returns:
+            List of (id, account_number) tuples, oldest deletion first
+        """
+        return db.query(Account.id, Account.account_number)\
+            .filter(Account.deleted_at < deleted_before)\
+            .order_by(Account.deleted_at)\
+            .limit(limit)\
+            .all()
+    
+    def purge(self, db: Session, *, account_id: int) -> int:
+        """
+        Delete an account row without loading it or its children.
+        
+        Its transactions must have been deleted first.
+        
+        Args:
+            db: Database session
+            account_id: Account ID
+            
+        Returns:
+            Number of deleted accounts
+        """
+        invalidate_on_commit(db, [account_id])
+        return db.query(Account).filter(Account.id == account_id).delete(synchronize_session=False)
+    
+    def mark_dormant(
+        self,
+        db: Session,
+        *,
+        account_ids: List[int],
+        deactivate: bool = False,
+    ) -> int:
+        """
+        Flag accounts as dormant, optionally deactivating them, in one UPDATE.
+        
+        Args:
+            db: Database session
+            account_ids: Account IDs
+            deactivate: Also set is_active to False
+            
+        Returns:
+            Number of updated accounts
+        """
+        if not account_ids:
+            return 0
+        
+        values = {Account.dormant_since: func.now(), Account.version: Account.version + 1}
+        if deactivate:
+            values[Account.is_active] = False
+        
+        invalidate_on_commit(db, account_ids)
+        return db.query(Account)\
+            .filter(Account.id.in_(account_ids), Account.dormant_since.is_(None))\
+            .update(values, synchronize_session=False)
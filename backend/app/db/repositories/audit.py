@@ -2,7 +2,7 @@
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from sqlalchemy import desc
+from sqlalchemy import desc, text
 from sqlalchemy.orm import Session
 
 from app.db.models.audit import AuditLog, AuditAction
@@ -185,4 +185,29 @@ class AuditLogRepository(BaseRepository[AuditLog, None, None]):
         # Order by creation date, newest first
         query = query.order_by(desc(AuditLog.created_at))
         
-        return query.offset(skip).limit(limit).all()
\ No newline at end of file
+        return query.offset(skip).limit(limit).all()
+    
+    def clear_user(self, db: Session, *, user_id: int, chunk_size: int) -> int:
+        """
+        Detach a purged user from its audit logs, committing every chunk.
+        
+        The logs themselves are retained.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            chunk_size: Rows updated per statement
+            
+        Returns:
+            Number of updated logs
+        """
+        updated = 0
+        while True:
+            count = db.execute(text("""
+                UPDATE audit_logs SET user_id = NULL
+                WHERE id IN (SELECT id FROM audit_logs WHERE user_id = :user_id LIMIT :chunk_size)
+            """), {"user_id": user_id, "chunk_size": chunk_size}).rowcount
+            db.commit()
+            updated += count
+            if count < chunk_size:
+                return updated
@@ -6,6 +6,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..base import BaseModel as DBBaseModel
+from ..unit_of_work import current_unit_of_work
 
 # Define generic types for ORM model and schema
 ModelType = TypeVar("ModelType", bound=DBBaseModel)
@@ -34,6 +35,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Get a record by ID.
         
+        Inside a unit of work the record is loaded once per request and
+        shared by every later get.
+        
         Args:
             db: Database session
             id: Record ID
@@ -41,6 +45,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             Record if found, None otherwise
         """
+        unit_of_work = current_unit_of_work(db)
+        if unit_of_work is not None:
+            return unit_of_work.get(self.model, id)
         return db.query(self.model).filter(self.model.id == id).first()
     
     def get_by(self, db: Session, **kwargs) -> Optional[ModelType]:
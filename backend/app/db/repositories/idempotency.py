@@ -0,0 +1,139 @@
+# backend/app/db/repositories/idempotency.py
+from typing import Any, Optional
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.idempotency import IdempotencyKey
+from .base import BaseRepository
+
+
+class IdempotencyKeyRepository(BaseRepository[IdempotencyKey, None, None]):
+    """Repository for IdempotencyKey model operations."""
+
+    def __init__(self):
+        super().__init__(IdempotencyKey)
+
+    def get_by_key(self, db: Session, *, user_id: int, key: str) -> Optional[IdempotencyKey]:
+        """
+        Get a stored idempotency key for a user.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            key: Client-supplied idempotency key
+
+        Returns:
+            IdempotencyKey if found, None otherwise
+        """
+        return db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+        ).first()
+
+    def claim(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        key: str,
+        request_method: str,
+        request_path: str,
+        request_hash: str,
+        expires_at: datetime,
+    ) -> Optional[IdempotencyKey]:
+        """
+        Claim an idempotency key inside the current transaction.
+
+        The insert uses ON CONFLICT DO NOTHING, so a concurrent request that
+        already claimed the same key in an uncommitted transaction makes this
+        call wait until that transaction commits or rolls back.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            key: Client-supplied idempotency key
+            request_method: HTTP method
+            request_path: Request path
+            request_hash: Hash of the request method, path and body
+            expires_at: Expiry timestamp
+
+        Returns:
+            Claimed record, or None if the key was already stored
+        """
+        now = datetime.utcnow()
+        statement = insert(IdempotencyKey).values(
+            user_id=user_id,
+            key=key,
+            request_method=request_method,
+            request_path=request_path,
+            request_hash=request_hash,
+            expires_at=expires_at,
+            created_at=now,
+            updated_at=now,
+        ).on_conflict_do_nothing(
+            constraint="uq_idempotency_keys_user_id_key",
+        ).returning(IdempotencyKey.id)
+
+        claimed_id = db.execute(statement).scalar()
+        if claimed_id is None:
+            return None
+        return db.query(IdempotencyKey).get(claimed_id)
+
+    def save_response(
+        self,
+        db: Session,
+        *,
+        db_obj: IdempotencyKey,
+        status_code: int,
+        body: Any,
+    ) -> IdempotencyKey:
+        """
+        Store the response for a claimed idempotency key.
+
+        Args:
+            db: Database session
+            db_obj: Claimed record
+            status_code: HTTP status code
+            body: JSON-serializable response body
+
+        Returns:
+            Updated record
+        """
+        return self.update(
+            db,
+            db_obj=db_obj,
+            obj_in={"response_status_code": status_code, "response_body": body},
+        )
+
+    def purge_expired(self, db: Session, *, now: datetime = None) -> int:
+        """
+        Delete expired idempotency keys.
+
+        Args:
+            db: Database session
+            now: Reference time, defaults to the current UTC time
+
+        Returns:
+            Number of deleted records
+        """
+        now = now or datetime.utcnow()
+        return db.query(IdempotencyKey)\
+            .filter(IdempotencyKey.expires_at < now)\
+            .delete(synchronize_session=False)
+
+    def delete_user_keys(self, db: Session, *, user_id: int) -> int:
+        """
+        Delete the idempotency keys of a purged user.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            Number of deleted records
+        """
+        return db.query(IdempotencyKey)\
+            .filter(IdempotencyKey.user_id == user_id)\
+            .delete(synchronize_session=False)
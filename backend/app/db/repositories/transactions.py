@@ -1,14 +1,34 @@
 # backend/app/db/repositories/transactions.py
-from typing import List, Optional, Tuple
-from datetime import datetime, timedelta
+from collections import Counter
+from typing import Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy import event, func, desc, and_, or_, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from app.core.metrics import TRANSACTIONS_POSTED
+from app.db.account_cache import invalidate_on_commit
+from app.db.archive import transaction_archive
 from app.db.models.transaction import Transaction, TransactionType, TransactionStatus
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
 from .base import BaseRepository
 
+# Session.info key of the postings counted in TRANSACTIONS_POSTED once the session commits
+POSTED_KEY = "transactions_posted"
+
+def _count_posted(db: Session, transaction_type: TransactionType, count: int = 1) -> None:
+    db.info.setdefault(POSTED_KEY, Counter())[transaction_type.value] += count
+
+@event.listens_for(Session, "after_commit")
+def _publish_posted(session: Session) -> None:
+    for transaction_type, count in session.info.pop(POSTED_KEY, Counter()).items():
+        TRANSACTIONS_POSTED.labels(transaction_type).inc(count)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_posted(session: Session) -> None:
+    session.info.pop(POSTED_KEY, None)
+
 
 class TransactionRepository(BaseRepository[Transaction, TransactionCreate, TransactionUpdate]):
     """Repository for Transaction model operations."""
@@ -16,18 +36,31 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
     def __init__(self):
         super().__init__(Transaction)
     
-    def get_by_reference_id(self, db: Session, *, reference_id: str) -> Optional[Transaction]:
+    def get_by_reference_id(
+        self,
+        db: Session,
+        *,
+        reference_id: str,
+        account_id: Optional[int] = None,
+    ) -> Optional[Transaction]:
         """
         Get a transaction by reference ID.
         
+        Without account_id every partition of the transactions table is
+        searched; with it only the account's partition is.
+        
         Args:
             db: Database session
             reference_id: Transaction reference ID
+            account_id: Account the transaction belongs to, if known
             
         Returns:
             Transaction if found, None otherwise
         """
-        return db.query(Transaction).filter(Transaction.reference_id == reference_id).first()
+        query = db.query(Transaction).filter(Transaction.reference_id == reference_id)
+        if account_id is not None:
+            query = query.filter(Transaction.account_id == account_id)
+        return query.first()
     
     def get_account_transactions(
         self,
@@ -46,6 +79,9 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
         """
         Get transactions for a specific account with optional filtering.
         
+        Transactions of archived months are read from the segment files
+        after the newer ones in the table.
+        
         Args:
             db: Database session
             account_id: Account ID
@@ -82,10 +118,19 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
         if max_amount is not None:
             query = query.filter(Transaction.amount <= max_amount)
         
-        # Order by creation date, newest first
-        query = query.order_by(desc(Transaction.created_at))
-        
-        return query.offset(skip).limit(limit).all()
+        return self._with_archived(
+            db,
+            query,
+            account_ids=[account_id],
+            skip=skip,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            transaction_type=transaction_type,
+            status=status,
+            min_amount=min_amount,
+            max_amount=max_amount,
+        )
     
     def get_user_transactions(
         self,
@@ -102,6 +147,9 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
         """
         Get transactions for all accounts of a specific user.
         
+        Transactions of archived months are read from the segment files
+        after the newer ones in the table.
+        
         Args:
             db: Database session
             user_id: User ID
@@ -134,17 +182,263 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
         if status:
             query = query.filter(Transaction.status == status)
         
+        account_ids = []
+        if transaction_archive.boundary(db) is not None:
+            account_ids = [account_id for (account_id,) in db.query(Account.id).filter(Account.user_id == user_id)]
+        return self._with_archived(
+            db,
+            query,
+            account_ids=account_ids,
+            skip=skip,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            transaction_type=transaction_type,
+            status=status,
+        )
+    
+    def _with_archived(
+        self,
+        db: Session,
+        query,
+        *,
+        account_ids: List[int],
+        skip: int,
+        limit: int,
+        **filters,
+    ) -> List[Transaction]:
+        """
+        Page through a history query followed by the archived transactions of its accounts.
+        
+        Archived months are older than every row left in the table, so
+        the archive continues the newest-first order where the table ends.
+        
+        Args:
+            db: Database session
+            query: Filtered transactions query, without ordering
+            account_ids: Accounts the query is restricted to
+            skip: Number of transactions to skip
+            limit: Maximum number of transactions to return
+            **filters: The query's filters, applied to the archive
+            
+        Returns:
+            List of transactions, newest first
+        """
+        boundary = transaction_archive.boundary(db)
+        if boundary is not None:
+            # Rows of served months may not be deleted yet
+            query = query.filter(Transaction.created_at >= boundary)
+        
         # Order by creation date, newest first
-        query = query.order_by(desc(Transaction.created_at))
+        transactions = query.order_by(desc(Transaction.created_at)).offset(skip).limit(limit).all()
+        start_date = filters.get("start_date")
+        if boundary is None or len(transactions) == limit or (start_date is not None and start_date >= boundary):
+            return transactions
+        
+        # Rows of the table skipped before the archive starts
+        in_table = skip + len(transactions) if transactions or not skip else query.order_by(None).count()
+        return transactions + transaction_archive.get_transactions(
+            db,
+            account_ids=account_ids,
+            skip=max(0, skip - in_table),
+            limit=limit - len(transactions),
+            **filters,
+        )
+    
+    def count_account_transactions(self, db: Session, *, account_id: int) -> int:
+        """
+        Count the transactions of an account, archived ones included.
+        
+        Args:
+            db: Database session
+            account_id: Account ID
+            
+        Returns:
+            Number of transactions
+        """
+        query = db.query(Transaction).filter(Transaction.account_id == account_id)
+        boundary = transaction_archive.boundary(db)
+        if boundary is None:
+            return query.count()
+        return query.filter(Transaction.created_at >= boundary).count() + \
+            transaction_archive.count(db, account_ids=[account_id])
+    
+    def get_oldest_created_at(self, db: Session) -> Optional[datetime]:
+        """
+        Get the creation time of the oldest transaction in the table.
         
-        return query.offset(skip).limit(limit).all()
+        Args:
+            db: Database session
+            
+        Returns:
+            Oldest creation time, None if the table is empty
+        """
+        return db.query(func.min(Transaction.created_at)).scalar()
     
-    def generate_reference_id(self, db: Session) -> str:
+    def count_pending_created_between(self, db: Session, *, start: datetime, end: datetime) -> int:
+        """
+        Count PENDING transactions created in [start, end).
+        
+        Args:
+            db: Database session
+            start: First creation time (inclusive)
+            end: Last creation time (exclusive)
+            
+        Returns:
+            Number of pending transactions
+        """
+        return db.query(Transaction)\
+            .filter(
+                Transaction.created_at >= start,
+                Transaction.created_at < end,
+                Transaction.status == TransactionStatus.PENDING,
+            )\
+            .count()
+    
+    def stream_created_between(self, db: Session, *, start: datetime, end: datetime) -> Iterator[Mapping]:
+        """
+        Stream the transactions created in [start, end) as column mappings.
+        
+        Rows are read through a server-side cursor, ordered by account_id,
+        created_at and id as the archive segments store them.
+        
+        Args:
+            db: Database session
+            start: First creation time (inclusive)
+            end: Last creation time (exclusive)
+            
+        Yields:
+            Column values of each transaction
+        """
+        table = Transaction.__table__
+        result = db.execute(
+            table.select()
+            .where(table.c.created_at >= start, table.c.created_at < end)
+            .order_by(table.c.account_id, table.c.created_at, table.c.id)
+            .execution_options(stream_results=True)
+        )
+        for row in result:
+            yield row._mapping
+    
+    def delete_created_between(self, db: Session, *, start: datetime, end: datetime, chunk_size: int) -> int:
+        """
+        Delete the transactions created in [start, end), committing every chunk.
+        
+        Args:
+            db: Database session
+            start: First creation time (inclusive)
+            end: Last creation time (exclusive)
+            chunk_size: Rows deleted per statement
+            
+        Returns:
+            Number of deleted transactions
+        """
+        deleted = 0
+        while True:
+            count = db.execute(text("""
+                DELETE FROM transactions
+                WHERE id IN (
+                    SELECT id FROM transactions
+                    WHERE created_at >= :start AND created_at < :end
+                    LIMIT :chunk_size
+                )
+            """), {"start": start, "end": end, "chunk_size": chunk_size}).rowcount
+            db.commit()
+            deleted += count
+            if count < chunk_size:
+                return deleted
+    
+    def delete_account_transactions(self, db: Session, *, account_id: int, chunk_size: int) -> int:
+        """
+        Delete the transactions of an account, committing every chunk.
+        
+        Only the account's partition is read, and no rows are loaded.
+        
+        Args:
+            db: Database session
+            account_id: Account ID
+            chunk_size: Rows deleted per statement
+            
+        Returns:
+            Number of deleted transactions
+        """
+        deleted = 0
+        while True:
+            count = db.execute(text("""
+                DELETE FROM transactions
+                WHERE account_id = :account_id AND id IN (
+                    SELECT id FROM transactions WHERE account_id = :account_id LIMIT :chunk_size
+                )
+            """), {"account_id": account_id, "chunk_size": chunk_size}).rowcount
+            db.commit()
+            deleted += count
+            if count < chunk_size:
+                return deleted
+    
+    def clear_recipient(self, db: Session, *, account_id: int, chunk_size: int) -> int:
+        """
+        Unlink a purged account from the transfers other accounts sent to it, committing every chunk.
+        
+        Args:
+            db: Database session
+            account_id: Purged account ID
+            chunk_size: Rows updated per statement
+            
+        Returns:
+            Number of updated transactions
+        """
+        updated = 0
+        while True:
+            count = db.execute(text("""
+                UPDATE transactions SET recipient_account_id = NULL
+                WHERE (id, account_id) IN (
+                    SELECT id, account_id FROM transactions
+                    WHERE recipient_account_id = :account_id LIMIT :chunk_size
+                )
+            """), {"account_id": account_id, "chunk_size": chunk_size}).rowcount
+            db.commit()
+            updated += count
+            if count < chunk_size:
+                return updated
+    
+    def get_pending_transfers(
+        self,
+        db: Session,
+        *,
+        created_before: datetime,
+        limit: int = 1000,
+    ) -> List[Transaction]:
+        """
+        Get transfers still PENDING that were created before a time.
+        
+        Args:
+            db: Database session
+            created_before: Upper bound on the creation time
+            limit: Maximum number of transfers to return
+            
+        Returns:
+            List of transfers, oldest first
+        """
+        return db.query(Transaction)\
+            .filter(
+                Transaction.transaction_type == TransactionType.TRANSFER,
+                Transaction.status == TransactionStatus.PENDING,
+                Transaction.created_at < created_before,
+            )\
+            .order_by(Transaction.created_at)\
+            .limit(limit)\
+            .all()
+    
+    def generate_reference_id(self, db: Session, account_id: Optional[int] = None) -> str:
         """
         Generate a unique transaction reference ID.
         
+        Reference IDs are unique per account, so the check for collisions
+        only reads the partition of account_id when it is given.
+        
         Args:
             db: Database session
+            account_id: Account the transaction will belong to
             
         Returns:
             Unique reference ID
@@ -159,7 +453,7 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
         reference_id = f"TXN-{timestamp}-{random_part}"
         
         # Check if the reference ID already exists
-        while self.get_by_reference_id(db, reference_id=reference_id):
+        while self.get_by_reference_id(db, reference_id=reference_id, account_id=account_id):
             random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
             reference_id = f"TXN-{timestamp}-{random_part}"
             
@@ -184,7 +478,7 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
             Created transaction
         """
         if not reference_id:
-            reference_id = self.generate_reference_id(db)
+            reference_id = self.generate_reference_id(db, obj_in.account_id)
             
         create_data = obj_in.dict()
         db_obj = Transaction(
@@ -193,8 +487,237 @@ class TransactionRepository(BaseRepository[Transaction, TransactionCreate, Trans
         )
         db.add(db_obj)
         db.flush()
+        _count_posted(db, db_obj.transaction_type)
         return db_obj
     
+    def bulk_create(self, db: Session, *, rows: List[dict]) -> Set[Tuple[str, int]]:
+        """
+        Insert many transactions with a single multi-row INSERT.
+        
+        Unlike create_with_reference_id, no ORM objects are built and each
+        row must already carry its reference_id. Rows whose reference ID
+        already exists for their account are skipped by ON CONFLICT, so
+        inserting the same rows again inserts nothing.
+        
+        Args:
+            db: Database session
+            rows: Column values for each transaction
+            
+        Returns:
+            (reference_id, account_id) of the rows actually inserted
+        """
+        if not rows:
+            return set()
+        table = Transaction.__table__
+        statement = insert(table).values(rows)\
+            .on_conflict_do_nothing(index_elements=[table.c.reference_id, table.c.account_id])\
+            .returning(table.c.reference_id, table.c.account_id, table.c.transaction_type)
+        inserted = db.execute(statement).all()
+        for transaction_type, count in Counter(row.transaction_type for row in inserted).items():
+            _count_posted(db, transaction_type, count)
+        return {(row.reference_id, row.account_id) for row in inserted}
+    
+    def get_existing_reference_ids(
+        self,
+        db: Session,
+        *,
+        account_ids: Iterable[int],
+        reference_ids: Iterable[str],
+    ) -> Set[Tuple[str, int]]:
+        """
+        Find which of a set of reference IDs were already posted, in a single query.
+        
+        Args:
+            db: Database session
+            account_ids: Accounts the transactions belong to, so only their partitions are searched
+            reference_ids: Reference IDs to look for
+            
+        Returns:
+            (reference_id, account_id) of the existing transactions
+        """
+        return set(
+            db.query(Transaction.reference_id, Transaction.account_id)
+            .filter(Transaction.account_id.in_(list(account_ids)), Transaction.reference_id.in_(list(reference_ids)))
+            .all()
+        )
+    
+    def post_interest_accruals(
+        self,
+        db: Session,
+        *,
+        accrual_date: date,
+        account_ids: List[int],
+        amounts: List[float],
+        carries: List[float],
+    ) -> Tuple[int, float]:
+        """
+        Post interest accruals with one set-based statement.
+        
+        Transactions are created with INSERT ... SELECT from the unnested
+        arrays, for the accounts with a whole cent to post. Every account's
+        balance is credited, its interest below a cent is carried and its
+        accrual date is stamped with one UPDATE ... FROM the accrual. Accounts
+        already stamped with the accrual date are skipped, so a rerun for the
+        same date posts nothing and does not carry twice; the reference ID is
+        derived from the accrual date and account as well, so ON CONFLICT
+        skips accruals posted by a run that predates the stamp.
+        
+        Args:
+            db: Database session
+            accrual_date: Accrual date
+            account_ids: Account IDs
+            amounts: Amount to post for each account, in whole cents
+            carries: Interest below a cent to carry for each account
+            
+        Returns:
+            Tuple of (number of accruals posted, total amount posted)
+        """
+        if not account_ids:
+            return 0, 0.0
+        
+        statement = text("""
+            WITH accrual AS (
+                SELECT accrual.*, a.currency FROM unnest(
+                    CAST(:account_ids AS integer[]),
+                    CAST(:amounts AS double precision[]),
+                    CAST(:carries AS double precision[])
+                ) AS accrual(account_id, amount, carry)
+                JOIN accounts a ON a.id = accrual.account_id
+                WHERE a.interest_accrued_on IS NULL OR a.interest_accrued_on < :accrual_date
+            ),
+            posted AS (
+                INSERT INTO transactions (
+                    transaction_type, amount, currency, description, reference_id,
+                    status, account_id, created_at, updated_at
+                )
+                SELECT
+                    CAST('INTEREST' AS transactiontype), accrual.amount, accrual.currency, :description,
+                    'INT-' || :date_tag || '-' || accrual.account_id,
+                    CAST('COMPLETED' AS transactionstatus), accrual.account_id, now(), now()
+                FROM accrual
+                WHERE accrual.amount > 0
+                ON CONFLICT (reference_id, account_id) DO NOTHING
+                RETURNING account_id, amount
+            ),
+            accrued AS (
+                UPDATE accounts
+                SET balance = accounts.balance + coalesce(posted.amount, 0),
+                    accrued_interest = accrual.carry,
+                    interest_accrued_on = :accrual_date,
+                    version = accounts.version + 1,
+                    updated_at = now()
+                FROM accrual LEFT JOIN posted ON posted.account_id = accrual.account_id
+                WHERE accounts.id = accrual.account_id
+                    AND (accounts.interest_accrued_on IS NULL OR accounts.interest_accrued_on < :accrual_date)
+                RETURNING posted.amount
+            )
+            SELECT count(amount), coalesce(sum(amount), 0) FROM accrued
+        """)
+        
+        count, total = db.execute(statement, {
+            "account_ids": account_ids,
+            "amounts": amounts,
+            "carries": carries,
+            "accrual_date": accrual_date,
+            "description": f"Interest accrual for {accrual_date.isoformat()}",
+            "date_tag": accrual_date.strftime("%Y%m%d"),
+        }).first()
+        invalidate_on_commit(db, account_ids)
+        _count_posted(db, TransactionType.INTEREST, count)
+        return count, float(total)
+    
+    def post_periodic_fees(
+        self,
+        db: Session,
+        *,
+        account_type: str,
+        amount: float,
+        balance_below: Optional[float],
+        reference_prefix: str,
+        description: str,
+        start_id: int,
+        end_id: int,
+        partition: Optional[int] = None,
+        partitions: Optional[int] = None,
+    ) -> Tuple[int, float]:
+        """
+        Charge a flat fee to every matching account in an ID range with one statement.
+        
+        Matching accounts are locked, fee transactions are created with
+        INSERT ... SELECT and balances are debited with UPDATE ... FROM the
+        inserted rows. The fee is capped at the current balance so no account
+        goes negative. Reference IDs are '<reference_prefix>-<account_id>', so
+        accounts already charged for the period are skipped by ON CONFLICT.
+        
+        Args:
+            db: Database session
+            account_type: AccountType member name
+            amount: Fee amount
+            balance_below: Only charge accounts whose balance is below this, None for all
+            reference_prefix: Reference ID prefix identifying the fee and period
+            description: Transaction description
+            start_id: First account ID (inclusive)
+            end_id: Last account ID (exclusive)
+            partition: Only accounts whose transactions go to this partition
+            partitions: Number of transactions partitions, required with partition
+            
+        Returns:
+            Tuple of (number of fees posted, total amount posted)
+        """
+        partition_filter = (
+            "AND satisfies_hash_partition('transactions'::regclass, :partitions, :partition, id)"
+            if partition is not None else ""
+        )
+        statement = text(f"""
+            WITH due AS (
+                SELECT id AS account_id, currency, LEAST(CAST(:amount AS double precision), balance) AS amount
+                FROM accounts
+                WHERE id >= :start_id AND id < :end_id
+                  AND account_type = CAST(:account_type AS accounttype)
+                  AND is_active
+                  AND balance > 0
+                  AND (CAST(:balance_below AS double precision) IS NULL OR balance < :balance_below)
+                  {partition_filter}
+                FOR UPDATE
+            ),
+            posted AS (
+                INSERT INTO transactions (
+                    transaction_type, amount, currency, description, reference_id,
+                    status, account_id, created_at, updated_at
+                )
+                SELECT
+                    CAST('FEE' AS transactiontype), due.amount, due.currency, :description,
+                    :reference_prefix || '-' || due.account_id,
+                    CAST('COMPLETED' AS transactionstatus), due.account_id, now(), now()
+                FROM due
+                ON CONFLICT (reference_id, account_id) DO NOTHING
+                RETURNING account_id, amount
+            ),
+            debited AS (
+                UPDATE accounts
+                SET balance = accounts.balance - posted.amount, version = accounts.version + 1, updated_at = now()
+                FROM posted
+                WHERE accounts.id = posted.account_id
+                RETURNING posted.account_id, posted.amount
+            )
+            SELECT count(*), coalesce(sum(amount), 0), coalesce(array_agg(account_id), '{{}}') FROM debited
+        """)
+        
+        count, total, debited_ids = db.execute(statement, {
+            "account_type": account_type,
+            "amount": amount,
+            "balance_below": balance_below,
+            "reference_prefix": reference_prefix,
+            "description": description,
+            "start_id": start_id,
+            "end_id": end_id,
+            "partition": partition,
+            "partitions": partitions,
+        }).first()
+        invalidate_on_commit(db, debited_ids)
+        _count_posted(db, TransactionType.FEE, count)
+        return count, float(total)
+    
     def get_transaction_stats(
         self,
         db: Session,
@@ -1,5 +1,6 @@
 # backend/app/db/repositories/users.py
 from typing import List, Optional
+from datetime import datetime
 
 from sqlalchemy.orm import Session
 
@@ -131,7 +132,7 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         Returns:
             List of users
         """
-        query = db.query(User)
+        query = db.query(User).filter(User.deleted_at.is_(None))
         
         # Apply filters
         if search:
@@ -158,4 +159,38 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
             # Default sort by id
             query = query.order_by(User.id)
         
-        return query.offset(skip).limit(limit).all()
\ No newline at end of file
+        return query.offset(skip).limit(limit).all()
+    
+    def get_deleted_ids(self, db: Session, *, deleted_before: datetime, limit: int) -> List[int]:
+        """
+        Get the IDs of users soft-deleted before a time.
+        
+        Args:
+            db: Database session
+            deleted_before: Upper bound on the deletion time
+            limit: Maximum number of users to return
+            
+        Returns:
+            List of user IDs, oldest deletion first
+        """
+        rows = db.query(User.id)\
+            .filter(User.deleted_at < deleted_before)\
+            .order_by(User.deleted_at)\
+            .limit(limit)\
+            .all()
+        return [user_id for (user_id,) in rows]
+    
+    def purge(self, db: Session, *, user_id: int) -> int:
+        """
+        Delete a user row without loading it or its accounts.
+        
+        Its accounts must have been purged first.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            
+        Returns:
+            Number of deleted users
+        """
+        return db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
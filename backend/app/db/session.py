@@ -1,12 +1,23 @@
 # backend/app/db/session.py
-from typing import Any, Generator
+import time
+from typing import Any, Generator, List, Optional
 
-from sqlalchemy import create_engine
+from fastapi import Depends
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 
 from app.config.settings import settings
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+)
+from app.db import deadlines, query_stats, slow_queries
+from app.db.sharding import ShardedSession, ShardRouter, create_shard_engines, prepare_shard
+from app.db.unit_of_work import UnitOfWork
 
 # Construct database URL based on configuration
 SQLALCHEMY_DATABASE_URL = (
@@ -14,10 +25,20 @@ SQLALCHEMY_DATABASE_URL = (
     f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
 )
 
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start_time)
+
 # Configure the SQLAlchemy engine with connection pooling
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    poolclass=QueuePool,
+    poolclass=InstrumentedQueuePool,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_timeout=settings.DB_POOL_TIMEOUT,
@@ -26,14 +47,79 @@ engine = create_engine(
     echo=settings.DB_ECHO_SQL,  # Log generated SQL (useful for debugging)
 )
 
-# Create a session factory configured with the engine
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-    expire_on_commit=False,
+# Pool gauges, refreshed whenever a connection changes hands
+DB_POOL_SIZE.set(settings.DB_POOL_SIZE)
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_POOL_CHECKED_OUT.set(engine.pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(0, engine.pool.overflow()))
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    # Fired before the connection is returned to the pool
+    DB_POOL_CHECKED_OUT.set(max(0, engine.pool.checkedout() - 1))
+    DB_POOL_OVERFLOW.set(max(0, engine.pool.overflow()))
+
+# Per-request query count and DB time
+query_stats.instrument_engine(engine)
+
+# Request deadlines and cancellation
+if settings.REQUEST_DEADLINES_ENABLED:
+    deadlines.instrument_engine(engine)
+
+# Slow query log
+if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+    slow_queries.instrument_engine(engine, slow_queries.slow_query_log)
+
+# Shards for user-owned rows; without SHARD_DATABASES everything stays on the engine
+shard_router = ShardRouter(
+    engine,
+    create_shard_engines(),
+    vnodes=settings.SHARD_VIRTUAL_NODES,
+    cache_size=settings.SHARD_DIRECTORY_CACHE_SIZE,
+    placement_ttl=settings.SHARD_PLACEMENT_TTL_SECONDS,
 )
 
+# Create a session factory configured with the engine
+if shard_router.shards:
+    SessionLocal = sessionmaker(
+        class_=ShardedSession,
+        router=shard_router,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    SessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        expire_on_commit=False,
+    )
+
+def shard_names() -> List[Optional[str]]:
+    """Get the shards batch jobs run over, [None] without sharding."""
+    return list(shard_router.shards) or [None]
+
+def shard_session(shard: Optional[str]) -> Session:
+    """
+    Create a session pinned to one shard, for batch jobs and cross-shard steps.
+
+    Args:
+        shard: Shard name, None without sharding
+
+    Returns:
+        Session whose user-owned rows all go to the shard
+    """
+    return SessionLocal(info={"shard": shard}) if shard else SessionLocal()
+
+def dispose_engines() -> None:
+    """Drop pooled connections of the engine and every shard, e.g. in a forked worker."""
+    engine.dispose()
+    for shard_engine in shard_router.shards.values():
+        shard_engine.dispose()
+
 # Function to get a database session
 def get_db() -> Generator[Session, None, None]:
     """
@@ -80,6 +166,33 @@ def get_transactional_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+# Function to get the unit of work of a mutating request
+def get_unit_of_work(db: Session = Depends(get_db)) -> Generator[UnitOfWork, None, None]:
+    """
+    FastAPI dependency that provides the request's unit of work.
+    
+    It wraps the same session as get_db, which get_current_user also uses,
+    so the current user is part of it. The route commits explicitly once
+    its writes are done: the exit code of a dependency runs after the
+    response is sent, too late to report a failed commit. Whatever the
+    route leaves uncommitted, on error or otherwise, is rolled back.
+    
+    Usage:
+        @app.post("/accounts/")
+        async def create_account(account_in: AccountCreate, uow: UnitOfWork = Depends(get_unit_of_work)):
+            account = await AccountService.create(uow.db, obj_in=account_in, ...)
+            uow.commit()
+            return account
+    
+    Yields:
+        UnitOfWork: Unit of work over the request's session
+    """
+    unit_of_work = UnitOfWork(db)
+    try:
+        yield unit_of_work
+    finally:
+        unit_of_work.close()
+
 # Function to execute raw SQL queries
 def execute_raw_sql(query: str, params: dict = None) -> list[Any]:
     """
@@ -101,6 +214,9 @@ def create_all_tables() -> None:
     """Create all tables defined in models if they don't exist."""
     from .base import Base
     Base.metadata.create_all(bind=engine)
+    for index, shard_engine in enumerate(shard_router.shards.values()):
+        Base.metadata.create_all(bind=shard_engine)
+        prepare_shard(shard_engine, index)
 
 # Function to drop all tables (use with caution)
 def drop_all_tables() -> None:
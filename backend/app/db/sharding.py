@@ -0,0 +1,508 @@
+# backend/app/db/sharding.py
+import bisect
+import hashlib
+import logging
+import operator
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import create_engine, event, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext import horizontal_shard
+from sqlalchemy.sql import functions, operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, Label, UnaryExpression
+
+from app.config.settings import settings
+from app.core.exceptions import ShardUnavailable
+from app.db import deadlines, query_stats, slow_queries
+from app.db.context import current_user_id, current_user_is_superuser
+from app.db.models.shard_directory import AccountDirectory, UserShard
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger("banking-system")
+
+PRIMARY = "primary"
+
+# Tables whose rows live on the shard of the owning user; everything else,
+# including users and the directory, stays on the primary database
+SHARDED_TABLES = frozenset({"accounts", "transactions", "audit_logs", "idempotency_keys"})
+
+# Columns that identify the owner in WHERE clauses, used to pick shards for queries
+ACCOUNT_ID_COLUMNS = frozenset({("accounts", "id"), ("transactions", "account_id")})
+USER_ID_COLUMNS = frozenset({
+    ("accounts", "user_id"), ("audit_logs", "user_id"), ("idempotency_keys", "user_id"),
+})
+ACCOUNT_NUMBER_COLUMNS = frozenset({("accounts", "account_number")})
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys to shards.
+
+    Each shard owns vnodes points on the ring, so adding a shard moves
+    about 1/n of the keys, all of them to the new shard.
+    """
+
+    def __init__(self, shards: Iterable[str], vnodes: int):
+        points = sorted((_hash(f"{shard}#{vnode}"), shard) for shard in shards for vnode in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key) -> str:
+        """Get the shard owning a key."""
+        index = bisect.bisect(self._points, _hash(str(key))) % len(self._points)
+        return self._shards[index]
+
+def compared_values(clause, columns: frozenset) -> Optional[List]:
+    """
+    Get the values a WHERE clause compares some columns with.
+
+    Only equality and IN comparisons with bound values are understood.
+
+    Args:
+        clause: WHERE clause, or None
+        columns: (table, column) names to look for
+
+    Returns:
+        Compared values, None if no such comparison was found
+    """
+    if clause is None:
+        return None
+    values = None
+    for node in visitors.iterate(clause):
+        if not isinstance(node, BinaryExpression) or node.operator not in (operators.eq, operators.in_op):
+            continue
+        column, value = node.left, node.right
+        table = getattr(column, "table", None)
+        if table is None or (getattr(table, "name", None), getattr(column, "name", None)) not in columns:
+            continue
+        if not isinstance(value, BindParameter):
+            continue
+        found = value.effective_value
+        values = (values or []) + (list(found) if isinstance(found, (list, tuple)) else [found])
+    return values
+
+class ShardRouter:
+    """
+    Place users on shards and find the shard of an account.
+
+    New users are placed by consistent hashing on user_id and their
+    placement is recorded in user_shards, so adding a shard does not move
+    existing users until the rebalancer copies them. account_directory maps
+    account IDs and numbers to owners for lookups that do not start from
+    the current user. Placements are cached for SHARD_PLACEMENT_TTL_SECONDS;
+    account owners and numbers never change and are cached until evicted.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        shards: Dict[str, Engine],
+        *,
+        vnodes: int,
+        cache_size: int,
+        placement_ttl: float,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            primary: Engine of the database holding users and the directory
+            shards: Shard engines by name
+            vnodes: Points per shard on the hash ring
+            cache_size: Entries kept in each directory cache
+            placement_ttl: Seconds a user's placement is cached
+        """
+        self.primary = primary
+        self.shards = shards
+        self.ring = HashRing(sorted(shards), vnodes) if shards else None
+        self.placement_ttl = placement_ttl
+        self._placements: LRUCache = LRUCache(maxsize=cache_size)
+        self._account_owners: LRUCache = LRUCache(maxsize=cache_size)
+        self._account_numbers: LRUCache = LRUCache(maxsize=cache_size)
+
+    def placement(self, user_id: int) -> Tuple[str, bool]:
+        """
+        Get where a user's data is.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            (shard, whether the user is being moved)
+        """
+        cached = self._placements.get(user_id)
+        if cached is not None and cached[2] > time.monotonic():
+            return cached[0], cached[1]
+        with self.primary.connect() as conn:
+            row = conn.execute(
+                select(UserShard.shard, UserShard.moving).where(UserShard.user_id == user_id)
+            ).first()
+        shard, moving = (row.shard, row.moving) if row else (self.ring.shard_for(user_id), False)
+        self._placements.set(user_id, (shard, moving, time.monotonic() + self.placement_ttl))
+        return shard, moving
+
+    def shard_for_user(self, user_id: int) -> str:
+        """
+        Get the shard of a user.
+
+        Raises:
+            ShardUnavailable: If the user is being moved to another shard
+        """
+        shard, moving = self.placement(user_id)
+        if moving:
+            raise ShardUnavailable()
+        return shard
+
+    def forget_placement(self, user_id: int) -> None:
+        self._placements.pop(user_id)
+
+    def forget_placements(self) -> None:
+        self._placements.clear()
+
+    def account_owner(self, account_id: int) -> Optional[int]:
+        """Get the user owning an account from the directory."""
+        owner = self._account_owners.get(account_id)
+        if owner is None:
+            with self.primary.connect() as conn:
+                owner = conn.execute(
+                    select(AccountDirectory.user_id).where(AccountDirectory.account_id == account_id)
+                ).scalar()
+            if owner is not None:
+                self._account_owners.set(account_id, owner)
+        return owner
+
+    def account_id_for_number(self, account_number: str) -> Optional[int]:
+        """Get the ID of an account from its number."""
+        account_id = self._account_numbers.get(account_number)
+        if account_id is None:
+            with self.primary.connect() as conn:
+                row = conn.execute(
+                    select(AccountDirectory.account_id, AccountDirectory.user_id)
+                    .where(AccountDirectory.account_number == account_number)
+                ).first()
+            if row is not None:
+                account_id = row.account_id
+                self._account_numbers.set(account_number, account_id)
+                self._account_owners.set(account_id, row.user_id)
+        return account_id
+
+    def shard_for_account(self, account_id: int) -> Optional[str]:
+        """Get the shard of an account, None if it is not in the directory."""
+        owner = self.account_owner(account_id)
+        return self.shard_for_user(owner) if owner is not None else None
+
+    def register_user(self, db, user) -> None:
+        """Record the placement of a new user, so later ring changes do not move it."""
+        db.add(UserShard(user_id=user.id, shard=self.ring.shard_for(user.id)))
+
+    def register_account(self, db, account) -> None:
+        """Add a new account to the directory."""
+        db.add(AccountDirectory(
+            account_id=account.id, account_number=account.account_number, user_id=account.user_id,
+        ))
+        self._account_owners.set(account.id, account.user_id)
+        self._account_numbers.set(account.account_number, account.id)
+
+    def unregister_account(self, db, *, account_id: int, account_number: str) -> None:
+        """Remove a purged account from the directory."""
+        db.query(AccountDirectory)\
+            .filter(AccountDirectory.account_id == account_id)\
+            .delete(synchronize_session=False)
+        self._account_owners.pop(account_id)
+        self._account_numbers.pop(account_number)
+
+    def shards_for(self, clause) -> Optional[Set[str]]:
+        """
+        Get the shards a WHERE clause restricts a query to.
+
+        Returns:
+            Shards, None if the clause does not name an owner or an account
+            that is missing from the directory
+        """
+        shards = set()
+        user_ids = compared_values(clause, USER_ID_COLUMNS)
+        for user_id in user_ids or ():
+            shards.add(self.shard_for_user(user_id))
+        account_ids = compared_values(clause, ACCOUNT_ID_COLUMNS) or []
+        for account_number in compared_values(clause, ACCOUNT_NUMBER_COLUMNS) or ():
+            account_ids.append(self.account_id_for_number(account_number))
+        for account_id in account_ids:
+            shard = self.shard_for_account(account_id) if account_id is not None else None
+            if shard is None:
+                return None
+            shards.add(shard)
+        return shards or None
+
+class ShardedSession(horizontal_shard.ShardedSession):
+    """
+    Session spanning the primary database and the shards.
+
+    Rows of SHARDED_TABLES go to the shard of their owner; queries go to the
+    shards named by their WHERE clause, else to the shard of the current
+    user (every shard for superusers), else to every shard. Setting
+    info["shard"] pins a session to one shard, as the batch jobs and the
+    rebalancer do. Raw SQL goes to the pinned shard or the current user's
+    shard.
+
+    SELECTs spread over several shards are merged like one query: rows are
+    sorted by the ORDER BY and OFFSET/LIMIT is applied after the merge
+    (each shard returns up to OFFSET + LIMIT rows), and counts are summed.
+
+    Writes to several shards in one session are committed one after the
+    other, not atomically; money moving between shards goes through
+    TransactionService's cross-shard transfer saga instead.
+    """
+
+    def __init__(self, router: ShardRouter, **kwargs):
+        self.router = router
+        super().__init__(
+            shard_chooser=self._choose_shard,
+            id_chooser=self._choose_shards_for_id,
+            execute_chooser=self._choose_shards_for_execute,
+            shards={PRIMARY: router.primary, **router.shards},
+            **kwargs,
+        )
+        # Ahead of the fan-out listener added by horizontal_shard
+        event.listen(self, "do_orm_execute", self._merge_fan_out, retval=True, insert=True)
+
+    def _default_shards(self) -> List[str]:
+        if self.info.get("shard"):
+            return [self.info["shard"]]
+        user_id = current_user_id()
+        if user_id is not None:
+            return [self.router.shard_for_user(user_id)]
+        return sorted(self.router.shards)
+
+    def _read_shards(self) -> List[str]:
+        # Superusers read everyone's rows, so owner-less queries need every shard
+        if not self.info.get("shard") and current_user_is_superuser():
+            return sorted(self.router.shards)
+        return self._default_shards()
+
+    @staticmethod
+    def _is_sharded(mapper=None, clause=None) -> Optional[bool]:
+        if mapper is not None:
+            return mapper.local_table.name in SHARDED_TABLES
+        table = getattr(clause, "table", None)
+        if table is not None:
+            return table.name in SHARDED_TABLES
+        return None
+
+    def _choose_shard(self, mapper, instance, clause=None) -> str:
+        sharded = self._is_sharded(mapper, clause)
+        if sharded is False:
+            return PRIMARY
+        if sharded is None:
+            # Raw SQL
+            shards = self._default_shards()
+            return shards[0] if len(shards) == 1 else PRIMARY
+
+        if self.info.get("shard"):
+            return self.info["shard"]
+        if instance is not None:
+            if getattr(instance, "user_id", None) is not None:
+                return self.router.shard_for_user(instance.user_id)
+            if getattr(instance, "account_id", None) is not None:
+                shard = self.router.shard_for_account(instance.account_id)
+                if shard is not None:
+                    return shard
+            if mapper.local_table.name == "audit_logs":
+                # Audit rows without an owner, such as self-registration, stay global
+                return PRIMARY
+        shards = self._default_shards()
+        if len(shards) != 1:
+            raise RuntimeError(f"No shard for a {mapper.class_.__name__ if mapper else 'statement'}; pin the session")
+        return shards[0]
+
+    def _choose_shards_for_id(self, query, ident) -> List[str]:
+        mapper = inspect(query.column_descriptions[0]["entity"])
+        if not self._is_sharded(mapper):
+            return [PRIMARY]
+        if mapper.local_table.name == "accounts" and not self.info.get("shard"):
+            shard = self.router.shard_for_account(ident[0])
+            if shard is not None:
+                return [shard]
+        return self._read_shards()
+
+    def _choose_shards_for_execute(self, orm_context) -> List[str]:
+        mapper = orm_context.bind_mapper
+        if mapper is None:
+            return [self._choose_shard(None, None, clause=orm_context.statement)]
+        if not self._is_sharded(mapper):
+            return [PRIMARY]
+        if self.info.get("shard"):
+            return [self.info["shard"]]
+        shards = self.router.shards_for(getattr(orm_context.statement, "whereclause", None))
+        if shards:
+            return sorted(shards)
+        return self._read_shards() if orm_context.is_select else self._default_shards()
+
+    def _merge_fan_out(self, orm_context):
+        if not orm_context.is_select or orm_context.load_options._refresh_identity_token is not None:
+            return None
+        if "shard_id" in orm_context.bind_arguments or "_sa_shard_id" in orm_context.execution_options:
+            return None
+        statement = orm_context.statement
+        if len(self._choose_shards_for_execute(orm_context)) < 2:
+            return None
+
+        if _is_count(statement):
+            frozen = orm_context.invoke_statement().freeze()
+            return frozen.with_new_rows([[sum(row[0] for row in frozen.rewrite_rows())]])()
+
+        limit, offset = statement._limit, statement._offset
+        if not statement._order_by_clauses and limit is None and offset is None:
+            return None
+        if limit is not None:
+            statement = statement.offset(None).limit((offset or 0) + limit)
+        elif offset is not None:
+            statement = statement.offset(None)
+
+        # ORDER BY columns the rows don't carry are selected too, then dropped
+        descriptions = orm_context.statement.column_descriptions
+        keys, extra = [], []
+        for column, descending in _order_keys(orm_context.statement):
+            value = _row_value(descriptions, column)
+            if value is None:
+                value = operator.itemgetter(len(descriptions) + len(extra))
+                extra.append(column)
+            keys.append((value, descending))
+        if extra:
+            statement = statement.add_columns(*extra)
+        frozen = orm_context.invoke_statement(statement=statement).freeze()
+
+        rows = frozen.rewrite_rows()
+        for value, descending in reversed(keys):
+            rows.sort(key=lambda row: _sort_key(value(row)), reverse=descending)
+        start = offset or 0
+        result = frozen.with_new_rows(rows[start:start + limit] if limit is not None else rows[start:])()
+        if not extra:
+            return result
+        result = result.columns(*range(len(descriptions)))
+        # Query returns lone entities rather than rows, unless told otherwise
+        single_entity = len(descriptions) == 1 and _is_entity(descriptions[0]) \
+            and not orm_context.load_options._only_return_tuples
+        result._attributes = result._attributes.union({"is_single_entity": single_entity})
+        return result
+
+def _is_count(statement) -> bool:
+    """Whether a SELECT is a single ungrouped count(*), as Query.count() issues."""
+    columns = list(statement.selected_columns)
+    if len(columns) != 1 or statement._group_by_clauses:
+        return False
+    column = columns[0].element if isinstance(columns[0], Label) else columns[0]
+    return isinstance(column, functions.count)
+
+def _order_keys(statement) -> List[Tuple[object, bool]]:
+    """(column, descending) for each ORDER BY term."""
+    keys = []
+    for clause in statement._order_by_clauses:
+        descending = False
+        while isinstance(clause, UnaryExpression):
+            if clause.modifier is operators.desc_op:
+                descending = True
+            clause = clause.element
+        keys.append((clause, descending))
+    return keys
+
+def _is_entity(description) -> bool:
+    return getattr(inspect(description["expr"], raiseerr=False), "is_mapper", False)
+
+def _row_value(descriptions, column):
+    """Build a function reading an ORDER BY column from a result row, None if not selected."""
+    for index, description in enumerate(descriptions):
+        expression = description["expr"]
+        if _is_entity(description):
+            # A whole entity: read the attribute mapped to the column
+            table = inspect(expression).local_table
+            if getattr(column, "table", None) is table:
+                attribute = inspect(expression).get_property_by_column(column).key
+                return lambda row: getattr(row[index], attribute)
+            continue
+        if hasattr(expression, "__clause_element__"):
+            expression = expression.__clause_element__()
+        if expression.compare(column):
+            return operator.itemgetter(index)
+    return None
+
+def _sort_key(value):
+    # NULLs sort last ascending and first descending, as in Postgres
+    return (1,) if value is None else (0, value)
+
+def parse_shard_databases(value: str) -> Dict[str, Tuple[str, int, str]]:
+    """
+    Parse SHARD_DATABASES.
+
+    Args:
+        value: Comma-separated name=host[:port]/database entries
+
+    Returns:
+        (host, port, database) by shard name, in the order given
+    """
+    shards = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        name, _, location = entry.strip().partition("=")
+        address, _, database = location.partition("/")
+        host, _, port = address.partition(":")
+        if not name or not host or not database:
+            raise ValueError(f"Invalid SHARD_DATABASES entry: {entry!r}")
+        shards[name] = (host, int(port or settings.POSTGRES_PORT), database)
+    return shards
+
+def create_shard_engines() -> Dict[str, Engine]:
+    """Create an instrumented engine for each shard in SHARD_DATABASES."""
+    engines = {}
+    for name, (host, port, database) in parse_shard_databases(settings.SHARD_DATABASES).items():
+        shard_engine = create_engine(
+            f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{host}:{port}/{database}",
+            pool_size=settings.SHARD_POOL_SIZE,
+            max_overflow=settings.SHARD_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+            echo=settings.DB_ECHO_SQL,
+        )
+        query_stats.instrument_engine(shard_engine)
+        if settings.REQUEST_DEADLINES_ENABLED:
+            deadlines.instrument_engine(shard_engine)
+        if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+            slow_queries.instrument_engine(shard_engine, slow_queries.slow_query_log)
+        engines[name] = shard_engine
+    return engines
+
+def prepare_shard(shard_engine: Engine, index: int) -> None:
+    """
+    Adapt a shard database created from the models.
+
+    Users live on the primary database and transfers point at accounts on
+    other shards, so foreign keys to users and to the recipient account are
+    dropped. ID sequences count in steps of SHARD_ID_STRIDE from the shard's
+    position in SHARD_DATABASES, which keeps IDs unique across shards and
+    lets the rebalancer move rows without renumbering them.
+
+    Args:
+        shard_engine: Engine of the shard
+        index: Position of the shard in SHARD_DATABASES
+    """
+    stride = settings.SHARD_ID_STRIDE
+    if index >= stride:
+        raise ValueError(f"Shard {index} does not fit SHARD_ID_STRIDE={stride}")
+    with shard_engine.begin() as conn:
+        foreign_keys = conn.execute(text("""
+            SELECT conrelid::regclass::text, conname FROM pg_constraint
+            WHERE contype = 'f' AND conparentid = 0
+              AND (confrelid = 'users'::regclass OR conname = 'transactions_recipient_account_id_fkey')
+        """)).all()
+        for table, constraint in foreign_keys:
+            conn.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"'))
+
+        for table in sorted(SHARDED_TABLES):
+            max_id = conn.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}")).scalar()
+            # Next ID of this shard's residue class above the existing rows
+            start = max_id + 1 + (index + 1 - (max_id + 1)) % stride
+            conn.execute(text(f"ALTER SEQUENCE {table}_id_seq INCREMENT BY {stride} RESTART WITH {start}"))
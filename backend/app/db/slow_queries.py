@@ -0,0 +1,206 @@
+# backend/app/db/slow_queries.py
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import settings
+from app.core.logging import JsonFormatter, add_queued_handler, request_id_var
+
+logger = logging.getLogger("banking-system.slow_queries")
+
+# Only plain reads are re-run under EXPLAIN ANALYZE
+_EXPLAINABLE = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+_LOCKING = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+
+@dataclass
+class SlowQuery:
+    """A statement that exceeded the slow query threshold."""
+    timestamp: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    caller: Optional[str]
+    request_id: str
+    explain: Optional[str] = None
+
+def parameter_shape(parameters: Any) -> Any:
+    """
+    Describe bound parameters by type, never by value.
+
+    Args:
+        parameters: DBAPI parameters (dict, sequence, or list of them for executemany)
+
+    Returns:
+        JSON-serializable shape, e.g. {"user_id_1": "int", "id_1": "list[25]"}
+    """
+    def describe(value: Any) -> str:
+        if isinstance(value, (list, tuple)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    if isinstance(parameters, dict):
+        return {name: describe(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return {"executemany": len(parameters), "row": parameter_shape(parameters[0])}
+    if isinstance(parameters, (list, tuple)):
+        return [describe(value) for value in parameters]
+    return describe(parameters)
+
+def find_caller() -> Optional[str]:
+    """
+    Find the repository method (or else the service method) that issued a statement.
+
+    Returns:
+        Qualified method name such as "TransactionRepository.get_user_transactions"
+    """
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(("app.db.repositories.", "app.services.")):
+            instance = frame.f_locals.get("self")
+            owner = type(instance).__name__ if instance is not None else module.rsplit(".", 1)[-1]
+            name = f"{owner}.{frame.f_code.co_name}"
+            if module.startswith("app.db.repositories."):
+                return name
+            fallback = fallback or name
+        frame = frame.f_back
+    return fallback
+
+class SlowQueryLog:
+    """
+    Recorder for statements slower than a threshold.
+
+    Entries go to the banking-system.slow_queries logger as JSON-friendly
+    extras and to a bounded in-memory buffer served by the admin API. A
+    sampled subset of slow SELECTs is re-run under
+    EXPLAIN (ANALYZE, BUFFERS) inside a savepoint on the same connection.
+    """
+
+    def __init__(self, *, threshold_ms: float, explain_sample_rate: float, buffer_size: int):
+        """
+        Initialize the log.
+
+        Args:
+            threshold_ms: Minimum duration to record
+            explain_sample_rate: Fraction of slow SELECTs to EXPLAIN ANALYZE
+            buffer_size: Number of entries kept in memory
+        """
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: Deque[SlowQuery] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    def recent(self, limit: int = 50) -> List[SlowQuery]:
+        """
+        Get the most recent slow queries, newest first.
+
+        Args:
+            limit: Maximum number of entries
+
+        Returns:
+            List of slow queries
+        """
+        with self._lock:
+            entries = list(self._entries)
+        return entries[::-1][:limit]
+
+    def record(self, cursor, statement: str, parameters: Any, duration: float, executemany: bool) -> None:
+        entry = SlowQuery(
+            timestamp=datetime.now(),
+            duration_ms=round(duration * 1000, 3),
+            statement=statement,
+            parameters=parameter_shape(parameters),
+            caller=find_caller(),
+            request_id=request_id_var.get(),
+        )
+        if (
+            not executemany
+            and random.random() < self.explain_sample_rate
+            and _EXPLAINABLE.match(statement)
+            and not _LOCKING.search(statement)
+        ):
+            entry.explain = self._explain(cursor, statement, parameters)
+
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(
+            "Slow query: %.1fms in %s: %s",
+            entry.duration_ms, entry.caller or "-", statement,
+            extra={key: value for key, value in asdict(entry).items() if key not in ("timestamp", "request_id")},
+        )
+
+    @staticmethod
+    def _explain(cursor, statement: str, parameters: Any) -> Optional[str]:
+        # A failed EXPLAIN must not abort the caller's transaction
+        explain_cursor = cursor.connection.cursor()
+        try:
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                explain_cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+            except Exception:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                raise
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as e:
+            logging.getLogger("banking-system").debug(f"EXPLAIN of slow query failed: {e}")
+            return None
+        finally:
+            explain_cursor.close()
+
+def instrument_engine(engine: Engine, slow_query_log: SlowQueryLog) -> None:
+    """
+    Record an engine's slow statements.
+
+    Args:
+        engine: SQLAlchemy engine
+        slow_query_log: Destination log
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["slow_query_start_time"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info.pop("slow_query_start_time", time.perf_counter())
+        if duration >= slow_query_log.threshold:
+            slow_query_log.record(cursor, statement, parameters, duration, executemany)
+
+def enable_file_output(path: str, *, max_bytes: int, backup_count: int) -> None:
+    """
+    Write slow queries as JSON lines to a rotating file (off the event loop).
+
+    Args:
+        path: File path, "{pid}" is replaced by the process ID so workers
+            never rotate each other's files
+        max_bytes: Rotate after this many bytes
+        backup_count: Number of rotated files kept
+    """
+    path = path.format(pid=os.getpid())
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    handler.setFormatter(JsonFormatter())
+    add_queued_handler(logger, handler)
+
+# Process-wide slow query log, attached to the engine in app.db.session
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    buffer_size=settings.SLOW_QUERY_BUFFER_SIZE,
+)
@@ -0,0 +1,130 @@
+# backend/app/db/unit_of_work.py
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy.orm import Session
+
+from app.core.timing import span
+
+logger = logging.getLogger("banking-system")
+
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+class UnitOfWork:
+    """
+    One transaction per mutating request, committed exactly once.
+
+    The route commits explicitly once its writes are done, before building
+    the response; anything not committed is rolled back when the request
+    ends. The unit of work also keeps every entity loaded by id during the
+    request, so the route's authorization check, the service and the
+    notification all share one Account instead of each issuing a SELECT.
+
+    Attributes:
+        db: Database session of the request
+        committed: Whether the unit of work has been committed
+        checkpointed: Whether part of the work was committed early by checkpoint
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.committed = False
+        self.checkpointed = False
+        self._identities: Dict[Tuple[Type, Any], Any] = {}
+        self._after_commit: List[Callable[[], None]] = []
+        db.info[UNIT_OF_WORK_KEY] = self
+
+    def get(self, model: Type, id: Any) -> Optional[Any]:
+        """
+        Get an entity by primary key, loading it at most once per request.
+
+        The session's identity map answers for entities already loaded and
+        not expired; the unit of work holds a reference to each so it stays
+        there until the request ends. A rollback expires them, and the next
+        get reloads the row.
+
+        Args:
+            model: Mapped class
+            id: Primary key
+
+        Returns:
+            Entity if found, None otherwise
+        """
+        entity = self.db.get(model, id)
+        if entity is not None:
+            self._identities[(model, id)] = entity
+        return entity
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the unit of work is committed, e.g. to fill an in-process cache."""
+        self._after_commit.append(callback)
+
+    def commit(self) -> None:
+        """
+        Commit the unit of work.
+
+        Raises:
+            RuntimeError: If it was already committed
+        """
+        if self.committed:
+            raise RuntimeError("Unit of work already committed")
+        with span("commit"):
+            self.db.commit()
+        self.committed = True
+
+        self._run_after_commit()
+
+    def checkpoint(self) -> None:
+        """
+        Commit the work done so far without ending the unit of work.
+
+        The one exception to committing exactly once, for sagas whose next
+        step runs on another database and must not start until this one is
+        durable: a cross-shard transfer commits its debit before crediting
+        the destination, and its refund if the credit is refused. The
+        request still ends with commit, or with a rollback of whatever
+        followed the checkpoint.
+
+        Raises:
+            RuntimeError: If the unit of work was already committed
+        """
+        if self.committed:
+            raise RuntimeError("Unit of work already committed")
+        with span("commit"):
+            self.db.commit()
+        self.checkpointed = True
+
+        self._run_after_commit()
+
+    def _run_after_commit(self) -> None:
+        for callback in self._after_commit:
+            callback()
+        self._after_commit.clear()
+
+    def rollback(self) -> None:
+        """Discard everything not committed."""
+        self.db.rollback()
+        self._after_commit.clear()
+
+    def close(self) -> None:
+        """Detach the unit of work from its session, rolling back what was not committed."""
+        if not self.committed:
+            self.rollback()
+        self._identities.clear()
+        self.db.info.pop(UNIT_OF_WORK_KEY, None)
+
+def current_unit_of_work(db: Session) -> Optional[UnitOfWork]:
+    """Get the unit of work owning the session, None for sessions outside a request."""
+    return db.info.get(UNIT_OF_WORK_KEY)
+
+def checkpoint(db: Session) -> None:
+    """
+    Commit the work done so far on a session, see UnitOfWork.checkpoint.
+
+    Sessions outside a request, e.g. of a batch job, are committed directly.
+    """
+    unit_of_work = current_unit_of_work(db)
+    if unit_of_work is not None:
+        unit_of_work.checkpoint()
+    else:
+        db.commit()
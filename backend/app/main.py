@@ -1,24 +1,37 @@
 # backend/app/main.py
-import time
-from fastapi import FastAPI, Request, Depends
+import asyncio
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 
 from app.api.v1.router import api_router
 from app.config.settings import settings
+from app.db.invalidation import invalidation_bus
+from app.db.replicas import replica_router
 from app.db.session import create_all_tables
+from app.db.slow_queries import enable_file_output as enable_slow_query_file
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import CONTENT_TYPE_LATEST, mark_process_dead, render_metrics
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.deadline import DeadlineMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.error_handler import error_handler
 from app.core.exceptions import CustomException
+from app.services.idempotency import IdempotencyService
+from app.services.retention import RetentionService
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Configure logging (handlers run on a background thread)
+setup_logging(level=settings.LOG_LEVEL, json_format=settings.LOG_JSON)
 logger = logging.getLogger("banking-system")
 
 # Create FastAPI application
@@ -28,7 +41,27 @@ app = FastAPI(
     debug=settings.DEBUG,
 )
 
-# Add CORS middleware
+# Add custom middleware
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+if settings.REQUEST_DEADLINES_ENABLED:
+    app.add_middleware(DeadlineMiddleware)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+if settings.POSTGRES_REPLICA_HOSTS:
+    app.add_middleware(ReadYourWritesMiddleware)
+if settings.STAGE_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+app.add_middleware(LoggingMiddleware)
+
+# Add CORS middleware last, so it wraps the others and responses they
+# send themselves (503 from admission, 429 from rate limiting) carry CORS
+# headers too; browsers hide responses without them from the client
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
@@ -38,9 +71,6 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
-# Add custom middleware
-app.add_middleware(LoggingMiddleware)
-
 # Exception handlers
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request, exc):
@@ -60,15 +90,6 @@ async def custom_exception_handler(request, exc):
         content={"detail": exc.detail},
     )
 
-# Request processing time middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -77,17 +98,49 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 async def health_check():
     return {"status": "ok"}
 
+# Prometheus metrics endpoint
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 # Startup event to create database tables
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up the application")
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    if settings.SLOW_QUERY_THRESHOLD_MS > 0 and settings.SLOW_QUERY_LOG_FILE:
+        enable_slow_query_file(
+            settings.SLOW_QUERY_LOG_FILE,
+            max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backup_count=settings.SLOW_QUERY_LOG_BACKUP_COUNT,
+        )
     create_all_tables()
     logger.info("Database tables created")
+    app.state.idempotency_purge_task = asyncio.create_task(
+        IdempotencyService.purge_expired_periodically()
+    )
+    app.state.retention_purge_task = asyncio.create_task(RetentionService.purge_deleted_periodically())
+    if replica_router.replicas:
+        app.state.replica_health_task = asyncio.create_task(replica_router.check_periodically())
+    if settings.INVALIDATION_BUS_ENABLED:
+        app.state.invalidation_listener_task = asyncio.create_task(invalidation_bus.listen())
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down the application")
+    app.state.idempotency_purge_task.cancel()
+    app.state.retention_purge_task.cancel()
+    if replica_router.replicas:
+        app.state.replica_health_task.cancel()
+    if settings.INVALIDATION_BUS_ENABLED:
+        app.state.invalidation_listener_task.cancel()
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.stop()
+    mark_process_dead()
+    shutdown_logging()
 
 # Main entry point for development
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+# backend/app/middleware/admission.py
+import json
+import logging
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.core.admission import (
+    BULK,
+    MONEY_MOVEMENT,
+    STANDARD,
+    AdmissionController,
+    PriorityClass,
+)
+from app.db.session import engine
+from app.middleware.rate_limit import EXEMPT_PATHS, MONEY_MOVEMENT_PATHS
+
+logger = logging.getLogger("banking-system")
+
+# Long-running requests that each hold a connection for a long time
+BULK_PATHS = frozenset({f"{settings.API_V1_STR}/transactions/bulk/pain001"})
+BULK_PREFIXES = (f"{settings.API_V1_STR}/transactions/stats/",)
+
+def create_controller() -> AdmissionController:
+    """Create the admission controller from settings, bound to the engine's pool."""
+    capacity = settings.ADMISSION_CAPACITY
+    controller = AdmissionController(
+        [
+            PriorityClass(
+                MONEY_MOVEMENT, 0, capacity,
+                settings.ADMISSION_MONEY_QUEUE_TIMEOUT_MS / 1000,
+            ),
+            PriorityClass(
+                STANDARD, 1, max(1, int(capacity * settings.ADMISSION_STANDARD_SHARE)),
+                settings.ADMISSION_STANDARD_QUEUE_TIMEOUT_MS / 1000,
+            ),
+            PriorityClass(
+                BULK, 2, max(1, int(capacity * settings.ADMISSION_BULK_SHARE)),
+                settings.ADMISSION_BULK_QUEUE_TIMEOUT_MS / 1000,
+            ),
+        ],
+        capacity=capacity,
+        max_queue=settings.ADMISSION_MAX_QUEUE,
+        pool_in_use=engine.pool.checkedout,
+    )
+    # Connections returned by background jobs free capacity too
+    event.listen(engine, "checkin", lambda dbapi_connection, record: controller.wake_soon())
+    return controller
+
+def classify(scope: Scope) -> Optional[str]:
+    """
+    Get the priority class of a request.
+
+    Args:
+        scope: ASGI scope
+
+    Returns:
+        Priority class, None if the request does not need admission
+    """
+    method, path = scope["method"], scope["path"]
+    if method == "OPTIONS" or path in EXEMPT_PATHS:
+        return None
+    if path in BULK_PATHS or path.startswith(BULK_PREFIXES):
+        return BULK
+    if method == "POST" and path in MONEY_MOVEMENT_PATHS:
+        return MONEY_MOVEMENT
+    if b"all_users=true" in scope.get("query_string", b"").lower():
+        return BULK
+    return STANDARD
+
+class AdmissionMiddleware:
+    """
+    Admit requests by priority class while the database pool has capacity.
+
+    Requests that cannot be admitted within their class's queue timeout get
+    an immediate 503 with Retry-After rather than waiting up to
+    DB_POOL_TIMEOUT for a connection. Money movement may use the whole
+    capacity; reads and exports are capped below it. Bulk pain.001 uploads,
+    statistics and all-user listings count as exports.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or create_controller()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority = classify(scope)
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(priority):
+            logger.warning(
+                f"Shedding {scope['method']} {scope['path']} ({priority}): "
+                f"{self.controller.in_flight} in flight, {self.controller.queued} queued"
+            )
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(priority)
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        body = json.dumps({"detail": "Service temporarily overloaded, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,108 @@
+# backend/app/middleware/deadline.py
+import asyncio
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.core.admission import BULK, MONEY_MOVEMENT, STANDARD
+from app.db.deadlines import RequestDeadline, start_deadline, stop_deadline
+from app.middleware.admission import classify
+
+logger = logging.getLogger("banking-system")
+
+TIMEOUT_HEADER = b"x-request-timeout"
+
+# Default budgets in milliseconds per priority class, and for single routes
+CLASS_BUDGETS_MS = {
+    MONEY_MOVEMENT: settings.REQUEST_DEADLINE_MONEY_MS,
+    STANDARD: settings.REQUEST_DEADLINE_MS,
+    BULK: settings.REQUEST_DEADLINE_BULK_MS,
+}
+ROUTE_BUDGETS_MS = {
+    f"{settings.API_V1_STR}/transactions/bulk/pain001": settings.REQUEST_DEADLINE_INGEST_MS,
+}
+
+def budget_ms(scope: Scope, priority: str) -> int:
+    """
+    Get the time budget of a request.
+
+    An X-Request-Timeout header (milliseconds) overrides the route default,
+    up to REQUEST_DEADLINE_MAX_MS.
+
+    Args:
+        scope: ASGI scope
+        priority: Priority class of the request
+
+    Returns:
+        Budget in milliseconds
+    """
+    for name, value in scope["headers"]:
+        if name == TIMEOUT_HEADER:
+            try:
+                return min(max(1, int(value)), settings.REQUEST_DEADLINE_MAX_MS)
+            except ValueError:
+                break
+    return ROUTE_BUDGETS_MS.get(scope["path"], CLASS_BUDGETS_MS[priority])
+
+class DeadlineMiddleware:
+    """
+    Give each request a deadline and stop its database work when the
+    client disconnects.
+
+    The deadline becomes the statement_timeout of the request's
+    transactions (see app.db.deadlines). Incoming messages are read by a
+    separate task, so an http.disconnect is seen while the handler is still
+    working and cancels the statements running for it.
+
+    Statements executed synchronously on the event loop block that task
+    as well; they are bounded by statement_timeout, and the disconnect
+    cancels whatever the request does once the loop is free again.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority = classify(scope)
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        deadline, token = start_deadline(budget_ms(scope, priority) / 1000)
+        messages: "asyncio.Queue[Message]" = asyncio.Queue(maxsize=1)
+        response_complete = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        async def watch_disconnect() -> None:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect" and not response_complete:
+                    self._abandon(scope, deadline)
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await self.app(scope, messages.get, send_tracking)
+        finally:
+            watcher.cancel()
+            stop_deadline(token)
+
+    @staticmethod
+    def _abandon(scope: Scope, deadline: RequestDeadline) -> None:
+        cancelled = deadline.cancel()
+        logger.info(
+            f"Client disconnected from {scope['method']} {scope['path']}; "
+            f"cancelled {cancelled} running statements"
+        )
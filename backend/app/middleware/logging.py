@@ -1,35 +1,75 @@
 # backend/app/middleware/logging.py
+import logging
 import time
 import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import request_id_var
 
 logger = logging.getLogger("banking-system")
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        # Log request
-        logger.info(
-            f"Request: {request_id} - {request.method} {request.url.path} "
-            f"- Client: {request.client.host}"
-        )
-        
-        # Process request
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Response: {request_id} - {request.method} {request.url.path} "
-            f"- Status: {response.status_code} - Time: {process_time:.4f}s"
-        )
-        
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
\ No newline at end of file
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 64
+
+class LoggingMiddleware:
+    """
+    Request ID, timing headers and access log.
+
+    Pure ASGI, so responses are passed through untouched (streaming keeps
+    working) and no extra task is spawned per request. The request ID is
+    taken from an incoming X-Request-ID header when present, exposed as
+    request.state.request_id and to log records through request_id_var.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                if len(value) <= MAX_REQUEST_ID_LENGTH:
+                    request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.perf_counter() - start_time
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER, request_id.encode("latin-1")),
+                    (b"x-process-time", f"{process_time:.6f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            process_time = time.perf_counter() - start_time
+            client = scope.get("client")
+            # Lazy %-formatting: the message is rendered on the log listener thread
+            logger.info(
+                "%s %s - Status: %d - Time: %.4fs - Client: %s",
+                scope["method"], scope["path"], status_code, process_time,
+                client[0] if client else "-",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": round(process_time * 1000, 3),
+                },
+            )
+            request_id_var.reset(token)
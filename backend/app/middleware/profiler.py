@@ -0,0 +1,127 @@
+# backend/app/middleware/profiler.py
+import logging
+from typing import Optional
+
+import jwt
+from jwt import PyJWTError
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.core.profiler import CPU, MEMORY, RequestProfiler, request_profiler
+from app.core.security import ALGORITHM
+from app.db.repositories import user_repository
+from app.db.session import SessionLocal
+
+logger = logging.getLogger("banking-system")
+
+PROFILE_HEADER = b"x-profile"
+
+# X-Profile header values
+_MODES = {b"1": CPU, b"true": CPU, b"cpu": CPU, b"memory": MEMORY}
+
+def _is_superuser(token: bytes) -> bool:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = int(payload.get("sub"))
+    except (PyJWTError, TypeError, ValueError):
+        return False
+    db = SessionLocal()
+    try:
+        user = user_repository.get(db, id=user_id)
+        return user is not None and user.is_active and user.is_superuser
+    finally:
+        db.close()
+
+class ProfilerMiddleware:
+    """
+    Profile selected requests.
+
+    A request is profiled when a superuser sends "X-Profile: 1", or when
+    profiling was armed for the next N requests through the admin API. The
+    profile is stored under the ID returned in the X-Profile-Id header and
+    served as a collapsed stack file by GET /admin/profiles/{id}. Other
+    requests cost one header scan.
+
+    With "X-Profile: memory" the request's allocations are traced instead,
+    and the peak and retained allocations are also returned in the
+    X-Memory-Peak-Bytes and X-Memory-Retained-Blocks headers.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler = None):
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = self.profiler.take(scope["path"]) or await self._requested(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if mode == MEMORY:
+            await self._trace_allocations(scope, receive, send)
+            return
+
+        sampler = self.profiler.start(scope["method"], scope["path"])
+        profile_id = sampler.profile.id.encode()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            profile = sampler.stop()
+            self.profiler.save(profile)
+            logger.info(
+                f"Profiled {profile.method} {profile.path}: "
+                f"{profile.total_samples} samples, profile {profile.id}"
+            )
+
+    async def _trace_allocations(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracker = self.profiler.start_memory(scope["method"], scope["path"])
+        if tracker is None:
+            logger.info(f"Not tracing {scope['method']} {scope['path']}: another request is traced")
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile = tracker.snapshot()
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.id.encode()),
+                    (b"x-memory-peak-bytes", str(profile.peak_bytes).encode()),
+                    (b"x-memory-retained-blocks", str(profile.retained_blocks).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            profile = tracker.stop()
+            self.profiler.save(profile)
+            logger.info(
+                f"Traced {profile.method} {profile.path}: peak {profile.peak_bytes} bytes, "
+                f"{profile.retained_blocks} blocks retained, profile {profile.id}"
+            )
+
+    @staticmethod
+    async def _requested(scope: Scope) -> Optional[str]:
+        mode = None
+        token: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                mode = _MODES.get(value.lower())
+            elif name == b"authorization":
+                scheme, _, token = value.partition(b" ")
+                if scheme.lower() != b"bearer":
+                    token = None
+        if mode is None or not token:
+            return None
+        # Only reached for requests asking to be profiled
+        return mode if await run_in_threadpool(_is_superuser, token) else None
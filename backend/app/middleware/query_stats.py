@@ -0,0 +1,57 @@
+# backend/app/middleware/query_stats.py
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.db.query_stats import track_queries
+
+logger = logging.getLogger("banking-system")
+
+class QueryStatsMiddleware:
+    """
+    Per-request SQL statement count and database time.
+
+    With SQL_QUERY_HEADERS (on in debug mode) responses carry
+    Server-Timing, X-DB-Query-Count and X-DB-Time headers. Requests over
+    SQL_QUERY_BUDGET statements, or repeating one statement shape at least
+    SQL_N_PLUS_ONE_THRESHOLD times, are logged as warnings.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            if settings.SQL_QUERY_HEADERS:
+                async def send_with_headers(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        db_time_ms = stats.duration * 1000
+                        message["headers"] = list(message.get("headers", [])) + [
+                            (b"server-timing", f'db;dur={db_time_ms:.2f};desc="{stats.count} queries"'.encode()),
+                            (b"x-db-query-count", str(stats.count).encode()),
+                            (b"x-db-time", f"{db_time_ms:.2f}ms".encode()),
+                        ]
+                    await send(message)
+            else:
+                send_with_headers = send
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                if stats.count > settings.SQL_QUERY_BUDGET:
+                    logger.warning(
+                        "Query budget exceeded: %s %s - %d queries (budget %d) - DB time: %.4fs",
+                        scope["method"], scope["path"], stats.count,
+                        settings.SQL_QUERY_BUDGET, stats.duration,
+                    )
+                if stats.count >= settings.SQL_N_PLUS_ONE_THRESHOLD:
+                    for shape, executions in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+                        logger.warning(
+                            "Possible N+1: %s %s - %d executions of: %s",
+                            scope["method"], scope["path"], executions, shape,
+                        )
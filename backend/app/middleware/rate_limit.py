@@ -0,0 +1,177 @@
+# backend/app/middleware/rate_limit.py
+import json
+import logging
+import math
+from typing import Dict, Optional
+
+import jwt
+from jwt import PyJWTError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.core.rate_limit import (
+    InMemoryTokenBucketStore,
+    RateLimitRule,
+    SharedMemoryTokenBucketStore,
+)
+from app.core.security import ALGORITHM
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger("banking-system")
+
+# Route classes
+LOGIN = "login"
+MONEY_MOVEMENT = "money"
+READ = "read"
+
+# Paths never rate limited (load balancer probes, metrics scrapes)
+EXEMPT_PATHS = frozenset({"/health", "/metrics"})
+
+# Paths whose POSTs are limited per IP, before a user is known
+LOGIN_PATHS = frozenset(
+    f"{settings.API_V1_STR}/auth/{path}"
+    for path in ("login", "login/email", "password-change")
+)
+
+# Paths whose POSTs move money
+MONEY_MOVEMENT_PATHS = frozenset(
+    f"{settings.API_V1_STR}/transactions/{path}"
+    for path in ("deposit", "withdrawal", "transfer", "payment", "bulk/pain001")
+)
+
+_UNKNOWN = object()
+
+def default_rules() -> Dict[str, RateLimitRule]:
+    """Per route class limits from settings."""
+    return {
+        LOGIN: RateLimitRule.per_minute(settings.RATE_LIMIT_LOGIN_PER_MINUTE),
+        MONEY_MOVEMENT: RateLimitRule.per_minute(settings.RATE_LIMIT_MONEY_MOVEMENT_PER_MINUTE),
+        READ: RateLimitRule.per_minute(settings.RATE_LIMIT_PER_MINUTE),
+    }
+
+def create_store(rules: Dict[str, RateLimitRule]):
+    """Create the bucket store selected by RATE_LIMIT_BACKEND."""
+    if settings.RATE_LIMIT_BACKEND == "shared":
+        return SharedMemoryTokenBucketStore(
+            settings.RATE_LIMIT_SHARED_MEMORY_NAME,
+            slots=settings.RATE_LIMIT_SHARED_SLOTS,
+            stale_after=max(rule.full_after for rule in rules.values()),
+        )
+    return InMemoryTokenBucketStore(
+        shards=settings.RATE_LIMIT_SHARDS,
+        max_buckets=settings.RATE_LIMIT_MAX_BUCKETS,
+    )
+
+def classify(method: str, path: str) -> Optional[str]:
+    """
+    Get the route class of a request.
+
+    Args:
+        method: HTTP method
+        path: Request path
+
+    Returns:
+        Route class, None if the request is not rate limited
+    """
+    if method == "OPTIONS" or path in EXEMPT_PATHS:
+        return None
+    if method == "POST":
+        if path in LOGIN_PATHS:
+            return LOGIN
+        if path in MONEY_MOVEMENT_PATHS:
+            return MONEY_MOVEMENT
+    return READ
+
+class RateLimitMiddleware:
+    """
+    Token bucket rate limiting per client and route class.
+
+    Login attempts are limited per client IP; everything else per user when
+    the request carries a valid bearer token and per IP otherwise. Tokens are
+    mapped to user IDs through an LRU cache, so the JWT is only verified the
+    first time a token is seen. Rejected requests get a 429 with Retry-After
+    and never reach the application or the database.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Dict[str, RateLimitRule] = None,
+        store=None,
+    ):
+        self.app = app
+        self.rules = rules or default_rules()
+        self.store = store or create_store(self.rules)
+        self._token_users: LRUCache = LRUCache(maxsize=settings.RATE_LIMIT_MAX_BUCKETS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.rules[route_class]
+        key = f"{route_class}:{self._client_key(scope, route_class)}"
+        allowed, remaining, retry_after = self.store.hit(key, rule)
+        limit_headers = [
+            (b"x-ratelimit-limit", str(int(rule.capacity)).encode()),
+            (b"x-ratelimit-remaining", str(int(remaining)).encode()),
+        ]
+
+        if not allowed:
+            logger.warning(f"Rate limit exceeded: {key} - {scope['method']} {scope['path']}")
+            await self._reject(send, retry_after, limit_headers)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + limit_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _client_key(self, scope: Scope, route_class: str) -> str:
+        if route_class != LOGIN:
+            user_id = self._user_id(scope)
+            if user_id is not None:
+                return f"user:{user_id}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    def _user_id(self, scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                break
+        else:
+            return None
+        scheme, _, token = value.partition(b" ")
+        if scheme.lower() != b"bearer" or not token:
+            return None
+
+        user_id = self._token_users.get(token, _UNKNOWN)
+        if user_id is _UNKNOWN:
+            try:
+                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+                user_id = payload.get("sub")
+            except PyJWTError:
+                user_id = None
+            self._token_users.set(token, user_id)
+        return user_id
+
+    @staticmethod
+    async def _reject(send: Send, retry_after: float, headers) -> None:
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ] + headers,
+        })
+        await send({"type": "http.response.body", "body": body})
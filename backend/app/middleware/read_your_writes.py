@@ -0,0 +1,53 @@
+# backend/app/middleware/read_your_writes.py
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.db.replicas import READ_AFTER_COOKIE, start_read_after, stop_read_after
+
+def read_after_lsn(scope: Scope) -> int:
+    """Get the WAL position from the request's read_after_lsn cookie, 0 without one."""
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            try:
+                return max(0, int(cookie_parser(value.decode("latin-1")).get(READ_AFTER_COOKIE, 0)))
+            except ValueError:
+                return 0
+    return 0
+
+class ReadYourWritesMiddleware:
+    """
+    Carry the WAL position of a client's last write between requests.
+
+    Responses to requests that committed a write set the read_after_lsn
+    cookie to the commit's position; later requests send it back and are
+    only read from replicas that have replayed it, whichever worker serves
+    them. Only added when read replicas are configured.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        read_after, token = start_read_after(read_after_lsn(scope))
+
+        async def send_with_cookie(message: Message) -> None:
+            # Commits happen before the response starts, see get_unit_of_work
+            if message["type"] == "http.response.start" and read_after.write_lsn:
+                cookie = (
+                    f"{READ_AFTER_COOKIE}={read_after.write_lsn}; Path=/; "
+                    f"Max-Age={settings.REPLICA_READ_AFTER_COOKIE_MAX_AGE}; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            stop_read_after(token)
@@ -0,0 +1,44 @@
+# backend/app/middleware/timing.py
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.core.metrics import HTTP_REQUEST_STAGE_DURATION
+from app.core.timing import start_recording, stop_recording
+from app.middleware.metrics import UNMATCHED_ROUTE
+
+class ServerTimingMiddleware:
+    """
+    Collect the spans of each request into per-stage histograms.
+
+    With STAGE_TIMING_HEADERS (on in debug mode) the stages are also sent
+    as a Server-Timing header. Only added when STAGE_TIMING_ENABLED, so
+    span() is a no-op otherwise.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder, token = start_recording()
+
+        if settings.STAGE_TIMING_HEADERS:
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start" and recorder.spans:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", recorder.server_timing().encode()),
+                    ]
+                await send(message)
+        else:
+            send_with_headers = send
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            stop_recording(token)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            for stage, duration in recorder.totals().items():
+                HTTP_REQUEST_STAGE_DURATION.labels(route, stage).observe(duration)
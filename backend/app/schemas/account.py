@@ -4,6 +4,7 @@ from datetime import datetime
 from pydantic import BaseModel, Field, validator
 
 from app.db.models.account import AccountType
+from app.schemas.user import User
 
 class AccountBase(BaseModel):
     """Base account schema with common attributes."""
@@ -41,6 +42,8 @@ class AccountInDBBase(AccountBase):
     account_number: str
     balance: float
     is_active: bool
+    last_activity_at: Optional[datetime] = None
+    dormant_since: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
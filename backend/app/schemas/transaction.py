@@ -4,6 +4,7 @@ from datetime import datetime
 from pydantic import BaseModel, Field, validator
 
 from app.db.models.transaction import TransactionType, TransactionStatus
+from app.schemas.account import Account
 
 class TransactionBase(BaseModel):
     """Base transaction schema with common attributes."""
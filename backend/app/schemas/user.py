@@ -1,6 +1,6 @@
 # backend/app/schemas/user.py
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 from pydantic import BaseModel, EmailStr, Field, validator
 import re
 
@@ -4,6 +4,12 @@ from .users import UserService
 from .accounts import AccountService
 from .transactions import TransactionService
 from .notifications import NotificationService
+from .idempotency import IdempotencyService
+from .bulk_payments import BulkPaymentService
+from .dormancy import DormancyService
+from .rebalancing import RebalanceService
+from .archival import ArchiveService
+from .retention import RetentionService
 
 # Export services for convenient importing
 __all__ = [
@@ -12,4 +18,10 @@ __all__ = [
     "AccountService",
     "TransactionService",
     "NotificationService",
+    "IdempotencyService",
+    "BulkPaymentService",
+    "DormancyService",
+    "RebalanceService",
+    "ArchiveService",
+    "RetentionService",
 ]
\ No newline at end of file
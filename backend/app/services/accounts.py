@@ -1,17 +1,30 @@
 # backend/app/services/accounts.py
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional
 from datetime import datetime
 
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.config.settings import settings
+from app.db.account_cache import AccountSnapshot, account_cache
+from app.db.invalidation import Subscriber, invalidation_bus
 from app.db.repositories import account_repository, audit_repository
+from app.db.session import get_db, shard_router
+from app.db.unit_of_work import current_unit_of_work
 from app.db.models.audit import AuditAction
 from app.db.models.account import Account, AccountType
+from app.db.models.user import User
 from app.schemas.account import AccountCreate, AccountUpdate
+from app.services.auth import AuthService
+from app.utils.cache import LRUCache
 
 class AccountService:
     """Account management service."""
     
+    # Owner of each live account; accounts never change hands, so entries only go
+    # when an account is deleted, in every worker (see delete)
+    _owners: LRUCache = LRUCache(maxsize=settings.ACCOUNT_OWNER_CACHE_SIZE)
+    
     @staticmethod
     async def get(db: Session, *, account_id: int) -> Optional[Account]:
         """
@@ -22,9 +35,10 @@ class AccountService:
             account_id: Account ID
             
         Returns:
-            Account if found, None otherwise
+            Account if found and not deleted, None otherwise
         """
-        return account_repository.get(db, id=account_id)
+        account = account_repository.get(db, id=account_id)
+        return account if account and account.deleted_at is None else None
     
     @staticmethod
     async def get_by_account_number(db: Session, *, account_number: str) -> Optional[Account]:
@@ -36,9 +50,185 @@ class AccountService:
             account_number: Account number
             
         Returns:
-            Account if found, None otherwise
+            Account if found and not deleted, None otherwise
+        """
+        account = account_repository.get_by_account_number(db, account_number=account_number)
+        return account if account and account.deleted_at is None else None
+    
+    @staticmethod
+    def get_owner_id(db: Session, *, account_id: int) -> Optional[int]:
+        """
+        Get the ID of the user owning an account, cached for the process.
+        
+        Args:
+            db: Database session
+            account_id: Account ID
+            
+        Returns:
+            Owner ID if the account exists and is not deleted, None otherwise
+        """
+        owner_id = AccountService._owners.get(account_id)
+        if owner_id is None:
+            owner_id = account_repository.get_owner_id(db, account_id=account_id)
+            if owner_id is not None:
+                AccountService._owners.set(account_id, owner_id)
+        return owner_id
+    
+    @staticmethod
+    async def get_owned(
+        db: Session,
+        *,
+        account_id: int,
+        user: User,
+        action: str = "access this account",
+        not_found: str = "Account not found",
+    ) -> Account:
+        """
+        Load an account the user may act on.
+        
+        The account is loaded with the ownership predicate in one query,
+        skipped for superusers. A cached owner that is not the user is
+        refused without a query; the owner is only looked up when the
+        account is not returned, to tell a missing account from another
+        user's.
+        
+        Args:
+            db: Database session
+            account_id: Account ID
+            user: User acting on the account
+            action: What the user is doing, for the 403 message
+            not_found: Detail of the 404
+            
+        Returns:
+            Account, to be handed to the service doing the work
+            
+        Raises:
+            HTTPException: 404 if the account does not exist or is deleted,
+                403 if it belongs to another user
+        """
+        forbidden = HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not enough permissions to {action}",
+        )
+        owner_id = AccountService._owners.get(account_id)
+        if owner_id is not None and owner_id != user.id and not user.is_superuser:
+            raise forbidden
+        
+        account = account_repository.get_owned(
+            db,
+            account_id=account_id,
+            user_id=None if user.is_superuser else user.id,
+        )
+        if account is not None:
+            AccountService._owners.set(account_id, account.user_id)
+            return account
+        
+        if owner_id is None:
+            owner_id = AccountService.get_owner_id(db, account_id=account_id)
+        if owner_id is None or owner_id == user.id or user.is_superuser:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+        raise forbidden
+    
+    @staticmethod
+    async def get_snapshot(db: Session, *, account_id: int, user: User) -> AccountSnapshot:
+        """
+        Get an account the user may read, from the account cache.
+        
+        A miss loads the row from the session, which must be on the primary
+        so a lagging replica never fills the cache, and caches it unless a
+        write committed in the meantime.
+        
+        Args:
+            db: Database session on the primary
+            account_id: Account ID
+            user: User reading the account
+            
+        Returns:
+            Snapshot of the account
+            
+        Raises:
+            HTTPException: 404 if the account does not exist or is deleted,
+                403 if it belongs to another user
+        """
+        started = account_cache.begin()
+        snapshot = account_cache.get(account_id)
+        if snapshot is not None:
+            if snapshot.user_id != user.id and not user.is_superuser:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not enough permissions to access this account",
+                )
+            return snapshot
+        
+        account = await AccountService.get_owned(db, account_id=account_id, user=user)
+        snapshot = AccountSnapshot.from_account(account)
+        account_cache.put(snapshot, started=started)
+        return snapshot
+    
+    @staticmethod
+    def owned(
+        action: str = "access this account",
+        *,
+        get_session: Callable = get_db,
+    ) -> Callable[..., Awaitable[Account]]:
+        """
+        Build a dependency loading the account named by the account_id path parameter.
+        
+        Usage:
+            @router.put("/{account_id}")
+            async def update_account(
+                account: Account = Depends(AccountService.owned("update this account")),
+                ...
+            ):
+        
+        Args:
+            action: What the route does with the account, for the 403 message
+            get_session: Session dependency of the route, so the account is
+                loaded on the session the route works with
+            
+        Returns:
+            FastAPI dependency returning the account for the current user
+        """
+        async def get_owned_account(
+            account_id: int,
+            db: Session = Depends(get_session),
+            current_user: User = Depends(AuthService.get_current_user),
+        ) -> Account:
+            return await AccountService.get_owned(db, account_id=account_id, user=current_user, action=action)
+        
+        return get_owned_account
+    
+    @staticmethod
+    async def authorize(
+        db: Session,
+        *,
+        account_id: int,
+        user: User,
+        action: str = "access this account",
+    ) -> None:
+        """
+        Check that the user may act on an account without loading it.
+        
+        Args:
+            db: Database session
+            account_id: Account ID
+            user: User acting on the account
+            action: What the user is doing, for the 403 message
+            
+        Raises:
+            HTTPException: 404 if the account does not exist or is deleted,
+                403 if it belongs to another user
         """
-        return account_repository.get_by_account_number(db, account_number=account_number)
+        if user.is_superuser:
+            return
+        owner_id = AccountService.get_owner_id(db, account_id=account_id)
+        if owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+        if owner_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Not enough permissions to {action}",
+            )
     
     @staticmethod
     async def get_user_accounts(
@@ -106,6 +296,10 @@ class AccountService:
             account_number=account_number,
         )
         
+        # Make the account reachable from other users' shards
+        if shard_router.shards:
+            shard_router.register_account(db, account)
+        
         # Audit account creation
         audit_repository.log_action(
             db,
@@ -128,6 +322,7 @@ class AccountService:
         db: Session, 
         *, 
         account_id: int, 
+        account: Optional[Account] = None,
         obj_in: AccountUpdate,
         current_user_id: int,
         ip_address: str = None,
@@ -138,6 +333,7 @@ class AccountService:
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it, e.g. with get_owned
             obj_in: Update data
             current_user_id: ID of the user performing the action (for audit)
             ip_address: Client IP address for audit logging
@@ -145,7 +341,8 @@ class AccountService:
         Returns:
             Updated account if found, None otherwise
         """
-        account = account_repository.get(db, id=account_id)
+        if account is None:
+            account = account_repository.get(db, id=account_id)
         if not account:
             return None
         
@@ -171,27 +368,46 @@ class AccountService:
         db: Session, 
         *, 
         account_id: int,
+        account: Optional[Account] = None,
         current_user_id: int,
         ip_address: str = None,
     ) -> Optional[Account]:
         """
         Delete an account.
         
+        The account is only marked deleted and deactivated; its
+        transactions are not loaded. RetentionService purges it with its
+        transactions after ACCOUNT_RETENTION_DAYS.
+        
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it, e.g. with get_owned
             current_user_id: ID of the user performing the action (for audit)
             ip_address: Client IP address for audit logging
             
         Returns:
             Deleted account if found, None otherwise
         """
-        account = account_repository.get(db, id=account_id)
-        if not account:
+        if account is None:
+            account = account_repository.get(db, id=account_id)
+        if not account or account.deleted_at is not None:
             return None
         
-        # Delete the account
-        account = account_repository.delete(db, id=account_id)
+        # Soft-delete the account
+        account = account_repository.update(
+            db,
+            db_obj=account,
+            obj_in={"is_active": False, "deleted_at": datetime.now()},
+        )
+        
+        # Cached owners would still authorize it: other workers drop theirs when the
+        # deletion commits, this one once it has (a lookup before that could cache it again)
+        invalidation_bus.publish(db, "account_owner", account_id)
+        unit_of_work = current_unit_of_work(db)
+        if unit_of_work is not None:
+            unit_of_work.after_commit(lambda: AccountService._owners.pop(account_id))
+        AccountService._owners.pop(account_id)
         
         # Audit account deletion
         audit_repository.log_action(
@@ -215,6 +431,7 @@ class AccountService:
         db: Session, 
         *, 
         account_id: int,
+        account: Optional[Account] = None,
         current_user_id: int,
         ip_address: str = None,
     ) -> Optional[Account]:
@@ -224,13 +441,15 @@ class AccountService:
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it, e.g. with get_owned
             current_user_id: ID of the user performing the action (for audit)
             ip_address: Client IP address for audit logging
             
         Returns:
             Updated account if found, None otherwise
         """
-        account = account_repository.get(db, id=account_id)
+        if account is None:
+            account = account_repository.get(db, id=account_id)
         if not account:
             return None
         
@@ -259,6 +478,7 @@ class AccountService:
         db: Session, 
         *, 
         account_id: int,
+        account: Optional[Account] = None,
         current_user_id: int,
         ip_address: str = None,
     ) -> Optional[Account]:
@@ -268,21 +488,27 @@ class AccountService:
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it, e.g. with get_owned
             current_user_id: ID of the user performing the action (for audit)
             ip_address: Client IP address for audit logging
             
         Returns:
             Updated account if found, None otherwise
         """
-        account = account_repository.get(db, id=account_id)
-        if not account:
+        if account is None:
+            account = account_repository.get(db, id=account_id)
+        if not account or account.deleted_at is not None:
             return None
         
-        # Reactivate the account
+        # Reactivate the account, restarting the dormancy clock
         account = account_repository.update(
             db, 
             db_obj=account, 
-            obj_in={"is_active": True},
+            obj_in={
+                "is_active": True,
+                "last_activity_at": datetime.now(),
+                "dormant_since": None,
+            },
         )
         
         # Audit account reactivation
@@ -303,6 +529,7 @@ class AccountService:
         db: Session, 
         *, 
         account_id: int, 
+        account: Optional[Account] = None,
         amount: float,
         description: str,
         current_user_id: int,
@@ -310,10 +537,14 @@ class AccountService:
     ) -> Optional[Account]:
         """
         Update an account balance.
+
+        The account row is locked first, so concurrent postings to the same
+        account wait for each other rather than fail with ConcurrentUpdate.
         
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it, e.g. with get_owned
             amount: Amount to add (positive) or subtract (negative)
             description: Description of the balance update
             current_user_id: ID of the user performing the action (for audit)
@@ -325,9 +556,11 @@ class AccountService:
         Raises:
             ValueError: If resulting balance would be negative
         """
-        account = account_repository.get(db, id=account_id)
+        if account is None:
+            account = account_repository.get(db, id=account_id)
         if not account:
             return None
+        account = account_repository.lock(db, account=account)
         
         # Calculate new balance
         new_balance = account.balance + amount
@@ -336,11 +569,15 @@ class AccountService:
         if new_balance < 0:
             raise ValueError("Insufficient funds")
         
-        # Update the balance
+        # Update the balance and record the activity for the dormancy sweep
         account = account_repository.update(
             db, 
             db_obj=account, 
-            obj_in={"balance": new_balance},
+            obj_in={
+                "balance": new_balance,
+                "last_activity_at": datetime.now(),
+                "dormant_since": None,
+            },
         )
         
         # Audit balance update
@@ -359,4 +596,9 @@ class AccountService:
             ip_address=ip_address,
         )
         
-        return account
\ No newline at end of file
+        return account
+
+invalidation_bus.subscribe("account_owner", Subscriber(
+    evict=lambda account_id, version: AccountService._owners.pop(account_id),
+    flush=lambda: AccountService._owners.clear(),
+))
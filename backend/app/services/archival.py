@@ -0,0 +1,220 @@
+# backend/app/services/archival.py
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.db.archive import AMOUNT_SCALE, Segment, checksum_rows, month_bounds, transaction_archive, write_segment
+from app.db.models.transaction_segment import SegmentStatus, TransactionSegment
+from app.db.repositories import transaction_repository
+from app.db.session import shard_names, shard_session
+
+logger = logging.getLogger("banking-system")
+
+@dataclass
+class ArchiveResult:
+    """Summary of an archived month."""
+    month: date
+    segments: int = 0
+    rows: int = 0
+    amount_total: float = 0.0
+    deleted: int = 0
+
+class ArchiveService:
+    """Move closed months of transactions into segment files."""
+
+    @staticmethod
+    def archive_cutoff(today: Optional[date] = None) -> date:
+        """
+        Get the first month that is too recent to archive.
+
+        Args:
+            today: Reference date, defaults to today
+
+        Returns:
+            First day of the month TRANSACTION_ARCHIVE_AFTER_MONTHS before the current one
+        """
+        today = today or date.today()
+        months = today.year * 12 + today.month - 1 - settings.TRANSACTION_ARCHIVE_AFTER_MONTHS
+        return date(months // 12, months % 12 + 1, 1)
+
+    @staticmethod
+    def next_month() -> Optional[date]:
+        """
+        Get the month to archive next.
+
+        Months are archived oldest first, so the archived months always
+        end where the transactions table starts.
+
+        Returns:
+            Oldest month with transactions in the table, None if it is not old enough
+        """
+        oldest = None
+        for shard in shard_names():
+            shard_db = shard_session(shard)
+            try:
+                created_at = transaction_repository.get_oldest_created_at(shard_db)
+            finally:
+                shard_db.close()
+            if created_at is not None and (oldest is None or created_at < oldest):
+                oldest = created_at
+        if oldest is None:
+            return None
+        month = oldest.date().replace(day=1)
+        return month if month < ArchiveService.archive_cutoff() else None
+
+    @staticmethod
+    def archive_month(
+        db: Session,
+        *,
+        month: date,
+        drain_seconds: Optional[float] = None,
+    ) -> ArchiveResult:
+        """
+        Archive one month of transactions and delete it from the table.
+
+        Every shard's rows of the month are written to a segment file,
+        read back and checked against the rows' checksum. Once every shard
+        is verified, reads of the month switch to the segments; after
+        drain_seconds, when all workers have reloaded the catalog, each
+        shard's rows are checksummed against its segment once more and
+        deleted. A run that fails can be repeated: segments not yet purged
+        are rewritten, purged ones are left alone.
+
+        Args:
+            db: Database session
+            month: Month to archive
+            drain_seconds: Wait before deleting, defaults to the catalog
+                refresh interval plus the longest request deadline
+
+        Returns:
+            Archive summary
+
+        Raises:
+            ValueError: If the month is not the oldest in the table, is too
+                recent or has pending transactions, or a checksum does not match
+        """
+        month = month.replace(day=1)
+        start, end = month_bounds(month)
+        if month >= ArchiveService.archive_cutoff():
+            raise ValueError(f"{month:%Y-%m} is too recent to archive")
+        oldest = ArchiveService.next_month()
+        if oldest is not None and oldest < month:
+            raise ValueError(f"Archive {oldest:%Y-%m} first; months are archived oldest first")
+
+        result = ArchiveResult(month=month)
+        segments = []
+        for shard in shard_names():
+            segment = db.query(TransactionSegment)\
+                .filter(TransactionSegment.month == month, TransactionSegment.shard == (shard or ""))\
+                .first()
+            if segment is not None and segment.status == SegmentStatus.PURGED:
+                segments.append(segment)
+                continue
+
+            shard_db = shard_session(shard)
+            try:
+                if transaction_repository.count_pending_created_between(shard_db, start=start, end=end):
+                    raise ValueError(f"{month:%Y-%m} still has pending transactions on shard {shard or 'default'}")
+                path = transaction_archive.path_for(shard, month)
+                full_path = os.path.join(transaction_archive.root, path)
+                row_count, amount_total, checksum = write_segment(
+                    full_path,
+                    transaction_repository.stream_created_between(shard_db, start=start, end=end),
+                )
+            finally:
+                shard_db.close()
+            if row_count == 0:
+                os.remove(full_path)
+                continue
+            if Segment(full_path).checksum() != (row_count, amount_total, checksum):
+                raise ValueError(f"Segment {path} does not read back as written")
+
+            if segment is None:
+                segment = TransactionSegment(month=month, shard=shard or "", status=SegmentStatus.VERIFIED)
+                db.add(segment)
+            segment.path = path
+            segment.row_count = row_count
+            segment.amount_total = amount_total
+            segment.checksum = checksum
+            db.commit()
+            segments.append(segment)
+        if not segments:
+            raise ValueError(f"No transactions in {month:%Y-%m}")
+
+        # Serve the month from the segments of every shard at once
+        for segment in segments:
+            if segment.status == SegmentStatus.VERIFIED:
+                segment.status = SegmentStatus.SERVING
+        db.commit()
+        transaction_archive.invalidate()
+        if drain_seconds is None:
+            drain_seconds = settings.TRANSACTION_ARCHIVE_REFRESH_SECONDS + settings.REQUEST_DEADLINE_MAX_MS / 1000
+        time.sleep(drain_seconds)
+
+        for segment in segments:
+            result.segments += 1
+            result.rows += segment.row_count
+            result.amount_total += segment.amount_total / AMOUNT_SCALE
+            if segment.status == SegmentStatus.PURGED:
+                continue
+
+            shard_db = shard_session(segment.shard or None)
+            try:
+                expected = (segment.row_count, segment.amount_total, segment.checksum)
+                source = checksum_rows(transaction_repository.stream_created_between(shard_db, start=start, end=end))
+                archived = Segment(os.path.join(transaction_archive.root, segment.path)).checksum()
+                if source != expected or archived != expected:
+                    # Nothing is deleted; archiving the month again rewrites the segment
+                    raise ValueError(
+                        f"Segment {segment.path} no longer matches the transactions table; archive {month:%Y-%m} again"
+                    )
+                result.deleted += transaction_repository.delete_created_between(
+                    shard_db, start=start, end=end, chunk_size=settings.TRANSACTION_ARCHIVE_DELETE_CHUNK_SIZE,
+                )
+            finally:
+                shard_db.close()
+            segment.status = SegmentStatus.PURGED
+            db.commit()
+
+        logger.info(
+            f"Archived {month:%Y-%m}: {result.rows} transactions in {result.segments} segments, "
+            f"{result.deleted} deleted from the table"
+        )
+        return result
+
+    @staticmethod
+    def verify_month(db: Session, *, month: date) -> bool:
+        """
+        Check a month's segments against the catalog and, until purged, the table.
+
+        Args:
+            db: Database session
+            month: Archived month
+
+        Returns:
+            Whether every segment of the month matches
+        """
+        month = month.replace(day=1)
+        start, end = month_bounds(month)
+        ok = True
+        for segment in db.query(TransactionSegment).filter(TransactionSegment.month == month):
+            expected = (segment.row_count, segment.amount_total, segment.checksum)
+            matches = Segment(os.path.join(transaction_archive.root, segment.path)).checksum() == expected
+            if matches and segment.status != SegmentStatus.PURGED:
+                shard_db = shard_session(segment.shard or None)
+                try:
+                    matches = checksum_rows(
+                        transaction_repository.stream_created_between(shard_db, start=start, end=end)
+                    ) == expected
+                finally:
+                    shard_db.close()
+            if not matches:
+                logger.error(f"Segment {segment.path} does not match")
+            ok = ok and matches
+        return ok
@@ -9,10 +9,13 @@ import jwt
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.db.context import bind_user
 from app.db.repositories import user_repository, audit_repository
 from app.db.models.audit import AuditAction
-from app.models.user import User
+from app.db.models.user import User
+from app.core.metrics import FAILED_LOGINS
 from app.core.security import ALGORITHM, verify_password
+from app.core.timing import span
 from app.config.settings import settings
 
 # OAuth2 token URL
@@ -52,6 +55,7 @@ class AuthService:
                 data={"email": email, "success": False, "reason": "user_not_found"},
                 ip_address=ip_address,
             )
+            FAILED_LOGINS.labels("user_not_found").inc()
             return None
         
         if not verify_password(password, user.hashed_password):
@@ -65,6 +69,7 @@ class AuthService:
                 data={"success": False, "reason": "invalid_password"},
                 ip_address=ip_address,
             )
+            FAILED_LOGINS.labels("invalid_password").inc()
             return None
         
         if not user.is_active:
@@ -78,6 +83,7 @@ class AuthService:
                 data={"success": False, "reason": "inactive_user"},
                 ip_address=ip_address,
             )
+            FAILED_LOGINS.labels("inactive_user").inc()
             return None
         
         # Audit successful login
@@ -117,19 +123,20 @@ class AuthService:
             headers={"WWW-Authenticate": "Bearer"},
         )
         
-        try:
-            payload = jwt.decode(
-                token, 
-                settings.SECRET_KEY, 
-                algorithms=[ALGORITHM]
-            )
-            user_id: str = payload.get("sub")
-            if user_id is None:
+        with span("auth"):
+            try:
+                payload = jwt.decode(
+                    token, 
+                    settings.SECRET_KEY, 
+                    algorithms=[ALGORITHM]
+                )
+                user_id: str = payload.get("sub")
+                if user_id is None:
+                    raise credentials_exception
+            except PyJWTError:
                 raise credentials_exception
-        except PyJWTError:
-            raise credentials_exception
-            
-        user = user_repository.get(db, id=int(user_id))
+                
+            user = user_repository.get(db, id=int(user_id))
         if user is None:
             raise credentials_exception
             
@@ -139,6 +146,8 @@ class AuthService:
                 detail="Inactive user",
             )
             
+        # Reads of this request must see the user's own earlier writes
+        bind_user(user.id, superuser=user.is_superuser)
         return user
     
     @staticmethod
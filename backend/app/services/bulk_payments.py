@@ -0,0 +1,514 @@
+# backend/app/services/bulk_payments.py
+import hashlib
+import uuid
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.account_cache import invalidate_on_commit
+from app.db.repositories import account_repository, transaction_repository, audit_repository
+from app.db.models.account import Account
+from app.db.models.audit import AuditAction
+from app.db.models.transaction import TransactionType, TransactionStatus
+from app.services.fees import FeeService
+
+PAIN_001_MESSAGE_NAME = "pain.001.001.03"
+PAIN_002_NAMESPACE = "urn:iso:std:iso:20022:tech:xsd:pain.002.001.03"
+
+# ISO 20022 external status reason codes used in the pain.002 report
+REASON_INCORRECT_ACCOUNT = "AC01"
+REASON_CLOSED_ACCOUNT = "AC04"
+REASON_NOT_ALLOWED_AMOUNT = "AM02"
+REASON_NOT_ALLOWED_CURRENCY = "AM03"
+REASON_INSUFFICIENT_FUNDS = "AM04"
+REASON_TRANSACTION_FORBIDDEN = "AG01"
+
+# Namespaced tag -> local name, memoized since a file only uses a few dozen tags
+_LOCAL_NAMES: Dict[str, str] = {}
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from an element tag."""
+    name = _LOCAL_NAMES.get(tag)
+    if name is None:
+        name = _LOCAL_NAMES[tag] = tag.rsplit("}", 1)[-1]
+    return name
+
+def _find_text(element: ET.Element, path: str) -> Optional[str]:
+    """Find the text of a namespace-agnostic child path such as 'PmtId/EndToEndId'."""
+    current = element
+    for name in path.split("/"):
+        for child in current:
+            if _local_name(child.tag) == name:
+                current = child
+                break
+        else:
+            return None
+    return current.text.strip() if current.text else None
+
+def _account_identifier(element: ET.Element) -> Optional[str]:
+    """Read an account identifier from an Id/IBAN or Id/Othr/Id block."""
+    return _find_text(element, "Id/IBAN") or _find_text(element, "Id/Othr/Id")
+
+@dataclass
+class Pain001Payment:
+    """Single credit transfer (CdtTrfTxInf) read from a pain.001 file."""
+    payment_information_id: str
+    end_to_end_id: str
+    instruction_id: Optional[str]
+    debtor_account: Optional[str]
+    amount: Optional[Decimal]
+    currency: Optional[str]
+    creditor_name: Optional[str]
+    creditor_account: Optional[str]
+    remittance_information: Optional[str]
+
+class Pain001Parser:
+    """
+    Incremental pain.001 parser.
+
+    Payments are yielded as their CdtTrfTxInf element closes and the element
+    is then detached from the tree, so memory stays constant regardless of
+    the number of payments in the file.
+
+    Attributes:
+        message_id: GrpHdr/MsgId, available once iteration has started
+        number_of_transactions: GrpHdr/NbOfTxs as declared by the sender
+        control_sum: GrpHdr/CtrlSum as declared by the sender
+    """
+
+    def __init__(self, source: Union[str, BinaryIO]):
+        """
+        Initialize the parser.
+
+        Args:
+            source: File path or binary file object
+        """
+        self.source = source
+        self.message_id: Optional[str] = None
+        self.number_of_transactions: Optional[int] = None
+        self.control_sum: Optional[Decimal] = None
+
+    def __iter__(self) -> Iterator[Pain001Payment]:
+        payment_information = None
+        payment_information_id = None
+        debtor_account = None
+
+        for event, element in ET.iterparse(self.source, events=("start", "end")):
+            name = _local_name(element.tag)
+
+            if event == "start":
+                if name == "PmtInf":
+                    payment_information = element
+                    payment_information_id = None
+                    debtor_account = None
+                continue
+
+            if name == "GrpHdr":
+                self.message_id = _find_text(element, "MsgId")
+                number_of_transactions = _find_text(element, "NbOfTxs")
+                control_sum = _find_text(element, "CtrlSum")
+                self.number_of_transactions = int(number_of_transactions) if number_of_transactions else None
+                self.control_sum = Decimal(control_sum) if control_sum else None
+                element.clear()
+
+            elif name == "PmtInfId" and payment_information is not None:
+                payment_information_id = (element.text or "").strip()
+
+            elif name == "DbtrAcct" and payment_information is not None:
+                debtor_account = _account_identifier(element)
+
+            elif name == "CdtTrfTxInf":
+                yield self._build_payment(element, payment_information_id, debtor_account)
+                # Detach the processed payment so the tree never grows
+                element.clear()
+                if payment_information is not None:
+                    payment_information.remove(element)
+
+            elif name == "PmtInf":
+                element.clear()
+                payment_information = None
+
+    @staticmethod
+    def _build_payment(
+        element: ET.Element,
+        payment_information_id: Optional[str],
+        debtor_account: Optional[str],
+    ) -> Pain001Payment:
+        amount = None
+        currency = None
+        for child in element:
+            if _local_name(child.tag) != "Amt":
+                continue
+            for amount_element in child:
+                if _local_name(amount_element.tag) == "InstdAmt":
+                    currency = amount_element.get("Ccy")
+                    try:
+                        amount = Decimal((amount_element.text or "").strip())
+                    except InvalidOperation:
+                        amount = None
+
+        creditor_account = None
+        for child in element:
+            if _local_name(child.tag) == "CdtrAcct":
+                creditor_account = _account_identifier(child)
+
+        return Pain001Payment(
+            payment_information_id=payment_information_id or "",
+            end_to_end_id=_find_text(element, "PmtId/EndToEndId") or "",
+            instruction_id=_find_text(element, "PmtId/InstrId"),
+            debtor_account=debtor_account,
+            amount=amount,
+            currency=currency.upper() if currency else None,
+            creditor_name=_find_text(element, "Cdtr/Nm"),
+            creditor_account=creditor_account,
+            remittance_information=_find_text(element, "RmtInf/Ustrd"),
+        )
+
+@dataclass
+class PaymentRejection:
+    """Rejected payment reported in the pain.002 status report."""
+    payment_information_id: str
+    end_to_end_id: str
+    instruction_id: Optional[str]
+    reason_code: str
+    reason: str
+
+@dataclass
+class BulkPaymentReport:
+    """Outcome of a pain.001 ingestion."""
+    message_id: Optional[str] = None
+    number_of_transactions: int = 0
+    accepted: int = 0
+    accepted_amount: Decimal = Decimal("0")
+    rejections: List[PaymentRejection] = field(default_factory=list)
+
+    @property
+    def group_status(self) -> str:
+        """ISO 20022 group status: ACSC, PART or RJCT."""
+        if not self.rejections:
+            return "ACSC"
+        if self.accepted:
+            return "PART"
+        return "RJCT"
+
+    def to_pain002(self) -> bytes:
+        """
+        Render the report as a pain.002 customer payment status report.
+
+        Returns:
+            UTF-8 encoded XML document
+        """
+        ET.register_namespace("", PAIN_002_NAMESPACE)
+        ns = f"{{{PAIN_002_NAMESPACE}}}"
+
+        document = ET.Element(f"{ns}Document")
+        report = ET.SubElement(document, f"{ns}CstmrPmtStsRpt")
+
+        group_header = ET.SubElement(report, f"{ns}GrpHdr")
+        ET.SubElement(group_header, f"{ns}MsgId").text = f"STS-{uuid.uuid4().hex[:16].upper()}"
+        ET.SubElement(group_header, f"{ns}CreDtTm").text = datetime.utcnow().replace(microsecond=0).isoformat()
+
+        original_group = ET.SubElement(report, f"{ns}OrgnlGrpInfAndSts")
+        ET.SubElement(original_group, f"{ns}OrgnlMsgId").text = self.message_id or ""
+        ET.SubElement(original_group, f"{ns}OrgnlMsgNmId").text = PAIN_001_MESSAGE_NAME
+        ET.SubElement(original_group, f"{ns}OrgnlNbOfTxs").text = str(self.number_of_transactions)
+        ET.SubElement(original_group, f"{ns}GrpSts").text = self.group_status
+
+        by_payment_information: Dict[str, List[PaymentRejection]] = defaultdict(list)
+        for rejection in self.rejections:
+            by_payment_information[rejection.payment_information_id].append(rejection)
+
+        for payment_information_id, rejections in by_payment_information.items():
+            original_payment = ET.SubElement(report, f"{ns}OrgnlPmtInfAndSts")
+            ET.SubElement(original_payment, f"{ns}OrgnlPmtInfId").text = payment_information_id
+            for rejection in rejections:
+                status = ET.SubElement(original_payment, f"{ns}TxInfAndSts")
+                if rejection.instruction_id:
+                    ET.SubElement(status, f"{ns}OrgnlInstrId").text = rejection.instruction_id
+                ET.SubElement(status, f"{ns}OrgnlEndToEndId").text = rejection.end_to_end_id
+                ET.SubElement(status, f"{ns}TxSts").text = "RJCT"
+                reason = ET.SubElement(status, f"{ns}StsRsnInf")
+                ET.SubElement(ET.SubElement(reason, f"{ns}Rsn"), f"{ns}Cd").text = rejection.reason_code
+                ET.SubElement(reason, f"{ns}AddtlInf").text = rejection.reason
+
+        return ET.tostring(document, encoding="utf-8", xml_declaration=True)
+
+class BulkPaymentService:
+    """Bulk payment file ingestion service."""
+
+    @staticmethod
+    def ingest_pain001(
+        db: Session,
+        *,
+        source: Union[str, BinaryIO],
+        current_user_id: int,
+        is_superuser: bool = False,
+        chunk_size: int = 1000,
+        ip_address: str = None,
+    ) -> BulkPaymentReport:
+        """
+        Ingest a pain.001 credit transfer file.
+
+        The file is streamed twice: the first pass collects the distinct
+        debtor accounts, which are then validated with a single batched
+        lookup; the second pass posts the payments in chunks, each chunk in
+        its own database transaction with the debtor rows locked. This method
+        is synchronous and should be run in a worker thread.
+
+        Reference IDs are derived from GrpHdr/MsgId and each payment's
+        identifiers and position in the file, so uploading a file again
+        after a failure skips the payments already posted and resumes where
+        it stopped. Payments are charged the per-transaction fee of a
+        single payment.
+
+        Args:
+            db: Database session
+            source: File path or seekable binary file object
+            current_user_id: ID of the user submitting the file
+            is_superuser: Whether the user may debit accounts they do not own
+            chunk_size: Number of payments posted per database transaction
+            ip_address: Client IP address for audit logging
+
+        Returns:
+            Ingestion report, renderable as pain.002
+
+        Raises:
+            ParseError: If the file is not well-formed or has no GrpHdr/MsgId
+        """
+        # First pass: distinct debtor accounts, validated with one query
+        parser = Pain001Parser(BulkPaymentService._rewind(source))
+        debtor_numbers = {payment.debtor_account for payment in parser if payment.debtor_account}
+        if not parser.message_id:
+            raise ET.ParseError("GrpHdr/MsgId is missing")
+        debtors = {
+            account.account_number: account
+            for account in account_repository.get_by_account_numbers(
+                db, account_numbers=list(debtor_numbers),
+            )
+        }
+        db.commit()
+
+        # Second pass: post payments chunk by chunk
+        parser = Pain001Parser(BulkPaymentService._rewind(source))
+        report = BulkPaymentReport(message_id=parser.message_id)
+        chunk: List[Tuple[str, Pain001Payment]] = []
+
+        for payment in parser:
+            report.number_of_transactions += 1
+            reason = BulkPaymentService._precheck(
+                payment,
+                debtors.get(payment.debtor_account),
+                current_user_id=current_user_id,
+                is_superuser=is_superuser,
+            )
+            if reason:
+                report.rejections.append(BulkPaymentService._rejection(payment, *reason))
+                continue
+
+            reference_id = BulkPaymentService.reference_id(
+                report.message_id, payment, sequence=report.number_of_transactions,
+            )
+            chunk.append((reference_id, payment))
+            if len(chunk) >= chunk_size:
+                BulkPaymentService._post_chunk(
+                    db, chunk, debtors, report,
+                    current_user_id=current_user_id,
+                    ip_address=ip_address,
+                )
+                chunk = []
+
+        if chunk:
+            BulkPaymentService._post_chunk(
+                db, chunk, debtors, report,
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+
+        return report
+
+    @staticmethod
+    def reference_id(message_id: str, payment: Pain001Payment, *, sequence: int) -> str:
+        """
+        Derive the reference ID of a payment, the same on every upload of the file.
+
+        Args:
+            message_id: GrpHdr/MsgId of the file
+            payment: Payment
+            sequence: Position of the payment in the file, from 1
+
+        Returns:
+            Reference ID
+        """
+        key = "\x1f".join((message_id, payment.payment_information_id, payment.end_to_end_id, str(sequence)))
+        return f"PAIN-{hashlib.sha256(key.encode()).hexdigest()[:32].upper()}"
+
+    @staticmethod
+    def _rewind(source: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source
+
+    @staticmethod
+    def _rejection(payment: Pain001Payment, reason_code: str, reason: str) -> PaymentRejection:
+        return PaymentRejection(
+            payment_information_id=payment.payment_information_id,
+            end_to_end_id=payment.end_to_end_id,
+            instruction_id=payment.instruction_id,
+            reason_code=reason_code,
+            reason=reason,
+        )
+
+    @staticmethod
+    def _precheck(
+        payment: Pain001Payment,
+        account: Optional[Account],
+        *,
+        current_user_id: int,
+        is_superuser: bool,
+    ) -> Optional[Tuple[str, str]]:
+        """Validate a payment against its debtor account, without touching balances."""
+        if account is None:
+            return REASON_INCORRECT_ACCOUNT, "Debtor account not found"
+        if account.user_id != current_user_id and not is_superuser:
+            return REASON_TRANSACTION_FORBIDDEN, "Not enough permissions to debit this account"
+        if not account.is_active:
+            return REASON_CLOSED_ACCOUNT, "Account is inactive"
+        if payment.amount is None or payment.amount <= 0:
+            return REASON_NOT_ALLOWED_AMOUNT, "Payment amount must be positive"
+        if payment.currency != account.currency:
+            return REASON_NOT_ALLOWED_CURRENCY, f"Currency mismatch. Account currency is {account.currency}"
+        return None
+
+    @staticmethod
+    def _post_chunk(
+        db: Session,
+        chunk: List[Tuple[str, Pain001Payment]],
+        debtors: Dict[str, Account],
+        report: BulkPaymentReport,
+        *,
+        current_user_id: int,
+        ip_address: str = None,
+    ) -> None:
+        """Post one chunk of prechecked payments in a single database transaction."""
+        account_ids = {debtors[payment.debtor_account].id for _, payment in chunk}
+
+        try:
+            # Lock the debtor rows and read their current balance and status
+            locked = {
+                row.id: row
+                for row in db.query(Account.id, Account.balance, Account.is_active, Account.deleted_at)
+                .filter(Account.id.in_(account_ids))
+                .with_for_update()
+                .all()
+            }
+            # Payments of an earlier upload of the file that stopped partway
+            posted = transaction_repository.get_existing_reference_ids(
+                db,
+                account_ids=account_ids,
+                reference_ids=[reference_id for reference_id, _ in chunk],
+            )
+
+            rows = []
+            accepted = 0
+            pending: Dict[int, float] = defaultdict(float)
+            chunk_amount = Decimal("0")
+            for reference_id, payment in chunk:
+                debtor = debtors[payment.debtor_account]
+                account = locked.get(debtor.id)
+                amount = float(payment.amount)
+                if (reference_id, debtor.id) in posted:
+                    accepted += 1
+                    chunk_amount += payment.amount
+                    continue
+                if account is None or not account.is_active or account.deleted_at is not None:
+                    report.rejections.append(BulkPaymentService._rejection(
+                        payment, REASON_CLOSED_ACCOUNT, "Account is inactive",
+                    ))
+                    continue
+
+                fee = FeeService.transaction_fee(
+                    transaction_type=TransactionType.PAYMENT,
+                    account_type=debtor.account_type,
+                    amount=amount,
+                )
+                if account.balance - pending[debtor.id] < amount + fee:
+                    report.rejections.append(BulkPaymentService._rejection(
+                        payment, REASON_INSUFFICIENT_FUNDS, "Insufficient funds",
+                    ))
+                    continue
+
+                pending[debtor.id] += amount + fee
+                accepted += 1
+                chunk_amount += payment.amount
+                description = f"Payment to {payment.creditor_name or payment.creditor_account or 'creditor'}"
+                if payment.remittance_information:
+                    description = f"{description}: {payment.remittance_information}"
+                rows.append({
+                    "transaction_type": TransactionType.PAYMENT,
+                    "amount": amount,
+                    "currency": payment.currency,
+                    "description": description,
+                    "reference_id": reference_id,
+                    "status": TransactionStatus.COMPLETED,
+                    "account_id": debtor.id,
+                })
+                if fee:
+                    rows.append({
+                        "transaction_type": TransactionType.FEE,
+                        "amount": fee,
+                        "currency": payment.currency,
+                        "description": f"Payment fee: {reference_id}",
+                        "reference_id": f"{reference_id}-FEE",
+                        "status": TransactionStatus.COMPLETED,
+                        "account_id": debtor.id,
+                    })
+
+            # Only what was inserted is debited, so no payment is ever debited twice
+            inserted = transaction_repository.bulk_create(db, rows=rows)
+            rows = [row for row in rows if (row["reference_id"], row["account_id"]) in inserted]
+            debits: Dict[int, float] = defaultdict(float)
+            for row in rows:
+                debits[row["account_id"]] += row["amount"]
+            for account_id, amount in debits.items():
+                db.query(Account)\
+                    .filter(Account.id == account_id)\
+                    .update(
+                        {
+                            Account.balance: Account.balance - amount,
+                            Account.last_activity_at: func.now(),
+                            Account.dormant_since: None,
+                            Account.version: Account.version + 1,
+                        },
+                        synchronize_session=False,
+                    )
+            invalidate_on_commit(db, debits)
+
+            if rows:
+                audit_repository.log_action(
+                    db,
+                    action=AuditAction.CREATE,
+                    entity_type="transaction",
+                    user_id=current_user_id,
+                    data={
+                        "transaction_type": TransactionType.PAYMENT.value,
+                        "bulk_reference": f"PAIN-{report.message_id}",
+                        "count": sum(row["transaction_type"] == TransactionType.PAYMENT for row in rows),
+                        "amount": float(chunk_amount),
+                        "fees": sum(row["amount"] for row in rows if row["transaction_type"] == TransactionType.FEE),
+                        "debits": {str(account_id): amount for account_id, amount in debits.items()},
+                    },
+                    ip_address=ip_address,
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        report.accepted += accepted
+        report.accepted_amount += chunk_amount
@@ -0,0 +1,128 @@
+# backend/app/services/dormancy.py
+import csv
+import enum
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, TextIO
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.db.repositories import account_repository, audit_repository
+from app.db.models.audit import AuditAction
+
+logger = logging.getLogger("banking-system")
+
+class DormancyAction(enum.Enum):
+    REPORT = "report"  # Only list dormant accounts
+    FLAG = "flag"  # Set dormant_since
+    DEACTIVATE = "deactivate"  # Set dormant_since and is_active = False
+
+@dataclass
+class DormancySweepResult:
+    """Summary of a dormancy sweep."""
+    cutoff_date: datetime
+    action: DormancyAction
+    accounts: int = 0
+    total_balance: float = 0.0
+
+REPORT_COLUMNS = ["account_id", "user_id", "account_number", "balance", "currency", "last_activity_at"]
+
+class DormancyService:
+    """Dormant account detection and sweep."""
+
+    @staticmethod
+    def sweep(
+        db: Session,
+        *,
+        days_inactive: int = None,
+        action: DormancyAction = DormancyAction.FLAG,
+        chunk_size: int = None,
+        report: Optional[TextIO] = None,
+        report_header: bool = True,
+        current_user_id: int = None,
+    ) -> DormancySweepResult:
+        """
+        Find accounts without postings for days_inactive days and flag or deactivate them.
+
+        Dormant accounts are streamed in keyset chunks from the partial
+        ix_accounts_dormancy index, so the cost scales with the number of
+        dormant accounts rather than with transaction history. Each chunk is
+        updated with a single UPDATE and committed on its own.
+
+        Args:
+            db: Database session
+            days_inactive: Days without postings, defaults to DORMANCY_DAYS
+            action: What to do with dormant accounts
+            chunk_size: Number of accounts per chunk
+            report: Optional text file receiving one CSV row per dormant account
+            report_header: Whether to start the report with a header row
+            current_user_id: ID of the user running the sweep (for audit), None for system
+
+        Returns:
+            Sweep summary
+        """
+        days_inactive = days_inactive or settings.DORMANCY_DAYS
+        chunk_size = chunk_size or settings.DORMANCY_SWEEP_CHUNK_SIZE
+        cutoff_date = datetime.now() - timedelta(days=days_inactive)
+        result = DormancySweepResult(cutoff_date=cutoff_date, action=action)
+
+        writer = None
+        if report is not None:
+            writer = csv.writer(report)
+            if report_header:
+                writer.writerow(REPORT_COLUMNS)
+
+        after = None
+        while True:
+            rows = account_repository.get_dormancy_candidates(
+                db,
+                cutoff_date=cutoff_date,
+                after=after,
+                limit=chunk_size,
+            )
+            if not rows:
+                break
+
+            after = (rows[-1].last_activity_at, rows[-1].id)
+            account_ids = [row.id for row in rows]
+
+            if writer is not None:
+                writer.writerows(
+                    [row.id, row.user_id, row.account_number, row.balance, row.currency,
+                     row.last_activity_at.isoformat()]
+                    for row in rows
+                )
+
+            try:
+                if action != DormancyAction.REPORT:
+                    account_repository.mark_dormant(
+                        db,
+                        account_ids=account_ids,
+                        deactivate=action == DormancyAction.DEACTIVATE,
+                    )
+                    audit_repository.log_action(
+                        db,
+                        action=AuditAction.UPDATE,
+                        entity_type="account",
+                        user_id=current_user_id,
+                        data={
+                            "dormancy_action": action.value,
+                            "cutoff_date": cutoff_date.isoformat(),
+                            "account_ids": account_ids,
+                        },
+                    )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            result.accounts += len(rows)
+            result.total_balance += sum(row.balance for row in rows)
+
+        logger.info(
+            f"Dormancy sweep ({action.value}, inactive since {cutoff_date:%Y-%m-%d}): "
+            f"{result.accounts} accounts, {result.total_balance:.2f} total balance"
+        )
+        return result
@@ -0,0 +1,211 @@
+# backend/app/services/fees.py
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.db.repositories import account_repository, transaction_repository, audit_repository
+from app.db.models.account import AccountType
+from app.db.models.audit import AuditAction
+from app.db.models.transaction import TransactionType
+
+logger = logging.getLogger("banking-system")
+
+@dataclass(frozen=True)
+class MonthlyMaintenanceFee:
+    """Flat monthly fee, waived when the balance is at least waived_at_balance."""
+    code: str
+    account_type: AccountType
+    amount: float
+    waived_at_balance: Optional[float] = None
+
+@dataclass(frozen=True)
+class MinimumBalanceFee:
+    """Monthly fee charged when the balance is below minimum_balance."""
+    code: str
+    account_type: AccountType
+    minimum_balance: float
+    amount: float
+
+@dataclass(frozen=True)
+class TransactionFee:
+    """Per-transaction fee: flat + percent of the amount, clamped to [minimum, maximum]."""
+    transaction_type: TransactionType
+    account_type: AccountType
+    flat: float = 0.0
+    percent: float = 0.0
+    minimum: float = 0.0
+    maximum: Optional[float] = None
+
+    def calculate(self, amount: float) -> float:
+        fee = max(self.flat + amount * self.percent, self.minimum)
+        if self.maximum is not None:
+            fee = min(fee, self.maximum)
+        return round(fee, 2)
+
+FeeSchedule = Union[MonthlyMaintenanceFee, MinimumBalanceFee, TransactionFee]
+
+# Declarative fee schedules
+FEE_SCHEDULES: Tuple[FeeSchedule, ...] = (
+    MonthlyMaintenanceFee(
+        code="MNT",
+        account_type=AccountType.CHECKING,
+        amount=5.00,
+        waived_at_balance=1_500.00,
+    ),
+    MinimumBalanceFee(
+        code="MIN",
+        account_type=AccountType.SAVINGS,
+        minimum_balance=300.00,
+        amount=3.00,
+    ),
+    TransactionFee(
+        transaction_type=TransactionType.WITHDRAWAL,
+        account_type=AccountType.SAVINGS,
+        flat=2.50,
+    ),
+)
+
+def compile_transaction_fees(
+    schedules: Tuple[FeeSchedule, ...],
+) -> Dict[Tuple[TransactionType, AccountType], TransactionFee]:
+    """Index per-transaction fees by (transaction type, account type) for O(1) lookup."""
+    return {
+        (schedule.transaction_type, schedule.account_type): schedule
+        for schedule in schedules
+        if isinstance(schedule, TransactionFee)
+    }
+
+# Compiled once at import so the posting path never queries for fees
+_TRANSACTION_FEES = compile_transaction_fees(FEE_SCHEDULES)
+
+@dataclass
+class FeeAssessmentResult:
+    """Summary of a periodic fee run."""
+    period: date
+    partition: Optional[int] = None
+    fees_posted: int = 0
+    amount_posted: float = 0.0
+
+class FeeService:
+    """Fee engine for periodic and per-transaction fees."""
+
+    @staticmethod
+    def transaction_fee(
+        *,
+        transaction_type: TransactionType,
+        account_type: AccountType,
+        amount: float,
+    ) -> float:
+        """
+        Calculate the fee for a transaction from the compiled schedule.
+
+        Args:
+            transaction_type: Transaction type
+            account_type: Type of the debited account
+            amount: Transaction amount
+
+        Returns:
+            Fee amount, 0.0 if no fee applies
+        """
+        schedule = _TRANSACTION_FEES.get((transaction_type, account_type))
+        if schedule is None:
+            return 0.0
+        return schedule.calculate(amount)
+
+    @staticmethod
+    def assess_periodic_fees(
+        db: Session,
+        *,
+        period: date,
+        chunk_size: int = None,
+        partition: Optional[int] = None,
+        partitions: Optional[int] = None,
+    ) -> FeeAssessmentResult:
+        """
+        Charge the monthly maintenance and minimum-balance fees for a period.
+
+        Each schedule is evaluated with one set-based statement per account
+        ID-range chunk, and each chunk is committed on its own. Reference IDs
+        embed the schedule code and month, so rerunning a period only charges
+        accounts that were not charged yet. Runs restricted to different
+        partitions of the transactions table charge disjoint sets of accounts
+        and can run in parallel.
+
+        Args:
+            db: Database session
+            period: Any date within the month being charged
+            chunk_size: Width of each account ID-range chunk
+            partition: Transactions partition to restrict the run to
+            partitions: Number of transactions partitions, defaults to TRANSACTION_PARTITIONS
+
+        Returns:
+            Fee run summary
+        """
+        chunk_size = chunk_size or settings.FEE_ASSESSMENT_CHUNK_SIZE
+        partitions = partitions or settings.TRANSACTION_PARTITIONS
+        result = FeeAssessmentResult(period=period.replace(day=1), partition=partition)
+        month_tag = period.strftime("%Y%m")
+
+        min_id, max_id = account_repository.get_id_range(db)
+        if min_id is None:
+            return result
+
+        for schedule in FEE_SCHEDULES:
+            if isinstance(schedule, MonthlyMaintenanceFee):
+                balance_below = schedule.waived_at_balance
+                description = f"Monthly maintenance fee {period:%Y-%m}"
+            elif isinstance(schedule, MinimumBalanceFee):
+                balance_below = schedule.minimum_balance
+                description = f"Minimum balance fee {period:%Y-%m}"
+            else:
+                continue
+
+            for start_id in range(min_id, max_id + 1, chunk_size):
+                end_id = start_id + chunk_size
+                try:
+                    posted, amount = transaction_repository.post_periodic_fees(
+                        db,
+                        account_type=schedule.account_type.name,
+                        amount=schedule.amount,
+                        balance_below=balance_below,
+                        reference_prefix=f"FEE-{schedule.code}-{month_tag}",
+                        description=description,
+                        start_id=start_id,
+                        end_id=end_id,
+                        partition=partition,
+                        partitions=partitions,
+                    )
+                    if posted:
+                        audit_repository.log_action(
+                            db,
+                            action=AuditAction.CREATE,
+                            entity_type="transaction",
+                            data={
+                                "transaction_type": TransactionType.FEE.value,
+                                "fee_code": schedule.code,
+                                "period": f"{period:%Y-%m}",
+                                "start_id": start_id,
+                                "end_id": end_id,
+                                "partition": partition,
+                                "count": posted,
+                                "amount": amount,
+                            },
+                        )
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+
+                result.fees_posted += posted
+                result.amount_posted += amount
+
+        scope = f" partition {partition}/{partitions}" if partition is not None else ""
+        logger.info(
+            f"Fee assessment {period:%Y-%m}{scope}: "
+            f"{result.fees_posted} posted, {result.amount_posted:.2f} total"
+        )
+        return result
@@ -0,0 +1,373 @@
+# backend/app/services/idempotency.py
+import asyncio
+import hashlib
+import json
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.core.timing import span
+from app.db.repositories import idempotency_repository
+from app.db.models.idempotency import IdempotencyKey
+from app.db.session import shard_names, shard_session
+from app.db.unit_of_work import current_unit_of_work
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger("banking-system")
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Completed response kept in the in-process LRU front."""
+    request_hash: str
+    status_code: int
+    body: Any
+    expires_at: datetime
+
+class IdempotencyScope:
+    """
+    Handle returned by IdempotencyService.scope.
+
+    Attributes:
+        replay: Stored response to return instead of executing the request,
+            or None if the caller owns the key and must execute the request
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        cache_key: Optional[Tuple[int, str]] = None,
+        request_hash: str = None,
+        record: Optional[IdempotencyKey] = None,
+        replay: Optional[JSONResponse] = None,
+    ):
+        self.db = db
+        self.cache_key = cache_key
+        self.request_hash = request_hash
+        self.record = record
+        self.replay = replay
+
+    async def save(self, body: Any, *, status_code: int = status.HTTP_200_OK) -> None:
+        """
+        Store the response for the claimed key in the unit of work.
+
+        The postings made by the request and the stored response are committed
+        in the same transaction, so a retry either sees both or neither. The
+        response reaches the in-process LRU once the route commits the unit
+        of work; sessions without one are committed here.
+        Does nothing when the request carried no Idempotency-Key header.
+
+        Args:
+            body: Response body
+            status_code: HTTP status code
+        """
+        if self.record is None:
+            return
+
+        encoded_body = jsonable_encoder(body)
+        idempotency_repository.save_response(
+            self.db,
+            db_obj=self.record,
+            status_code=status_code,
+            body=encoded_body,
+        )
+        stored = StoredResponse(
+            request_hash=self.request_hash,
+            status_code=status_code,
+            body=encoded_body,
+            expires_at=self.record.expires_at,
+        )
+
+        unit_of_work = current_unit_of_work(self.db)
+        if unit_of_work is not None:
+            unit_of_work.after_commit(lambda: IdempotencyService._cache.set(self.cache_key, stored))
+            return
+
+        with span("commit"):
+            self.db.commit()
+        IdempotencyService._cache.set(self.cache_key, stored)
+
+    async def save_failure(self, exc: HTTPException) -> None:
+        """
+        Store a client error as the response if the claim was already committed.
+
+        A cross-shard transfer checkpoints its debit, and the claim with it,
+        before crediting the destination. When it then fails for good (the
+        source was refunded and checkpointed too), a retry must replay that
+        failure rather than find the claim in progress until it expires.
+        The failure is stored with another checkpoint, after discarding
+        what the failed request left uncommitted, as closing its unit of
+        work would. Claims of requests that did not checkpoint are simply
+        rolled back with the request.
+
+        Args:
+            exc: Error the request ended with
+        """
+        if self.record is None or exc.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            return
+
+        unit_of_work = current_unit_of_work(self.db)
+        if unit_of_work is None or not unit_of_work.checkpointed:
+            return
+
+        record_id = self.record.id
+        unit_of_work.rollback()
+        record = idempotency_repository.get(self.db, id=record_id)
+        if record is None or record.response_status_code is not None:
+            return
+        self.record = record
+        await self.save({"detail": exc.detail}, status_code=exc.status_code)
+        unit_of_work.checkpoint()
+
+class IdempotencyService:
+    """Idempotency-Key handling for money-movement endpoints."""
+
+    # Hot front for completed keys, checked before the database
+    _cache: LRUCache = LRUCache(maxsize=settings.IDEMPOTENCY_CACHE_SIZE)
+
+    # Keys currently being processed by this worker
+    _in_flight: Dict[Tuple[int, str], asyncio.Event] = {}
+
+    @staticmethod
+    def hash_request(*, method: str, path: str, payload: Any) -> str:
+        """
+        Compute a stable fingerprint of a request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            payload: Request body
+
+        Returns:
+            Hex-encoded SHA-256 digest
+        """
+        canonical = json.dumps(
+            jsonable_encoder(payload),
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(f"{method}\n{path}\n{canonical}".encode()).hexdigest()
+
+    @staticmethod
+    def _replay(stored: StoredResponse, request_hash: str) -> JSONResponse:
+        """Build the replayed response, rejecting reuse with a different payload."""
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key has already been used with a different request",
+            )
+        if stored.status_code is None:
+            # Claimed by a request that committed part of its work and has not finished
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed",
+            )
+
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.body,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    @staticmethod
+    @asynccontextmanager
+    async def scope(
+        db: Session,
+        *,
+        key: Optional[str],
+        user_id: int,
+        request: Request,
+        payload: Any,
+    ) -> AsyncIterator[IdempotencyScope]:
+        """
+        Guard a money-movement request with an Idempotency-Key.
+
+        Completed keys are replayed from the in-process LRU or the
+        idempotency_keys table without touching accounts, so routes open the
+        scope before loading and authorizing them. Duplicates that
+        arrive while the first request is still running wait for it: within
+        a worker on an asyncio.Event, across workers on the unique index of
+        the uncommitted claim row. A claim committed before its response (by
+        a cross-shard transfer) answers duplicates with 409, and a client
+        error ending such a request is stored as its response.
+
+        Usage:
+            async with IdempotencyService.scope(uow.db, key=key, ...) as idempotency:
+                if idempotency.replay is not None:
+                    return idempotency.replay
+                account = await AccountService.get_owned(uow.db, ...)
+                transaction = ...
+                await idempotency.save(transaction_schema)
+                uow.commit()
+
+        Args:
+            db: Database session
+            key: Client-supplied Idempotency-Key header value, may be None
+            user_id: ID of the user performing the request
+            request: Incoming request
+            payload: Request body
+
+        Yields:
+            IdempotencyScope for the request
+
+        Raises:
+            HTTPException: If the key is invalid, reused with a different payload,
+                or claimed by a request still in progress
+        """
+        if key is None:
+            yield IdempotencyScope(db)
+            return
+
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be between 1 and {MAX_IDEMPOTENCY_KEY_LENGTH} characters",
+            )
+
+        cache_key = (user_id, key)
+        request_hash = IdempotencyService.hash_request(
+            method=request.method,
+            path=request.url.path,
+            payload=payload,
+        )
+
+        # Wait for a duplicate already running in this worker
+        while cache_key in IdempotencyService._in_flight:
+            await IdempotencyService._in_flight[cache_key].wait()
+
+        now = datetime.utcnow()
+        stored = IdempotencyService._cache.get(cache_key)
+        if stored is not None:
+            if stored.expires_at > now:
+                yield IdempotencyScope(db, replay=IdempotencyService._replay(stored, request_hash))
+                return
+            IdempotencyService._cache.pop(cache_key)
+
+        event = asyncio.Event()
+        IdempotencyService._in_flight[cache_key] = event
+        try:
+            record = IdempotencyService._claim(
+                db,
+                user_id=user_id,
+                key=key,
+                request=request,
+                request_hash=request_hash,
+                now=now,
+            )
+
+            if isinstance(record, StoredResponse):
+                replay = IdempotencyService._replay(record, request_hash)
+                IdempotencyService._cache.set(cache_key, record)
+                yield IdempotencyScope(db, replay=replay)
+                return
+
+            idempotency = IdempotencyScope(
+                db,
+                cache_key=cache_key,
+                request_hash=request_hash,
+                record=record,
+            )
+            try:
+                yield idempotency
+            except HTTPException as e:
+                await idempotency.save_failure(e)
+                raise
+        finally:
+            del IdempotencyService._in_flight[cache_key]
+            event.set()
+
+    @staticmethod
+    def _claim(
+        db: Session,
+        *,
+        user_id: int,
+        key: str,
+        request: Request,
+        request_hash: str,
+        now: datetime,
+    ):
+        """
+        Claim the key, or return what is stored for it.
+
+        The stored response has no status code while the request that
+        claimed the key has committed part of its work but not finished;
+        _replay turns that into a 409.
+        """
+        expires_at = now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+        while True:
+            record = idempotency_repository.claim(
+                db,
+                user_id=user_id,
+                key=key,
+                request_method=request.method,
+                request_path=request.url.path,
+                request_hash=request_hash,
+                expires_at=expires_at,
+            )
+            if record is not None:
+                return record
+
+            existing = idempotency_repository.get_by_key(db, user_id=user_id, key=key)
+            if existing is None:
+                # Removed by the purge job between the insert and the select
+                continue
+
+            if existing.expires_at <= now:
+                # Expired but not yet purged, so the key can be reused
+                db.delete(existing)
+                db.flush()
+                continue
+
+            return StoredResponse(
+                request_hash=existing.request_hash,
+                status_code=existing.response_status_code,
+                body=existing.response_body,
+                expires_at=existing.expires_at,
+            )
+
+    @staticmethod
+    def purge_expired() -> int:
+        """
+        Delete expired idempotency keys from the database.
+
+        Returns:
+            Number of deleted keys
+        """
+        deleted = 0
+        for shard in shard_names():
+            db = shard_session(shard)
+            try:
+                deleted += idempotency_repository.purge_expired(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        return deleted
+
+    @staticmethod
+    async def purge_expired_periodically() -> None:
+        """Background task purging expired keys every IDEMPOTENCY_PURGE_INTERVAL_SECONDS."""
+        while True:
+            try:
+                deleted = await run_in_threadpool(IdempotencyService.purge_expired)
+                if deleted:
+                    logger.info(f"Purged {deleted} expired idempotency keys")
+            except Exception:
+                logger.exception("Failed to purge expired idempotency keys")
+
+            await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,238 @@
+# backend/app/services/interest.py
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.db.repositories import account_repository, transaction_repository, audit_repository
+from app.db.models.account import AccountType
+from app.db.models.audit import AuditAction
+from app.db.models.transaction import TransactionType
+
+logger = logging.getLogger("banking-system")
+
+@dataclass(frozen=True)
+class InterestRateTier:
+    """Annual rate applied to the whole balance once it reaches min_balance."""
+    min_balance: float
+    annual_rate: float
+
+# Per account type rate tables, tiers ordered by min_balance.
+# Account types without a table do not accrue interest; credit balances
+# are owed to the bank, so they are never credited interest.
+INTEREST_RATE_TABLES: Dict[AccountType, Tuple[InterestRateTier, ...]] = {
+    AccountType.SAVINGS: (
+        InterestRateTier(min_balance=0.0, annual_rate=0.0100),
+        InterestRateTier(min_balance=10_000.0, annual_rate=0.0150),
+        InterestRateTier(min_balance=100_000.0, annual_rate=0.0200),
+    ),
+}
+
+@dataclass
+class InterestAccrualResult:
+    """Summary of an accrual run over an account ID range."""
+    accrual_date: date
+    start_id: int
+    end_id: int
+    partition: Optional[int] = None
+    accounts_scanned: int = 0
+    accruals_posted: int = 0
+    amount_posted: float = 0.0
+
+class InterestService:
+    """Daily interest accrual engine."""
+
+    @staticmethod
+    def compute_daily_accruals(
+        balances: np.ndarray,
+        tiers: Tuple[InterestRateTier, ...],
+        *,
+        day_count_basis: int = None,
+    ) -> np.ndarray:
+        """
+        Compute one day of interest for an array of balances.
+
+        Args:
+            balances: Account balances
+            tiers: Rate table for the account type
+            day_count_basis: Days per year, defaults to INTEREST_DAY_COUNT_BASIS
+
+        Returns:
+            Accrued amounts, unrounded
+        """
+        day_count_basis = day_count_basis or settings.INTEREST_DAY_COUNT_BASIS
+        thresholds = np.array([tier.min_balance for tier in tiers], dtype=np.float64)
+        rates = np.array([tier.annual_rate for tier in tiers], dtype=np.float64)
+
+        tier_index = np.searchsorted(thresholds, balances, side="right") - 1
+        applicable = tier_index >= 0
+        annual_rates = np.where(applicable, rates[np.clip(tier_index, 0, None)], 0.0)
+
+        return balances * annual_rates / day_count_basis
+
+    @staticmethod
+    def split_cents(accrued: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Split accrued interest into whole cents to post and the rest to carry.
+
+        Rounding every day instead would lose or invent up to half a cent per
+        account per day; truncating and carrying the remainder posts exactly
+        the interest accrued over time.
+
+        Args:
+            accrued: Interest accrued so far, including the carried remainder
+
+        Returns:
+            Tuple of (amounts to post, remainders to carry)
+        """
+        # Round first so 0.29999999999999998 is 30 cents rather than 29
+        cents = np.floor(np.round(accrued * 100, 6))
+        amounts = cents / 100
+        return amounts, np.maximum(accrued - amounts, 0.0)
+
+    @staticmethod
+    def accrue(
+        db: Session,
+        *,
+        accrual_date: date,
+        start_id: Optional[int] = None,
+        end_id: Optional[int] = None,
+        chunk_size: int = None,
+        partition: Optional[int] = None,
+        partitions: Optional[int] = None,
+    ) -> InterestAccrualResult:
+        """
+        Accrue one day of interest for accounts in an ID range.
+
+        Accounts are streamed in ID-range chunks and each chunk is posted and
+        committed on its own. Each account is stamped with the accrual date
+        along with its posting, so the run is idempotent per date: rerunning
+        it after a crash only posts the chunks that did not commit. Interest
+        below a cent is carried on the account to the next day rather than
+        rounded away. Disjoint ID ranges can be run
+        in parallel by separate processes, and so can the partitions of the
+        transactions table: a run restricted to one partition only accrues
+        accounts whose transactions are written to that partition.
+
+        Args:
+            db: Database session
+            accrual_date: Date the interest is accrued for
+            start_id: First account ID (inclusive), defaults to the smallest ID
+            end_id: Last account ID (exclusive), defaults to past the largest ID
+            chunk_size: Width of each ID-range chunk
+            partition: Transactions partition to restrict the run to
+            partitions: Number of transactions partitions, defaults to TRANSACTION_PARTITIONS
+
+        Returns:
+            Accrual run summary
+        """
+        chunk_size = chunk_size or settings.INTEREST_ACCRUAL_CHUNK_SIZE
+        partitions = partitions or settings.TRANSACTION_PARTITIONS
+        if start_id is None or end_id is None:
+            min_id, max_id = account_repository.get_id_range(db)
+            if start_id is None:
+                start_id = min_id or 0
+            if end_id is None:
+                end_id = (max_id or 0) + 1
+
+        result = InterestAccrualResult(
+            accrual_date=accrual_date, start_id=start_id, end_id=end_id, partition=partition,
+        )
+
+        for chunk_start in range(start_id, end_id, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, end_id)
+            try:
+                scanned, posted, amount = InterestService._accrue_chunk(
+                    db,
+                    accrual_date=accrual_date,
+                    start_id=chunk_start,
+                    end_id=chunk_end,
+                    partition=partition,
+                    partitions=partitions,
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            result.accounts_scanned += scanned
+            result.accruals_posted += posted
+            result.amount_posted += amount
+
+        scope = f" partition {partition}/{partitions}" if partition is not None else ""
+        logger.info(
+            f"Interest accrual {accrual_date.isoformat()} [{start_id}, {end_id}){scope}: "
+            f"{result.accruals_posted} posted, {result.amount_posted:.2f} total"
+        )
+        return result
+
+    @staticmethod
+    def _accrue_chunk(
+        db: Session,
+        *,
+        accrual_date: date,
+        start_id: int,
+        end_id: int,
+        partition: Optional[int] = None,
+        partitions: Optional[int] = None,
+    ) -> Tuple[int, int, float]:
+        """Compute and post accruals for one ID-range chunk, without committing."""
+        scanned = 0
+        account_ids = []
+        amounts = []
+        carries = []
+
+        for account_type, tiers in INTEREST_RATE_TABLES.items():
+            rows = account_repository.get_balances_in_id_range(
+                db,
+                account_type=account_type,
+                start_id=start_id,
+                end_id=end_id,
+                accrual_date=accrual_date,
+                partition=partition,
+                partitions=partitions,
+            )
+            if not rows:
+                continue
+
+            scanned += len(rows)
+            ids, balances, carried = (np.array(column) for column in zip(*rows))
+            accrued = carried.astype(np.float64) + InterestService.compute_daily_accruals(
+                balances.astype(np.float64), tiers,
+            )
+            # Every scanned account is stamped with the date, even with nothing to post
+            due, carry = InterestService.split_cents(accrued)
+            account_ids.extend(ids.tolist())
+            amounts.extend(due.tolist())
+            carries.extend(carry.tolist())
+
+        posted, amount = transaction_repository.post_interest_accruals(
+            db,
+            accrual_date=accrual_date,
+            account_ids=account_ids,
+            amounts=amounts,
+            carries=carries,
+        )
+
+        if posted:
+            # Audit one summary entry per chunk rather than one per account
+            audit_repository.log_action(
+                db,
+                action=AuditAction.CREATE,
+                entity_type="transaction",
+                data={
+                    "transaction_type": TransactionType.INTEREST.value,
+                    "accrual_date": accrual_date.isoformat(),
+                    "start_id": start_id,
+                    "end_id": end_id,
+                    "partition": partition,
+                    "count": posted,
+                    "amount": amount,
+                },
+            )
+
+        return scanned, posted, amount
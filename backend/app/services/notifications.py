@@ -4,6 +4,7 @@ from datetime import datetime
 
 from sqlalchemy.orm import Session
 
+from app.core.metrics import NOTIFICATIONS_SENT
 from app.db.repositories import user_repository, account_repository, transaction_repository
 from app.db.models.user import User
 from app.db.models.account import Account
@@ -38,6 +39,7 @@ class NotificationService:
         print(f"Subject: {subject}")
         print(f"Body: {body}")
         
+        NOTIFICATIONS_SENT.labels("email").inc()
         return True
     
     @staticmethod
@@ -63,6 +65,7 @@ class NotificationService:
         print(f"Sending SMS to {phone_number}")
         print(f"Message: {message}")
         
+        NOTIFICATIONS_SENT.labels("sms").inc()
         return True
     
     @staticmethod
@@ -0,0 +1,205 @@
+# backend/app/services/rebalancing.py
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import Numeric, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.db.base import Base
+from app.db.invalidation import invalidation_bus
+from app.db.models.shard_directory import UserShard
+from app.db.models.user import User
+from app.db.session import shard_router, shard_session
+
+logger = logging.getLogger("banking-system")
+
+# Tables moved with a user, parents first
+MOVED_TABLES = ("accounts", "transactions", "audit_logs", "idempotency_keys")
+
+# Column summed to check each copied table, besides the row count
+CHECKSUM_COLUMNS = {"accounts": "balance", "transactions": "amount"}
+
+@dataclass(frozen=True)
+class UserMove:
+    """A user whose data should be on another shard."""
+    user_id: int
+    source: str
+    target: str
+
+@dataclass
+class MoveResult:
+    """Summary of a user move."""
+    user_id: int
+    source: str
+    target: str
+    rows: Dict[str, int] = field(default_factory=dict)
+
+class RebalanceService:
+    """Move users between shards."""
+
+    @staticmethod
+    def pin_users(db: Session) -> int:
+        """
+        Record the current placement of users placed only by the hash ring.
+
+        Run this before adding a shard to SHARD_DATABASES: the new ring
+        would otherwise send these users to a shard without their data.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of users pinned
+        """
+        unpinned = db.query(User.id)\
+            .outerjoin(UserShard, UserShard.user_id == User.id)\
+            .filter(UserShard.user_id.is_(None))\
+            .all()
+        for (user_id,) in unpinned:
+            db.add(UserShard(user_id=user_id, shard=shard_router.ring.shard_for(user_id)))
+        db.commit()
+        return len(unpinned)
+
+    @staticmethod
+    def plan(db: Session, *, limit: Optional[int] = None) -> List[UserMove]:
+        """
+        List users whose shard is not the one the hash ring gives them.
+
+        Args:
+            db: Database session
+            limit: Maximum number of moves
+
+        Returns:
+            Moves that bring placements in line with the ring
+        """
+        moves = []
+        for placement in db.query(UserShard).filter(UserShard.moving.is_(False)).order_by(UserShard.user_id):
+            target = shard_router.ring.shard_for(placement.user_id)
+            if target != placement.shard:
+                moves.append(UserMove(placement.user_id, placement.shard, target))
+                if limit is not None and len(moves) >= limit:
+                    break
+        return moves
+
+    @staticmethod
+    def move_user(
+        db: Session,
+        *,
+        user_id: int,
+        target: str,
+        batch_size: int = 10000,
+        drain_seconds: Optional[float] = None,
+    ) -> MoveResult:
+        """
+        Move a user's rows to another shard.
+
+        The user is marked as moving, so requests for it get 503 once the
+        other workers have dropped their cached placements (published on
+        the invalidation bus; the drain still waits out the cache TTL in
+        case a worker is not listening). After drain_seconds the
+        rows are copied and checked by count and amount totals in one
+        transaction on the target, the placement is switched, and the rows
+        are deleted from the source. A failed move can simply be rerun.
+
+        Args:
+            db: Database session
+            user_id: User to move
+            target: Destination shard
+            batch_size: Rows inserted per statement
+            drain_seconds: Wait for running requests, defaults to the
+                placement cache TTL plus the longest request deadline
+
+        Returns:
+            Move summary
+
+        Raises:
+            ValueError: If the user has no recorded placement or the copy does not match
+        """
+        if target not in shard_router.shards:
+            raise ValueError(f"Unknown shard {target}")
+        placement = db.query(UserShard).filter(UserShard.user_id == user_id).first()
+        if placement is None:
+            raise ValueError(f"User {user_id} has no recorded placement; pin users first")
+        result = MoveResult(user_id=user_id, source=placement.shard, target=target)
+        if placement.shard == target:
+            return result
+
+        placement.moving = True
+        invalidation_bus.publish(db, "user_placement", user_id)
+        db.commit()
+        if drain_seconds is None:
+            drain_seconds = settings.SHARD_PLACEMENT_TTL_SECONDS + settings.REQUEST_DEADLINE_MAX_MS / 1000
+        time.sleep(drain_seconds)
+
+        source_db = shard_session(result.source)
+        target_db = shard_session(target)
+        try:
+            account_ids = source_db.execute(
+                select(Base.metadata.tables["accounts"].c.id)
+                .where(Base.metadata.tables["accounts"].c.user_id == user_id)
+            ).scalars().all()
+
+            # Leftovers of an earlier attempt
+            for name in reversed(MOVED_TABLES):
+                target_db.execute(RebalanceService._rows_of(name, user_id, account_ids, delete=True))
+
+            for name in MOVED_TABLES:
+                table = Base.metadata.tables[name]
+                rows = source_db.execute(
+                    RebalanceService._rows_of(name, user_id, account_ids)
+                    .execution_options(stream_results=True)
+                )
+                copied = 0
+                for batch in rows.partitions(batch_size):
+                    target_db.execute(table.insert(), [dict(row._mapping) for row in batch])
+                    copied += len(batch)
+                expected = RebalanceService._checksum(source_db, name, user_id, account_ids)
+                actual = RebalanceService._checksum(target_db, name, user_id, account_ids)
+                if expected != actual or expected[0] != copied:
+                    raise ValueError(f"Copy of {name} for user {user_id} does not match: {expected} != {actual}")
+                result.rows[name] = copied
+            target_db.commit()
+
+            placement.shard = target
+            placement.moving = False
+            invalidation_bus.publish(db, "user_placement", user_id)
+            db.commit()
+            shard_router.forget_placement(user_id)
+
+            for name in reversed(MOVED_TABLES):
+                source_db.execute(RebalanceService._rows_of(name, user_id, account_ids, delete=True))
+            source_db.commit()
+        except Exception:
+            target_db.rollback()
+            source_db.rollback()
+            db.rollback()
+            raise
+        finally:
+            target_db.close()
+            source_db.close()
+
+        logger.info(f"Moved user {user_id} from {result.source} to {target}: {result.rows}")
+        return result
+
+    @staticmethod
+    def _rows_of(name: str, user_id: int, account_ids: List[int], *, delete: bool = False):
+        """Statement selecting, or deleting, a user's rows of a table."""
+        table = Base.metadata.tables[name]
+        if name == "transactions":
+            condition = table.c.account_id.in_(account_ids)
+        else:
+            condition = table.c.user_id == user_id
+        return table.delete().where(condition) if delete else select(table).where(condition)
+
+    @staticmethod
+    def _checksum(db: Session, name: str, user_id: int, account_ids: List[int]) -> tuple:
+        """Row count and amount total of a user's rows of a table."""
+        table = Base.metadata.tables[name]
+        rows = RebalanceService._rows_of(name, user_id, account_ids).subquery()
+        column = CHECKSUM_COLUMNS.get(name)
+        # Rounded, as float sums depend on the order rows are added in
+        total = func.round(cast(func.coalesce(func.sum(rows.c[column]), 0), Numeric), 2) if column else func.count()
+        return tuple(db.execute(select(func.count(), total).select_from(rows)).one())
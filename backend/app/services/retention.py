@@ -0,0 +1,120 @@
+# backend/app/services/retention.py
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.db.repositories import (
+    account_repository,
+    audit_repository,
+    idempotency_repository,
+    transaction_repository,
+    user_repository,
+)
+from app.db.session import SessionLocal, shard_names, shard_router, shard_session
+
+logger = logging.getLogger("banking-system")
+
+@dataclass
+class PurgeResult:
+    """Summary of a retention purge."""
+    accounts: int = 0
+    transactions: int = 0
+    users: int = 0
+
+class RetentionService:
+    """Purge of soft-deleted users and accounts once their retention period ends."""
+
+    @staticmethod
+    def purge_deleted(
+        *,
+        retention_days: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        limit: int = 1000,
+    ) -> PurgeResult:
+        """
+        Delete users and accounts soft-deleted more than retention_days ago.
+
+        An account's transactions are deleted in chunks, each committed on
+        its own, before the account row, and transfers other accounts sent
+        to it lose their recipient link. Users go once all their accounts
+        are gone; their audit logs are kept without the user. Nothing is
+        loaded into the session, and a purge interrupted part way simply
+        continues on the next run.
+
+        Args:
+            retention_days: Days deleted records are kept, defaults to ACCOUNT_RETENTION_DAYS
+            chunk_size: Rows deleted per statement
+            limit: Maximum number of accounts per shard, and of users, per run
+
+        Returns:
+            Purge summary
+        """
+        retention_days = settings.ACCOUNT_RETENTION_DAYS if retention_days is None else retention_days
+        chunk_size = chunk_size or settings.RETENTION_PURGE_CHUNK_SIZE
+        deleted_before = datetime.now() - timedelta(days=retention_days)
+        result = PurgeResult()
+
+        db = SessionLocal()
+        sessions = {shard: shard_session(shard) for shard in shard_names()}
+        try:
+            for shard, shard_db in sessions.items():
+                for account_id, account_number in account_repository.get_deleted(
+                    shard_db, deleted_before=deleted_before, limit=limit,
+                ):
+                    result.transactions += transaction_repository.delete_account_transactions(
+                        shard_db, account_id=account_id, chunk_size=chunk_size,
+                    )
+                    # Transfers to the account may be on any shard
+                    for other_db in sessions.values():
+                        transaction_repository.clear_recipient(other_db, account_id=account_id, chunk_size=chunk_size)
+                    account_repository.purge(shard_db, account_id=account_id)
+                    shard_db.commit()
+                    shard_router.unregister_account(db, account_id=account_id, account_number=account_number)
+                    db.commit()
+                    result.accounts += 1
+
+            for user_id in user_repository.get_deleted_ids(db, deleted_before=deleted_before, limit=limit):
+                shard_db = sessions[shard_router.shard_for_user(user_id) if shard_router.shards else None]
+                if account_repository.count(shard_db, user_id=user_id):
+                    # Accounts deleted later, or beyond this run's limit
+                    continue
+                idempotency_repository.delete_user_keys(shard_db, user_id=user_id)
+                audit_repository.clear_user(shard_db, user_id=user_id, chunk_size=chunk_size)
+                if shard_router.shards:
+                    # Audit logs without an owning shard stay on the primary
+                    audit_repository.clear_user(db, user_id=user_id, chunk_size=chunk_size)
+                user_repository.purge(db, user_id=user_id)
+                db.commit()
+                result.users += 1
+        except Exception:
+            db.rollback()
+            for shard_db in sessions.values():
+                shard_db.rollback()
+            raise
+        finally:
+            db.close()
+            for shard_db in sessions.values():
+                shard_db.close()
+
+        if result.accounts or result.users:
+            logger.info(
+                f"Purged {result.accounts} accounts with {result.transactions} transactions "
+                f"and {result.users} users deleted before {deleted_before:%Y-%m-%d}"
+            )
+        return result
+
+    @staticmethod
+    async def purge_deleted_periodically() -> None:
+        """Background task purging expired deletions every RETENTION_PURGE_INTERVAL_SECONDS."""
+        while True:
+            try:
+                await run_in_threadpool(RetentionService.purge_deleted)
+            except Exception:
+                logger.exception("Failed to purge deleted users and accounts")
+
+            await asyncio.sleep(settings.RETENTION_PURGE_INTERVAL_SECONDS)
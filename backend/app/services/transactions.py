@@ -1,13 +1,23 @@
 # backend/app/services/transactions.py
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import logging
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.timing import span
 from app.db.repositories import transaction_repository, account_repository, audit_repository
+from app.db.session import shard_router, shard_session
+from app.db.unit_of_work import checkpoint
+from app.db.models.account import Account
 from app.db.models.audit import AuditAction
 from app.db.models.transaction import Transaction, TransactionType, TransactionStatus
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.accounts import AccountService
+from app.services.fees import FeeService
+
+logger = logging.getLogger("banking-system")
 
 class TransactionService:
     """Transaction processing service."""
@@ -90,6 +100,7 @@ class TransactionService:
         db: Session,
         *,
         account_id: int,
+        account: Optional[Account] = None,
         amount: float,
         description: str = None,
         currency: str = "USD",
@@ -102,6 +113,7 @@ class TransactionService:
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it
             amount: Deposit amount
             description: Transaction description
             currency: Transaction currency
@@ -119,7 +131,9 @@ class TransactionService:
             raise ValueError("Deposit amount must be positive")
         
         # Get account
-        account = account_repository.get(db, id=account_id)
+        if account is None:
+            with span("account_load"):
+                account = account_repository.get(db, id=account_id)
         if not account:
             raise ValueError("Account not found")
         
@@ -132,7 +146,8 @@ class TransactionService:
             raise ValueError(f"Currency mismatch. Account currency is {account.currency}")
         
         # Create transaction
-        reference_id = transaction_repository.generate_reference_id(db)
+        with span("reference_id"):
+            reference_id = transaction_repository.generate_reference_id(db, account.id)
         transaction_in = TransactionCreate(
             transaction_type=TransactionType.DEPOSIT,
             amount=amount,
@@ -142,37 +157,41 @@ class TransactionService:
             account_id=account_id,
         )
         
-        transaction = transaction_repository.create_with_reference_id(
-            db,
-            obj_in=transaction_in,
-            reference_id=reference_id,
-        )
+        with span("transaction_insert"):
+            transaction = transaction_repository.create_with_reference_id(
+                db,
+                obj_in=transaction_in,
+                reference_id=reference_id,
+            )
         
         # Update account balance
-        await AccountService.update_balance(
-            db,
-            account_id=account_id,
-            amount=amount,
-            description=f"Deposit: {transaction.reference_id}",
-            current_user_id=current_user_id,
-            ip_address=ip_address,
-        )
+        with span("balance_update"):
+            await AccountService.update_balance(
+                db,
+                account_id=account_id,
+                account=account,
+                amount=amount,
+                description=f"Deposit: {transaction.reference_id}",
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
         
         # Audit deposit
-        audit_repository.log_action(
-            db,
-            action=AuditAction.CREATE,
-            entity_type="transaction",
-            entity_id=transaction.id,
-            user_id=current_user_id,
-            data={
-                "transaction_type": TransactionType.DEPOSIT.value,
-                "amount": amount,
-                "account_id": account_id,
-                "reference_id": transaction.reference_id,
-            },
-            ip_address=ip_address,
-        )
+        with span("audit"):
+            audit_repository.log_action(
+                db,
+                action=AuditAction.CREATE,
+                entity_type="transaction",
+                entity_id=transaction.id,
+                user_id=current_user_id,
+                data={
+                    "transaction_type": TransactionType.DEPOSIT.value,
+                    "amount": amount,
+                    "account_id": account_id,
+                    "reference_id": transaction.reference_id,
+                },
+                ip_address=ip_address,
+            )
         
         return transaction
     
@@ -181,6 +200,7 @@ class TransactionService:
         db: Session,
         *,
         account_id: int,
+        account: Optional[Account] = None,
         amount: float,
         description: str = None,
         currency: str = "USD",
@@ -193,6 +213,7 @@ class TransactionService:
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it
             amount: Withdrawal amount
             description: Transaction description
             currency: Transaction currency
@@ -210,7 +231,9 @@ class TransactionService:
             raise ValueError("Withdrawal amount must be positive")
         
         # Get account
-        account = account_repository.get(db, id=account_id)
+        if account is None:
+            with span("account_load"):
+                account = account_repository.get(db, id=account_id)
         if not account:
             raise ValueError("Account not found")
         
@@ -222,12 +245,20 @@ class TransactionService:
         if currency != account.currency:
             raise ValueError(f"Currency mismatch. Account currency is {account.currency}")
         
+        # Per-transaction fee from the compiled schedule, no query needed
+        fee = FeeService.transaction_fee(
+            transaction_type=TransactionType.WITHDRAWAL,
+            account_type=account.account_type,
+            amount=amount,
+        )
+        
         # Check balance
-        if account.balance < amount:
+        if account.balance < amount + fee:
             raise ValueError("Insufficient funds")
         
         # Create transaction
-        reference_id = transaction_repository.generate_reference_id(db)
+        with span("reference_id"):
+            reference_id = transaction_repository.generate_reference_id(db, account.id)
         transaction_in = TransactionCreate(
             transaction_type=TransactionType.WITHDRAWAL,
             amount=amount,
@@ -237,37 +268,46 @@ class TransactionService:
             account_id=account_id,
         )
         
-        transaction = transaction_repository.create_with_reference_id(
-            db,
-            obj_in=transaction_in,
-            reference_id=reference_id,
-        )
+        with span("transaction_insert"):
+            transaction = transaction_repository.create_with_reference_id(
+                db,
+                obj_in=transaction_in,
+                reference_id=reference_id,
+            )
         
         # Update account balance
-        await AccountService.update_balance(
-            db,
-            account_id=account_id,
-            amount=-amount,  # Negative for withdrawal
-            description=f"Withdrawal: {transaction.reference_id}",
-            current_user_id=current_user_id,
-            ip_address=ip_address,
-        )
+        with span("balance_update"):
+            await AccountService.update_balance(
+                db,
+                account_id=account_id,
+                account=account,
+                amount=-(amount + fee),  # Negative for withdrawal
+                description=f"Withdrawal: {transaction.reference_id}",
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+        
+        with span("fee_insert"):
+            if fee:
+                TransactionService._create_fee_transaction(db, transaction=transaction, fee=fee)
         
         # Audit withdrawal
-        audit_repository.log_action(
-            db,
-            action=AuditAction.CREATE,
-            entity_type="transaction",
-            entity_id=transaction.id,
-            user_id=current_user_id,
-            data={
-                "transaction_type": TransactionType.WITHDRAWAL.value,
-                "amount": amount,
-                "account_id": account_id,
-                "reference_id": transaction.reference_id,
-            },
-            ip_address=ip_address,
-        )
+        with span("audit"):
+            audit_repository.log_action(
+                db,
+                action=AuditAction.CREATE,
+                entity_type="transaction",
+                entity_id=transaction.id,
+                user_id=current_user_id,
+                data={
+                    "transaction_type": TransactionType.WITHDRAWAL.value,
+                    "amount": amount,
+                    "fee": fee,
+                    "account_id": account_id,
+                    "reference_id": transaction.reference_id,
+                },
+                ip_address=ip_address,
+            )
         
         return transaction
     
@@ -277,6 +317,8 @@ class TransactionService:
         *,
         source_account_id: int,
         destination_account_id: int,
+        source_account: Optional[Account] = None,
+        destination_account: Optional[Account] = None,
         amount: float,
         description: str = None,
         currency: str = "USD",
@@ -290,6 +332,8 @@ class TransactionService:
             db: Database session
             source_account_id: Source account ID
             destination_account_id: Destination account ID
+            source_account: The source account if the caller already loaded it
+            destination_account: The destination account if the caller already loaded it
             amount: Transfer amount
             description: Transaction description
             currency: Transaction currency
@@ -308,7 +352,9 @@ class TransactionService:
             raise ValueError("Transfer amount must be positive")
         
         # Get source account
-        source_account = account_repository.get(db, id=source_account_id)
+        if source_account is None:
+            with span("account_load"):
+                source_account = account_repository.get(db, id=source_account_id)
         if not source_account:
             raise ValueError("Source account not found")
         
@@ -317,7 +363,9 @@ class TransactionService:
             raise ValueError("Source account is inactive")
         
         # Get destination account
-        destination_account = account_repository.get(db, id=destination_account_id)
+        if destination_account is None:
+            with span("account_load"):
+                destination_account = account_repository.get(db, id=destination_account_id)
         if not destination_account:
             raise ValueError("Destination account not found")
         
@@ -332,12 +380,47 @@ class TransactionService:
         if currency != destination_account.currency:
             raise ValueError(f"Currency mismatch. Destination account currency is {destination_account.currency}")
         
+        # Per-transaction fee from the compiled schedule, no query needed
+        fee = FeeService.transaction_fee(
+            transaction_type=TransactionType.TRANSFER,
+            account_type=source_account.account_type,
+            amount=amount,
+        )
+        
         # Check balance
-        if source_account.balance < amount:
+        if source_account.balance < amount + fee:
             raise ValueError("Insufficient funds")
         
+        # Accounts on different shards cannot be posted in one database transaction
+        destination_shard = None
+        if shard_router.shards:
+            destination_shard = shard_router.shard_for_account(destination_account_id)
+            if destination_shard == shard_router.shard_for_account(source_account_id):
+                destination_shard = None
+        
         # Create transaction
-        reference_id = transaction_repository.generate_reference_id(db)
+        with span("reference_id"):
+            reference_id = transaction_repository.generate_reference_id(db, source_account.id)
+        
+        if destination_shard is not None:
+            return await TransactionService._create_cross_shard_transfer(
+                db,
+                source_account=source_account,
+                destination_account=destination_account,
+                destination_shard=destination_shard,
+                amount=amount,
+                fee=fee,
+                currency=currency,
+                description=description,
+                reference_id=reference_id,
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+        
+        # Lock both rows in ID order, so opposite transfers cannot deadlock
+        for account in sorted((source_account, destination_account), key=lambda account: account.id):
+            account_repository.lock(db, account=account)
+        
         transaction_in = TransactionCreate(
             transaction_type=TransactionType.TRANSFER,
             amount=amount,
@@ -348,33 +431,133 @@ class TransactionService:
             recipient_account_id=destination_account_id,
         )
         
+        with span("transaction_insert"):
+            transaction = transaction_repository.create_with_reference_id(
+                db,
+                obj_in=transaction_in,
+                reference_id=reference_id,
+            )
+        
+        # Update source account balance
+        with span("balance_update"):
+            await AccountService.update_balance(
+                db,
+                account_id=source_account_id,
+                account=source_account,
+                amount=-(amount + fee),  # Negative for outgoing transfer
+                description=f"Transfer to {destination_account.account_number}: {transaction.reference_id}",
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+        
+        with span("fee_insert"):
+            if fee:
+                TransactionService._create_fee_transaction(db, transaction=transaction, fee=fee)
+        
+        # Update destination account balance
+        with span("balance_update"):
+            await AccountService.update_balance(
+                db,
+                account_id=destination_account_id,
+                account=destination_account,
+                amount=amount,  # Positive for incoming transfer
+                description=f"Transfer from {source_account.account_number}: {transaction.reference_id}",
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+        
+        # Audit transfer
+        with span("audit"):
+            audit_repository.log_action(
+                db,
+                action=AuditAction.CREATE,
+                entity_type="transaction",
+                entity_id=transaction.id,
+                user_id=current_user_id,
+                data={
+                    "transaction_type": TransactionType.TRANSFER.value,
+                    "amount": amount,
+                    "fee": fee,
+                    "source_account_id": source_account_id,
+                    "destination_account_id": destination_account_id,
+                    "reference_id": transaction.reference_id,
+                },
+                ip_address=ip_address,
+            )
+        
+        return transaction
+    
+    @staticmethod
+    async def _create_cross_shard_transfer(
+        db: Session,
+        *,
+        source_account,
+        destination_account,
+        destination_shard: str,
+        amount: float,
+        fee: float,
+        currency: str,
+        description: Optional[str],
+        reference_id: str,
+        current_user_id: int,
+        ip_address: str = None,
+    ) -> Transaction:
+        """
+        Transfer between accounts on different shards as a saga.
+        
+        The source is debited and the transfer recorded as PENDING, and
+        both are committed on the source shard with a unit of work
+        checkpoint. The destination is then
+        credited on its shard, and the transfer is completed; if the
+        destination refuses the credit, the source is refunded and the
+        transfer marked FAILED. A transfer left PENDING by a crash, or by a
+        credit whose outcome is unknown, is finished by
+        scripts/resolve_transfers.py.
+        
+        Args:
+            db: Database session on the source shard
+            source_account: Source account
+            destination_account: Destination account
+            destination_shard: Shard of the destination account
+            amount: Transfer amount
+            fee: Transfer fee charged to the source
+            currency: Transaction currency
+            description: Transaction description
+            reference_id: Reference ID of the transfer
+            current_user_id: ID of the user performing the action (for audit)
+            ip_address: Client IP address for audit logging
+            
+        Returns:
+            Completed transfer transaction
+            
+        Raises:
+            ValueError: If the destination refused the credit and the source was refunded
+        """
+        # Step 1: debit the source
+        transaction_in = TransactionCreate(
+            transaction_type=TransactionType.TRANSFER,
+            amount=amount,
+            currency=currency,
+            description=description or f"Transfer to {destination_account.account_number}",
+            status=TransactionStatus.PENDING,
+            account_id=source_account.id,
+            recipient_account_id=destination_account.id,
+        )
         transaction = transaction_repository.create_with_reference_id(
             db,
             obj_in=transaction_in,
             reference_id=reference_id,
         )
-        
-        # Update source account balance
-        await AccountService.update_balance(
-            db,
-            account_id=source_account_id,
-            amount=-amount,  # Negative for outgoing transfer
-            description=f"Transfer to {destination_account.account_number}: {transaction.reference_id}",
-            current_user_id=current_user_id,
-            ip_address=ip_address,
-        )
-        
-        # Update destination account balance
         await AccountService.update_balance(
             db,
-            account_id=destination_account_id,
-            amount=amount,  # Positive for incoming transfer
-            description=f"Transfer from {source_account.account_number}: {transaction.reference_id}",
+            account_id=source_account.id,
+            amount=-(amount + fee),
+            description=f"Transfer to {destination_account.account_number}: {reference_id}",
             current_user_id=current_user_id,
             ip_address=ip_address,
         )
-        
-        # Audit transfer
+        if fee:
+            TransactionService._create_fee_transaction(db, transaction=transaction, fee=fee)
         audit_repository.log_action(
             db,
             action=AuditAction.CREATE,
@@ -384,20 +567,175 @@ class TransactionService:
             data={
                 "transaction_type": TransactionType.TRANSFER.value,
                 "amount": amount,
-                "source_account_id": source_account_id,
-                "destination_account_id": destination_account_id,
-                "reference_id": transaction.reference_id,
+                "fee": fee,
+                "source_account_id": source_account.id,
+                "destination_account_id": destination_account.id,
+                "destination_shard": destination_shard,
+                "reference_id": reference_id,
             },
             ip_address=ip_address,
         )
+        checkpoint(db)
+        
+        # Step 2: credit the destination
+        try:
+            await TransactionService.credit_transfer(
+                transaction,
+                shard=destination_shard,
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+        except ValueError as e:
+            # The destination refused the credit, so it was certainly not applied
+            await TransactionService._refund_transfer(
+                db, transaction=transaction, current_user_id=current_user_id, ip_address=ip_address,
+            )
+            checkpoint(db)
+            raise ValueError(f"Transfer failed and was refunded: {e}")
+        except Exception:
+            # The credit may have been committed (e.g. the connection dropped
+            # during its commit); resolve_transfers.py checks before crediting
+            logger.exception(f"Credit of transfer {reference_id} failed, left PENDING for resolution")
+            raise
+        
+        # Step 3: complete; committed with the rest of the request
+        return transaction_repository.update(
+            db, db_obj=transaction, obj_in={"status": TransactionStatus.COMPLETED},
+        )
+    
+    @staticmethod
+    async def _refund_transfer(
+        db: Session,
+        *,
+        transaction: Transaction,
+        current_user_id: Optional[int] = None,
+        ip_address: str = None,
+    ) -> None:
+        """Compensate a cross-shard transfer whose credit failed, fee included, without committing."""
+        fee_transaction = transaction_repository.get_by_reference_id(
+            db, reference_id=f"{transaction.reference_id}-FEE", account_id=transaction.account_id,
+        )
+        fee = fee_transaction.amount if fee_transaction else 0.0
+        await AccountService.update_balance(
+            db,
+            account_id=transaction.account_id,
+            amount=transaction.amount + fee,
+            description=f"Refund of failed transfer: {transaction.reference_id}",
+            current_user_id=current_user_id,
+            ip_address=ip_address,
+        )
+        for failed in filter(None, (transaction, fee_transaction)):
+            transaction_repository.update(db, db_obj=failed, obj_in={"status": TransactionStatus.FAILED})
+    
+    @staticmethod
+    async def resolve_cross_shard_transfers(db: Session, *, older_than: timedelta) -> Tuple[int, int]:
+        """
+        Finish cross-shard transfers left PENDING on a shard.
         
-        return transaction
+        Each transfer is credited if it was not yet, then completed; a
+        transfer whose destination cannot be credited anymore is refunded.
+        Each transfer is committed on its own.
+        
+        Args:
+            db: Session pinned to the source shard
+            older_than: Only transfers at least this old, so running requests are not raced
+            
+        Returns:
+            Tuple of (transfers completed, transfers refunded)
+        """
+        completed = refunded = 0
+        pending = transaction_repository.get_pending_transfers(
+            db, created_before=datetime.now() - older_than,
+        )
+        for transaction in pending:
+            shard = shard_router.shard_for_account(transaction.recipient_account_id)
+            if shard is None or shard == db.info.get("shard"):
+                continue
+            try:
+                await TransactionService.credit_transfer(transaction, shard=shard)
+                transaction_repository.update(
+                    db, db_obj=transaction, obj_in={"status": TransactionStatus.COMPLETED},
+                )
+                completed += 1
+            except ValueError:
+                await TransactionService._refund_transfer(db, transaction=transaction)
+                refunded += 1
+            db.commit()
+        return completed, refunded
+    
+    @staticmethod
+    async def credit_transfer(
+        transaction: Transaction,
+        *,
+        shard: str,
+        current_user_id: Optional[int] = None,
+        ip_address: str = None,
+    ) -> None:
+        """
+        Credit the destination of a cross-shard transfer on its shard.
+        
+        The incoming transaction reuses the transfer's reference ID, so a
+        retried credit finds it, or fails on the unique key, and does not
+        credit twice.
+        
+        Args:
+            transaction: Transfer recorded on the source shard
+            shard: Shard of the destination account
+            current_user_id: ID of the user performing the action (for audit)
+            ip_address: Client IP address for audit logging
+            
+        Raises:
+            ValueError: If the destination account is missing or inactive
+        """
+        db = shard_session(shard)
+        try:
+            destination_id = transaction.recipient_account_id
+            if transaction_repository.get_by_reference_id(
+                db, reference_id=transaction.reference_id, account_id=destination_id,
+            ):
+                return
+            
+            destination_account = account_repository.get(db, id=destination_id)
+            if not destination_account or not destination_account.is_active:
+                raise ValueError("Destination account is not available")
+            
+            transaction_repository.create_with_reference_id(
+                db,
+                obj_in=TransactionCreate(
+                    transaction_type=TransactionType.TRANSFER,
+                    amount=transaction.amount,
+                    currency=transaction.currency,
+                    description=f"Transfer from account {transaction.account_id}: {transaction.reference_id}",
+                    status=TransactionStatus.COMPLETED,
+                    account_id=destination_id,
+                    recipient_account_id=destination_id,
+                ),
+                reference_id=transaction.reference_id,
+            )
+            await AccountService.update_balance(
+                db,
+                account_id=destination_id,
+                amount=transaction.amount,
+                description=f"Transfer from account {transaction.account_id}: {transaction.reference_id}",
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+            db.commit()
+        except IntegrityError:
+            # Credited concurrently by another attempt
+            db.rollback()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
     
     @staticmethod
     async def create_payment(
         db: Session,
         *,
         account_id: int,
+        account: Optional[Account] = None,
         amount: float,
         recipient: str,
         description: str = None,
@@ -411,6 +749,7 @@ class TransactionService:
         Args:
             db: Database session
             account_id: Account ID
+            account: The account if the caller already loaded it
             amount: Payment amount
             recipient: Payment recipient
             description: Transaction description
@@ -429,7 +768,9 @@ class TransactionService:
             raise ValueError("Payment amount must be positive")
         
         # Get account
-        account = account_repository.get(db, id=account_id)
+        if account is None:
+            with span("account_load"):
+                account = account_repository.get(db, id=account_id)
         if not account:
             raise ValueError("Account not found")
         
@@ -441,12 +782,20 @@ class TransactionService:
         if currency != account.currency:
             raise ValueError(f"Currency mismatch. Account currency is {account.currency}")
         
+        # Per-transaction fee from the compiled schedule, no query needed
+        fee = FeeService.transaction_fee(
+            transaction_type=TransactionType.PAYMENT,
+            account_type=account.account_type,
+            amount=amount,
+        )
+        
         # Check balance
-        if account.balance < amount:
+        if account.balance < amount + fee:
             raise ValueError("Insufficient funds")
         
         # Create transaction
-        reference_id = transaction_repository.generate_reference_id(db)
+        with span("reference_id"):
+            reference_id = transaction_repository.generate_reference_id(db, account.id)
         payment_description = description or f"Payment to {recipient}"
         transaction_in = TransactionCreate(
             transaction_type=TransactionType.PAYMENT,
@@ -457,41 +806,82 @@ class TransactionService:
             account_id=account_id,
         )
         
-        transaction = transaction_repository.create_with_reference_id(
-            db,
-            obj_in=transaction_in,
-            reference_id=reference_id,
-        )
+        with span("transaction_insert"):
+            transaction = transaction_repository.create_with_reference_id(
+                db,
+                obj_in=transaction_in,
+                reference_id=reference_id,
+            )
         
         # Update account balance
-        await AccountService.update_balance(
-            db,
-            account_id=account_id,
-            amount=-amount,  # Negative for payment
-            description=f"Payment: {transaction.reference_id}",
-            current_user_id=current_user_id,
-            ip_address=ip_address,
-        )
+        with span("balance_update"):
+            await AccountService.update_balance(
+                db,
+                account_id=account_id,
+                account=account,
+                amount=-(amount + fee),  # Negative for payment
+                description=f"Payment: {transaction.reference_id}",
+                current_user_id=current_user_id,
+                ip_address=ip_address,
+            )
+        
+        with span("fee_insert"):
+            if fee:
+                TransactionService._create_fee_transaction(db, transaction=transaction, fee=fee)
         
         # Audit payment
-        audit_repository.log_action(
-            db,
-            action=AuditAction.CREATE,
-            entity_type="transaction",
-            entity_id=transaction.id,
-            user_id=current_user_id,
-            data={
-                "transaction_type": TransactionType.PAYMENT.value,
-                "amount": amount,
-                "account_id": account_id,
-                "recipient": recipient,
-                "reference_id": transaction.reference_id,
-            },
-            ip_address=ip_address,
-        )
+        with span("audit"):
+            audit_repository.log_action(
+                db,
+                action=AuditAction.CREATE,
+                entity_type="transaction",
+                entity_id=transaction.id,
+                user_id=current_user_id,
+                data={
+                    "transaction_type": TransactionType.PAYMENT.value,
+                    "amount": amount,
+                    "fee": fee,
+                    "account_id": account_id,
+                    "recipient": recipient,
+                    "reference_id": transaction.reference_id,
+                },
+                ip_address=ip_address,
+            )
         
         return transaction
     
+    @staticmethod
+    def _create_fee_transaction(db: Session, *, transaction: Transaction, fee: float) -> Transaction:
+        """
+        Record the fee charged for a transaction.
+        
+        The balance has already been debited together with the transaction
+        amount; this only adds the FEE transaction row. Its reference ID is
+        derived from the parent transaction, so no uniqueness lookup is needed.
+        
+        Args:
+            db: Database session
+            transaction: Transaction the fee was charged for
+            fee: Fee amount
+            
+        Returns:
+            Created fee transaction
+        """
+        fee_in = TransactionCreate(
+            transaction_type=TransactionType.FEE,
+            amount=fee,
+            currency=transaction.currency,
+            description=f"{transaction.transaction_type.value.capitalize()} fee: {transaction.reference_id}",
+            status=TransactionStatus.COMPLETED,
+            account_id=transaction.account_id,
+        )
+        
+        return transaction_repository.create_with_reference_id(
+            db,
+            obj_in=fee_in,
+            reference_id=f"{transaction.reference_id}-FEE",
+        )
+    
     @staticmethod
     async def update_transaction_status(
         db: Session,
@@ -1,9 +1,11 @@
 # backend/app/services/users.py
 from typing import List, Optional
+from datetime import datetime
 
 from sqlalchemy.orm import Session
 
-from app.db.repositories import user_repository, audit_repository
+from app.db.repositories import account_repository, user_repository, audit_repository
+from app.db.session import shard_router
 from app.db.models.audit import AuditAction
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -22,9 +24,10 @@ class UserService:
             user_id: User ID
             
         Returns:
-            User if found, None otherwise
+            User if found and not deleted, None otherwise
         """
-        return user_repository.get(db, id=user_id)
+        user = user_repository.get(db, id=user_id)
+        return user if user and user.deleted_at is None else None
     
     @staticmethod
     async def get_by_email(db: Session, *, email: str) -> Optional[User]:
@@ -95,6 +98,10 @@ class UserService:
             hashed_password=hashed_password,
         )
         
+        # Fix the user's shard before anything is written for it
+        if shard_router.shards:
+            shard_router.register_user(db, user)
+        
         # Audit user creation
         audit_repository.log_action(
             db,
@@ -185,6 +192,11 @@ class UserService:
         """
         Delete a user.
         
+        The user and all of its accounts are marked deleted and
+        deactivated with one UPDATE each, without loading the accounts or
+        their transactions. RetentionService purges them after
+        ACCOUNT_RETENTION_DAYS.
+        
         Args:
             db: Database session
             user_id: User ID
@@ -195,11 +207,16 @@ class UserService:
             Deleted user if found, None otherwise
         """
         user = user_repository.get(db, id=user_id)
-        if not user:
+        if not user or user.deleted_at is not None:
             return None
         
-        # Delete the user
-        user = user_repository.delete(db, id=user_id)
+        # Soft-delete the user and its accounts
+        user = user_repository.update(
+            db,
+            db_obj=user,
+            obj_in={"is_active": False, "deleted_at": datetime.now()},
+        )
+        account_repository.soft_delete_user_accounts(db, user_id=user_id)
         
         # Audit user deletion
         audit_repository.log_action(
@@ -0,0 +1,83 @@
+# backend/benchmarks/bench_interest.py
+"""
+Benchmark the daily interest accrual against its one minute budget.
+
+Without --post, times the vectorized accrual for synthetic balances, chunk
+by chunk as InterestService.accrue does. With --post, runs a full accrual
+against the configured database, which should hold about 1M accounts.
+
+Usage:
+    python benchmarks/bench_interest.py --accounts 1000000
+    python benchmarks/bench_interest.py --post --date 2026-10-18
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import settings
+from app.services.interest import INTEREST_RATE_TABLES, InterestService
+
+def bench_compute(*, accounts: int, chunk_size: int) -> float:
+    rng = np.random.default_rng(0)
+    balances = rng.lognormal(mean=8.0, sigma=1.5, size=accounts)
+    carried = np.zeros(accounts)
+    tiers = next(iter(INTEREST_RATE_TABLES.values()))
+
+    start = time.perf_counter()
+    posted = 0
+    for chunk_start in range(0, accounts, chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        accrued = carried[chunk] + InterestService.compute_daily_accruals(balances[chunk], tiers)
+        amounts, carried[chunk] = InterestService.split_cents(accrued)
+        posted += int(np.count_nonzero(amounts))
+    elapsed = time.perf_counter() - start
+
+    print(f"compute: {accounts} accounts in {elapsed:.2f}s ({accounts / elapsed:,.0f} accounts/s), {posted} postings")
+    return elapsed
+
+def bench_post(*, accrual_date: date, chunk_size: int) -> float:
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        result = InterestService.accrue(db, accrual_date=accrual_date, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+
+    print(
+        f"post: {result.accounts_scanned} accounts scanned, {result.accruals_posted} posted "
+        f"in {elapsed:.2f}s ({result.accounts_scanned / elapsed:,.0f} accounts/s)"
+    )
+    if result.accounts_scanned == 0:
+        print(f"post: nothing to accrue, was {accrual_date.isoformat()} already accrued?")
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=settings.INTEREST_ACCRUAL_CHUNK_SIZE)
+    parser.add_argument("--post", action="store_true", help="run the accrual against the database")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="accrual date with --post")
+    parser.add_argument("--budget", type=float, default=60.0, help="seconds the run may take")
+    args = parser.parse_args()
+
+    if args.post:
+        elapsed = bench_post(accrual_date=args.date, chunk_size=args.chunk_size)
+    else:
+        elapsed = bench_compute(accounts=args.accounts, chunk_size=args.chunk_size)
+
+    if elapsed > args.budget:
+        print(f"over budget: {elapsed:.2f}s > {args.budget:.0f}s")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
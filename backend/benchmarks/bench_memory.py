@@ -0,0 +1,123 @@
+# backend/benchmarks/bench_memory.py
+"""
+Benchmark peak memory and allocations of list endpoints per page size.
+
+Every request is sent with "X-Profile: memory", so ProfilerMiddleware
+traces it with tracemalloc and reports the peak traced memory and the
+allocations still alive when the response started. Each measurement is the
+minimum of --repeat runs. Results are compared with the budgets in
+memory_budgets.json; the run fails (exit status 1) when a figure exceeds
+its budget by more than --tolerance, or has no budget at all. --update
+records the results as the budgets instead; commit the file it writes.
+Requests are driven in-process against the configured database, which
+should hold at least as many rows as the largest page size.
+
+`make bench-memory` runs the check from the repository root.
+
+Usage:
+    python benchmarks/bench_memory.py --email admin@example.com --password secret
+    python benchmarks/bench_memory.py --email admin@example.com --password secret --update
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Budgets are per request; keep unrelated features out of the measurement
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOOP_MONITOR_ENABLED", "false")
+
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.main import app
+
+ENDPOINTS = [
+    "/transactions/?all_users=true&limit={page_size}",
+    "/accounts/?limit={page_size}",
+    "/users/?limit={page_size}",
+]
+PAGE_SIZES = [10, 100, 1000, 10000]
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_budgets.json")
+METRICS = ("peak_bytes", "retained_blocks")
+
+def measure(client: TestClient, path: str, headers: Dict[str, str], repeat: int) -> Dict[str, int]:
+    runs = []
+    for _ in range(repeat):
+        response = client.get(path, headers={**headers, "X-Profile": "memory"})
+        response.raise_for_status()
+        if "x-memory-peak-bytes" not in response.headers:
+            raise RuntimeError(f"{path} was not traced; is PROFILER_ENABLED set?")
+        runs.append({
+            "peak_bytes": int(response.headers["x-memory-peak-bytes"]),
+            "retained_blocks": int(response.headers["x-memory-retained-blocks"]),
+        })
+    return {metric: min(run[metric] for run in runs) for metric in METRICS}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", required=True, help="Superuser email")
+    parser.add_argument("--password", required=True, help="Superuser password")
+    parser.add_argument("--page-sizes", default=",".join(map(str, PAGE_SIZES)))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed growth over budget")
+    parser.add_argument("--update", action="store_true", help="Record the results as the new budgets")
+    args = parser.parse_args()
+
+    page_sizes = [int(size) for size in args.page_sizes.split(",")]
+    budgets = {}
+    if os.path.exists(BUDGET_FILE):
+        with open(BUDGET_FILE) as f:
+            budgets = json.load(f)
+
+    with TestClient(app) as client:
+        response = client.post(
+            f"{settings.API_V1_STR}/auth/login",
+            data={"username": args.email, "password": args.password},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        results = {}
+        for endpoint in ENDPOINTS:
+            for page_size in page_sizes:
+                key = endpoint.format(page_size=page_size)
+                results[key] = measure(client, settings.API_V1_STR + key, headers, args.repeat)
+
+    failures = 0
+    print(f"{'endpoint':<52} {'peak KiB':>10} {'budget':>10} {'blocks':>9} {'budget':>9}")
+    for key, result in results.items():
+        budget = budgets.get(key, {})
+        over = [
+            metric for metric in METRICS
+            if metric in budget and result[metric] > budget[metric] * (1 + args.tolerance)
+        ]
+        failures += bool(over)
+        print(
+            f"{key:<52} {result['peak_bytes'] / 1024:>10.0f} "
+            f"{budget['peak_bytes'] / 1024 if 'peak_bytes' in budget else float('nan'):>10.0f} "
+            f"{result['retained_blocks']:>9} {budget.get('retained_blocks', '-'):>9}"
+            + (f"  OVER BUDGET ({', '.join(over)})" if over else "")
+        )
+
+    if args.update:
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Budgets written to {BUDGET_FILE}")
+        return 0
+
+    missing = [key for key in results if key not in budgets]
+    if missing:
+        print(f"No budget for {len(missing)} measurements; run with --update to record them")
+    if failures:
+        print(f"{failures} measurements over budget (tolerance {args.tolerance:.0%})")
+    # An unchecked measurement must not pass as within budget
+    return 1 if failures or missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
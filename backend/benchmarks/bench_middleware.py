@@ -0,0 +1,137 @@
+# backend/benchmarks/bench_middleware.py
+"""
+Benchmark requests per second on /health through the middleware stack.
+
+Compares the previous stack (LoggingMiddleware and the X-Process-Time
+middleware as two BaseHTTPMiddleware layers, logging synchronously) with the
+pure ASGI LoggingMiddleware logging through the queue listener. Requests
+are driven in-process through the ASGI interface, so the numbers measure
+framework and middleware overhead only. Log output goes to /dev/null.
+
+Usage:
+    python benchmarks/bench_middleware.py --requests 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.logging import setup_logging, shutdown_logging
+from app.middleware.logging import LoggingMiddleware
+
+logger = logging.getLogger("banking-system")
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The LoggingMiddleware this benchmark replaced, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        logger.info(
+            f"Request: {request_id} - {request.method} {request.url.path} "
+            f"- Client: {request.client.host}"
+        )
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.info(
+            f"Response: {request_id} - {request.method} {request.url.path} "
+            f"- Status: {response.status_code} - Time: {process_time:.4f}s"
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+def create_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "ok"}
+
+    if legacy:
+        app.add_middleware(LegacyLoggingMiddleware)
+
+        @app.middleware("http")
+        async def add_process_time_header(request: Request, call_next):
+            start_time = time.time()
+            response = await call_next(request)
+            response.headers["X-Process-Time"] = str(time.time() - start_time)
+            return response
+    else:
+        app.add_middleware(LoggingMiddleware)
+    return app
+
+async def call(app: FastAPI) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/health",
+        "raw_path": b"/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+async def run(app: FastAPI, *, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            assert await call(app) == 200
+
+    # Warm up routing and lazily built middleware stack
+    for _ in range(100):
+        await call(app)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+
+    logging.basicConfig(level=logging.INFO, stream=devnull, force=True)
+    before = asyncio.run(run(create_app(legacy=True), requests=args.requests, concurrency=args.concurrency))
+    print(f"before (BaseHTTPMiddleware x2, sync logging): {before:,.0f} req/s")
+
+    stderr, sys.stderr = sys.stderr, devnull
+    setup_logging()
+    sys.stderr = stderr
+    after = asyncio.run(run(create_app(legacy=False), requests=args.requests, concurrency=args.concurrency))
+    shutdown_logging()
+    print(f"after (pure ASGI, queued logging):            {after:,.0f} req/s ({after / before:.2f}x)")
+
+if __name__ == "__main__":
+    main()
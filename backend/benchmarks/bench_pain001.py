@@ -0,0 +1,106 @@
+# backend/benchmarks/bench_pain001.py
+"""
+Benchmark pain.001 ingestion throughput and peak RSS.
+
+Usage:
+    python benchmarks/bench_pain001.py --payments 100000
+    python benchmarks/bench_pain001.py --payments 100000 --post \
+        --debtor-account 202401010123456789 --user-id 1
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bulk_payments import Pain001Parser
+
+PAIN_001_NAMESPACE = "urn:iso:std:iso:20022:tech:xsd:pain.001.001.03"
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (ru_maxrss is KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def generate_pain001(path: str, *, payments: int, debtor_account: str, currency: str = "USD") -> None:
+    """Write a pain.001 file without holding it in memory."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(f'<Document xmlns="{PAIN_001_NAMESPACE}"><CstmrCdtTrfInitn>')
+        f.write(
+            f"<GrpHdr><MsgId>BENCH-{payments}</MsgId><CreDtTm>2024-01-01T00:00:00</CreDtTm>"
+            f"<NbOfTxs>{payments}</NbOfTxs><CtrlSum>{payments}.00</CtrlSum>"
+            f"<InitgPty><Nm>Benchmark Corp</Nm></InitgPty></GrpHdr>"
+        )
+        f.write(
+            f"<PmtInf><PmtInfId>PMT-1</PmtInfId><PmtMtd>TRF</PmtMtd><NbOfTxs>{payments}</NbOfTxs>"
+            f"<ReqdExctnDt>2024-01-01</ReqdExctnDt><Dbtr><Nm>Benchmark Corp</Nm></Dbtr>"
+            f"<DbtrAcct><Id><Othr><Id>{debtor_account}</Id></Othr></Id></DbtrAcct>"
+        )
+        for i in range(payments):
+            f.write(
+                f"<CdtTrfTxInf><PmtId><InstrId>I-{i}</InstrId><EndToEndId>E2E-{i}</EndToEndId></PmtId>"
+                f'<Amt><InstdAmt Ccy="{currency}">1.00</InstdAmt></Amt>'
+                f"<Cdtr><Nm>Supplier {i}</Nm></Cdtr>"
+                f"<CdtrAcct><Id><IBAN>DE89370400440532{i:06d}</IBAN></Id></CdtrAcct>"
+                f"<RmtInf><Ustrd>Invoice {i}</Ustrd></RmtInf></CdtTrfTxInf>"
+            )
+        f.write("</PmtInf></CstmrCdtTrfInitn></Document>")
+
+def bench_parse(path: str) -> None:
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    count = sum(1 for _ in Pain001Parser(path))
+    elapsed = time.perf_counter() - start
+    print(f"parse: {count} payments in {elapsed:.2f}s ({count / elapsed:,.0f} payments/s)")
+    print(f"parse: peak RSS {peak_rss_mb():.1f} MiB (before {rss_before:.1f} MiB)")
+
+def bench_post(path: str, *, user_id: int, chunk_size: int) -> None:
+    from app.db.session import SessionLocal
+    from app.services.bulk_payments import BulkPaymentService
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        report = BulkPaymentService.ingest_pain001(
+            db,
+            source=path,
+            current_user_id=user_id,
+            chunk_size=chunk_size,
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+
+    total = report.number_of_transactions
+    print(
+        f"post: {report.accepted}/{total} accepted in {elapsed:.2f}s "
+        f"({total / elapsed:,.0f} payments/s), group status {report.group_status}"
+    )
+    print(f"post: peak RSS {peak_rss_mb():.1f} MiB")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payments", type=int, default=100_000)
+    parser.add_argument("--debtor-account", default="BENCHMARK000000001")
+    parser.add_argument("--post", action="store_true", help="also post the payments to the database")
+    parser.add_argument("--user-id", type=int, help="owner of the debtor account (required with --post)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pain001.xml")
+        generate_pain001(path, payments=args.payments, debtor_account=args.debtor_account)
+        print(f"file: {args.payments} payments, {os.path.getsize(path) / 1024 / 1024:.1f} MiB")
+
+        bench_parse(path)
+        if args.post:
+            if args.user_id is None:
+                parser.error("--post requires --user-id")
+            bench_post(path, user_id=args.user_id, chunk_size=args.chunk_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# backend/benchmarks/bench_unit_of_work.py
+"""
+Compare per-endpoint statement counts with and without the unit of work.
+
+Runs the database work of the mutating endpoints (authorization, service
+call and notifications) against a real database, once on a bare session as
+get_db provided it and once inside a UnitOfWork, and prints how many
+statements each executed. Every run is rolled back, so the accounts are
+left as they were; COMMIT itself is not counted.
+
+Usage:
+    python benchmarks/bench_unit_of_work.py --user-id 1 --account-id 1 --destination-account-id 2
+"""
+import argparse
+import asyncio
+import os
+import sys
+from contextlib import redirect_stdout
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.context import bind_user
+from app.db.query_stats import track_queries
+from app.db.repositories import user_repository
+from app.db.session import SessionLocal
+from app.db.unit_of_work import UnitOfWork
+from app.services import AccountService, NotificationService, TransactionService
+
+async def deposit(db, args) -> None:
+    account = await AccountService.get(db, account_id=args.account_id)
+    transaction = await TransactionService.create_deposit(
+        db,
+        account_id=account.id,
+        amount=1.0,
+        currency=account.currency,
+        current_user_id=args.user_id,
+    )
+    await NotificationService.send_transaction_notification(db, transaction_id=transaction.id)
+
+async def withdrawal(db, args) -> None:
+    account = await AccountService.get(db, account_id=args.account_id)
+    transaction = await TransactionService.create_withdrawal(
+        db,
+        account_id=account.id,
+        amount=1.0,
+        currency=account.currency,
+        current_user_id=args.user_id,
+    )
+    await NotificationService.send_transaction_notification(db, transaction_id=transaction.id)
+    await NotificationService.send_low_balance_notification(db, account_id=account.id, threshold=100.0)
+
+async def transfer(db, args) -> None:
+    source_account = await AccountService.get(db, account_id=args.account_id)
+    destination_account = await AccountService.get(db, account_id=args.destination_account_id)
+    transaction = await TransactionService.create_transfer(
+        db,
+        source_account_id=source_account.id,
+        destination_account_id=destination_account.id,
+        amount=1.0,
+        currency=source_account.currency,
+        current_user_id=args.user_id,
+    )
+    await NotificationService.send_transaction_notification(db, transaction_id=transaction.id)
+    await NotificationService.send_low_balance_notification(db, account_id=source_account.id, threshold=100.0)
+
+async def deactivate(db, args) -> None:
+    account = await AccountService.get(db, account_id=args.account_id)
+    await AccountService.deactivate(db, account_id=account.id, current_user_id=args.user_id)
+
+ENDPOINTS = {
+    "POST /transactions/deposit": deposit,
+    "POST /transactions/withdrawal": withdrawal,
+    "POST /transactions/transfer": transfer,
+    "POST /accounts/{id}/deactivate": deactivate,
+}
+
+async def count_statements(endpoint, args, *, unit_of_work: bool) -> int:
+    db = SessionLocal()
+    uow = UnitOfWork(db) if unit_of_work else None
+    try:
+        with track_queries() as stats, open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            # get_current_user loads the user on the same session
+            user_repository.get(db, id=args.user_id)
+            await endpoint(db, args)
+        return stats.count
+    finally:
+        if uow is not None:
+            uow.close()
+        db.rollback()
+        db.close()
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--user-id", type=int, required=True, help="owner of both accounts")
+    parser.add_argument("--account-id", type=int, required=True)
+    parser.add_argument("--destination-account-id", type=int, required=True)
+    args = parser.parse_args()
+    bind_user(args.user_id)
+
+    print(f"{'endpoint':<32} {'get_db':>8} {'unit of work':>14}")
+    for name, endpoint in ENDPOINTS.items():
+        before = await count_statements(endpoint, args, unit_of_work=False)
+        after = await count_statements(endpoint, args, unit_of_work=True)
+        print(f"{name:<32} {before:>8} {after:>14}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+# backend/scripts/accrue_interest.py
+"""
+Accrue one day of interest for all interest-bearing accounts.
+
+Usage:
+    python scripts/accrue_interest.py                      # yesterday, single process
+    python scripts/accrue_interest.py --date 2024-01-31 --workers 8
+    python scripts/accrue_interest.py --date 2024-01-31 --start-id 1 --end-id 500000
+    python scripts/accrue_interest.py --date 2024-01-31 --by-partition --workers 8
+
+The run is idempotent per accrual date, so it can simply be restarted
+after a failure. --start-id/--end-id let separate hosts split the ID space.
+--by-partition runs one task per partition of the transactions table, so
+concurrent workers insert into different partitions and indexes. With
+SHARD_DATABASES set, every shard gets its own tasks.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Optional
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import dispose_engines, shard_names, shard_session
+from app.db.partitioning import partition_count
+from app.db.repositories import account_repository
+from app.services.interest import InterestService, InterestAccrualResult
+
+def accrue_range(
+    shard: Optional[str],
+    accrual_date: date,
+    start_id: int,
+    end_id: int,
+    partition: int = None,
+    partitions: int = None,
+) -> InterestAccrualResult:
+    """Accrue an ID range of a shard, optionally of one transactions partition, in the current process."""
+    # Connections inherited from the parent process must not be reused
+    dispose_engines()
+    db = shard_session(shard)
+    try:
+        return InterestService.accrue(
+            db,
+            accrual_date=accrual_date,
+            start_id=start_id,
+            end_id=end_id,
+            partition=partition,
+            partitions=partitions,
+        )
+    finally:
+        db.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today() - timedelta(days=1))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--start-id", type=int)
+    parser.add_argument("--end-id", type=int, help="exclusive")
+    parser.add_argument("--by-partition", action="store_true", help="one task per transactions partition")
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = []
+        for shard in shard_names():
+            db = shard_session(shard)
+            try:
+                min_id, max_id = account_repository.get_id_range(db)
+                partitions = partition_count(db, "transactions") if args.by_partition else 0
+            finally:
+                db.close()
+            if min_id is None:
+                continue
+            if args.by_partition and not partitions:
+                sys.exit("The transactions table is not partitioned")
+            start_id = min_id if args.start_id is None else args.start_id
+            end_id = max_id + 1 if args.end_id is None else args.end_id
+
+            if args.by_partition:
+                futures += [
+                    executor.submit(accrue_range, shard, args.date, start_id, end_id, partition, partitions)
+                    for partition in range(partitions)
+                ]
+            elif start_id < end_id:
+                # Split the ID space into one contiguous range per worker
+                step = max(1, -(-(end_id - start_id) // args.workers))
+                futures += [
+                    executor.submit(accrue_range, shard, args.date, lo, min(lo + step, end_id))
+                    for lo in range(start_id, end_id, step)
+                ]
+        results = [future.result() for future in futures]
+
+    if not results:
+        print("No accounts")
+        return
+
+    print(
+        f"Accrued interest for {args.date.isoformat()}: "
+        f"{sum(r.accounts_scanned for r in results)} accounts scanned, "
+        f"{sum(r.accruals_posted for r in results)} accruals posted, "
+        f"{sum(r.amount_posted for r in results):.2f} total"
+    )
+
+if __name__ == "__main__":
+    main()
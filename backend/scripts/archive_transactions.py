@@ -0,0 +1,73 @@
+# backend/scripts/archive_transactions.py
+"""
+Move closed months of transactions into compressed segment files.
+
+Usage:
+    python scripts/archive_transactions.py run [--months 3]
+        archive every month older than TRANSACTION_ARCHIVE_AFTER_MONTHS, oldest first
+    python scripts/archive_transactions.py month --month 2022-01
+        archive one month; it must be the oldest one left in the table
+    python scripts/archive_transactions.py verify --month 2022-01
+        check a month's segments against the catalog and, until purged, the table
+    python scripts/archive_transactions.py list
+
+Segments are written to TRANSACTION_ARCHIVE_DIR, which every application
+host must see. A failed run can be restarted; rows are only deleted after
+their segment has been checksummed against them.
+"""
+import argparse
+import os
+import sys
+from datetime import date, datetime
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.models.transaction_segment import TransactionSegment
+from app.db.session import SessionLocal
+from app.services.archival import ArchiveService
+
+def parse_month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["run", "month", "verify", "list"])
+    parser.add_argument("--month", type=parse_month, help="YYYY-MM")
+    parser.add_argument("--months", type=int, help="maximum number of months archived by run")
+    parser.add_argument("--drain-seconds", type=float, help="wait before deleting (default: catalog refresh + deadline)")
+    args = parser.parse_args()
+    if args.command in ("month", "verify") and args.month is None:
+        sys.exit(f"{args.command} needs --month")
+
+    db = SessionLocal()
+    try:
+        if args.command == "list":
+            for segment in db.query(TransactionSegment).order_by(TransactionSegment.month, TransactionSegment.shard):
+                print(
+                    f"{segment.month:%Y-%m} {segment.shard or 'default'}: {segment.row_count} rows, "
+                    f"{segment.status.value}, {segment.path}"
+                )
+        elif args.command == "verify":
+            if not ArchiveService.verify_month(db, month=args.month):
+                sys.exit(1)
+            print(f"{args.month:%Y-%m} matches")
+        else:
+            archived = 0
+            month = args.month if args.command == "month" else ArchiveService.next_month()
+            while month is not None and (args.months is None or archived < args.months):
+                result = ArchiveService.archive_month(db, month=month, drain_seconds=args.drain_seconds)
+                print(
+                    f"Archived {result.month:%Y-%m}: {result.rows} transactions, "
+                    f"{result.amount_total:.2f} total, {result.deleted} deleted from the table",
+                    flush=True,
+                )
+                archived += 1
+                month = ArchiveService.next_month() if args.command == "run" else None
+            if not archived:
+                print("Nothing to archive")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
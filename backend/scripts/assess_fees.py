@@ -0,0 +1,85 @@
+# backend/scripts/assess_fees.py
+"""
+Charge monthly maintenance and minimum-balance fees.
+
+Usage:
+    python scripts/assess_fees.py                 # previous month
+    python scripts/assess_fees.py --month 2024-01
+    python scripts/assess_fees.py --month 2024-01 --by-partition --workers 8
+
+The run is idempotent per month and can be restarted after a failure.
+--by-partition charges the accounts of each partition of the transactions
+table in a separate task, --workers of them at a time. With SHARD_DATABASES
+set, every shard is charged separately.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import dispose_engines, shard_names, shard_session
+from app.db.partitioning import partition_count
+from app.services.fees import FeeAssessmentResult, FeeService
+
+def parse_month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+def assess_partition(
+    shard: Optional[str], period: date, partition: int, partitions: int,
+) -> FeeAssessmentResult:
+    """Charge the accounts of one transactions partition of a shard in the current process."""
+    # Connections inherited from the parent process must not be reused
+    dispose_engines()
+    db = shard_session(shard)
+    try:
+        return FeeService.assess_periodic_fees(
+            db, period=period, partition=partition, partitions=partitions,
+        )
+    finally:
+        db.close()
+
+def main() -> None:
+    previous_month = (date.today().replace(day=1) - timedelta(days=1)).replace(day=1)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--month", type=parse_month, default=previous_month, help="YYYY-MM")
+    parser.add_argument("--by-partition", action="store_true", help="one task per transactions partition")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    results = []
+    partitions = {}
+    for shard in shard_names():
+        db = shard_session(shard)
+        try:
+            if not args.by_partition:
+                results.append(FeeService.assess_periodic_fees(db, period=args.month))
+            else:
+                partitions[shard] = partition_count(db, "transactions")
+                if not partitions[shard]:
+                    sys.exit("The transactions table is not partitioned")
+        finally:
+            db.close()
+
+    if args.by_partition:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(assess_partition, shard, args.month, partition, count)
+                for shard, count in partitions.items()
+                for partition in range(count)
+            ]
+            results = [future.result() for future in futures]
+
+    print(
+        f"Assessed fees for {args.month:%Y-%m}: "
+        f"{sum(r.fees_posted for r in results)} posted, "
+        f"{sum(r.amount_posted for r in results):.2f} total"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# backend/scripts/partition_transactions.py
+"""
+Move the transactions table to hash partitions on account_id while it is in use.
+
+The partition_transactions migration creates transactions_partitioned and a
+trigger that mirrors every write to transactions into it. The phases are:
+
+    python scripts/partition_transactions.py backfill [--batch-size 50000]
+        copy existing rows in ID batches, one commit per batch; restartable
+    python scripts/partition_transactions.py verify
+        check that every row was copied
+    python scripts/partition_transactions.py cutover
+        swap the tables under a short exclusive lock
+    python scripts/partition_transactions.py verify-pruning [--account-id N]
+        check that the per-account repository queries read one partition
+    python scripts/partition_transactions.py drop-old
+        drop the unpartitioned table once the cutover has been checked
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.partitioning import explain_plans, partition_count, partition_name, scanned_relations
+from app.db.repositories import account_repository, transaction_repository
+from app.db.session import SessionLocal
+
+COLUMNS = (
+    "created_at, updated_at, id, transaction_type, amount, currency, "
+    "description, reference_id, status, recipient_account_id, account_id"
+)
+
+def backfill(db: Session, batch_size: int) -> None:
+    """Copy rows the trigger has not seen, without overwriting newer copies."""
+    min_id, max_id = db.execute(text("SELECT min(id), max(id) FROM transactions")).first()
+    if min_id is None:
+        print("Nothing to copy")
+        return
+
+    copied = 0
+    started = time.monotonic()
+    for start_id in range(min_id, max_id + 1, batch_size):
+        copied += db.execute(text(f"""
+            INSERT INTO transactions_partitioned ({COLUMNS})
+            SELECT {COLUMNS} FROM transactions
+            WHERE id >= :start_id AND id < :end_id
+            ON CONFLICT (id, account_id) DO NOTHING
+        """), {"start_id": start_id, "end_id": start_id + batch_size}).rowcount
+        db.commit()
+        print(f"Copied up to id {start_id + batch_size - 1} of {max_id} ({copied} rows)", flush=True)
+    print(f"Backfill done: {copied} rows in {time.monotonic() - started:.0f}s")
+
+def verify(db: Session) -> bool:
+    """Compare the two tables row by row."""
+    missing = db.execute(text("""
+        SELECT count(*) FROM transactions t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM transactions_partitioned p
+            WHERE p.id = t.id AND p.account_id = t.account_id
+        )
+    """)).scalar()
+    extra = db.execute(text("""
+        SELECT count(*) FROM transactions_partitioned p
+        WHERE NOT EXISTS (
+            SELECT 1 FROM transactions t
+            WHERE t.id = p.id AND t.account_id = p.account_id
+        )
+    """)).scalar()
+    print(f"{missing} rows missing from, {extra} extra rows in transactions_partitioned")
+    return missing == 0 and extra == 0
+
+def _rename_relation_objects(db: Session, table: str, old: str, new: str) -> None:
+    """Rename the constraints and indexes of a table, replacing old with new in their names."""
+    constraints = db.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass)"
+    ), {"table": table}).scalars().all()
+    for name in constraints:
+        db.execute(text(f'ALTER TABLE {table} RENAME CONSTRAINT "{name}" TO "{name.replace(old, new)}"'))
+    # Indexes backing constraints were renamed with them
+    indexes = db.execute(text("""
+        SELECT indexname FROM pg_indexes
+        WHERE tablename = :table AND indexname NOT IN (
+            SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass)
+        )
+    """), {"table": table}).scalars().all()
+    for name in indexes:
+        db.execute(text(f'ALTER INDEX "{name}" RENAME TO "{name.replace(old, new)}"'))
+
+def cutover(db: Session, lock_timeout: str) -> None:
+    """Swap transactions_partitioned in for transactions in one short transaction."""
+    # Give up rather than queue behind long transactions while blocking everyone else
+    db.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+    db.execute(text("LOCK TABLE transactions, transactions_partitioned IN ACCESS EXCLUSIVE MODE"))
+
+    # The trigger keeps the copy current; a cheap check catches a skipped backfill
+    source, copy = db.execute(text("""
+        SELECT (SELECT max(id) FROM transactions), (SELECT max(id) FROM transactions_partitioned)
+    """)).first()
+    if source != copy:
+        db.rollback()
+        sys.exit(f"Not backfilled: max id {source} in transactions, {copy} in the copy")
+
+    db.execute(text("DROP TRIGGER transactions_sync_partitioned ON transactions"))
+    db.execute(text("DROP FUNCTION transactions_sync_partitioned()"))
+    _rename_relation_objects(db, "transactions", "transactions", "transactions_unpartitioned")
+    db.execute(text("ALTER TABLE transactions RENAME TO transactions_unpartitioned"))
+    _rename_relation_objects(db, "transactions_partitioned", "transactions_partitioned", "transactions")
+    db.execute(text("ALTER TABLE transactions_partitioned RENAME TO transactions"))
+    # Otherwise dropping the old table would drop the ID sequence
+    db.execute(text("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id"))
+    db.commit()
+    print("transactions is now partitioned; the old table is transactions_unpartitioned")
+
+def verify_pruning(db: Session, account_id: int) -> bool:
+    """Check that the per-account repository queries read a single partition."""
+    partitions = partition_count(db, "transactions")
+    if not partitions:
+        print("transactions is not partitioned")
+        return False
+    partition_names = {partition_name("transactions", remainder) for remainder in range(partitions)}
+
+    reference_id = db.execute(text(
+        "SELECT reference_id FROM transactions WHERE account_id = :account_id LIMIT 1"
+    ), {"account_id": account_id}).scalar() or "TXN-NONE"
+    queries = {
+        "get_account_transactions": lambda: transaction_repository.get_account_transactions(
+            db, account_id=account_id,
+        ),
+        "get_by_reference_id": lambda: transaction_repository.get_by_reference_id(
+            db, reference_id=reference_id, account_id=account_id,
+        ),
+        "get_transaction_stats": lambda: transaction_repository.get_transaction_stats(
+            db, account_id=account_id,
+        ),
+    }
+
+    pruned = True
+    for name, query in queries.items():
+        with explain_plans(db) as plans:
+            query()
+        for plan in plans:
+            scanned = sorted(scanned_relations(plan) & partition_names)
+            ok = len(scanned) == 1
+            pruned = pruned and ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name}: {len(scanned)} of {partitions} partitions {scanned}")
+    return pruned
+
+def drop_old(db: Session) -> None:
+    db.execute(text("DROP TABLE transactions_unpartitioned"))
+    db.commit()
+    print("Dropped transactions_unpartitioned")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("phase", choices=["backfill", "verify", "cutover", "verify-pruning", "drop-old"])
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--lock-timeout", default="5s")
+    parser.add_argument("--account-id", type=int, help="account used by verify-pruning")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.phase == "backfill":
+            backfill(db, args.batch_size)
+        elif args.phase == "verify":
+            if not verify(db):
+                sys.exit(1)
+        elif args.phase == "cutover":
+            cutover(db, args.lock_timeout)
+        elif args.phase == "verify-pruning":
+            account_id = args.account_id or account_repository.get_id_range(db)[0]
+            if account_id is None or not verify_pruning(db, account_id):
+                sys.exit(1)
+        elif args.phase == "drop-old":
+            drop_old(db)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
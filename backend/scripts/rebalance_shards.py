@@ -0,0 +1,85 @@
+# backend/scripts/rebalance_shards.py
+"""
+Manage the placement of users on the shards in SHARD_DATABASES.
+
+Usage:
+    python scripts/rebalance_shards.py init
+        create the tables on the primary and every shard, and stride the
+        shard ID sequences so IDs stay unique across shards
+    python scripts/rebalance_shards.py pin
+        record the current shard of every user; run before adding a shard
+    python scripts/rebalance_shards.py plan [--limit N]
+        list users the current ring places on another shard
+    python scripts/rebalance_shards.py move --user-id N --to SHARD
+        move one user's accounts, transactions, audit logs and idempotency keys
+    python scripts/rebalance_shards.py apply [--limit N]
+        move the planned users one at a time
+
+Adding a shard: run pin, add it to SHARD_DATABASES, run init, deploy, then
+apply. Each move makes the user's requests fail with 503 for about
+SHARD_PLACEMENT_TTL_SECONDS plus the request deadline; a failed move can be
+rerun.
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal, create_all_tables, shard_router
+from app.services.rebalancing import RebalanceService
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["init", "pin", "plan", "move", "apply"])
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--to", dest="target", help="target shard of move")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--drain-seconds", type=float, help="wait before copying (default: placement TTL + deadline)")
+    args = parser.parse_args()
+
+    if not shard_router.shards:
+        sys.exit("SHARD_DATABASES is not set")
+    if args.command == "init":
+        create_all_tables()
+        print(f"Created tables on the primary and {len(shard_router.shards)} shards")
+        return
+
+    db = SessionLocal()
+    try:
+        if args.command == "pin":
+            print(f"Pinned {RebalanceService.pin_users(db)} users")
+        elif args.command == "plan":
+            moves = RebalanceService.plan(db, limit=args.limit)
+            for move in moves:
+                print(f"user {move.user_id}: {move.source} -> {move.target}")
+            print(f"{len(moves)} users to move")
+        elif args.command == "move":
+            if args.user_id is None or args.target is None:
+                sys.exit("move needs --user-id and --to")
+            result = RebalanceService.move_user(
+                db,
+                user_id=args.user_id,
+                target=args.target,
+                batch_size=args.batch_size,
+                drain_seconds=args.drain_seconds,
+            )
+            print(f"Moved user {result.user_id} from {result.source} to {result.target}: {result.rows}")
+        elif args.command == "apply":
+            moves = RebalanceService.plan(db, limit=args.limit)
+            for number, move in enumerate(moves, start=1):
+                result = RebalanceService.move_user(
+                    db,
+                    user_id=move.user_id,
+                    target=move.target,
+                    batch_size=args.batch_size,
+                    drain_seconds=args.drain_seconds,
+                )
+                print(f"[{number}/{len(moves)}] user {result.user_id}: {result.source} -> {result.target} {result.rows}", flush=True)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
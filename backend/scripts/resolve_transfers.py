@@ -0,0 +1,47 @@
+# backend/scripts/resolve_transfers.py
+"""
+Finish cross-shard transfers interrupted between the debit and the credit.
+
+Usage:
+    python scripts/resolve_transfers.py
+    python scripts/resolve_transfers.py --older-than 300
+
+Transfers still PENDING after --older-than seconds (default:
+CROSS_SHARD_TRANSFER_TIMEOUT_SECONDS) are credited and completed, or refunded
+when the destination account cannot be credited. Safe to run repeatedly,
+e.g. from cron.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import timedelta
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import settings
+from app.db.session import shard_names, shard_session
+from app.services.transactions import TransactionService
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than", type=int, default=settings.CROSS_SHARD_TRANSFER_TIMEOUT_SECONDS)
+    args = parser.parse_args()
+
+    completed = refunded = 0
+    for shard in shard_names():
+        db = shard_session(shard)
+        try:
+            shard_completed, shard_refunded = asyncio.run(TransactionService.resolve_cross_shard_transfers(
+                db, older_than=timedelta(seconds=args.older_than),
+            ))
+        finally:
+            db.close()
+        completed += shard_completed
+        refunded += shard_refunded
+
+    print(f"Resolved cross-shard transfers: {completed} completed, {refunded} refunded")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# backend/scripts/sweep_dormant_accounts.py
+"""
+Find dormant accounts and flag or deactivate them.
+
+Usage:
+    python scripts/sweep_dormant_accounts.py --action report --report dormant.csv
+    python scripts/sweep_dormant_accounts.py --action flag --days 365
+    python scripts/sweep_dormant_accounts.py --action deactivate --days 730 --report deactivated.csv
+
+With SHARD_DATABASES set, the shards are swept one after another.
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import shard_names, shard_session
+from app.services.dormancy import DormancyAction, DormancyService
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--action", choices=[a.value for a in DormancyAction], default=DormancyAction.FLAG.value)
+    parser.add_argument("--days", type=int, help="days without postings (default: DORMANCY_DAYS)")
+    parser.add_argument("--report", help="write a CSV report of dormant accounts to this file")
+    args = parser.parse_args()
+
+    results = []
+    report = open(args.report, "w", newline="") if args.report else None
+    try:
+        for shard in shard_names():
+            db = shard_session(shard)
+            try:
+                results.append(DormancyService.sweep(
+                    db,
+                    days_inactive=args.days,
+                    action=DormancyAction(args.action),
+                    report=report,
+                    report_header=not results,
+                ))
+            finally:
+                db.close()
+    finally:
+        if report is not None:
+            report.close()
+    result = results[0]
+    result.accounts = sum(r.accounts for r in results)
+    result.total_balance = sum(r.total_balance for r in results)
+
+    print(
+        f"Dormancy sweep ({result.action.value}): {result.accounts} accounts inactive since "
+        f"{result.cutoff_date:%Y-%m-%d}, {result.total_balance:.2f} total balance"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# backend/tests/conftest.py
+pytest_plugins = ["pytester", "tests.plugins.query_budget"]
@@ -145,17 +145,22 @@ def test_create_account(auth_headers):
     assert response.json()["currency"] == "USD"
     assert response.json()["balance"] == 0.0
 
-def test_deposit(auth_headers, test_account):
-    response = client.post(
-        "/api/v1/transactions/deposit",
-        headers=auth_headers,
-        json={
-            "account_id": test_account.id,
-            "amount": 1000.0,
-            "currency": "USD",
-            "description": "Initial deposit"
-        }
-    )
+def test_deposit(auth_headers, test_account, query_budget):
+    # User, SET LOCAL statement_timeout, owned account, reference ID check,
+    # transaction INSERT, account SELECT ... FOR UPDATE, account UPDATE, two
+    # audit INSERTs; after the commit a second SET LOCAL and the reload of
+    # server defaults for the response. Idempotency-Key requests add the claim.
+    with query_budget(max_queries=14):
+        response = client.post(
+            "/api/v1/transactions/deposit",
+            headers=auth_headers,
+            json={
+                "account_id": test_account.id,
+                "amount": 1000.0,
+                "currency": "USD",
+                "description": "Initial deposit"
+            }
+        )
     assert response.status_code == 200
     assert response.json()["transaction_type"] == "deposit"
     assert response.json()["amount"] == 1000.0
@@ -0,0 +1,84 @@
+# backend/tests/plugins/query_budget.py
+"""
+Query budgets for tests.
+
+Mark a test to fail when it executes more statements than declared, or
+repeats one statement shape too often (the N+1 pattern):
+
+    @pytest.mark.query_budget(max_queries=10, max_repeats=3)
+    def test_deposit(...):
+        ...
+
+or scope a budget to part of a test with the query_budget fixture:
+
+    def test_deposit(query_budget, ...):
+        with query_budget(max_queries=10):
+            client.post(...)
+"""
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import pytest
+
+from app.config.settings import settings
+from app.db.query_stats import QueryStats, record_queries
+
+def check_query_budget(
+    stats: QueryStats,
+    *,
+    max_queries: Optional[int] = None,
+    max_repeats: Optional[int] = None,
+) -> None:
+    """
+    Fail the current test if the recorded statements exceed the budget.
+
+    Args:
+        stats: Recorded statements
+        max_queries: Maximum number of statements, None for no limit
+        max_repeats: Maximum executions of one statement shape,
+            defaults to SQL_N_PLUS_ONE_THRESHOLD - 1
+    """
+    if max_repeats is None:
+        max_repeats = settings.SQL_N_PLUS_ONE_THRESHOLD - 1
+
+    problems = []
+    if max_queries is not None and stats.count > max_queries:
+        problems.append(f"{stats.count} queries executed, budget is {max_queries}")
+    for shape, executions in stats.repeated(max_repeats + 1):
+        problems.append(f"{executions} executions (max {max_repeats}) of: {shape}")
+    if problems:
+        statements = "\n".join(
+            f"  {executions}x {statement}" for statement, executions in stats.statements.most_common()
+        )
+        pytest.fail("Query budget exceeded:\n" + "\n".join(problems) + "\nStatements:\n" + statements)
+
+@pytest.fixture
+def query_budget():
+    """Context manager factory enforcing a query budget on a block."""
+    @contextmanager
+    def budget(max_queries: int = None, max_repeats: int = None) -> Iterator[QueryStats]:
+        with record_queries() as stats:
+            yield stats
+        check_query_budget(stats, max_queries=max_queries, max_repeats=max_repeats)
+    return budget
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries=None, max_repeats=None): fail if the test exceeds "
+        "its SQL statement budget or repeats one statement shape more than max_repeats times",
+    )
+
+@pytest.hookimpl(wrapper=True)
+def pytest_pyfunc_call(pyfuncitem):
+    marker = pyfuncitem.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    # Wrap whichever implementation calls the test, pytest's own or an async
+    # plugin's that awaits a coroutine test, so fixture setup and teardown
+    # are not counted; a failing test is reported as is
+    with record_queries() as stats:
+        result = yield
+    check_query_budget(stats, **marker.kwargs)
+    return result
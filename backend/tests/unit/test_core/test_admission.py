@@ -0,0 +1,88 @@
+# backend/tests/unit/test_core/test_admission.py
+import asyncio
+import threading
+
+from app.core.admission import (
+    BULK,
+    MONEY_MOVEMENT,
+    NOT_QUEUED,
+    STANDARD,
+    AdmissionController,
+    PriorityClass,
+)
+from app.core.metrics import ADMISSION_SHED
+
+def _controller(pool_in_use=lambda: 0) -> AdmissionController:
+    return AdmissionController(
+        [
+            PriorityClass(MONEY_MOVEMENT, 0, 2, 1.0),
+            PriorityClass(STANDARD, 1, 1, 0.05),
+            PriorityClass(BULK, 2, 1, 0),
+        ],
+        capacity=2,
+        max_queue=10,
+        pool_in_use=pool_in_use,
+    )
+
+def test_lower_classes_are_capped_and_shed():
+    async def main():
+        controller = _controller()
+        assert await controller.acquire(STANDARD)
+        # Standard is at its limit: queues briefly, then is shed
+        assert not await controller.acquire(STANDARD)
+        # Money movement may still use the remaining capacity
+        assert await controller.acquire(MONEY_MOVEMENT)
+        # Bulk never queues
+        not_queued = ADMISSION_SHED.labels(BULK, NOT_QUEUED)._value.get()
+        assert not await controller.acquire(BULK)
+        assert ADMISSION_SHED.labels(BULK, NOT_QUEUED)._value.get() == not_queued + 1
+        assert controller.in_flight == 2 and controller.queued == 0
+
+    asyncio.run(main())
+
+def test_released_slot_goes_to_highest_priority_waiter():
+    async def main():
+        controller = _controller()
+        controller.classes[STANDARD].queue_timeout = 1.0
+        assert await controller.acquire(MONEY_MOVEMENT)
+        assert await controller.acquire(MONEY_MOVEMENT)
+
+        standard = asyncio.ensure_future(controller.acquire(STANDARD))
+        await asyncio.sleep(0)
+        money = asyncio.ensure_future(controller.acquire(MONEY_MOVEMENT))
+        await asyncio.sleep(0)
+        assert controller.queued == 2
+
+        controller.release(MONEY_MOVEMENT)
+        assert await money
+        assert not standard.done()
+
+        controller.release(MONEY_MOVEMENT)
+        assert await standard
+        assert controller.in_flight == 2
+
+    asyncio.run(main())
+
+def test_pool_check_in_wakes_waiters_and_arrivals_queue_behind_them():
+    async def main():
+        # Background jobs hold the whole pool; admitted requests check out one connection each
+        background = [2]
+        controller = _controller(pool_in_use=lambda: background[0] + controller.in_flight)
+        first = asyncio.ensure_future(controller.acquire(MONEY_MOVEMENT))
+        await asyncio.sleep(0)
+        assert controller.in_flight == 0 and controller.queued == 1
+
+        background[0] = 1
+        threading.Thread(target=controller.wake_soon).start()
+        assert await first
+
+        # A connection is checked in, and a request arrives before the wake runs
+        second = asyncio.ensure_future(controller.acquire(MONEY_MOVEMENT))
+        await asyncio.sleep(0)
+        background[0] = 0
+        standard = asyncio.ensure_future(controller.acquire(STANDARD))
+        assert await second
+        assert not await standard
+        assert controller.in_flight == 2
+
+    asyncio.run(main())
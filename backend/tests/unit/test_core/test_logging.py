@@ -0,0 +1,28 @@
+# backend/tests/unit/test_core/test_logging.py
+import json
+import logging
+
+from app.core.logging import JsonFormatter, RequestIdFilter, request_id_var
+
+def make_record(**extra) -> logging.LogRecord:
+    record = logging.LogRecord("banking-system", logging.INFO, __file__, 1, "%s done", ("deposit",), None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(make_record(status_code=201, duration_ms=1.5)))
+    assert entry["message"] == "deposit done"
+    assert entry["level"] == "INFO"
+    assert entry["status_code"] == 201
+    assert entry["duration_ms"] == 1.5
+    assert "args" not in entry
+
+def test_request_id_filter_uses_context():
+    token = request_id_var.set("req-123")
+    try:
+        record = make_record()
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+    assert record.request_id == "req-123"
+    assert json.loads(JsonFormatter().format(record))["request_id"] == "req-123"
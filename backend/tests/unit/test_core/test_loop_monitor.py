@@ -0,0 +1,36 @@
+# backend/tests/unit/test_core/test_loop_monitor.py
+import asyncio
+import time
+
+from app.core.loop_monitor import LoopMonitor, blocking_site
+
+def test_blocking_site_prefers_application_frame():
+    stack = [
+        ("asyncio.events", "_run", 80),
+        ("app.services.auth", "authenticate", 52),
+        ("app.core.security", "verify_password", 30),
+        ("bcrypt", "checkpw", 91),
+    ]
+    assert blocking_site(stack) == ("app.core.security:verify_password:30", "bcrypt:checkpw")
+    assert blocking_site(stack[3:]) == ("bcrypt:checkpw", "bcrypt:checkpw")
+
+def test_blocking_callback_is_recorded():
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.03, max_sites=10)
+
+    def blocking_handler():
+        time.sleep(0.15)
+
+    async def main():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        blocking_handler()
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+    asyncio.run(main())
+
+    [site] = monitor.top()
+    assert site.leaf.endswith(":blocking_handler")
+    assert site.count == 1
+    assert site.total_ms >= 100
+    assert "test_loop_monitor:main" in site.stack
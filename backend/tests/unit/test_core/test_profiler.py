@@ -0,0 +1,62 @@
+# backend/tests/unit/test_core/test_profiler.py
+import asyncio
+import time
+
+from app.core.profiler import CPU, SUSPENDED, RequestProfiler
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_profiles_the_running_task_only():
+    profiler = RequestProfiler(interval=0.001, max_profiles=2)
+
+    async def profiled():
+        sampler = profiler.start("GET", "/api/v1/accounts")
+        _busy(0.05)
+        await asyncio.sleep(0.05)
+        return sampler.stop()
+
+    async def main():
+        profiled_task = asyncio.ensure_future(profiled())
+        await asyncio.sleep(0.06)
+        _busy(0.02)
+        return await profiled_task
+
+    profile = asyncio.run(main())
+    profiler.save(profile)
+
+    stacks = profile.collapsed().splitlines()
+    assert any("test_profiler:_busy" in line and "test_profiler:profiled" in line for line in stacks)
+    assert not any("test_profiler:main" in line for line in stacks)
+    assert profile.samples[SUSPENDED] > 0
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    assert profiler.get(profile.id) is profile
+
+def test_arming_profiles_n_matching_requests():
+    profiler = RequestProfiler(interval=0.001, max_profiles=2)
+    assert not profiler.take("/api/v1/accounts")
+
+    profiler.arm(2, path_prefix="/api/v1/transactions")
+    assert not profiler.take("/api/v1/accounts")
+    assert profiler.take("/api/v1/transactions/deposit") == CPU
+    assert profiler.take("/api/v1/transactions")
+    assert not profiler.take("/api/v1/transactions")
+    assert profiler.armed == 0
+
+def test_memory_profile_records_peak_and_retained_allocations():
+    profiler = RequestProfiler(interval=0.001, max_profiles=2)
+    tracker = profiler.start_memory("GET", "/api/v1/transactions")
+    assert profiler.start_memory("GET", "/api/v1/accounts") is None
+
+    temporary = [bytearray(1024) for _ in range(1000)]
+    del temporary
+    retained = [object() for _ in range(500)]
+    profile = tracker.stop()
+
+    assert profile.peak_bytes >= 1024 * 1000
+    assert profile.retained_blocks >= 500
+    assert any("test_profiler.py" in site.site for site in profile.top_sites)
+    assert profiler.start_memory("GET", "/api/v1/accounts").stop() is not None
+    assert retained
@@ -0,0 +1,75 @@
+# backend/tests/unit/test_core/test_rate_limit.py
+import os
+import time
+import uuid
+
+import pytest
+
+from app.core.rate_limit import (
+    InMemoryTokenBucketStore,
+    RateLimitRule,
+    SharedMemoryTokenBucketStore,
+)
+
+@pytest.fixture(params=["memory", "shared"])
+def store(request):
+    if request.param == "memory":
+        yield InMemoryTokenBucketStore(shards=4)
+        return
+    name = f"banking-test-{uuid.uuid4().hex[:8]}"
+    shared = SharedMemoryTokenBucketStore(name, slots=256, stripes=4)
+    yield shared
+    shared.close()
+    shared.unlink()
+    os.unlink(os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else "/tmp", f"{name}.lock"))
+
+def test_bucket_allows_burst_then_rejects(store):
+    rule = RateLimitRule.per_minute(3)
+    results = [store.hit("user:1", rule) for _ in range(4)]
+    assert [allowed for allowed, _, _ in results] == [True, True, True, False]
+    allowed, remaining, retry_after = results[-1]
+    assert remaining < 1.0
+    assert 0.0 < retry_after <= 20.0
+
+def test_buckets_are_independent_per_key(store):
+    rule = RateLimitRule.per_minute(1)
+    assert store.hit("login:ip:10.0.0.1", rule)[0]
+    assert not store.hit("login:ip:10.0.0.1", rule)[0]
+    assert store.hit("login:ip:10.0.0.2", rule)[0]
+
+def test_in_memory_store_only_evicts_refilled_buckets():
+    store = InMemoryTokenBucketStore(shards=1, max_buckets=2)
+    rule = RateLimitRule.per_minute(1)
+    store.hit("a", rule)
+    store.hit("b", rule)
+    store.hit("c", rule)
+    # "a" is still empty, so the shard grows rather than evict it
+    assert not store.hit("a", rule)[0]
+
+    store.hit("d", rule)
+    store.hit("e", rule)
+    # Beyond twice its size, the least recently used bucket ("b") goes regardless
+    assert store.hit("b", rule)[0]
+
+    fast = RateLimitRule(capacity=1.0, refill_rate=1000.0)
+    store = InMemoryTokenBucketStore(shards=1, max_buckets=2)
+    store.hit("a", fast)
+    time.sleep(0.01)
+    store.hit("b", rule)
+    store.hit("c", rule)
+    assert list(store._shards[0]) == ["b", "c"]
+
+def test_shared_memory_store_is_shared_between_handles():
+    name = f"banking-test-{uuid.uuid4().hex[:8]}"
+    first = SharedMemoryTokenBucketStore(name, slots=64, stripes=2)
+    second = SharedMemoryTokenBucketStore(name, slots=64, stripes=2)
+    rule = RateLimitRule.per_minute(2)
+    try:
+        assert first.hit("user:7", rule)[0]
+        assert second.hit("user:7", rule)[0]
+        assert not first.hit("user:7", rule)[0]
+    finally:
+        second.close()
+        first.close()
+        first.unlink()
+        os.unlink(os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else "/tmp", f"{name}.lock"))
@@ -0,0 +1,29 @@
+# backend/tests/unit/test_core/test_timing.py
+from app.core.timing import current_span_recorder, span, start_recording, stop_recording
+
+def test_span_without_recorder_is_noop():
+    assert current_span_recorder() is None
+    with span("account_load"):
+        pass
+    assert current_span_recorder() is None
+
+def test_spans_are_totalled_per_stage():
+    recorder, token = start_recording()
+    try:
+        with span("account_load"):
+            pass
+        with span("balance_update"):
+            pass
+        with span("account_load"):
+            pass
+    finally:
+        stop_recording(token)
+
+    assert [name for name, _ in recorder.spans] == ["account_load", "balance_update", "account_load"]
+    totals = recorder.totals()
+    assert list(totals) == ["account_load", "balance_update"]
+    assert totals["account_load"] == recorder.spans[0][1] + recorder.spans[2][1]
+    header = recorder.server_timing()
+    assert header.startswith("account_load;dur=")
+    assert ", balance_update;dur=" in header
+    assert current_span_recorder() is None
@@ -0,0 +1,51 @@
+# backend/tests/unit/test_db/test_account_cache.py
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db import account_cache as account_cache_module
+from app.db.account_cache import AccountCache, AccountSnapshot, invalidate_on_commit
+from app.db.models import Account
+from app.db.models.account import AccountType
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = AccountCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(account_cache_module, "account_cache", cache)
+    return cache
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Account.__table__.create(engine)
+    with Session(engine) as db:
+        db.add(Account(id=1, account_number="1000", account_type=AccountType.CHECKING, user_id=1))
+        db.commit()
+        yield db
+
+def test_committed_writes_invalidate_and_reject_older_snapshots(cache, db):
+    started = cache.begin()
+    stale = AccountSnapshot.from_account(db.get(Account, 1))
+    assert stale.version == 1
+
+    # A write commits while the reader still holds the row it loaded
+    db.get(Account, 1).balance = 50.0
+    db.commit()
+    assert not cache.put(stale, started=started)
+    assert cache.get(1) is None
+
+    started = cache.begin()
+    fresh = AccountSnapshot.from_account(db.get(Account, 1))
+    assert fresh.version == 2
+    assert cache.put(fresh, started=started)
+    assert cache.get(1).balance == 50.0
+
+    # Rolled back writes leave the entry alone
+    db.get(Account, 1).balance = 70.0
+    db.flush()
+    db.rollback()
+    assert cache.get(1) is fresh
+
+    invalidate_on_commit(db, [1])
+    db.commit()
+    assert cache.get(1) is None
@@ -0,0 +1,56 @@
+# backend/tests/unit/test_db/test_archive.py
+from datetime import datetime, timedelta
+
+from app.db.archive import Segment, checksum_rows, write_segment
+from app.db.models.transaction import TransactionStatus, TransactionType
+
+def _rows():
+    rows = []
+    for account_id in (3, 5):
+        for minute in range(300):
+            created_at = datetime(2022, 1, 1) + timedelta(minutes=minute)
+            rows.append({
+                "id": account_id * 1000 + minute,
+                "account_id": account_id,
+                "transaction_type": TransactionType.FEE if minute % 2 else TransactionType.DEPOSIT,
+                "amount": round(minute * 1.25, 2),
+                "currency": "USD",
+                "description": None if minute % 5 == 0 else f"Payment {minute}",
+                "reference_id": f"TXN-{account_id}-{minute}",
+                "status": TransactionStatus.COMPLETED,
+                "recipient_account_id": None,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+    return rows
+
+def test_segment_reads_back_rows_and_checksum(tmp_path):
+    rows = _rows()
+    path = str(tmp_path / "2022-01.seg")
+
+    checksum = write_segment(path, rows, block_rows=64)
+    segment = Segment(path)
+
+    assert checksum == checksum_rows(rows)
+    assert segment.checksum() == checksum
+    assert [segment.row(index) for index in (0, 5, 299, 450)] == [rows[index] for index in (0, 5, 299, 450)]
+
+def test_segment_select_applies_history_filters(tmp_path):
+    path = str(tmp_path / "2022-01.seg")
+    write_segment(path, _rows(), block_rows=64)
+    segment = Segment(path)
+
+    fees = segment.select(5, transaction_type=TransactionType.FEE, min_amount=10, max_amount=20)
+    first_hour = segment.select(3, start_date=datetime(2022, 1, 1), end_date=datetime(2022, 1, 1, 1))
+
+    assert [segment.row(index)["amount"] for index in fees] == [11.25, 13.75, 16.25, 18.75]
+    assert len(first_hour) == 61
+    assert len(segment.select(4)) == 0
+
+def test_checksum_detects_changed_rows():
+    rows = _rows()
+    changed = [dict(row) for row in rows]
+    changed[10]["status"] = TransactionStatus.CANCELLED
+
+    assert checksum_rows(rows)[:2] == checksum_rows(changed)[:2]
+    assert checksum_rows(rows)[2] != checksum_rows(changed)[2]
@@ -0,0 +1,35 @@
+# backend/tests/unit/test_db/test_deadlines.py
+import pytest
+
+from app.core.exceptions import DeadlineExceeded
+from app.db.deadlines import RequestDeadline, current_deadline, start_deadline, stop_deadline
+
+class _Connection:
+    cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+def test_deadline_expires():
+    deadline = RequestDeadline(0)
+    with pytest.raises(DeadlineExceeded, match="deadline exceeded"):
+        deadline.check()
+    assert deadline.remaining() == 0
+
+def test_cancel_reaches_attached_connections_only():
+    deadline, token = start_deadline(5)
+    try:
+        assert current_deadline() is deadline
+        running, returned = _Connection(), _Connection()
+        deadline.attach(running)
+        deadline.attach(returned)
+        deadline.detach(returned)
+        deadline.check()
+
+        assert deadline.cancel() == 1
+        assert running.cancelled and not returned.cancelled
+        with pytest.raises(DeadlineExceeded, match="Client disconnected"):
+            deadline.check()
+    finally:
+        stop_deadline(token)
+    assert current_deadline() is None
@@ -0,0 +1,42 @@
+# backend/tests/unit/test_db/test_invalidation.py
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.invalidation import InvalidationBus, Subscriber
+
+def make_bus():
+    evicted, flushed = [], []
+    bus = InvalidationBus(create_engine("sqlite://"), "cache_invalidation")
+    bus.subscribe("account", Subscriber(
+        evict=lambda key, version: evicted.append((key, version)),
+        flush=lambda: flushed.append(True),
+    ))
+    return bus, evicted, flushed
+
+def test_dispatch_evicts_entries_of_other_workers_and_resyncs_on_garbage():
+    bus, evicted, flushed = make_bus()
+    bus.dispatch(json.dumps({"origin": "other", "entries": [["account", 1, 2], ["alert_rule", 3, None]]}))
+    assert evicted == [(1, 2)]
+
+    # Our own commits were evicted locally already
+    bus.dispatch(json.dumps({"origin": bus.origin, "entries": [["account", 4, 1]]}))
+    assert evicted == [(1, 2)]
+
+    bus.dispatch(json.dumps({"origin": "other", "entries": [["account", None, None]]}))
+    bus.dispatch("not json")
+    assert flushed == [True, True]
+
+def test_large_commits_publish_an_entity_flush(monkeypatch):
+    bus, _, _ = make_bus()
+    monkeypatch.setattr("app.db.invalidation.settings.INVALIDATION_MAX_ENTRIES", 2)
+    with Session(bus.engine) as db:
+        bus.publish(db, "account", 1, 5)
+        bus.publish(db, "account", 1)
+        bus.publish(db, "account", 1, 6)
+        assert bus._entries(db) == [["account", 1, None]]
+
+        bus.publish(db, "account", 2)
+        bus.publish(db, "account", 3)
+        assert bus._entries(db) == [["account", None, None]]
@@ -0,0 +1,57 @@
+# backend/tests/unit/test_db/test_partitioning.py
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, Transaction
+from app.db.partitioning import hash_partitions_ddl, scanned_relations
+from app.db.repositories import transaction_repository
+from app.db.repositories.transactions import transaction_archive
+
+def test_hash_partitions_cover_every_remainder():
+    statements = hash_partitions_ddl("transactions_partitioned", 4, name="transactions")
+
+    assert len(statements) == 4
+    assert statements[3] == (
+        "CREATE TABLE IF NOT EXISTS transactions_p3 PARTITION OF transactions_partitioned "
+        "FOR VALUES WITH (MODULUS 4, REMAINDER 3)"
+    )
+
+def test_scanned_relations_walks_nested_plans():
+    plan = {
+        "Node Type": "Limit",
+        "Plans": [{
+            "Node Type": "Append",
+            "Plans": [
+                {"Node Type": "Index Scan", "Relation Name": "transactions_p3"},
+                {"Node Type": "Seq Scan", "Relation Name": "accounts"},
+            ],
+        }],
+    }
+
+    assert scanned_relations(plan) == {"transactions_p3", "accounts"}
+
+def test_per_account_queries_filter_on_the_partition_key(monkeypatch):
+    # Partition pruning needs account_id in every WHERE clause on transactions
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    Account.__table__.to_metadata(metadata)
+    # SQLite cannot autoincrement the (id, account_id) key of the partitioned table
+    Transaction.__table__.to_metadata(metadata).c.id.autoincrement = False
+    metadata.create_all(engine, tables=[metadata.tables["transactions"]])
+    monkeypatch.setattr(transaction_archive, "boundary", lambda db: None)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, parameters, *args: (
+        statements.append((" ".join(statement.split()), parameters))
+    ))
+
+    with Session(engine) as db:
+        transaction_repository.get_account_transactions(db, account_id=42)
+        transaction_repository.get_by_reference_id(db, reference_id="TXN-1", account_id=42)
+        transaction_repository.get_transaction_stats(db, account_id=42)
+
+    assert len(statements) > 3
+    for statement, parameters in statements:
+        assert "FROM transactions" in statement
+        where = statement.split(" WHERE ", 1)[1]
+        assert where.startswith("transactions.account_id = ?") or " AND transactions.account_id = ?" in where, statement
+        assert 42 in parameters
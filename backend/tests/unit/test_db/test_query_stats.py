@@ -0,0 +1,70 @@
+# backend/tests/unit/test_db/test_query_stats.py
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.query_stats import instrument_engine, statement_shape, track_queries
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE accounts (id INTEGER PRIMARY KEY, balance FLOAT)"))
+    return engine
+
+def test_statement_shape_collapses_in_lists_and_whitespace():
+    first = statement_shape("SELECT * FROM accounts\n WHERE id IN (%(id_1_1)s, %(id_1_2)s)")
+    second = statement_shape("SELECT * FROM accounts WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)")
+    assert first == second == "SELECT * FROM accounts WHERE id IN (...)"
+
+def test_track_queries_counts_statements_in_context(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))  # Not tracked
+        with track_queries() as stats:
+            for account_id in range(3):
+                connection.execute(text("SELECT * FROM accounts WHERE id = :id"), {"id": account_id})
+    assert stats.count == 3
+    assert stats.duration > 0
+    assert stats.repeated(3) == [("SELECT * FROM accounts WHERE id = ?", 3)]
+    assert stats.repeated(4) == []
+
+def test_query_budget_fixture_fails_on_repeated_statements(engine, query_budget):
+    with engine.connect() as connection:
+        with query_budget(max_queries=2):
+            connection.execute(text("SELECT 1"))
+
+        with pytest.raises(pytest.fail.Exception, match="2 executions"):
+            with query_budget(max_repeats=1):
+                for account_id in range(2):
+                    connection.execute(text("SELECT * FROM accounts WHERE id = :id"), {"id": account_id})
+
+@pytest.mark.query_budget(max_queries=1)
+def test_query_budget_marker(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+def test_query_budget_marker_awaits_async_tests(pytester):
+    pytester.makeconftest('pytest_plugins = ["tests.plugins.query_budget"]')
+    pytester.makepyfile('''
+        import pytest
+        from sqlalchemy import create_engine, text
+
+        from app.db.query_stats import instrument_engine
+
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+
+        @pytest.fixture
+        def anyio_backend():
+            return "asyncio"
+
+        @pytest.mark.anyio
+        @pytest.mark.query_budget(max_queries=1)
+        async def test_over_budget():
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+    ''')
+    result = pytester.runpytest_inprocess("-p", "anyio")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*2 queries executed, budget is 1*"])
@@ -0,0 +1,49 @@
+# backend/tests/unit/test_db/test_replicas.py
+from sqlalchemy import create_engine
+
+from app.db.replicas import READ_AFTER_COOKIE, Replica, ReplicaRouter, parse_lsn
+from app.middleware.read_your_writes import read_after_lsn
+
+def _router(*replicas: Replica) -> ReplicaRouter:
+    return ReplicaRouter(list(replicas), max_lag=5, tracked_users=10)
+
+def test_parse_lsn_orders_positions():
+    assert parse_lsn("0/16B3748") == 0x16B3748
+    assert parse_lsn("1/0") > parse_lsn("0/FFFFFFFF")
+    assert parse_lsn(None) == 0
+
+def test_round_robin_skips_unhealthy_replicas():
+    first = Replica("first", engine=None, healthy=True, replay_lsn=100)
+    down = Replica("down", engine=None, healthy=False, replay_lsn=100)
+    second = Replica("second", engine=None, healthy=True, replay_lsn=100)
+    router = _router(first, down, second)
+
+    chosen = [router.choose().name for _ in range(4)]
+    assert set(chosen) == {"first", "second"}
+    assert _router().choose() is None
+
+def test_reads_after_a_write_wait_for_replay():
+    # A replica that cannot report a newer position is skipped for the writer
+    replica = Replica("lagging", engine=create_engine("sqlite://"), healthy=True, replay_lsn=100)
+    router = _router(replica)
+    router.record_write(1, 200)
+
+    assert router.choose(user_id=2) is replica
+    assert router.choose(user_id=1) is None
+    assert not replica.healthy
+
+def test_reads_wait_for_the_write_in_the_client_cookie():
+    # Written through another worker, which this router never heard of
+    replica = Replica("lagging", engine=create_engine("sqlite://"), healthy=True, replay_lsn=100)
+    router = _router(replica)
+
+    assert router.choose(user_id=1, min_lsn=100) is replica
+    assert router.choose(user_id=1, min_lsn=200) is None
+
+def test_read_after_cookie_is_parsed_leniently():
+    def scope(cookie):
+        return {"headers": [(b"cookie", cookie.encode())]}
+
+    assert read_after_lsn(scope(f"session=x; {READ_AFTER_COOKIE}=4096")) == 4096
+    assert read_after_lsn(scope(f"{READ_AFTER_COOKIE}=16/B374D848")) == 0
+    assert read_after_lsn({"headers": []}) == 0
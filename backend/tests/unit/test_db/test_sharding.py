@@ -0,0 +1,67 @@
+# backend/tests/unit/test_db/test_sharding.py
+import contextvars
+
+from sqlalchemy import column, create_engine, desc, select, table
+from sqlalchemy.orm import sessionmaker
+
+from app.db.context import bind_user
+from app.db.models import Account
+from app.db.models.account import AccountType
+from app.db.sharding import (
+    USER_ID_COLUMNS,
+    HashRing,
+    ShardedSession,
+    ShardRouter,
+    compared_values,
+    parse_shard_databases,
+)
+
+def test_adding_a_shard_only_moves_keys_to_it():
+    before = HashRing(["s1", "s2", "s3"], vnodes=64)
+    after = HashRing(["s1", "s2", "s3", "s4"], vnodes=64)
+
+    moved = [key for key in range(10000) if before.shard_for(key) != after.shard_for(key)]
+
+    assert {after.shard_for(key) for key in moved} == {"s4"}
+    assert 1500 < len(moved) < 3500
+
+def test_compared_values_finds_equality_and_in():
+    accounts = table("accounts", column("id"), column("user_id"))
+
+    by_user = select(accounts).where(accounts.c.user_id == 7, accounts.c.id > 3)
+    by_users = select(accounts).where(accounts.c.user_id.in_([1, 2]))
+
+    assert compared_values(by_user.whereclause, USER_ID_COLUMNS) == [7]
+    assert compared_values(by_users.whereclause, USER_ID_COLUMNS) == [1, 2]
+    assert compared_values(select(accounts).where(accounts.c.id == 3).whereclause, USER_ID_COLUMNS) is None
+
+def test_parse_shard_databases():
+    assert parse_shard_databases("a=db1:5433/bank, b=db2/bank") == {
+        "a": ("db1", 5433, "bank"),
+        "b": ("db2", 5432, "bank"),
+    }
+
+def test_superuser_queries_merge_every_shard_in_order():
+    shards = {"a": create_engine("sqlite://"), "b": create_engine("sqlite://")}
+    for name, ids in {"a": [1, 3, 5, 8], "b": [2, 4, 6, 7]}.items():
+        Account.__table__.create(shards[name])
+        with shards[name].begin() as conn:
+            conn.execute(Account.__table__.insert(), [
+                dict(id=i, account_number=str(i), account_type=AccountType.CHECKING, user_id=i,
+                     balance=float(i % 3), currency="USD", version=1)
+                for i in ids
+            ])
+    router = ShardRouter(create_engine("sqlite://"), shards, vnodes=8, cache_size=10, placement_ttl=10)
+
+    def run():
+        bind_user(1, superuser=True)
+        with sessionmaker(class_=ShardedSession, router=router)() as db:
+            page = db.query(Account).order_by(Account.id).offset(2).limit(3).all()
+            assert [account.id for account in page] == [3, 4, 5]
+            assert db.query(Account).count() == 8
+            assert db.query(Account.id).order_by(desc(Account.balance), Account.id).limit(3).all() \
+                == [(2,), (5,), (8,)]
+            by_balance = db.query(Account).order_by(Account.balance, desc(Account.id)).limit(2).all()
+            assert [account.id for account in by_balance] == [6, 3]
+
+    contextvars.copy_context().run(run)
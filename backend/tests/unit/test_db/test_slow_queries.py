@@ -0,0 +1,31 @@
+# backend/tests/unit/test_db/test_slow_queries.py
+from sqlalchemy import create_engine, text
+
+from app.db.slow_queries import SlowQueryLog, instrument_engine, parameter_shape
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape({"user_id_1": 7, "id_1": [1, 2, 3], "email": "a@b.c"}) == {
+        "user_id_1": "int",
+        "id_1": "list[3]",
+        "email": "str",
+    }
+    assert parameter_shape([{"amount": 1.0}, {"amount": 2.0}]) == {
+        "executemany": 2,
+        "row": {"amount": "float"},
+    }
+
+def test_slow_queries_are_recorded_newest_first():
+    engine = create_engine("sqlite://")
+    slow_query_log = SlowQueryLog(threshold_ms=0, explain_sample_rate=0.0, buffer_size=2)
+    instrument_engine(engine, slow_query_log)
+
+    with engine.connect() as connection:
+        for value in range(3):
+            connection.execute(text("SELECT :value"), {"value": value})
+
+    entries = slow_query_log.recent()
+    assert len(entries) == 2
+    assert entries[0].timestamp >= entries[1].timestamp
+    assert entries[0].statement == "SELECT ?"
+    assert entries[0].parameters == ["int"]
+    assert entries[0].explain is None
@@ -0,0 +1,71 @@
+# backend/tests/unit/test_db/test_unit_of_work.py
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Account
+from app.db.models.account import AccountType
+from app.db.query_stats import instrument_engine, track_queries
+from app.db.unit_of_work import UnitOfWork, current_unit_of_work
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    Account.__table__.create(engine)
+    with Session(engine) as db:
+        db.add(Account(id=1, account_number="1000", account_type=AccountType.CHECKING, user_id=1))
+        db.commit()
+    return engine
+
+def test_get_loads_each_entity_once_per_unit_of_work(engine):
+    with Session(engine, expire_on_commit=False) as db:
+        uow = UnitOfWork(db)
+        assert current_unit_of_work(db) is uow
+        with track_queries() as stats:
+            account = uow.get(Account, 1)
+            assert uow.get(Account, 1) is account
+            assert uow.get(Account, 2) is None
+        assert stats.count == 2
+
+        uow.close()
+        assert current_unit_of_work(db) is None
+
+def test_commit_runs_once_and_close_rolls_back_the_rest(engine):
+    committed = []
+    with Session(engine, expire_on_commit=False) as db:
+        uow = UnitOfWork(db)
+        uow.after_commit(lambda: committed.append(True))
+        uow.get(Account, 1).balance = 10.0
+        uow.commit()
+        assert committed == [True]
+        with pytest.raises(RuntimeError):
+            uow.commit()
+        uow.close()
+
+    with Session(engine) as db:
+        uow = UnitOfWork(db)
+        uow.get(Account, 1).balance = 20.0
+        db.flush()
+        uow.close()
+
+    with Session(engine) as db:
+        assert db.get(Account, 1).balance == 10.0
+
+def test_checkpoint_commits_without_ending_the_unit_of_work(engine):
+    committed = []
+    with Session(engine, expire_on_commit=False) as db:
+        uow = UnitOfWork(db)
+        uow.after_commit(lambda: committed.append("debit"))
+        uow.get(Account, 1).balance = 10.0
+        uow.checkpoint()
+        assert committed == ["debit"]
+
+        # Work after the checkpoint is rolled back unless committed
+        uow.get(Account, 1).balance = 20.0
+        db.flush()
+        uow.close()
+        assert not uow.committed
+
+    with Session(engine) as db:
+        assert db.get(Account, 1).balance == 10.0
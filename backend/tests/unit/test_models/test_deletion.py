@@ -0,0 +1,10 @@
+# backend/tests/unit/test_models/test_deletion.py
+from sqlalchemy import inspect
+
+from app.db.models import Account, User
+
+def test_deleting_a_parent_never_loads_its_children():
+    for relationship in (inspect(User).relationships["accounts"], inspect(Account).relationships["transactions"]):
+        assert relationship.passive_deletes == "all"
+        assert not relationship.cascade.delete
+        assert not relationship.cascade.delete_orphan
@@ -0,0 +1,97 @@
+# backend/tests/unit/test_services/test_accounts.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, AuditLog
+from app.db.models.account import AccountType
+from app.db.query_stats import instrument_engine, track_queries
+from app.db.repositories import account_repository
+from app.services.accounts import AccountService
+from app.utils.cache import LRUCache
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(AccountService, "_owners", LRUCache(maxsize=10))
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    Account.__table__.create(engine)
+    with Session(engine) as db:
+        db.add(Account(id=1, account_number="1000", account_type=AccountType.CHECKING, user_id=1))
+        db.add(Account(id=2, account_number="2000", account_type=AccountType.CHECKING, user_id=2))
+        db.commit()
+        yield db
+
+def get_owned(db, account_id, user):
+    return asyncio.run(AccountService.get_owned(db, account_id=account_id, user=user))
+
+def test_get_owned_checks_ownership_in_the_loading_query(db):
+    owner = SimpleNamespace(id=1, is_superuser=False)
+    with track_queries() as stats:
+        assert get_owned(db, 1, owner).id == 1
+    assert stats.count == 1
+
+    with pytest.raises(HTTPException) as missing:
+        get_owned(db, 3, owner)
+    assert missing.value.status_code == 404
+
+    with pytest.raises(HTTPException) as foreign:
+        get_owned(db, 2, owner)
+    assert foreign.value.status_code == 403
+
+    # The owner of account 2 is now cached, so a second attempt costs nothing
+    with track_queries() as stats, pytest.raises(HTTPException):
+        get_owned(db, 2, owner)
+    assert stats.count == 0
+
+    assert get_owned(db, 2, SimpleNamespace(id=3, is_superuser=True)).id == 2
+
+def test_postings_work_from_the_balance_committed_since_the_load(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bank.db'}")
+    Account.__table__.create(engine)
+    AuditLog.__table__.create(engine)
+    with Session(engine) as setup:
+        setup.add(Account(id=1, account_number="1000", account_type=AccountType.CHECKING, user_id=1, balance=100.0))
+        setup.commit()
+
+    with Session(engine) as db, Session(engine) as other:
+        account = db.get(Account, 1)
+        # Another request posts to the account after it was loaded here
+        other.get(Account, 1).balance = 150.0
+        other.commit()
+
+        account = asyncio.run(AccountService.update_balance(
+            db, account_id=1, account=account, amount=-120.0, description="Withdrawal", current_user_id=1,
+        ))
+        db.commit()
+        assert (account.balance, account.version) == (30.0, 3)
+
+def test_deleted_accounts_are_no_longer_authorized(db):
+    AuditLog.__table__.create(db.get_bind())
+    owner = SimpleNamespace(id=1, is_superuser=False)
+    asyncio.run(AccountService.authorize(db, account_id=1, user=owner))
+    assert AccountService._owners.get(1) == 1
+
+    asyncio.run(AccountService.delete(db, account_id=1, current_user_id=3))
+    db.commit()
+    with pytest.raises(HTTPException) as deleted:
+        asyncio.run(AccountService.authorize(db, account_id=1, user=owner))
+    assert deleted.value.status_code == 404
+
+def test_rows_locked_by_the_transaction_are_not_locked_again(db):
+    account = db.get(Account, 1)
+    with track_queries() as stats:
+        assert account_repository.lock(db, account=account) is account
+        assert account_repository.lock(db, account=account) is account
+    assert stats.count == 1
+
+    # Committing releases the lock, so the next transaction takes it again
+    db.commit()
+    account = db.get(Account, 1)
+    with track_queries() as stats:
+        account_repository.lock(db, account=account)
+    assert stats.count == 1
@@ -0,0 +1,156 @@
+# backend/tests/unit/test_services/test_bulk_payments.py
+import io
+import xml.etree.ElementTree as ET
+from decimal import Decimal
+
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db.models import Account, AuditLog, Transaction
+from app.db.models.account import AccountType
+from app.db.models.transaction import TransactionStatus, TransactionType
+from app.db.repositories import transaction_repository
+from app.services import fees
+from app.services.bulk_payments import (
+    BulkPaymentReport, BulkPaymentService, Pain001Parser, PaymentRejection, PAIN_002_NAMESPACE,
+)
+
+PAIN_001 = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pain.001.001.03">
+  <CstmrCdtTrfInitn>
+    <GrpHdr>
+      <MsgId>MSG-1</MsgId>
+      <CreDtTm>2024-01-01T00:00:00</CreDtTm>
+      <NbOfTxs>2</NbOfTxs>
+      <CtrlSum>30.50</CtrlSum>
+    </GrpHdr>
+    <PmtInf>
+      <PmtInfId>PMT-1</PmtInfId>
+      <DbtrAcct><Id><Othr><Id>2024010100000001</Id></Othr></Id></DbtrAcct>
+      <CdtTrfTxInf>
+        <PmtId><InstrId>I-1</InstrId><EndToEndId>E2E-1</EndToEndId></PmtId>
+        <Amt><InstdAmt Ccy="usd">10.50</InstdAmt></Amt>
+        <Cdtr><Nm>Supplier</Nm></Cdtr>
+        <CdtrAcct><Id><IBAN>DE89370400440532013000</IBAN></Id></CdtrAcct>
+        <RmtInf><Ustrd>Invoice 1</Ustrd></RmtInf>
+      </CdtTrfTxInf>
+      <CdtTrfTxInf>
+        <PmtId><EndToEndId>E2E-2</EndToEndId></PmtId>
+        <Amt><InstdAmt Ccy="USD">20.00</InstdAmt></Amt>
+      </CdtTrfTxInf>
+    </PmtInf>
+  </CstmrCdtTrfInitn>
+</Document>
+"""
+
+def test_parser_streams_payments():
+    parser = Pain001Parser(io.BytesIO(PAIN_001))
+    payments = list(parser)
+
+    assert parser.message_id == "MSG-1"
+    assert parser.number_of_transactions == 2
+    assert parser.control_sum == Decimal("30.50")
+    assert [p.end_to_end_id for p in payments] == ["E2E-1", "E2E-2"]
+
+    first = payments[0]
+    assert first.payment_information_id == "PMT-1"
+    assert first.instruction_id == "I-1"
+    assert first.debtor_account == "2024010100000001"
+    assert first.amount == Decimal("10.50")
+    assert first.currency == "USD"
+    assert first.creditor_name == "Supplier"
+    assert first.creditor_account == "DE89370400440532013000"
+    assert first.remittance_information == "Invoice 1"
+
+    assert payments[1].creditor_name is None
+    assert payments[1].debtor_account == "2024010100000001"
+
+def test_report_renders_rejections_as_pain002():
+    report = BulkPaymentReport(message_id="MSG-1", number_of_transactions=2, accepted=1)
+    report.rejections.append(PaymentRejection(
+        payment_information_id="PMT-1",
+        end_to_end_id="E2E-2",
+        instruction_id=None,
+        reason_code="AM04",
+        reason="Insufficient funds",
+    ))
+
+    document = ET.fromstring(report.to_pain002())
+    ns = {"p": PAIN_002_NAMESPACE}
+
+    assert report.group_status == "PART"
+    assert document.findtext("p:CstmrPmtStsRpt/p:OrgnlGrpInfAndSts/p:OrgnlMsgId", namespaces=ns) == "MSG-1"
+    assert document.findtext("p:CstmrPmtStsRpt/p:OrgnlGrpInfAndSts/p:GrpSts", namespaces=ns) == "PART"
+    status = document.find("p:CstmrPmtStsRpt/p:OrgnlPmtInfAndSts/p:TxInfAndSts", namespaces=ns)
+    assert status.findtext("p:OrgnlEndToEndId", namespaces=ns) == "E2E-2"
+    assert status.findtext("p:StsRsnInf/p:Rsn/p:Cd", namespaces=ns) == "AM04"
+
+def test_reposting_a_chunk_resumes_and_charges_fees(monkeypatch):
+    engine = create_engine("sqlite://")
+    for model in (Account, AuditLog):
+        model.__table__.create(engine)
+    # SQLite cannot autoincrement the (id, account_id) key of the partitioned table
+    metadata = MetaData()
+    Account.__table__.to_metadata(metadata)
+    transactions = Transaction.__table__.to_metadata(metadata)
+    transactions.c.id.autoincrement = False
+    transactions.c.id.nullable = True
+    transactions.create(engine)
+    monkeypatch.setattr(fees, "_TRANSACTION_FEES", fees.compile_transaction_fees((fees.TransactionFee(
+        transaction_type=TransactionType.PAYMENT, account_type=AccountType.CHECKING, flat=1.0,
+    ),)))
+    # SQLite cannot RETURNING; insert the rows as Postgres would
+    def bulk_create(db, *, rows):
+        if rows:
+            db.execute(Transaction.__table__.insert(), rows)
+        return {(row["reference_id"], row["account_id"]) for row in rows}
+    monkeypatch.setattr(transaction_repository, "bulk_create", bulk_create)
+
+    payments = list(Pain001Parser(io.BytesIO(PAIN_001)))
+    chunk = [
+        (BulkPaymentService.reference_id("MSG-1", payment, sequence=sequence), payment)
+        for sequence, payment in enumerate(payments, start=1)
+    ]
+    assert BulkPaymentService.reference_id("MSG-1", payments[0], sequence=1) == chunk[0][0]
+    assert len({reference_id for reference_id, _ in chunk}) == 2
+
+    with Session(engine) as db:
+        db.add(Account(id=1, account_number="2024010100000001", account_type=AccountType.CHECKING,
+                       user_id=1, balance=100.0))
+        db.commit()
+        debtors = {"2024010100000001": db.get(Account, 1)}
+
+        # The first upload stopped after posting the first payment
+        BulkPaymentService._post_chunk(db, chunk[:1], debtors, BulkPaymentReport(), current_user_id=1)
+        report = BulkPaymentReport()
+        BulkPaymentService._post_chunk(db, chunk, debtors, report, current_user_id=1)
+
+        assert (report.accepted, report.accepted_amount, report.rejections) == (2, Decimal("30.50"), [])
+        references = sorted(reference_id for reference_id, in db.query(Transaction.reference_id))
+        assert references == sorted([chunk[0][0], f"{chunk[0][0]}-FEE", chunk[1][0], f"{chunk[1][0]}-FEE"])
+        assert db.query(Account.balance).scalar() == 100.0 - 10.5 - 20.0 - 2 * 1.0
+
+        # Status is checked on the locked row, not the first pass snapshot
+        db.query(Account).update({Account.is_active: False})
+        db.commit()
+        report = BulkPaymentReport()
+        other = [(BulkPaymentService.reference_id("MSG-2", payments[0], sequence=1), payments[0])]
+        BulkPaymentService._post_chunk(db, other, debtors, report, current_user_id=1)
+        assert [rejection.reason_code for rejection in report.rejections] == ["AC04"]
+
+def test_bulk_insert_skips_rows_already_posted():
+    class Recorder:
+        info = {}
+        def execute(self, statement):
+            self.statement = statement
+            return type("Result", (), {"all": lambda self: []})()
+
+    db = Recorder()
+    transaction_repository.bulk_create(db, rows=[{
+        "transaction_type": TransactionType.PAYMENT, "amount": 1.0, "currency": "USD",
+        "reference_id": "PAIN-1", "status": TransactionStatus.COMPLETED, "account_id": 1,
+    }])
+    sql = str(db.statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (reference_id, account_id) DO NOTHING" in sql
+    assert "RETURNING transactions.reference_id, transactions.account_id" in sql
@@ -0,0 +1,102 @@
+# backend/tests/unit/test_services/test_fees.py
+from types import SimpleNamespace
+
+from app.db.models.account import AccountType
+from app.db.models.transaction import TransactionStatus, TransactionType
+from app.db.repositories import transaction_repository
+from app.services.fees import FeeService, TransactionFee, compile_transaction_fees
+from app.services.transactions import TransactionService
+
+class Recorder:
+    """Session stand-in capturing the statement a repository executes."""
+    def __init__(self):
+        self.info = {}
+    
+    def execute(self, statement, params):
+        self.statement, self.params = statement, params
+        return SimpleNamespace(first=lambda: (2, 7.5, [3, 4]))
+
+def test_transaction_fee_is_clamped():
+    fee = TransactionFee(
+        transaction_type=TransactionType.PAYMENT,
+        account_type=AccountType.CREDIT,
+        flat=0.25,
+        percent=0.01,
+        minimum=1.00,
+        maximum=10.00,
+    )
+    
+    assert fee.calculate(10.0) == 1.00
+    assert fee.calculate(200.0) == 2.25
+    assert fee.calculate(5_000.0) == 10.00
+
+def test_compiled_schedule_lookup():
+    fee = TransactionFee(
+        transaction_type=TransactionType.WITHDRAWAL,
+        account_type=AccountType.SAVINGS,
+        flat=2.50,
+    )
+    compiled = compile_transaction_fees((fee,))
+    
+    assert compiled == {(TransactionType.WITHDRAWAL, AccountType.SAVINGS): fee}
+
+def test_no_fee_without_schedule():
+    assert FeeService.transaction_fee(
+        transaction_type=TransactionType.DEPOSIT,
+        account_type=AccountType.CHECKING,
+        amount=100.0,
+    ) == 0.0
+
+def test_periodic_fees_are_posted_once_per_period_and_capped_at_the_balance():
+    db = Recorder()
+    
+    posted = transaction_repository.post_periodic_fees(
+        db,
+        account_type="CHECKING",
+        amount=5.0,
+        balance_below=1_000.0,
+        reference_prefix="FEE-MAINT-202610",
+        description="Monthly maintenance fee",
+        start_id=1,
+        end_id=100,
+    )
+    
+    sql = " ".join(str(db.statement).split())
+    assert posted == (2, 7.5)
+    # Matching accounts are locked and charged at most their balance
+    assert "LEAST(CAST(:amount AS double precision), balance) AS amount" in sql
+    assert "(CAST(:balance_below AS double precision) IS NULL OR balance < :balance_below)" in sql
+    assert "FOR UPDATE ), posted AS ( INSERT INTO transactions" in sql
+    # A rerun for the same period skips the accounts already charged
+    assert ":reference_prefix || '-' || due.account_id" in sql
+    assert "ON CONFLICT (reference_id, account_id) DO NOTHING RETURNING account_id, amount" in sql
+    assert "UPDATE accounts SET balance = accounts.balance - posted.amount" in sql
+    assert "satisfies_hash_partition" not in sql
+    assert (db.params["balance_below"], db.params["reference_prefix"]) == (1_000.0, "FEE-MAINT-202610")
+
+def test_periodic_fees_restricted_to_a_partition():
+    db = Recorder()
+    
+    transaction_repository.post_periodic_fees(
+        db, account_type="SAVINGS", amount=1.0, balance_below=None, reference_prefix="FEE-X",
+        description="Fee", start_id=1, end_id=100, partition=2, partitions=8,
+    )
+    
+    assert "satisfies_hash_partition('transactions'::regclass, :partitions, :partition, id)" in str(db.statement)
+    assert (db.params["balance_below"], db.params["partition"], db.params["partitions"]) == (None, 2, 8)
+
+def test_fee_transaction_is_derived_from_its_parent(monkeypatch):
+    created = {}
+    def create_with_reference_id(db, *, obj_in, reference_id):
+        created.update(obj_in.dict(), reference_id=reference_id)
+    monkeypatch.setattr(transaction_repository, "create_with_reference_id", create_with_reference_id)
+    transfer = SimpleNamespace(
+        transaction_type=TransactionType.TRANSFER, reference_id="TXN-20261018-ABC", currency="EUR", account_id=7,
+    )
+    
+    TransactionService._create_fee_transaction(None, transaction=transfer, fee=1.25)
+    
+    assert created["reference_id"] == "TXN-20261018-ABC-FEE"
+    assert (created["transaction_type"], created["status"]) == (TransactionType.FEE, TransactionStatus.COMPLETED)
+    assert (created["amount"], created["currency"], created["account_id"]) == (1.25, "EUR", 7)
+    assert created["description"] == "Transfer fee: TXN-20261018-ABC"
@@ -0,0 +1,86 @@
+# backend/tests/unit/test_services/test_idempotency.py
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.models.idempotency import IdempotencyKey
+from app.db.unit_of_work import UnitOfWork
+from app.services.idempotency import IdempotencyScope, IdempotencyService, StoredResponse
+from app.utils.cache import LRUCache
+
+def test_request_hash_ignores_key_order():
+    first = IdempotencyService.hash_request(
+        method="POST",
+        path="/api/v1/transactions/deposit",
+        payload={"account_id": 1, "amount": 10.0, "currency": "USD"},
+    )
+    second = IdempotencyService.hash_request(
+        method="POST",
+        path="/api/v1/transactions/deposit",
+        payload={"currency": "USD", "amount": 10.0, "account_id": 1},
+    )
+    assert first == second
+
+def test_request_hash_depends_on_payload_and_path():
+    payload = {"account_id": 1, "amount": 10.0, "currency": "USD"}
+    deposit = IdempotencyService.hash_request(
+        method="POST", path="/api/v1/transactions/deposit", payload=payload,
+    )
+    withdrawal = IdempotencyService.hash_request(
+        method="POST", path="/api/v1/transactions/withdrawal", payload=payload,
+    )
+    larger = IdempotencyService.hash_request(
+        method="POST",
+        path="/api/v1/transactions/deposit",
+        payload={**payload, "amount": 20.0},
+    )
+    assert len({deposit, withdrawal, larger}) == 3
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get("b") is None
+    assert cache.hits == 3
+    assert cache.misses == 1
+
+def test_claim_committed_mid_request_is_in_progress_then_keeps_the_failure(monkeypatch):
+    monkeypatch.setattr(IdempotencyService, "_cache", LRUCache(maxsize=10))
+    engine = create_engine("sqlite://")
+    IdempotencyKey.__table__.create(engine)
+    expires_at = datetime.utcnow() + timedelta(hours=1)
+
+    in_progress = StoredResponse(request_hash="h", status_code=None, body=None, expires_at=expires_at)
+    with pytest.raises(HTTPException) as conflict:
+        IdempotencyService._replay(in_progress, "h")
+    assert conflict.value.status_code == 409
+
+    with Session(engine) as db:
+        uow = UnitOfWork(db)
+        # Checkpointed with the debit of a cross-shard transfer
+        record = IdempotencyKey(
+            user_id=1, key="k", request_method="POST", request_path="/transfer",
+            request_hash="h", expires_at=expires_at,
+        )
+        db.add(record)
+        uow.checkpoint()
+
+        scope = IdempotencyScope(db, cache_key=(1, "k"), request_hash="h", record=record)
+        asyncio.run(scope.save_failure(HTTPException(status_code=400, detail="Transfer failed and was refunded")))
+        assert not uow.committed
+        uow.close()
+
+    with Session(engine) as db:
+        stored = db.query(IdempotencyKey).one()
+        assert (stored.response_status_code, stored.response_body) == (400, {"detail": "Transfer failed and was refunded"})
+    assert IdempotencyService._replay(IdempotencyService._cache.get((1, "k")), "h").status_code == 400
@@ -0,0 +1,73 @@
+# backend/tests/unit/test_services/test_interest.py
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app.db.models.account import Account, AccountType
+from app.db.models.audit import AuditLog
+from app.db.repositories import transaction_repository
+from app.services.interest import InterestRateTier, InterestService
+
+TIERS = (
+    InterestRateTier(min_balance=0.0, annual_rate=0.0365),
+    InterestRateTier(min_balance=10_000.0, annual_rate=0.0730),
+)
+
+def test_daily_accrual_uses_balance_tier():
+    balances = np.array([1_000.0, 9_999.99, 10_000.0, 20_000.0])
+    
+    accruals = InterestService.compute_daily_accruals(balances, TIERS, day_count_basis=365)
+    
+    assert accruals.tolist() == pytest.approx([0.10, 0.999999, 2.00, 4.00])
+
+def test_daily_accrual_below_first_tier_is_zero():
+    tiers = (InterestRateTier(min_balance=500.0, annual_rate=0.0365),)
+    
+    accruals = InterestService.compute_daily_accruals(
+        np.array([499.0, 1_000.0]), tiers, day_count_basis=365,
+    )
+    
+    assert accruals.tolist() == pytest.approx([0.0, 0.10])
+
+def test_interest_below_a_cent_is_carried_until_it_adds_up():
+    carried = np.zeros(1)
+    posted = []
+    for _ in range(10):
+        # 0.4 cents a day, which rounding would lose every day
+        amounts, carried = InterestService.split_cents(carried + np.array([0.004]))
+        posted.append(amounts[0])
+    
+    assert posted == [0.0, 0.0, 0.01, 0.0, 0.01, 0.0, 0.0, 0.01, 0.0, 0.01]
+    assert carried[0] == pytest.approx(0.0)
+
+def test_second_run_for_the_same_date_posts_nothing(monkeypatch):
+    engine = create_engine("sqlite://")
+    for model in (Account, AuditLog):
+        model.__table__.create(engine)
+    monkeypatch.setattr("app.services.interest.INTEREST_RATE_TABLES", {AccountType.SAVINGS: TIERS})
+    # SQLite cannot run the unnest CTE; apply the accrual as the statement does
+    calls = []
+    def post_interest_accruals(db, *, accrual_date, account_ids, amounts, carries):
+        calls.append(account_ids)
+        for account_id, amount, carry in zip(account_ids, amounts, carries):
+            db.execute(update(Account).where(Account.id == account_id).values(
+                balance=Account.balance + amount, accrued_interest=carry, interest_accrued_on=accrual_date,
+            ))
+        return sum(amount > 0 for amount in amounts), sum(amounts)
+    monkeypatch.setattr(transaction_repository, "post_interest_accruals", post_interest_accruals)
+    
+    with Session(engine) as db:
+        db.add(Account(id=1, account_number="1", account_type=AccountType.SAVINGS, user_id=1, balance=36_500.0))
+        db.commit()
+        
+        first = InterestService.accrue(db, accrual_date=date(2026, 10, 18))
+        second = InterestService.accrue(db, accrual_date=date(2026, 10, 18))
+        
+        assert (first.accounts_scanned, first.accruals_posted) == (1, 1)
+        assert (second.accounts_scanned, second.accruals_posted, second.amount_posted) == (0, 0, 0.0)
+        # The second run has no account left to post to
+        assert calls == [[1], []]
+        assert db.query(Account.balance).scalar() == pytest.approx(36_507.3)